@@ -1,7 +1,90 @@
+from panda3d.core import ConfigVariableDouble
 from panda3d.direct import DCPacker
 from . import MsgTypes
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.PyDatagram import PyDatagram
+from direct.task.TaskManagerGlobal import taskMgr
+
+
+class ObjectQueryBatch:
+    """
+    Tracks a queryObjects() request. Keeps up to maxInFlight queries outstanding
+    at a time, sending the next one as each response comes back, and calls the
+    callback once every object has been answered for, or once timeout seconds
+    have passed, with everything still unanswered counted as failed.
+    """
+
+    def __init__(self, dbInterface, databaseId, doIds, callback, dclass, fieldNames, maxInFlight, timeout):
+        self.dbInterface = dbInterface
+        self.databaseId = databaseId
+        self.callback = callback
+        self.dclass = dclass
+        self.fieldNames = fieldNames
+        self.maxInFlight = max(1, maxInFlight)
+        self.timeout = timeout
+
+        # Drop duplicates, but keep the order we were given.
+        self.pending = list(dict.fromkeys(doIds))
+        self.pending.reverse()
+        # doId -> context of the query waiting on it.
+        self.inFlight = {}
+        self.done = False
+
+        self.results = {}
+        self.failures = []
+
+    def getTaskName(self):
+        return 'astron-db-query-batch-%d' % id(self)
+
+    def start(self):
+        if not self.pending:
+            self.__finish()
+            return
+
+        if self.timeout > 0:
+            taskMgr.doMethodLater(self.timeout, self.__handleTimeout, self.getTaskName())
+        self.__sendQueries()
+
+    def __sendQueries(self):
+        while self.pending and len(self.inFlight) < self.maxInFlight:
+            doId = self.pending.pop()
+            self.inFlight[doId] = self.dbInterface.queryObject(
+                self.databaseId, doId, lambda dclass, fields, doId=doId: self.__handleResponse(doId, dclass, fields),
+                dclass=self.dclass, fieldNames=self.fieldNames)
+
+    def __handleResponse(self, doId, dclass, fields):
+        if self.done:
+            # Too late, the batch already timed out.
+            return
+
+        self.inFlight.pop(doId, None)
+        if dclass is None:
+            self.failures.append(doId)
+        else:
+            self.results[doId] = (dclass, fields)
+
+        if self.pending:
+            self.__sendQueries()
+        elif not self.inFlight:
+            self.__finish()
+
+    def __handleTimeout(self, task):
+        self.dbInterface.notify.warning('Query batch timed out with %d objects unanswered.'
+                                        % (len(self.inFlight) + len(self.pending)))
+        # Stop waiting on the queries we gave up on.
+        for doId, ctx in self.inFlight.items():
+            self.dbInterface.cancelQuery(ctx)
+            self.failures.append(doId)
+        self.failures.extend(reversed(self.pending))
+        self.inFlight.clear()
+        self.pending = []
+        self.__finish()
+        return task.done
+
+    def __finish(self):
+        self.done = True
+        taskMgr.remove(self.getTaskName())
+        self.callback(self.results, self.failures)
 
 
 class AstronDatabaseInterface:
@@ -15,6 +98,14 @@ class AstronDatabaseInterface:
     """
     notify = DirectNotifyGlobal.directNotify.newCategory("AstronDatabaseInterface")
 
+    # The default amount of queries queryObjects() will have waiting on the
+    # database at once.
+    MAX_QUERIES_IN_FLIGHT = 64
+
+    # How long queryObjects() waits for the database to answer everything
+    # before giving up on what's left, in seconds, or 0 to wait forever.
+    QUERY_BATCH_TIMEOUT = ConfigVariableDouble('db-query-batch-timeout', 60.0).getValue()
+
     def __init__(self, air):
         self.air = air
 
@@ -82,6 +173,8 @@ class AstronDatabaseInterface:
         On success, the callback will be invoked as callback(dclass, fields)
         where dclass is a DCClass instance and fields is a dict.
         On failure, the callback will be invoked as callback(None, None).
+
+        Returns the context of the query, which can be passed to cancelQuery().
         """
 
         # Save the callback:
@@ -114,6 +207,38 @@ class AstronDatabaseInterface:
                                   ' %s object' % (fieldName, dclass.getName()))
             dg.addUint16(field.getNumber())
         self.air.send(dg)
+        return ctx
+
+    def cancelQuery(self, ctx):
+        """
+        Stops waiting on the query with context `ctx`. Its callback won't be
+        invoked, and any answer that still comes in is dropped.
+        """
+        self._callbacks.pop(ctx, None)
+        self._dclasses.pop(ctx, None)
+
+    def queryObjects(self, databaseId, doIds, callback, dclass=None, fieldNames=(), maxInFlight=None, timeout=None):
+        """
+        Query many objects out of the database at once.
+
+        Queries are pipelined: up to maxInFlight of them (MAX_QUERIES_IN_FLIGHT
+        by default) are outstanding at a time, and the next one is sent as each
+        response comes back.
+
+        Once every object has been answered for, the callback is invoked once
+        as callback(results, failures), where results is a dict of
+        doId->(dclass, fields) and failures is a list of doIds that could not
+        be queried. If the database hasn't answered for every object within
+        timeout seconds (QUERY_BATCH_TIMEOUT by default), the callback is
+        invoked with whatever is left counted as failures, and any answers
+        that come in later are ignored.
+        """
+        if maxInFlight is None:
+            maxInFlight = self.MAX_QUERIES_IN_FLIGHT
+        if timeout is None:
+            timeout = self.QUERY_BATCH_TIMEOUT
+
+        ObjectQueryBatch(self, databaseId, doIds, callback, dclass, fieldNames, maxInFlight, timeout).start()
 
     def handleQueryObjectResp(self, msgType, di):
         ctx = di.getUint32()
@@ -0,0 +1,351 @@
+import collections
+import os
+import struct
+import time
+
+from panda3d.core import ConfigVariableDouble, ConfigVariableInt, ConfigVariableString
+from direct.directnotify import DirectNotifyGlobal
+from direct.task.TaskManagerGlobal import taskMgr
+
+_packUint16 = struct.Struct('>H').pack
+_packUint32 = struct.Struct('>I').pack
+_packUint64 = struct.Struct('>Q').pack
+_packInt16 = struct.Struct('>h').pack
+_packInt32 = struct.Struct('>i').pack
+_packInt64 = struct.Struct('>q').pack
+_packFloat64 = struct.Struct('>d').pack
+
+
+def msgpack_pack_length(out, length, fix, maxfix, tag16, tag32):
+    if length < maxfix:
+        out.append(fix + length)
+    elif length < 1 << 16:
+        out.append(tag16)
+        out += _packUint16(length)
+    elif length < 1 << 32:
+        out.append(tag32)
+        out += _packUint32(length)
+    else:
+        raise ValueError('Value too big for MessagePack')
+
+
+def msgpack_pack(out, element, default=None):
+    """
+    Appends element to the bytearray out as MessagePack. Anything MessagePack
+    can't hold is passed to default, if given, and what it returns is packed
+    instead.
+    """
+    kind = type(element)
+    if kind is str:
+        data = element.encode('utf-8')
+        # 0xd9 is str 8 in all recent versions of the MsgPack spec, but somehow
+        # Logstash bundles a MsgPack implementation SO OLD that this isn't
+        # handled correctly so this function avoids it too
+        msgpack_pack_length(out, len(data), 0xa0, 0x20, 0xda, 0xdb)
+        out += data
+    elif kind is int:
+        if -32 <= element < 128:
+            out.append(element & 0xff)
+        elif 128 <= element < 256:
+            out.append(0xcc)
+            out.append(element)
+        elif 256 <= element < 65536:
+            out.append(0xcd)
+            out += _packUint16(element)
+        elif 65536 <= element < (1 << 32):
+            out.append(0xce)
+            out += _packUint32(element)
+        elif (1 << 32) <= element < (1 << 64):
+            out.append(0xcf)
+            out += _packUint64(element)
+        elif -128 <= element < -32:
+            out.append(0xd0)
+            out.append(element & 0xff)
+        elif -32768 <= element < -128:
+            out.append(0xd1)
+            out += _packInt16(element)
+        elif -1 << 31 <= element < -32768:
+            out.append(0xd2)
+            out += _packInt32(element)
+        elif -1 << 63 <= element < -1 << 31:
+            out.append(0xd3)
+            out += _packInt64(element)
+        else:
+            raise ValueError('int out of range for msgpack: %d' % element)
+    elif element is None:
+        out.append(0xc0)
+    elif element is False:
+        out.append(0xc2)
+    elif element is True:
+        out.append(0xc3)
+    elif kind is float:
+        # Python does not distinguish between floats and doubles, so we send
+        # everything as a double in MsgPack:
+        out.append(0xcb)
+        out += _packFloat64(element)
+    elif kind is dict:
+        msgpack_pack_length(out, len(element), 0x80, 0x10, 0xde, 0xdf)
+        for k, v in element.items():
+            msgpack_pack(out, k, default)
+            msgpack_pack(out, v, default)
+    elif kind is list or kind is tuple:
+        msgpack_pack_length(out, len(element), 0x90, 0x10, 0xdc, 0xdd)
+        for v in element:
+            msgpack_pack(out, v, default)
+    elif isinstance(element, int):
+        # IntEnums and the like.
+        msgpack_pack(out, int(element), default)
+    elif isinstance(element, float):
+        msgpack_pack(out, float(element), default)
+    elif isinstance(element, str):
+        msgpack_pack(out, str(element), default)
+    elif isinstance(element, dict):
+        msgpack_pack(out, dict(element), default)
+    elif isinstance(element, (list, tuple)):
+        msgpack_pack(out, list(element), default)
+    elif default is not None:
+        msgpack_pack(out, default(element))
+    else:
+        raise TypeError('Encountered non-MsgPack-packable value: %r' % element)
+
+
+class EventLogFile:
+    """
+    Appends events to a file, moving it aside once it gets too big and keeping
+    the last few that were moved aside.
+    """
+
+    def __init__(self, filename, maxSize, backups):
+        self.filename = filename
+        self.maxSize = maxSize
+        self.backups = backups
+        self.file = open(filename, 'ab')
+        self.size = self.file.tell()
+
+    def write(self, data):
+        if self.size and self.size + len(data) > self.maxSize:
+            self.rotate()
+
+        self.file.write(data)
+        self.file.flush()
+        self.size += len(data)
+
+    def rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = '%s.%d' % (self.filename, i)
+            if os.path.exists(source):
+                os.replace(source, '%s.%d' % (self.filename, i + 1))
+        if self.backups:
+            os.replace(self.filename, '%s.1' % self.filename)
+        else:
+            os.remove(self.filename)
+
+        self.file = open(self.filename, 'ab')
+        self.size = 0
+
+    def close(self):
+        self.file.close()
+
+
+class AstronEventLog:
+    """
+    Buffers the events written with AstronInternalRepository.writeServerEvent
+    and writes them out in batches, to the Event Logger set with
+    setEventLogHost and/or to files in eventlog-dir.
+
+    Writing an event only packs it into MessagePack and puts it on the end of
+    a ring buffer, so it's cheap enough for anywhere on the AI. If the buffer
+    fills up, the oldest events are thrown out. Every type of event is also
+    limited to so many a second, so one noisy type can't crowd out the rest.
+    Everything thrown out is counted, and the counts are logged as an event of
+    their own every so often.
+
+    Do not create this class directly; instead, use AstronInternalRepository's
+    eventLog attribute.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory("AstronEventLog")
+
+    # How many events can wait to be written before the oldest are thrown out.
+    BUFFER_SIZE = ConfigVariableInt('eventlog-buffer-size', 65536).getValue()
+
+    # How long events wait to be written out with the ones after them, in
+    # seconds, and the most that are written out at once.
+    FLUSH_INTERVAL = ConfigVariableDouble('eventlog-flush-interval', 0.25).getValue()
+    FLUSH_BATCH = ConfigVariableInt('eventlog-flush-batch', 4096).getValue()
+
+    # How many events of each type can be written a second, or 0 for no limit,
+    # and how many seconds' worth can be written at once after a quiet spell.
+    # eventlog-rate-limits sets it for single types, e.g.
+    # "chat-message-said:500 suspicious:50".
+    RATE_LIMIT = ConfigVariableDouble('eventlog-rate-limit', 200.0).getValue()
+    RATE_LIMITS = ConfigVariableString('eventlog-rate-limits', '').getValue()
+    RATE_BURST = ConfigVariableDouble('eventlog-rate-burst', 5.0).getValue()
+
+    # Where to keep event files, how many bytes one gets to before it's moved
+    # aside and how many are kept once they have been.
+    LOG_DIR = ConfigVariableString('eventlog-dir', '').getValue()
+    LOG_FILE_SIZE = ConfigVariableInt('eventlog-file-size', 64 << 20).getValue()
+    LOG_FILE_BACKUPS = ConfigVariableInt('eventlog-file-backups', 10).getValue()
+
+    # How often to log how many events have been thrown out, if any were, in
+    # seconds.
+    DROP_REPORT_INTERVAL = ConfigVariableDouble('eventlog-drop-report-interval', 60.0).getValue()
+
+    def __init__(self, air):
+        self.air = air
+
+        self.buffer = collections.deque()
+        self.rateLimits = {}
+        for limit in self.RATE_LIMITS.split():
+            logtype, rate = limit.rsplit(':', 1)
+            self.rateLimits[logtype] = float(rate)
+        # Maps logtype -> [events it can still write, when it last could].
+        self.buckets = {}
+
+        self.file = None
+        if self.LOG_DIR:
+            os.makedirs(self.LOG_DIR, exist_ok=True)
+            filename = os.path.join(self.LOG_DIR, '%s.events' % self.air.eventLogId.replace(':', '-'))
+            self.file = EventLogFile(filename, self.LOG_FILE_SIZE, self.LOG_FILE_BACKUPS)
+
+        self.written = 0
+        self.dropped = collections.Counter()
+        self.droppedByType = collections.Counter()
+        self.lastDropReport = 0.0
+        self.reportedDrops = 0
+
+    def isEnabled(self):
+        return self.air.eventSocket is not None or self.file is not None
+
+    def write(self, logtype, args, kwargs):
+        """
+        Packs an event and queues it to be written out. The event is a map
+        of its type, who sent it, when and its fields: args are numbered
+        from _1, and kwargs keep their names.
+        """
+        if self.air.eventSocket is None and self.file is None:
+            return
+
+        if not self.__allow(logtype):
+            self.dropped['rate-limited'] += 1
+            self.droppedByType[logtype] += 1
+            self.__scheduleFlush()
+            return
+
+        out = bytearray()
+        msgpack_pack_length(out, 3 + len(args) + len(kwargs), 0x80, 0x10, 0xde, 0xdf)
+        out += b'\xa4type'
+        msgpack_pack(out, logtype, str)
+        out += b'\xa6sender'
+        msgpack_pack(out, self.air.eventLogId, str)
+        out += b'\xa4time'
+        msgpack_pack(out, time.time())
+        for i, v in enumerate(args):
+            # +1 because the logtype was _0, so we start at _1
+            msgpack_pack(out, '_%d' % (i + 1))
+            msgpack_pack(out, v, str)
+        for k, v in kwargs.items():
+            msgpack_pack(out, k)
+            msgpack_pack(out, v, str)
+
+        self.__queue(bytes(out))
+
+    def __allow(self, logtype):
+        rate = self.rateLimits.get(logtype, self.RATE_LIMIT)
+        if rate <= 0:
+            return True
+
+        now = globalClock.getFrameTime()
+        bucket = self.buckets.get(logtype)
+        if bucket is None:
+            bucket = [rate * self.RATE_BURST, now]
+            self.buckets[logtype] = bucket
+        else:
+            bucket[0] = min(rate * self.RATE_BURST, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            return False
+
+        bucket[0] -= 1
+        return True
+
+    def __queue(self, event):
+        if len(self.buffer) >= self.BUFFER_SIZE:
+            self.buffer.popleft()
+            self.dropped['overflow'] += 1
+
+        self.buffer.append(event)
+        self.__scheduleFlush()
+
+    def __scheduleFlush(self):
+        if not taskMgr.hasTaskNamed('astron-eventlog-flush'):
+            taskMgr.doMethodLater(self.FLUSH_INTERVAL, self.__flushTask, 'astron-eventlog-flush')
+
+    def flush(self, maxEvents=None):
+        """
+        Writes out up to maxEvents waiting events, or all of them.
+        """
+        self.__considerDropReport()
+
+        count = len(self.buffer)
+        if maxEvents is not None:
+            count = min(count, maxEvents)
+        if not count:
+            return
+
+        buffer = self.buffer
+        events = [buffer.popleft() for _ in range(count)]
+        self.written += count
+
+        socket = self.air.eventSocket
+        if socket is not None:
+            address = self.air.eventLogAddress
+            failed = 0
+            for event in events:
+                # The Event Logger reads one event per datagram.
+                try:
+                    socket.sendto(event, address)
+                except OSError:
+                    failed += 1
+            if failed:
+                self.dropped['send-failed'] += failed
+
+        if self.file is not None:
+            try:
+                self.file.write(b''.join(events))
+            except OSError as e:
+                self.notify.warning('Could not write %d events: %s' % (count, e))
+                self.dropped['write-failed'] += count
+
+    def flushAllEvents(self):
+        """
+        Immediately writes out every waiting event. Should be called on
+        shutdown.
+        """
+        taskMgr.remove('astron-eventlog-flush')
+        self.flush()
+
+    def __flushTask(self, task):
+        self.flush(self.FLUSH_BATCH)
+        if self.buffer or sum(self.dropped.values()) != self.reportedDrops:
+            return task.again
+        return task.done
+
+    def __considerDropReport(self):
+        drops = sum(self.dropped.values())
+        if drops == self.reportedDrops:
+            return
+
+        now = globalClock.getFrameTime()
+        if now - self.lastDropReport < self.DROP_REPORT_INTERVAL:
+            return
+
+        self.lastDropReport = now
+        self.reportedDrops = drops
+        # Straight into the buffer, so the report itself can't be rate limited.
+        out = bytearray()
+        msgpack_pack(out, {'type': 'eventlog-dropped', 'sender': self.air.eventLogId, 'time': time.time(),
+                           'reasons': dict(self.dropped), 'types': dict(self.droppedByType.most_common(20))})
+        self.__queue(bytes(out))
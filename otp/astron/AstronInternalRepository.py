@@ -9,86 +9,17 @@ from direct.distributed.PyDatagram import PyDatagram
 
 from otp.astron.AstronNetMessenger import AstronNetMessenger
 
-import collections
+import socket
 
 from .AstronDatabaseInterface import AstronDatabaseInterface
+from .AstronEventLog import AstronEventLog, msgpack_pack
 
 
 # Helper functions for logging output:
-def msgpack_length(dg, length, fix, maxfix, tag8, tag16, tag32):
-    if length < maxfix:
-        dg.addUint8(fix + length)
-    elif tag8 is not None and length < 1 << 8:
-        dg.addUint8(tag8)
-        dg.addUint8(length)
-    elif tag16 is not None and length < 1 << 16:
-        dg.addUint8(tag16)
-        dg.addBeUint16(length)
-    elif tag32 is not None and length < 1 << 32:
-        dg.addUint8(tag32)
-        dg.addBeUint32(length)
-    else:
-        raise ValueError('Value too big for MessagePack')
-
-
 def msgpack_encode(dg, element):
-    if element is None:
-        dg.addUint8(0xc0)
-    elif element is False:
-        dg.addUint8(0xc2)
-    elif element is True:
-        dg.addUint8(0xc3)
-    elif isinstance(element, int):
-        if -32 <= element < 128:
-            dg.addInt8(element)
-        elif 128 <= element < 256:
-            dg.addUint8(0xcc)
-            dg.addUint8(element)
-        elif 256 <= element < 65536:
-            dg.addUint8(0xcd)
-            dg.addBeUint16(element)
-        elif 65536 <= element < (1 << 32):
-            dg.addUint8(0xce)
-            dg.addBeUint32(element)
-        elif (1 << 32) <= element < (1 << 64):
-            dg.addUint8(0xcf)
-            dg.addBeUint64(element)
-        elif -128 <= element < -32:
-            dg.addUint8(0xd0)
-            dg.addInt8(element)
-        elif -32768 <= element < -128:
-            dg.addUint8(0xd1)
-            dg.addBeInt16(element)
-        elif -1 << 31 <= element < -32768:
-            dg.addUint8(0xd2)
-            dg.addBeInt32(element)
-        elif -1 << 63 <= element < -1 << 31:
-            dg.addUint8(0xd3)
-            dg.addBeInt64(element)
-        else:
-            raise ValueError('int out of range for msgpack: %d' % element)
-    elif isinstance(element, dict):
-        msgpack_length(dg, len(element), 0x80, 0x10, None, 0xde, 0xdf)
-        for k, v in list(element.items()):
-            msgpack_encode(dg, k)
-            msgpack_encode(dg, v)
-    elif isinstance(element, list):
-        msgpack_length(dg, len(element), 0x90, 0x10, None, 0xdc, 0xdd)
-        for v in element:
-            msgpack_encode(dg, v)
-    elif isinstance(element, str):
-        # 0xd9 is str 8 in all recent versions of the MsgPack spec, but somehow
-        # Logstash bundles a MsgPack implementation SO OLD that this isn't
-        # handled correctly so this function avoids it too
-        msgpack_length(dg, len(element), 0xa0, 0x20, None, 0xda, 0xdb)
-        dg.appendData(element.encode('utf-8'))
-    elif isinstance(element, float):
-        # Python does not distinguish between floats and doubles, so we send
-        # everything as a double in MsgPack:
-        dg.addUint8(0xcb)
-        dg.addBeFloat64(element)
-    else:
-        raise TypeError('Encountered non-MsgPack-packable value: %r' % element)
+    out = bytearray()
+    msgpack_pack(out, element)
+    dg.appendData(bytes(out))
 
 
 class AstronInternalRepository(ConnectionRepository):
@@ -133,10 +64,15 @@ class AstronInternalRepository(ConnectionRepository):
 
         self.__callbacks = {}
 
+        # How many datagrams we have handled since we started. Read by load reports.
+        self.numDatagramsHandled = 0
+
         self.ourChannel = self.allocateChannel()
 
         self.eventLogId = self.config.GetString('eventlog-id', 'AIR:%d' % self.ourChannel)
         self.eventSocket = None
+        self.eventLogAddress = None
+        self.eventLog = AstronEventLog(self)
         eventLogHost = self.config.GetString('eventlog-host', '')
         if eventLogHost:
             if ':' in eventLogHost:
@@ -230,6 +166,7 @@ class AstronInternalRepository(ConnectionRepository):
         self.send(dg)
 
     def handleDatagram(self, di):
+        self.numDatagramsHandled += 1
         msgType = self.getMsgType()
 
         if msgType in (
@@ -661,13 +598,16 @@ class AstronInternalRepository(ConnectionRepository):
             self.eventSocket = None
             return
 
-        address = SocketAddress()
-        if not address.setHost(host, port):
+        try:
+            address = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+        except (socket.gaierror, UnicodeError):
             self.notify.warning('Invalid Event Log host specified: %s:%s' % (host, port))
             self.eventSocket = None
         else:
-            self.eventSocket = SocketUDPOutgoing()
-            self.eventSocket.InitToAddress(address)
+            # Panda's SocketUDPOutgoing only sends strings, which mangles MessagePack.
+            self.eventSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.eventSocket.setblocking(False)
+            self.eventLogAddress = address
 
     def writeServerEvent(self, logtype, *args, **kwargs):
         """
@@ -676,9 +616,11 @@ class AstronInternalRepository(ConnectionRepository):
         The purpose of the Event Logger is to keep a game-wide record of all
         interesting in-game events that take place. Therefore, this function
         should be used whenever such an interesting in-game event occurs.
+
+        Events are written out in batches shortly after, see AstronEventLog.
         """
 
-        pass
+        self.eventLog.write(logtype, args, kwargs)
 
     def setAI(self, doId, aiChannel):
         """
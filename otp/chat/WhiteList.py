@@ -4,11 +4,26 @@ import sys
 import os
 
 class WhiteList:
+    """
+    Every word toons are allowed to type, kept as one sorted list of lowercase byte strings.
+
+    Whole words are found with a binary search, and every word starting with a prefix is found with two, since they
+    all sit next to each other in the list. Whitelist files are already sorted, so loading one is a split and a sort
+    that has nothing to do.
+    """
 
     def __init__(self, wordlist):
-        self.words = []
-        for line in wordlist:
-            self.words.append(line.strip(b'\n\r').lower())
+        self.setWords(wordlist)
+
+    def setWords(self, wordlist):
+        """
+        Replaces the whitelist with the words in wordlist, which is either the raw contents of a whitelist file or
+        its lines.
+        """
+        if isinstance(wordlist, bytes):
+            self.words = wordlist.lower().splitlines()
+        else:
+            self.words = [line.strip(b'\n\r').lower() for line in wordlist]
 
         self.words.sort()
         self.numWords = len(self.words)
@@ -33,19 +48,42 @@ class WhiteList:
         return self.words[i].startswith(text)
 
     def prefixCount(self, text):
-        text = self.cleanText(text)
-        i = bisect_left(self.words, text)
-        j = i
-        while j < self.numWords and self.words[j].startswith(text):
-            j += 1
-
+        i, j = self.getPrefixRange(self.cleanText(text))
         return j - i
 
     def prefixList(self, text):
-        text = self.cleanText(text)
-        i = bisect_left(self.words, text)
-        j = i
-        while j < self.numWords and self.words[j].startswith(text):
-            j += 1
-
+        i, j = self.getPrefixRange(self.cleanText(text))
         return self.words[i:j]
+
+    def getPrefixRange(self, prefix):
+        """
+        Returns where the words starting with prefix begin and end in self.words.
+        """
+        i = bisect_left(self.words, prefix)
+
+        # Every word starting with the prefix comes before the prefix with its last byte bumped up one. A prefix of
+        # nothing but 0xff bytes runs to the end of the list.
+        upper = prefix.rstrip(b'\xff')
+        if not upper:
+            return i, self.numWords
+        upper = upper[:-1] + bytes((upper[-1] + 1,))
+        return i, bisect_left(self.words, upper, i)
+
+    def filterText(self, text, mask='*'):
+        """
+        Masks every word in text that isn't on the whitelist, in one pass. Returns the masked text, and the first and
+        last index of every word that was masked.
+        """
+        modifications = []
+        words = []
+        offset = 0
+        for word in text.split(' '):
+            if word and not self.isWord(word):
+                modifications.append((offset, offset + len(word) - 1))
+                words.append(mask * len(word))
+            else:
+                words.append(word)
+
+            offset += len(word) + 1
+
+        return ' '.join(words), modifications
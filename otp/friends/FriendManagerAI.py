@@ -251,6 +251,8 @@ class FriendManagerAI(DistributedObjectAI):
                     self.air.dbInterface.updateObject(self.air.dbId, friendId,
                                                       self.air.dclassesByName['DistributedToonAI'],
                                                       {'setFriendsList': [newFriendsList]})
+                    if self.air.chatManager is not None:
+                        self.air.chatManager.d_avatarProfileChanged(friendId)
                     av.extendFriendsList(friendId, 1)
                     av.d_setFriendsList(av.getFriendsList())
                     self.d_submitSecretResponse(avId, 1, friendId)
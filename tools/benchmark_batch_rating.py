@@ -0,0 +1,138 @@
+"""
+A script that measures how much faster rating lots of matches at once is than rating them one by one, and checks that
+it gives bit-identical results. Rates random 1v1 matches with the zero-sum ELO model through rate_matches() and through
+model.rate() one match at a time, both with NumPy and without it, and does the same for the 1v1 rank normalization
+curve. Also checks that rate_matches() refuses what model.rate() refuses. Exits with an error if anything differs.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from toontown.matchmaking.skill_globals import MODEL, ZERO_SUM_MODEL
+from toontown.matchmaking.skill_rating import rate_matches
+from toontown.matchmaking.skill_rating_utils import compress_ratings
+
+MATCHES = 100_000
+OPENSKILL_MATCHES = 1000
+RATINGS = 100_000
+# The curve tools/perform_1v1_rank_normalization.py runs everyone's 1v1 rank through.
+RATING_PIVOT = 1000
+CURVE_EXPONENT = 7 / 9
+
+
+def rate_one_by_one(matches: list, ranks: list) -> list:
+    """
+    The old way of rating a batch of matches, kept here for comparison.
+    """
+    results = []
+    for match, match_ranks in zip(matches, ranks):
+        teams = [[ZERO_SUM_MODEL.rating(mu=mu, sigma=sigma, name='0') for mu, sigma in team] for team in match]
+        rated = ZERO_SUM_MODEL.rate(teams, ranks=match_ranks)
+        results.append([[(player.mu, player.sigma) for player in team] for team in rated])
+    return results
+
+
+def compress_one_by_one(ratings: list[int]) -> list[int]:
+    """
+    The old way the rank normalization tools ran ratings through the curve, kept here for comparison.
+    """
+    return [int(((rating - RATING_PIVOT) ** CURVE_EXPONENT + RATING_PIVOT).real) for rating in ratings]
+
+
+def without_numpy(func, *args):
+    # Importing a module that is None in sys.modules raises ImportError, like it isn't installed.
+    numpy = sys.modules.get('numpy')
+    sys.modules['numpy'] = None
+    try:
+        return func(*args)
+    finally:
+        if numpy is None:
+            del sys.modules['numpy']
+        else:
+            sys.modules['numpy'] = numpy
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bits(results: list) -> list:
+    return [[[(float(mu).hex(), sigma) for mu, sigma in team] for team in match] for match in results]
+
+
+def refuses(func) -> bool:
+    try:
+        func()
+    except RuntimeError:
+        return True
+    return False
+
+
+rng = random.Random(0)
+failed = False
+
+matches = [[[(rng.randint(0, 3000), 0)], [(rng.uniform(0, 3000), 0)]] for _ in range(MATCHES)]
+ranks = [rng.choice([[1, 2], [2, 1], [1, 1]]) for _ in range(MATCHES)]
+expected, one_by_one = timed(rate_one_by_one, matches, ranks)
+batch, batch_time = timed(rate_matches, ZERO_SUM_MODEL, matches, ranks)
+fallback, fallback_time = timed(without_numpy, rate_matches, ZERO_SUM_MODEL, matches, ranks)
+mismatches = sum(a != b for a, b in zip(bits(expected), bits(batch)))
+fallback_mismatches = sum(a != b for a, b in zip(bits(expected), bits(fallback)))
+print(f"Rating {MATCHES} 1v1 matches with the zero-sum ELO model:")
+print(f"  one by one:       {one_by_one * 1000:8.1f}ms")
+print(f"  batch:            {batch_time * 1000:8.1f}ms, {mismatches} ratings that aren't bit-identical")
+print(f"  batch, no NumPy:  {fallback_time * 1000:8.1f}ms, {fallback_mismatches} ratings that aren't bit-identical")
+failed |= bool(mismatches or fallback_mismatches)
+
+openskill_matches = [[[(rng.uniform(0, 3000), rng.uniform(1, 400)) for _ in range(2)] for _ in range(3)]
+                     for _ in range(OPENSKILL_MATCHES)]
+openskill_ranks = [rng.sample([1, 2, 3], 3) for _ in range(OPENSKILL_MATCHES)]
+openskill_weights = [[[rng.uniform(0.5, 1.5) for _ in range(2)] for _ in range(3)] for _ in range(OPENSKILL_MATCHES)]
+openskill_expected = []
+for match, match_ranks, match_weights in zip(openskill_matches, openskill_ranks, openskill_weights):
+    teams = [[MODEL.rating(mu=mu, sigma=sigma) for mu, sigma in team] for team in match]
+    rated = MODEL.rate(teams, ranks=match_ranks, weights=match_weights)
+    openskill_expected.append([[(player.mu, player.sigma) for player in team] for team in rated])
+openskill_batch = rate_matches(MODEL, openskill_matches, openskill_ranks, openskill_weights)
+openskill_mismatches = sum(a != b for a, b in zip(openskill_expected, openskill_batch))
+print(f"Rating {OPENSKILL_MATCHES} 2v2v2 matches with OpenSkill:")
+print(f"  {openskill_mismatches} matches rated differently than model.rate() rates them")
+failed |= bool(openskill_mismatches)
+
+ratings = [rng.randint(0, 4000) for _ in range(RATINGS)]
+expected, one_by_one = timed(compress_one_by_one, ratings)
+batch, batch_time = timed(compress_ratings, ratings, RATING_PIVOT, CURVE_EXPONENT)
+fallback, fallback_time = timed(without_numpy, compress_ratings, ratings, RATING_PIVOT, CURVE_EXPONENT)
+mismatches = sum(a != b for a, b in zip(expected, batch))
+fallback_mismatches = sum(a != b for a, b in zip(expected, fallback))
+print(f"Normalizing {RATINGS} 1v1 ranks:")
+print(f"  one by one:       {one_by_one * 1000:8.1f}ms")
+print(f"  batch:            {batch_time * 1000:8.1f}ms, {mismatches} ranks that aren't identical")
+print(f"  batch, no NumPy:  {fallback_time * 1000:8.1f}ms, {fallback_mismatches} ranks that aren't identical")
+failed |= bool(mismatches or fallback_mismatches)
+
+# rate_matches() has to refuse the same matches model.rate() does, and weights the zero-sum model can't use.
+problems = []
+if not refuses(lambda: rate_matches(ZERO_SUM_MODEL, [[[(1000, 0), (1000, 0)], [(1000, 0), (1000, 0)]]], [[1, 2]])):
+    problems.append("a 2v2 was rated with the zero-sum ELO model")
+if not refuses(lambda: rate_matches(ZERO_SUM_MODEL, [[[(1000, 0)], [(1000, 0)], [(1000, 0)]]], [[1, 2, 3]])):
+    problems.append("a three way match was rated with the zero-sum ELO model")
+if not refuses(lambda: rate_matches(ZERO_SUM_MODEL, [[[(1000, 0)], [(1000, 0)]]], [[1, 2]], [[[1.0], [1.0]]])):
+    problems.append("weights were silently ignored by the zero-sum ELO model")
+if not refuses(lambda: rate_matches(ZERO_SUM_MODEL, [[[(1000, 0)], [(1000, 0)]]], [[2, 2]])):
+    problems.append("a match nobody won was rated with the zero-sum ELO model")
+print("Checking what rate_matches() refuses:")
+print(f"  {len(problems)} bad matches accepted")
+for problem in problems:
+    print(f"    {problem}")
+failed |= bool(problems)
+
+if failed:
+    print("FAILED")
+    sys.exit(1)
@@ -0,0 +1,231 @@
+"""
+A script that plays a busy playground's worth of chat through the UberDOG's chat manager against a simulated database,
+and measures how long every line takes to go out and how many database reads it costs. Compares the chat manager's
+profile cache at a few sizes against reading the sender from the database for every line, the way it used to.
+
+Toons chat at random, reply to each other in bursts and whisper to friends and strangers. Every so often the AI changes
+someone's friends list and the UberDOG renames someone. The database answers after a random delay.
+"""
+
+import builtins
+import heapq
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from direct.showbase import DConfig
+from panda3d.core import ClockObject, Filename, loadPrcFileData
+from panda3d.direct import DCFile
+
+# What the UberDOG has around before the chat manager is imported.
+builtins.config = DConfig
+globalClock = ClockObject.getGlobalClock()
+globalClock.setMode(ClockObject.MSlave)
+builtins.globalClock = globalClock
+
+from toontown.uberdog.AvatarProfileCacheUD import AvatarProfile, AvatarProfileCacheUD
+from toontown.uberdog.TTOffChatManagerUD import TTOffChatManagerUD
+
+DC_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astron', 'dclass', 'ttap.dc'))
+
+TOONS = 300
+FRIENDS = 20
+MINUTES = 10
+# How long a toon goes between lines on average, in seconds, and the chance someone answers them right away.
+CHAT_INTERVAL = 15.0
+REPLY_CHANCE = 0.3
+WHISPER_CHANCE = 0.2
+# How often the AI changes someone's friends list, and how often the UberDOG renames someone, in seconds.
+FRIENDS_CHANGE_INTERVAL = 10.0
+RENAME_INTERVAL = 60.0
+# How long the database takes to answer on median, in seconds.
+DB_LATENCY = 0.004
+
+# The chat manager's config at a few cache sizes, or None for reading the database every time.
+CACHES = [
+    ('no cache (old)', None),
+    ('in-flight only', (0, 0.0)),
+    ('100 toons, 5m', (100, 300.0)),
+    ('10000 toons, 5m', (10000, 300.0)),
+]
+
+loadPrcFileData('benchmark_chat_profile_cache', 'want-whitelist #f')
+
+
+class UncachedProfiles:
+    """
+    The old way of finding out who is chatting, kept here for comparison.
+    """
+
+    def __init__(self, air):
+        self.air = air
+
+    def getProfile(self, avId, callback):
+        def handleAvatar(dclass, fields):
+            if dclass != self.air.dclassesByName['DistributedToonUD']:
+                callback(None)
+                return
+            callback(AvatarProfile(fields['setName'][0], fields['setFriendsList'][0]))
+
+        self.air.dbInterface.queryObject(self.air.dbId, avId, handleAvatar)
+
+    def invalidate(self, avId):
+        pass
+
+
+class Simulation:
+    """
+    Simulated time, and everything that happens in it in order.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.events = []
+        self.seq = 0
+
+    def schedule(self, when: float, callback, *args):
+        self.seq += 1
+        heapq.heappush(self.events, (when, self.seq, callback, args))
+
+    def run(self, end: float):
+        while self.events and self.events[0][0] <= end:
+            self.now, _, callback, args = heapq.heappop(self.events)
+            globalClock.setFrameTime(self.now)
+            callback(*args)
+
+
+class FakeDatabase:
+
+    def __init__(self, air, sim: Simulation, rng: random.Random):
+        self.air = air
+        self.sim = sim
+        self.rng = rng
+        self.reads = 0
+
+    def queryObject(self, databaseId, doId, callback, dclass=None, fieldNames=()):
+        self.reads += 1
+        fields = {'setName': (self.air.names[doId],), 'setFriendsList': (list(self.air.friends[doId]),)}
+        latency = self.rng.lognormvariate(math.log(DB_LATENCY), 0.5)
+        self.sim.schedule(self.sim.now + latency, callback, self.air.dclassesByName['DistributedToonUD'], fields)
+
+
+class FakeUberRepository:
+    """
+    The bare minimum of the UberDOG that the chat manager needs, without a connection to Astron.
+    """
+
+    def __init__(self, sim: Simulation, rng: random.Random):
+        self.sim = sim
+        self.dbId = 4003
+        self.ourChannel = 4000
+        self.dbInterface = FakeDatabase(self, sim, rng)
+        self.sender = 0
+
+        # Distributed objects look their class up by name, with the UD suffix, just like the real repository has them.
+        self.dcFile = DCFile()
+        self.dcFile.read(Filename.fromOsSpecific(DC_FILE))
+        self.dclassesByName = {}
+        for i in range(self.dcFile.getNumClasses()):
+            dclass = self.dcFile.getClass(i)
+            self.dclassesByName[dclass.getName() + 'UD'] = dclass
+
+        # What the database has for every toon.
+        self.names = {}
+        self.friends = {}
+
+        # When every line a toon said was sent, waiting to go out.
+        self.sentAt = {}
+        self.latencies = []
+
+    def getAccountIdFromSender(self):
+        return self.sender + 1
+
+    def getAvatarIdFromSender(self):
+        return self.sender
+
+    def registerForChannel(self, channel):
+        pass
+
+    def send(self, datagram):
+        pass
+
+    def writeServerEvent(self, logtype, *args, **kwargs):
+        if logtype in ('chat-message-said', 'whisper-message-said'):
+            self.latencies.append(self.sim.now - self.sentAt[kwargs['avId']].pop(0))
+
+
+def run(cache, rng: random.Random) -> tuple[FakeUberRepository, int, float]:
+    sim = Simulation()
+    air = FakeUberRepository(sim, rng)
+    toons = [100_000_000 + i for i in range(TOONS)]
+    for avId in toons:
+        air.names[avId] = f'Toon {avId}'
+        air.friends[avId] = {(friendId, 1) for friendId in rng.sample(toons, FRIENDS)}
+
+    manager = TTOffChatManagerUD(air)
+    manager.doId = 4681
+    manager.announceGenerate()
+    if cache is None:
+        manager.profileCache = UncachedProfiles(air)
+    else:
+        manager.profileCache = AvatarProfileCacheUD(air, maxSize=cache[0], ttl=cache[1])
+
+    cpu = 0.0
+    lines = 0
+
+    def say(avId):
+        nonlocal cpu, lines
+        air.sender = avId
+        air.sentAt.setdefault(avId, []).append(sim.now)
+        start = time.perf_counter()
+        if rng.random() < WHISPER_CHANCE:
+            manager.whisperMessage('hello there', rng.choice(toons))
+        else:
+            manager.chatMessage('hello there')
+        cpu += time.perf_counter() - start
+        lines += 1
+
+    def chat(avId):
+        say(avId)
+        if rng.random() < REPLY_CHANCE:
+            sim.schedule(sim.now + rng.uniform(0.5, 3.0), say, rng.choice(toons))
+        sim.schedule(sim.now + rng.expovariate(1 / CHAT_INTERVAL), chat, avId)
+
+    def changeFriends():
+        avId = rng.choice(toons)
+        air.friends[avId].add((rng.choice(toons), 1))
+        manager.avatarProfileChangedAiToUd(avId)
+        sim.schedule(sim.now + rng.expovariate(1 / FRIENDS_CHANGE_INTERVAL), changeFriends)
+
+    def rename():
+        avId = rng.choice(toons)
+        air.names[avId] += '!'
+        manager.invalidateProfile(avId)
+        sim.schedule(sim.now + rng.expovariate(1 / RENAME_INTERVAL), rename)
+
+    for avId in toons:
+        sim.schedule(rng.expovariate(1 / CHAT_INTERVAL), chat, avId)
+    sim.schedule(0.0, changeFriends)
+    sim.schedule(0.0, rename)
+    sim.run(MINUTES * 60)
+    return air, lines, cpu
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+print(f"{TOONS} toons chatting every {CHAT_INTERVAL:g}s on average for {MINUTES} simulated minutes, "
+      f"database answering in {DB_LATENCY * 1000:g}ms on median:")
+for name, cache in CACHES:
+    air, lines, cpu = run(cache, random.Random(0))
+    reads = air.dbInterface.reads
+    print(f"  {name:<18} {lines:>6} lines, {reads:>6} database reads ({reads / lines:.3f} a line), "
+          f"latency p50 {percentile(air.latencies, 0.5) * 1000:6.2f}ms  p99 {percentile(air.latencies, 0.99) * 1000:6.2f}ms"
+          f"  mean {statistics.mean(air.latencies) * 1000:6.2f}ms, {cpu / lines * 1_000_000:6.1f}us cpu a line")
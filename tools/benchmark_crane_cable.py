@@ -0,0 +1,239 @@
+"""
+A script that measures how much a crane's cable broadcasts cost, and checks that smoothing them on another client still
+moves the crane the same way.
+
+Plays a simulated controller swinging a crane around, stopping for a while and starting again, with the cable hanging
+off it. Broadcasts where the cable is every frame the way cranes used to, with every link in full every time, and the
+way they do now, with deltas and keyframes and nothing while the crane stands still. Smooths both the way a watching
+client does and exits with an error if they ever end up further apart than the broadcasts are precise.
+"""
+
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import Filename
+from panda3d.direct import DCFile, DCPacker, SmoothMover
+
+from toontown.coghq import CraneCableTelemetry
+
+DC_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astron', 'dclass', 'ttap.dc'))
+
+SECONDS = 300
+FRAME_RATE = 60
+# How long the controller holds the stick for, and how long they let go for, in seconds.
+MOVE_TIME = (0.2, 2.0)
+IDLE_TIME = (0.5, 5.0)
+
+# The crane, as DistributedCashbotBossCrane has it.
+CRANE_MIN_Y = 8
+CRANE_MAX_Y = 25
+ARM_MIN_H = -45
+ARM_MAX_H = 45
+SLIDE_SPEED = 10
+ROTATE_SPEED = 20
+CABLE_LENGTH = 20
+NUM_LINKS = 3
+GRAVITY = 32.174
+# How much of its speed a link keeps every frame, and how slow it has to be going for friction to stop it outright.
+LINK_DAMPING = 0.97
+LINK_STATIC_SPEED = 0.5
+
+# The length, message type, doId and field number in front of every field update a client sends or gets.
+MESSAGE_HEADER = 10
+# Anything up to a hundredth off in either stream can put them this far apart once smoothed.
+TOLERANCE = 0.03
+
+
+class Cable:
+    """
+    A crane on an arm, with links hanging off it that swing behind it as it moves.
+    """
+
+    def __init__(self):
+        self.y = 20.0
+        self.h = 0.0
+        self.links = []
+        linkLength = CABLE_LENGTH / NUM_LINKS
+        for linkNum in range(NUM_LINKS):
+            position = self.getCranePos()
+            position[2] -= linkLength * (linkNum + 1)
+            self.links.append((position, list(position)))
+
+    def getCranePos(self) -> list[float]:
+        h = math.radians(self.h)
+        return [-math.sin(h) * self.y, math.cos(h) * self.y, 0.0]
+
+    def move(self, slide: int, rotate: int, dt: float):
+        self.y = min(max(self.y + slide * SLIDE_SPEED * dt, CRANE_MIN_Y), CRANE_MAX_Y)
+        self.h = min(max(self.h + rotate * ROTATE_SPEED * dt, ARM_MIN_H), ARM_MAX_H)
+
+        # Verlet, keeping every link its length away from the one above.
+        linkLength = CABLE_LENGTH / NUM_LINKS
+        anchor = self.getCranePos()
+        anchorMoved = slide or rotate
+        for position, last in self.links:
+            velocity = [(position[i] - last[i]) * LINK_DAMPING for i in range(3)]
+            if not anchorMoved and math.sqrt(sum(value * value for value in velocity)) < LINK_STATIC_SPEED * dt:
+                last[:] = position
+                anchor = position
+                continue
+
+            anchorMoved = True
+            last[:] = position
+            for i in range(3):
+                position[i] += velocity[i]
+            position[2] -= GRAVITY * dt * dt
+
+            offset = [position[i] - anchor[i] for i in range(3)]
+            distance = math.sqrt(sum(value * value for value in offset)) or 1.0
+            for i in range(3):
+                position[i] = anchor[i] + offset[i] * linkLength / distance
+            anchor = position
+
+    def getRelativeLinks(self) -> list[tuple[float, float, float]]:
+        # Where every link is relative to the crane, the way d_sendCablePos finds them.
+        h = math.radians(-self.h)
+        crane = self.getCranePos()
+        links = []
+        for position, last in self.links:
+            x, y, z = (position[i] - crane[i] for i in range(3))
+            links.append((x * math.cos(h) - y * math.sin(h), x * math.sin(h) + y * math.cos(h), z))
+        return links
+
+    def getLinks(self) -> list[tuple[float, float, float]]:
+        return [tuple(position) for position, last in self.links]
+
+
+class Watcher:
+    """
+    Smooths a crane's broadcasts the way another client's crane does.
+    """
+
+    def __init__(self):
+        self.armSmoother = SmoothMover()
+        self.armSmoother.setSmoothMode(SmoothMover.SMOn)
+        self.linkSmoothers = []
+        for linkNum in range(NUM_LINKS):
+            smoother = SmoothMover()
+            smoother.setSmoothMode(SmoothMover.SMOn)
+            self.linkSmoothers.append(smoother)
+        self.cableState = None
+
+    def setCablePos(self, y, h, links, timestamp, relative=True):
+        self.cableState = CraneCableTelemetry.makeCableState(y, h, links)
+        if relative:
+            links = CraneCableTelemetry.getLinkPositions(0, 0, y, h - ARM_MAX_H, links)
+        self.mark(y, h, links, timestamp)
+
+    def setCableDelta(self, mask, deltas, timestamp):
+        self.cableState = CraneCableTelemetry.applyCableDelta(self.cableState, mask, deltas)
+        y, h, links = CraneCableTelemetry.getCableState(self.cableState)
+        self.mark(y, h, CraneCableTelemetry.getLinkPositions(0, 0, y, h - ARM_MAX_H, links), timestamp)
+
+    def mark(self, y, h, links, timestamp):
+        h -= ARM_MAX_H
+        self.armSmoother.setY(y)
+        self.armSmoother.setH(h)
+        self.armSmoother.setTimestamp(timestamp)
+        self.armSmoother.markPosition()
+        for smoother, link in zip(self.linkSmoothers, links):
+            smoother.setPos(*link)
+            smoother.setTimestamp(timestamp)
+            smoother.markPosition()
+
+    def getSmoothPos(self, now: float) -> list[tuple[float, float, float]]:
+        self.armSmoother.computeSmoothPosition(now)
+        positions = [(self.armSmoother.getSmoothPos()[1], self.armSmoother.getSmoothHpr()[0], 0.0)]
+        for smoother in self.linkSmoothers:
+            smoother.computeSmoothPosition(now)
+            positions.append(tuple(smoother.getSmoothPos()))
+        return positions
+
+
+def get_distance(a, b) -> float:
+    return math.sqrt(sum((a[i] - b[i]) ** 2 for i in range(3)))
+
+
+dcFile = DCFile()
+dcFile.read(Filename.fromOsSpecific(DC_FILE))
+dclass = dcFile.getClassByName('DistributedCashbotBossCrane')
+
+
+def get_size(fieldName: str, args: list) -> int:
+    packer = DCPacker()
+    packer.beginPack(dclass.getFieldByName(fieldName))
+    packer.packObject(args)
+    packer.endPack()
+    return MESSAGE_HEADER + len(packer.getBytes())
+
+
+rng = random.Random(0)
+cable = Cable()
+encoder = CraneCableTelemetry.CableStateEncoder()
+old = Watcher()
+new = Watcher()
+oldBytes = newBytes = 0
+oldMessages = newMessages = keyframes = 0
+stillFrames = 0
+lastState = None
+errors = []
+
+slide = rotate = 0
+changeSeq = 0
+nextChange = 0.0
+dt = 1 / FRAME_RATE
+for frame in range(SECONDS * FRAME_RATE):
+    now = frame * dt
+    if now >= nextChange:
+        if slide or rotate:
+            slide = rotate = 0
+            nextChange = now + rng.uniform(*IDLE_TIME)
+        else:
+            while not (slide or rotate):
+                slide, rotate = rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1))
+            changeSeq = changeSeq + 1 & 255
+            nextChange = now + rng.uniform(*MOVE_TIME)
+    cable.move(slide, rotate, dt)
+
+    timestamp = now % 327
+    h = cable.h + ARM_MAX_H
+    oldArgs = [changeSeq, cable.y, h, cable.getLinks(), timestamp]
+    oldBytes += get_size('setCablePos', oldArgs)
+    oldMessages += 1
+    old.setCablePos(cable.y, h, cable.getLinks(), now, relative=False)
+
+    state = CraneCableTelemetry.makeCableState(cable.y, h, cable.getRelativeLinks())
+    stillFrames += state == lastState
+    lastState = state
+    for fieldName, args, frameTime in encoder.encode(changeSeq, state, now):
+        newBytes += get_size(fieldName, args + [frameTime % 327])
+        newMessages += 1
+        if fieldName == 'setCablePos':
+            keyframes += 1
+            new.setCablePos(*args[1:], frameTime)
+        else:
+            new.setCableDelta(*args[1:], frameTime)
+
+    oldPositions = old.getSmoothPos(now)
+    newPositions = new.getSmoothPos(now)
+    errors.append(max(get_distance(a, b) for a, b in zip(oldPositions[1:], newPositions[1:])))
+    errors.append(abs(oldPositions[0][0] - newPositions[0][0]))
+    errors.append(abs((oldPositions[0][1] - newPositions[0][1] + 180) % 360 - 180))
+
+print(f"{SECONDS}s of one crane's cable at {FRAME_RATE}fps, moving {MOVE_TIME[0]:g}-{MOVE_TIME[1]:g}s at a time and "
+      f"letting go {IDLE_TIME[0]:g}-{IDLE_TIME[1]:g}s, standing completely still "
+      f"{stillFrames / (SECONDS * FRAME_RATE):.0%} of the time:")
+print(f"  full (old):   {oldMessages / SECONDS:6.1f} messages/s  {oldBytes / SECONDS:8.1f} bytes/s up and to every "
+      f"watcher")
+print(f"  deltas (new): {newMessages / SECONDS:6.1f} messages/s  {newBytes / SECONDS:8.1f} bytes/s up and to every "
+      f"watcher, {keyframes / SECONDS:.1f} keyframes/s")
+print(f"  {oldBytes / newBytes:.1f}x less bandwidth, smoothed positions at most {max(errors):.4f} apart "
+      f"(mean {sum(errors) / len(errors):.4f})")
+
+if max(errors) > TOLERANCE:
+    print("FAILED")
+    sys.exit(1)
@@ -0,0 +1,234 @@
+"""
+A script that measures what writing server events costs the AI. Writes events as fast as a busy AI might, a frame at a
+time, through the event log to a UDP socket and to files, and reports how long every frame spends on it. Compares it
+against packing and sending every event on the spot, the way Panda's writeServerEvent does, and exits with an error if
+the event log packs anything differently.
+
+Also floods the event log with one type of event to check that the rate limit holds it back, that other types still get
+through and that everything dropped is counted.
+"""
+
+import builtins
+import collections
+import os
+import random
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import ClockObject, loadPrcFileData
+from direct.distributed.PyDatagram import PyDatagram
+
+LOG_DIR = tempfile.mkdtemp(prefix='eventlog-')
+loadPrcFileData('benchmark_event_log', f'eventlog-dir {LOG_DIR}\neventlog-rate-limit 0\neventlog-flush-interval 0')
+
+# What the AI has around before the event log is imported.
+globalClock = ClockObject.getGlobalClock()
+globalClock.setMode(ClockObject.MSlave)
+builtins.globalClock = globalClock
+
+from direct.task.TaskManagerGlobal import taskMgr
+
+from otp.astron.AstronEventLog import AstronEventLog, msgpack_pack
+
+FRAME_RATE = 30
+SECONDS = 10
+# How many events a second the AI writes.
+RATES = [1_000, 10_000, 50_000]
+# Each flooded frame writes this many chat events and one of everything else.
+FLOOD_PER_FRAME = 2_000
+FLOOD_RATE_LIMIT = 500.0
+
+
+def msgpack_length(dg, length, fix, maxfix, tag8, tag16, tag32):
+    if length < maxfix:
+        dg.addUint8(fix + length)
+    elif tag8 is not None and length < 1 << 8:
+        dg.addUint8(tag8)
+        dg.addUint8(length)
+    elif tag16 is not None and length < 1 << 16:
+        dg.addUint8(tag16)
+        dg.addBeUint16(length)
+    elif tag32 is not None and length < 1 << 32:
+        dg.addUint8(tag32)
+        dg.addBeUint32(length)
+    else:
+        raise ValueError('Value too big for MessagePack')
+
+
+def msgpack_encode(dg, element):
+    """
+    The old way of packing events, kept here for comparison.
+    """
+    if element is None:
+        dg.addUint8(0xc0)
+    elif element is False:
+        dg.addUint8(0xc2)
+    elif element is True:
+        dg.addUint8(0xc3)
+    elif isinstance(element, int):
+        if -32 <= element < 128:
+            dg.addInt8(element)
+        elif 128 <= element < 256:
+            dg.addUint8(0xcc)
+            dg.addUint8(element)
+        elif 256 <= element < 65536:
+            dg.addUint8(0xcd)
+            dg.addBeUint16(element)
+        elif 65536 <= element < (1 << 32):
+            dg.addUint8(0xce)
+            dg.addBeUint32(element)
+        elif -128 <= element < -32:
+            dg.addUint8(0xd0)
+            dg.addInt8(element)
+        elif -32768 <= element < -128:
+            dg.addUint8(0xd1)
+            dg.addBeInt16(element)
+        elif -1 << 31 <= element < -32768:
+            dg.addUint8(0xd2)
+            dg.addBeInt32(element)
+        else:
+            raise ValueError('int out of range for msgpack: %d' % element)
+    elif isinstance(element, dict):
+        msgpack_length(dg, len(element), 0x80, 0x10, None, 0xde, 0xdf)
+        for k, v in list(element.items()):
+            msgpack_encode(dg, k)
+            msgpack_encode(dg, v)
+    elif isinstance(element, list):
+        msgpack_length(dg, len(element), 0x90, 0x10, None, 0xdc, 0xdd)
+        for v in element:
+            msgpack_encode(dg, v)
+    elif isinstance(element, str):
+        msgpack_length(dg, len(element), 0xa0, 0x20, None, 0xda, 0xdb)
+        dg.appendData(element.encode('utf-8'))
+    elif isinstance(element, float):
+        dg.addUint8(0xcb)
+        dg.addBeFloat64(element)
+    else:
+        raise TypeError('Encountered non-MsgPack-packable value: %r' % element)
+
+
+class FakeAIRepository:
+    """
+    The bare minimum of the AI that the event log needs, sending to a UDP socket nobody reads.
+    """
+
+    def __init__(self, port):
+        self.eventLogId = 'AIR:401000000'
+        self.eventSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.eventSocket.setblocking(False)
+        self.eventLogAddress = ('127.0.0.1', port)
+
+    def writeServerEventNow(self, logtype, *args, **kwargs):
+        # Panda's writeServerEvent, but with a socket that can send bytes.
+        log = collections.OrderedDict()
+        log['type'] = logtype
+        log['sender'] = self.eventLogId
+        log['time'] = time.time()
+        for i, v in enumerate(args):
+            log['_%d' % (i + 1)] = v
+        log.update(kwargs)
+
+        dg = PyDatagram()
+        msgpack_encode(dg, log)
+        try:
+            self.eventSocket.sendto(dg.getMessage(), self.eventLogAddress)
+        except OSError:
+            pass
+
+
+def make_event(rng: random.Random):
+    kind = rng.random()
+    if kind < 0.5:
+        return 'chat-message-said', (), {'avId': rng.randrange(100_000_000, 100_100_000),
+                                         'message': 'hello there ' * rng.randint(1, 5),
+                                         'filteredMessage': 'hello ***** ' * rng.randint(1, 5)}
+    if kind < 0.8:
+        return 'crane-hit', (rng.randrange(100_000_000, 100_100_000), rng.randint(0, 300)), \
+            {'impact': rng.random(), 'craneId': rng.randrange(1000)}
+    return 'suspicious', (rng.randrange(100_000_000, 100_100_000), 'Toon tried to do something odd!'), {}
+
+
+def run_frames(write, rate: int, rng: random.Random) -> list[float]:
+    perFrame = rate // FRAME_RATE
+    events = [make_event(rng) for _ in range(perFrame)]
+    frameTimes = []
+    for frame in range(SECONDS * FRAME_RATE):
+        globalClock.setFrameTime(frame / FRAME_RATE)
+        start = time.perf_counter()
+        for logtype, args, kwargs in events:
+            write(logtype, *args, **kwargs)
+        taskMgr.step()
+        frameTimes.append(time.perf_counter() - start)
+    return frameTimes
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+receiver.bind(('127.0.0.1', 0))
+air = FakeAIRepository(receiver.getsockname()[1])
+eventLog = AstronEventLog(air)
+rng = random.Random(0)
+
+mismatches = 0
+for _ in range(1000):
+    logtype, args, kwargs = make_event(rng)
+    log = {'type': logtype, 'sender': air.eventLogId, 'time': 0.5}
+    log.update({'_%d' % (i + 1): v for i, v in enumerate(args)})
+    log.update(kwargs)
+    dg = PyDatagram()
+    msgpack_encode(dg, log)
+    out = bytearray()
+    msgpack_pack(out, log)
+    mismatches += bytes(out) != dg.getMessage()
+
+print(f"Writing events a frame at a time at {FRAME_RATE}fps, to UDP and files:")
+for rate in RATES:
+    old = run_frames(air.writeServerEventNow, rate, random.Random(rate))
+    new = run_frames(lambda logtype, *args, **kwargs: eventLog.write(logtype, args, kwargs), rate, random.Random(rate))
+    print(f"  {rate:>6} events/s: on the spot (old) p50 {percentile(old, 0.5) * 1000:6.2f}ms  "
+          f"p99 {percentile(old, 0.99) * 1000:6.2f}ms a frame, "
+          f"{statistics.mean(old) * FRAME_RATE:5.1%} of the AI | "
+          f"event log (new) p50 {percentile(new, 0.5) * 1000:6.2f}ms  p99 {percentile(new, 0.99) * 1000:6.2f}ms, "
+          f"{statistics.mean(new) * FRAME_RATE:5.1%}")
+
+fileEvents = sum(rate // FRAME_RATE * SECONDS * FRAME_RATE for rate in RATES)
+print(f"  {eventLog.written} events written, {sum(eventLog.dropped.values())} dropped, "
+      f"{sum(os.path.getsize(os.path.join(LOG_DIR, name)) for name in os.listdir(LOG_DIR)) / fileEvents:.0f} bytes an "
+      f"event on disk")
+failed = eventLog.written != fileEvents or sum(eventLog.dropped.values())
+
+eventLog.rateLimits['chat-message-said'] = FLOOD_RATE_LIMIT
+eventLog.written = 0
+frames = SECONDS * FRAME_RATE
+for frame in range(frames):
+    globalClock.setFrameTime(1000 + frame / FRAME_RATE)
+    for _ in range(FLOOD_PER_FRAME):
+        eventLog.write('chat-message-said', (), {'avId': 100_000_000, 'message': 'spam'})
+    eventLog.write('suspicious', (100_000_000, 'Toon is spamming chat!'), {})
+    taskMgr.step()
+eventLog.flushAllEvents()
+
+limited = eventLog.droppedByType['chat-message-said']
+allowed = frames * FLOOD_PER_FRAME - limited
+expected = FLOOD_RATE_LIMIT * (SECONDS + eventLog.RATE_BURST)
+print(f"Flooding one type at {FLOOD_PER_FRAME * FRAME_RATE} events/s, limited to {FLOOD_RATE_LIMIT:g}/s:")
+print(f"  {allowed} let through (at most {expected:g} expected), {limited} dropped, "
+      f"{eventLog.written - allowed} other events and drop reports written")
+failed |= allowed > expected or eventLog.written - allowed < frames
+
+print(f"  {mismatches} events packed differently than the old way")
+eventLog.file.close()
+shutil.rmtree(LOG_DIR)
+if mismatches or failed:
+    print("FAILED")
+    sys.exit(1)
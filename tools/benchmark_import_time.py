@@ -0,0 +1,153 @@
+"""
+A script that measures what the big literal data modules cost a process at startup, and checks that the AI no longer
+loads the ones it doesn't need.
+
+Imports every data module in a fresh interpreter, both straight from source (as a process that can't write bytecode
+does every time) and from its cached bytecode, and reports how long each took on its own. Then starts the AI's side of
+the firework show and maze game the way they are now and the way they used to be, loading the old firework shows and
+the mazes up front, and reports how long that took and how much memory it left the process with. Exits with an error
+if the AI still loads a table it doesn't need, or if the zone to NPC index disagrees with scanning every NPC.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+# The big tables, and what has to be imported before each so that only its own cost is measured.
+MODULES = [
+    ('toontown.toonbase.TTLocalizerEnglish', 'toontown.toonbase.TTLocalizer'),
+    ('toontown.toon.NPCToons', 'toontown.toon.ToonDNA'),
+    ('toontown.effects.FireworkShows', 'toontown.parties.PartyGlobals'),
+    ('toontown.quest.LegacyQuestDict', 'toontown.quest.Quests'),
+    ('toontown.minigame.MazeData', None),
+]
+# Tables the AI only needs once it's asked for them.
+LAZY_MODULES = ['toontown.effects.FireworkShows', 'toontown.minigame.MazeData', 'toontown.quest.LegacyQuestDict']
+AI_MODULES = ['toontown.effects.DistributedFireworkShowAI', 'toontown.minigame.DistributedMazeGameAI',
+              'toontown.toon.NPCToons']
+# What the AI used to import along with them.
+OLD_AI_MODULES = AI_MODULES + ['toontown.effects.FireworkShows', 'toontown.minigame.MazeData']
+RUNS = 5
+
+# What AIStart has set up before anything is imported.
+BOOTSTRAP = """
+import builtins
+class game:
+    name = 'toontown'
+    process = 'server'
+builtins.game = game
+from otp.ai.AIBaseGlobal import *
+"""
+
+MEASURE_AI = BOOTSTRAP + """
+import importlib, resource, sys, time
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+print(elapsed, memory, *[name for name in %r if name in sys.modules])
+""" % (LAZY_MODULES,)
+
+
+def run_python(code: str, args: list[str], pycache: str, writeBytecode: bool, importTime: bool = False):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONPYCACHEPREFIX=pycache)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    command = [sys.executable]
+    if not writeBytecode:
+        command.append('-B')
+    if importTime:
+        command += ['-X', 'importtime']
+    result = subprocess.run(command + ['-c', code] + args, env=env, cwd=ROOT, capture_output=True, text=True)
+    if result.returncode:
+        print(result.stderr)
+        print("FAILED")
+        sys.exit(1)
+    return result
+
+
+def import_self_time(module: str, before: str | None, pycache: str, writeBytecode: bool) -> float:
+    code = BOOTSTRAP
+    if before:
+        code += 'import %s\n' % before
+    code += 'import %s\n' % module
+    result = run_python(code, [], pycache, writeBytecode, importTime=True)
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and line.rsplit('|', 1)[1].strip() == module:
+            return int(line.split('|')[0].split(':')[1]) / 1_000_000
+    raise RuntimeError('%s was never imported' % module)
+
+
+def measure_ai(modules: list[str], pycache: str) -> tuple[float, int, list[str]]:
+    # The localizers print which language they're in, so the results are on the last line.
+    runs = [run_python(MEASURE_AI, modules, pycache, True).stdout.splitlines()[-1].split() for _ in range(RUNS)]
+    return min(float(run[0]) for run in runs), min(int(run[1]) for run in runs), runs[0][2:]
+
+
+sourceCache = tempfile.mkdtemp(prefix='pycache-source-')
+bytecodeCache = tempfile.mkdtemp(prefix='pycache-bytecode-')
+failed = False
+
+print("Importing every data module on its own:")
+totalSource = totalBytecode = 0.0
+for module, before in MODULES:
+    # Fills the bytecode cache the first time around.
+    import_self_time(module, before, bytecodeCache, True)
+    source = min(import_self_time(module, before, sourceCache, False) for _ in range(RUNS))
+    bytecode = min(import_self_time(module, before, bytecodeCache, True) for _ in range(RUNS))
+    totalSource += source
+    totalBytecode += bytecode
+    print(f"  {module:<40} from source {source * 1000:7.2f}ms  from bytecode {bytecode * 1000:6.2f}ms")
+print(f"  {'all of them':<40} from source {totalSource * 1000:7.2f}ms  from bytecode {totalBytecode * 1000:6.2f}ms")
+
+oldTime, oldMemory, oldLoaded = measure_ai(OLD_AI_MODULES, bytecodeCache)
+newTime, newMemory, newLoaded = measure_ai(AI_MODULES, bytecodeCache)
+print("Starting the AI's firework shows, maze game and NPCs:")
+print(f"  old: {oldTime * 1000:7.2f}ms  {oldMemory:6d}KiB, loading {', '.join(oldLoaded) or 'no tables'}")
+print(f"  new: {newTime * 1000:7.2f}ms  {newMemory:6d}KiB, loading {', '.join(newLoaded) or 'no tables'}")
+failed |= bool(newLoaded)
+
+shutil.rmtree(sourceCache)
+shutil.rmtree(bytecodeCache)
+
+exec(BOOTSTRAP)
+from toontown.toon import NPCToons
+
+
+def generate_zone_2_npc_dict():
+    """
+    The old way the AI built the zone to NPC index at boot, kept here for comparison.
+    """
+    zone2NpcDict = {}
+    for id, npcDesc in list(NPCToons.NPCToonDict.items()):
+        zoneId = npcDesc[0]
+        if zoneId in zone2NpcDict:
+            zone2NpcDict[zoneId].append(id)
+        else:
+            zone2NpcDict[zoneId] = [id]
+    return zone2NpcDict
+
+
+start = time.perf_counter()
+expected = generate_zone_2_npc_dict()
+scan = time.perf_counter() - start
+mismatches = sum(sorted(NPCToons.zone2NpcDict.get(zoneId, [])) != sorted(npcIds)
+                 for zoneId, npcIds in expected.items())
+mismatches += len(set(NPCToons.zone2NpcDict) - set(expected))
+NPCToons.generateZone2NpcDict()
+mismatches += sum(len(npcIds) != len(set(npcIds)) for npcIds in NPCToons.zone2NpcDict.values())
+print(f"{len(NPCToons.NPCToonDict)} NPCs in {len(expected)} zones, scanned in {scan * 1000:.2f}ms when the index is "
+      f"built:")
+print(f"  {mismatches} zones the index disagrees with the scan on")
+failed |= bool(mismatches)
+
+if failed:
+    print("FAILED")
+    sys.exit(1)
@@ -0,0 +1,101 @@
+"""
+A script that measures how fast the ranked leaderboard can be kept up to date and read from.
+Compares the standings structure against copying and sorting every record whenever a page is requested, and checks
+that ranks and pages still agree with sorting every record after toons have come, gone and changed SR. Exits with an
+error if they don't.
+"""
+
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from toontown.matchmaking.leaderboard import RankedLeaderboard, SortedKeys
+
+TRACKED_TOONS = (10_000, 100_000)
+OPERATIONS = 1000
+PAGE_SIZE = 10
+# A small bucket size for the agreement check, so buckets are split and emptied often.
+CHECK_LOAD = 4
+CHECK_TOONS = 2000
+
+
+def timed(func, *args) -> float:
+    """
+    Runs func OPERATIONS times and returns the average time per call in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(OPERATIONS):
+        func(*args)
+    return (time.perf_counter() - start) / OPERATIONS * 1_000_000
+
+
+def copy_and_sort_page(records: dict[int, list], start: int, amount: int) -> list:
+    """
+    The old way of serving a page, kept here for comparison.
+    """
+    ordered = copy.deepcopy(list(records.values()))
+    ordered.sort(key=lambda x: x[1], reverse=True)
+    return ordered[start - 1:start - 1 + amount]
+
+
+random.seed(0)
+for size in TRACKED_TOONS:
+    leaderboard = RankedLeaderboard()
+    records = {}
+
+    start = time.perf_counter()
+    for toonId in range(size):
+        sr = int(random.gauss(1000, 300))
+        leaderboard.update(toonId, f"Toon {toonId}", sr, 0, 0)
+        records[toonId] = [f"Toon {toonId}", sr, 0, 0]
+    build_time = time.perf_counter() - start
+
+    def update_random():
+        toonId = random.randrange(size)
+        leaderboard.update(toonId, f"Toon {toonId}", int(random.gauss(1000, 300)), 1, 1)
+
+    print(f"{size} tracked toons:")
+    print(f"  build:             {build_time * 1000:.1f}ms")
+    print(f"  update:            {timed(update_random):.2f}us")
+    print(f"  rank lookup:       {timed(lambda: leaderboard.get_rank(random.randrange(size))):.2f}us")
+    print(f"  page (top 10):     {timed(leaderboard.get_page, 1, PAGE_SIZE):.2f}us")
+    print(f"  page (rank 490):   {timed(leaderboard.get_page, 490, PAGE_SIZE):.2f}us")
+    print(f"  page (last 10):    {timed(leaderboard.get_page, size - PAGE_SIZE + 1, PAGE_SIZE):.2f}us")
+
+    # The old approach is far too slow to run as many times.
+    start = time.perf_counter()
+    for _ in range(5):
+        copy_and_sort_page(records, 1, PAGE_SIZE)
+    print(f"  copy + sort page:  {(time.perf_counter() - start) / 5 * 1_000_000:.2f}us")
+
+# Check the standings against sorting every record, with buckets small enough to be split and emptied all the time.
+SortedKeys.LOAD = CHECK_LOAD
+leaderboard = RankedLeaderboard()
+records = {}
+for _ in range(CHECK_TOONS * 10):
+    toonId = random.randrange(CHECK_TOONS)
+    if toonId in records and random.random() < 0.3:
+        leaderboard.remove(toonId)
+        del records[toonId]
+    else:
+        sr = random.randrange(500, 1500)
+        leaderboard.update(toonId, f"Toon {toonId}", sr, 0, 0)
+        records[toonId] = sr
+
+ordered = sorted(records, key=lambda toonId: (-records[toonId], toonId))
+mismatches = sum(leaderboard.get_rank(toonId) != ranking for ranking, toonId in enumerate(ordered, start=1))
+for start in range(1, len(ordered) + PAGE_SIZE, 7):
+    page = [entry[0:3] for entry in leaderboard.get_page(start, PAGE_SIZE)]
+    expected = [[ranking, f"Toon {toonId}", records[toonId]]
+                for ranking, toonId in enumerate(ordered[start - 1:start - 1 + PAGE_SIZE], start=start)]
+    mismatches += page != expected
+print(f"{len(records)} toons after {CHECK_TOONS * 10} random updates and removals:")
+print(f"  {mismatches} ranks or pages that disagree with sorting every record")
+
+if mismatches:
+    print("FAILED")
+    sys.exit(1)
@@ -0,0 +1,76 @@
+"""
+A script that measures how long a single matchmaking pass takes with a given amount of players queued.
+Players are given a random hidden MMR around the starting rating, just like a real population would be.
+Exits with an error if any match comes out the wrong shape or puts a player in it twice.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from toontown.matchmaking.matchmaking_modes import MATCHMAKING_MODES, MatchmakingMode
+from toontown.matchmaking.matchmaking_queue import MatchmakingQueue
+from toontown.matchmaking.player_skill_profile import PlayerSkillProfile
+from toontown.matchmaking.skill_globals import STARTING_RATING
+from toontown.matchmaking.skill_profile_keys import SkillProfileKey
+
+QUEUE_SIZES = (10, 100, 1000)
+RUNS_PER_SIZE = 10
+SKILL_DEVIATION = 300
+
+
+class FakeToon:
+    """
+    The bare minimum of a DistributedToonAI that the queue needs to know about.
+    """
+
+    def __init__(self, avId: int, key: SkillProfileKey, mu: int):
+        self.avId = avId
+        self.profile = PlayerSkillProfile.create_fresh(avId, key.value)
+        self.profile.mu = mu
+
+    def getDoId(self) -> int:
+        return self.avId
+
+    def getName(self) -> str:
+        return f"Toon {self.avId}"
+
+    def getOrCreateSkillProfile(self, key: str) -> PlayerSkillProfile:
+        return self.profile
+
+
+def is_valid_match(match, mode: MatchmakingMode) -> bool:
+    players = [player.avatar.getDoId() for team in match for player in team]
+    return (len(match) == mode.num_teams and all(len(team) == 1 for team in match)
+            and len(set(players)) == len(players))
+
+
+random.seed(0)
+badMatches = 0
+for mode in MATCHMAKING_MODES.values():
+    key = mode.key
+    print(f"{key.value} ({mode.num_teams} players):")
+    for size in QUEUE_SIZES:
+        timings = []
+        numMatches = 0
+        for _ in range(RUNS_PER_SIZE):
+            queue = MatchmakingQueue(mode)
+            for avId in range(size):
+                queue.add(FakeToon(avId, key, int(random.gauss(STARTING_RATING, SKILL_DEVIATION))))
+            start = time.perf_counter()
+            matches = queue.run_matching_pass(10)
+            timings.append(time.perf_counter() - start)
+            numMatches += len(matches)
+            badMatches += sum(not is_valid_match(match, mode) for match in matches)
+
+        print(f"{size:>5} queued: median {statistics.median(timings) * 1000:.3f}ms, worst {max(timings) * 1000:.3f}ms, "
+              f"{numMatches / RUNS_PER_SIZE:.1f} matches")
+
+print(f"  {badMatches} matches the wrong shape")
+if badMatches:
+    print("FAILED")
+    sys.exit(1)
@@ -0,0 +1,167 @@
+"""
+A script that measures how long a frame of goons pushing safes around takes in the crane game, with the most goons a
+round can have and more and more safes on the floor.
+Compares the shared safe broadphase against every goon and every pushed safe traversing the whole collision scene.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import BitMask32, CollisionHandlerQueue, CollisionNode, CollisionSegment, CollisionSphere, \
+    CollisionTraverser, NodePath
+
+from toontown.coghq import CraneLeagueGlobals
+from toontown.minigame.craning import SafeBroadphase
+from toontown.toonbase import ToontownGlobals
+
+SAFE_COUNTS = (8, 16, 32)
+GOONS = CraneLeagueGlobals.CraneGameRuleset().MAX_GOON_AMOUNT_END
+FRAMES = 300
+PUSH_DISTANCE = 0.1
+
+# The floor of the crane room, around where the safes start out.
+ROOM_CENTER = (120, -315)
+ROOM_SIZE = 90
+
+# The feelers every goon sweeps in front of itself, which the old traversal ran along with its safe detection sphere.
+FEELER_HEADINGS = (0, 10, -10, 20, -20, 40, -40, 60, -60, 80, -80, 120, -120, 180)
+FEELER_LENGTH = 15
+
+
+class BenchSafe:
+
+    def __init__(self, scene, doId, x, y):
+        self.doId = doId
+        self.state = 'Sliding Floor'
+        self.nodePath = scene.attachNewNode('safe-%d' % doId)
+        self.nodePath.setPos(x, y, 0)
+        self.pushes = 0
+
+        for name, radius in (('safe', SafeBroadphase.SAFE_RADIUS), ('safe-to-safe', SafeBroadphase.SAFE_TO_SAFE_RADIUS)):
+            node = CollisionNode(name)
+            node.addSolid(CollisionSphere(0, 0, 0, radius))
+            node.setIntoCollideMask(ToontownGlobals.CashbotBossObjectBitmask)
+            node.setTag('doId', str(doId))
+            self.nodePath.attachNewNode(node)
+
+    def getPos(self):
+        return self.nodePath.getPos()
+
+    def pushFrom(self, pos):
+        direction = self.getPos() - pos
+        direction[2] = 0
+        direction.normalize()
+        self.nodePath.setPos(self.getPos() + direction * PUSH_DISTANCE)
+        self.pushes += 1
+
+
+class BenchGoon:
+
+    def __init__(self, scene, x, y):
+        self.nodePath = scene.attachNewNode('goon')
+        self.nodePath.setPos(x, y, 0)
+
+        feelers = CollisionNode('feelerNode')
+        for heading in FEELER_HEADINGS:
+            rad = math.radians(heading)
+            feelers.addSolid(CollisionSegment(-math.sin(rad), math.cos(rad), 0,
+                                              -math.sin(rad) * FEELER_LENGTH, math.cos(rad) * FEELER_LENGTH, 0))
+        feelers.setIntoCollideMask(BitMask32(0))
+
+        detection = CollisionNode('safeDetectionFeelers')
+        detection.addSolid(CollisionSphere(0, 0, 0, SafeBroadphase.GOON_SAFE_DETECTION_RADIUS))
+        detection.setFromCollideMask(ToontownGlobals.CashbotBossObjectBitmask)
+        detection.setIntoCollideMask(BitMask32(0))
+
+        self.cTrav = CollisionTraverser('goon')
+        self.cQueue = CollisionHandlerQueue()
+        self.cTrav.addCollider(self.nodePath.attachNewNode(feelers), self.cQueue)
+        self.cTrav.addCollider(self.nodePath.attachNewNode(detection), self.cQueue)
+
+    def getPos(self):
+        return self.nodePath.getPos()
+
+
+def make_room(safeCount: int, seed: int) -> tuple[NodePath, list[BenchSafe], list[BenchGoon]]:
+    rng = random.Random(seed)
+    scene = NodePath('scene')
+
+    def spot():
+        return (ROOM_CENTER[0] + rng.uniform(-ROOM_SIZE / 2, ROOM_SIZE / 2),
+                ROOM_CENTER[1] + rng.uniform(-ROOM_SIZE / 2, ROOM_SIZE / 2))
+
+    safes = [BenchSafe(scene, doId, *spot()) for doId in range(1, safeCount + 1)]
+    goons = [BenchGoon(scene, *spot()) for _ in range(GOONS)]
+    return scene, safes, goons
+
+
+def traversal_frame(scene: NodePath, safes: list[BenchSafe], goons: list[BenchGoon], safeTraversers: dict):
+    """
+    The old way of pushing safes, kept here for comparison.
+    """
+    safesById = {safe.doId: safe for safe in safes}
+
+    for goon in goons:
+        goon.cTrav.traverse(scene)
+        for i in range(goon.cQueue.getNumEntries()):
+            entry = goon.cQueue.getEntry(i)
+            intoNodePath = entry.getIntoNodePath()
+            if 'safe' in intoNodePath.node().getName() and 'safeDetectionFeelers' in entry.getFromNode().getName():
+                safe = safesById[int(intoNodePath.getNetTag('doId'))]
+                safe.pushFrom(goon.getPos())
+
+                # Every safe a goon pushes traverses the scene again to push the safes around it.
+                cTrav, cQueue = safeTraversers[safe.doId]
+                cTrav.traverse(scene)
+                for j in range(cQueue.getNumEntries()):
+                    safeEntry = cQueue.getEntry(j)
+                    safeIntoNodePath = safeEntry.getIntoNodePath()
+                    if 'safe-to-safe' in safeIntoNodePath.node().getName():
+                        safesById[int(safeIntoNodePath.getNetTag('doId'))].pushFrom(safe.getPos())
+
+
+def broadphase_frame(broadphase: SafeBroadphase.SafeBroadphase, safes: list[BenchSafe], goons: list[BenchGoon]):
+    broadphase.rebuild(safes)
+    goonReach = SafeBroadphase.GOON_SAFE_DETECTION_RADIUS + SafeBroadphase.SAFE_TO_SAFE_RADIUS
+    doubleReach = SafeBroadphase.GOON_SAFE_DETECTION_RADIUS + SafeBroadphase.SAFE_RADIUS
+    for goon in goons:
+        goonPos = goon.getPos()
+        for safe, distance in broadphase.getSafesNear(goonPos, goonReach):
+            for _ in range(2 if distance <= doubleReach else 1):
+                safe.pushFrom(goonPos)
+                broadphase.update(safe)
+                for other, _ in broadphase.getSafesNear(safe.getPos(), SafeBroadphase.SAFE_TO_SAFE_RADIUS * 2):
+                    if other is not safe:
+                        other.pushFrom(safe.getPos())
+                        broadphase.update(other)
+
+
+for safeCount in SAFE_COUNTS:
+    print(f"{safeCount} safes, {GOONS} goons:")
+
+    scene, safes, goons = make_room(safeCount, safeCount)
+    safeTraversers = {}
+    for safe in safes:
+        cTrav, cQueue = CollisionTraverser('safe'), CollisionHandlerQueue()
+        cTrav.addCollider(safe.nodePath.find('safe-to-safe'), cQueue)
+        safeTraversers[safe.doId] = (cTrav, cQueue)
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        traversal_frame(scene, safes, goons, safeTraversers)
+    elapsed = time.perf_counter() - start
+    print(f"  traversal:   {elapsed / FRAMES * 1_000_000:8.1f}us per frame, {sum(safe.pushes for safe in safes)} pushes")
+
+    scene, safes, goons = make_room(safeCount, safeCount)
+    broadphase = SafeBroadphase.SafeBroadphase(None)
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        broadphase_frame(broadphase, safes, goons)
+    elapsed = time.perf_counter() - start
+    print(f"  broadphase:  {elapsed / FRAMES * 1_000_000:8.1f}us per frame, {sum(safe.pushes for safe in safes)} pushes")
@@ -0,0 +1,173 @@
+"""
+A script that measures how long the status effect timers of a busy elemental mastery match take each frame, and how
+fast the status effect queries the crane game makes on every hit are.
+Compares the status effect timer wheel against a Panda task for every effect, and the counted effects against the
+lists the status effect system used to keep.
+"""
+
+from collections import Counter
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import ClockObject
+from direct.task.TaskManagerGlobal import taskMgr
+
+from toontown.coghq import CraneLeagueGlobals
+from toontown.minigame.statuseffects.DistributedStatusEffectSystemAI import DistributedStatusEffectSystemAI
+from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect, STATUS_EFFECT_DURATIONS
+from toontown.minigame.statuseffects.StatusEffectScheduler import StatusEffectScheduler
+
+FRAME_RATE = 60
+SECONDS = 10
+# How many effects are applied every second, all of them burning for 10 ticks half a second apart.
+EFFECTS_PER_SECOND = 40
+BURN_TICKS = 10
+BURN_PERIOD = 0.5
+QUERIES = 200_000
+
+globalClock = ClockObject.getGlobalClock()
+globalClock.setMode(ClockObject.MNonRealTime)
+globalClock.setFrameRate(FRAME_RATE)
+__builtins__.globalClock = globalClock
+
+
+def effects_to_apply(frame: int, rng: random.Random) -> list[StatusEffect]:
+    count = EFFECTS_PER_SECOND // FRAME_RATE + (rng.random() < (EFFECTS_PER_SECOND % FRAME_RATE) / FRAME_RATE)
+    return [rng.choice(list(StatusEffect)) for _ in range(count)]
+
+
+def run_tasks() -> tuple[float, int]:
+    """
+    The old way of timing effects, kept here for comparison.
+    """
+    fired = 0
+
+    def burnTick(task):
+        nonlocal fired
+        fired += 1
+        task.ticksRemaining -= 1
+        return task.again if task.ticksRemaining > 0 else task.done
+
+    def endEffect(task):
+        nonlocal fired
+        fired += 1
+        return task.done
+
+    rng = random.Random(0)
+    elapsed = 0.0
+    for frame in range(SECONDS * FRAME_RATE):
+        start = time.perf_counter()
+        for i, effect in enumerate(effects_to_apply(frame, rng)):
+            taskName = f'effect-{frame}-{i}'
+            if effect == StatusEffect.BURNED:
+                task = taskMgr.doMethodLater(BURN_PERIOD, burnTick, taskName)
+                task.ticksRemaining = BURN_TICKS
+            else:
+                taskMgr.doMethodLater(STATUS_EFFECT_DURATIONS[effect], endEffect, taskName)
+        globalClock.tick()
+        taskMgr.step()
+        elapsed += time.perf_counter() - start
+
+    taskMgr.removeTasksMatching('effect-*')
+    return elapsed, fired
+
+
+def run_wheel() -> tuple[float, int]:
+    fired = 0
+    scheduler = StatusEffectScheduler()
+
+    def burnTick(ticksRemaining):
+        nonlocal fired
+        fired += 1
+        if ticksRemaining > 1:
+            scheduler.schedule(BURN_PERIOD, burnTick, ticksRemaining - 1)
+
+    def endEffect():
+        nonlocal fired
+        fired += 1
+
+    scheduler.start('status-effect-timers')
+    rng = random.Random(0)
+    elapsed = 0.0
+    for frame in range(SECONDS * FRAME_RATE):
+        start = time.perf_counter()
+        for effect in effects_to_apply(frame, rng):
+            if effect == StatusEffect.BURNED:
+                scheduler.schedule(BURN_PERIOD, burnTick, BURN_TICKS)
+            else:
+                scheduler.schedule(STATUS_EFFECT_DURATIONS[effect], endEffect)
+        globalClock.tick()
+        taskMgr.step()
+        elapsed += time.perf_counter() - start
+
+    scheduler.destroy()
+    return elapsed, fired
+
+
+class BenchGame:
+
+    def __init__(self):
+        self.ruleset = CraneLeagueGlobals.CraneGameRuleset()
+        self.ruleset.WANT_ELEMENTAL_MASTERY_MODE = True
+
+
+class ListStatusEffectSystem:
+    """
+    The old way of storing status effects, kept here for comparison.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.objectsWithStatusEffects = {}
+
+    def applyStatusEffect(self, objectId, statusEffect):
+        currentStatusEffects = self.objectsWithStatusEffects.get(objectId, [])
+        currentStatusEffects.append(statusEffect)
+        self.objectsWithStatusEffects[objectId] = currentStatusEffects
+
+    def hasStatusEffect(self, objectId, statusEffect):
+        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+            return False
+        return statusEffect in self.objectsWithStatusEffects.get(objectId, [])
+
+
+def make_counted_system(game) -> DistributedStatusEffectSystemAI:
+    # Only the storage is needed, so skip setting up a distributed object.
+    system = DistributedStatusEffectSystemAI.__new__(DistributedStatusEffectSystemAI)
+    system.game = game
+    system.objectsWithStatusEffects = {}
+    return system
+
+
+def run_queries() -> None:
+    rng = random.Random(0)
+    objectIds = list(range(100, 120))
+    applied = [(objectId, rng.choice(list(StatusEffect))) for objectId in objectIds for _ in range(rng.randint(0, 6))]
+    queries = [(rng.choice(objectIds), rng.choice(list(StatusEffect))) for _ in range(QUERIES)]
+
+    print("hasStatusEffect:")
+    game = BenchGame()
+    for name, system in (('lists', ListStatusEffectSystem(game)), ('counted', make_counted_system(game))):
+        for objectId, effect in applied:
+            if isinstance(system, ListStatusEffectSystem):
+                system.applyStatusEffect(objectId, effect)
+            else:
+                system.objectsWithStatusEffects.setdefault(objectId, Counter())[effect] += 1
+
+        start = time.perf_counter()
+        for objectId, effect in queries:
+            system.hasStatusEffect(objectId, effect)
+        elapsed = time.perf_counter() - start
+        print(f"  {name + ':':<9} {elapsed / QUERIES * 1_000_000_000:6.0f}ns per query")
+
+
+frames = SECONDS * FRAME_RATE
+print(f"{EFFECTS_PER_SECOND} effects applied a second for {SECONDS}s at {FRAME_RATE} fps:")
+for name, run in (('tasks', run_tasks), ('wheel', run_wheel)):
+    elapsed, fired = run()
+    print(f"  {name}:  {elapsed / frames * 1_000_000:8.1f}us per frame, {fired} timers fired")
+run_queries()
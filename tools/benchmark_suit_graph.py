@@ -0,0 +1,169 @@
+"""
+A script that measures how long the largest street takes to load, how fast the suit graph lookups that the
+suit planner makes every tick are, and how long finding a path for a new suit takes.
+Compares DNAStorage against the scans and the greedy path walk it used to do.
+"""
+
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# DNA files are looked up relative to the root of the repository.
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from toontown.dna import DNALoader
+from toontown.dna import DNASuitEdge
+from toontown.dna import DNASuitPath
+from toontown.dna.DNAStorage import DNAStorage
+from toontown.toonbase import ToontownGlobals
+
+LOADS = 5
+LOOKUPS = 100_000
+PATHS = 2000
+MIN_PATH_LEN = 40
+MAX_PATH_LEN = 300
+
+
+class ScanningDNAStorage(DNAStorage):
+    """
+    The old way of looking up suit points and edges, kept here for comparison.
+    """
+
+    def storeSuitEdge(self, startIndex, endIndex, zoneId):
+        startPoint = self.getSuitPointWithIndex(startIndex)
+        endPoint = self.getSuitPointWithIndex(endIndex)
+        if startIndex not in self.suitEdges:
+            self.suitEdges[startIndex] = []
+        self.suitEdges[startIndex].append(DNASuitEdge.DNASuitEdge(startPoint, endPoint, zoneId))
+
+    def getSuitEdge(self, startIndex, endIndex):
+        for edge in self.suitEdges[startIndex]:
+            if edge.getEndPoint().getIndex() == endIndex:
+                return edge
+
+    def getSuitPointWithIndex(self, index):
+        for point in self.suitPoints:
+            if point.getIndex() == index:
+                return point
+
+    def getSuitEdgeTravelTime(self, startIndex, endIndex, suitWalkSpeed):
+        startPoint = self.getSuitPointWithIndex(startIndex)
+        endPoint = self.getSuitPointWithIndex(endIndex)
+        if not startPoint or not endPoint:
+            return 0
+        return (endPoint.getPos() - startPoint.getPos()).length() / suitWalkSpeed
+
+    def getAdjacentPoints(self, point):
+        path = DNASuitPath.DNASuitPath()
+        for edge in self.suitEdges.get(point.getIndex(), ()):
+            path.addPoint(edge.getEndPoint())
+        return path
+
+    def getSuitPath(self, startPoint, endPoint, minPathLen, maxPathLen):
+        path = DNASuitPath.DNASuitPath()
+        path.addPoint(startPoint)
+        while path.getNumPoints() < maxPathLen:
+            if startPoint == endPoint and path.getNumPoints() >= minPathLen:
+                break
+
+            nonDoorPoint = None
+            adjacentPoints = self.getAdjacentPoints(startPoint)
+            for i in range(adjacentPoints.getNumPoints()):
+                point = adjacentPoints.getPoint(i)
+                if point == endPoint and path.getNumPoints() >= minPathLen + 1:
+                    path.addPoint(point)
+                    return path
+                if not self.isDoorPoint(point) and nonDoorPoint is None:
+                    nonDoorPoint = point
+
+            if nonDoorPoint is None:
+                return None
+
+            startPoint = nonDoorPoint
+            path.addPoint(startPoint)
+
+        return path
+
+
+def load(storeClass, filename: str) -> tuple[DNAStorage, float]:
+    start = time.perf_counter()
+    store = storeClass()
+    loader = DNALoader.DNALoader(loadAssets=False)
+    loader.loadDNAFileAI(store, filename)
+    loader.destroy()
+    return store, time.perf_counter() - start
+
+
+def planner_lookups(store: DNAStorage, edges: list[tuple[int, int]]) -> float:
+    """
+    Makes the same lookups the suit planner makes when checking a path for collisions, and returns how long it took.
+    """
+    start = time.perf_counter()
+    for startIndex, endIndex in edges:
+        point = store.getSuitPointWithIndex(startIndex)
+        adjacent = store.getAdjacentPoints(point)
+        for i in range(adjacent.getNumPoints()):
+            adjacent.getPointIndex(i)
+        store.getSuitEdgeTravelTime(startIndex, endIndex, ToontownGlobals.SuitWalkSpeed)
+        store.getSuitEdgeZone(startIndex, endIndex)
+    return time.perf_counter() - start
+
+
+def find_paths(store: DNAStorage, pairs: list[tuple[int, int]]) -> tuple[float, int]:
+    """
+    Finds a path between every pair of street points, and returns how long it took and how many of the paths
+    actually lead to where they were meant to.
+    """
+    start = time.perf_counter()
+    paths = [
+        store.getSuitPath(store.getSuitPointWithIndex(startIndex), store.getSuitPointWithIndex(endIndex),
+                          MIN_PATH_LEN, MAX_PATH_LEN)
+        for startIndex, endIndex in pairs
+    ]
+    elapsed = time.perf_counter() - start
+
+    arrived = sum(1 for path, (_, endIndex) in zip(paths, pairs)
+                  if path is not None and path.getPointIndex(path.getNumPoints() - 1) == endIndex)
+    return elapsed, arrived
+
+
+# The largest street is the one with the most suit points, which is what both the load and the lookups scale with.
+streets = [
+    os.path.relpath(filename, 'resources').replace('.pdna', '.dna')
+    for filename in glob.glob('resources/phase_*/dna/*.pdna') if re.search(r'_\d+\.pdna$', filename)
+]
+largest, largestStore = None, None
+for street in streets:
+    store, _ = load(DNAStorage, street)
+    if largestStore is None or store.getNumSuitPoints() > largestStore.getNumSuitPoints():
+        largest, largestStore = street, store
+
+edgeCount = sum(len(edges) for edges in largestStore.suitEdges.values())
+print(f"{largest}: {largestStore.getNumSuitPoints()} suit points, {edgeCount} suit edges")
+
+random.seed(0)
+edges = [(startIndex, edge.getEndPoint().getIndex()) for startIndex, startEdges in largestStore.suitEdges.items()
+         for edge in startEdges]
+edges = [random.choice(edges) for _ in range(LOOKUPS)]
+streetPoints = [point.getIndex() for point in largestStore.suitPoints if not DNAStorage.isDoorPoint(point)]
+pairs = [(random.choice(streetPoints), random.choice(streetPoints)) for _ in range(PATHS)]
+
+for name, storeClass in (('indexed', DNAStorage), ('scanning', ScanningDNAStorage)):
+    loadTimes = []
+    for _ in range(LOADS):
+        store, loadTime = load(storeClass, largest)
+        loadTimes.append(loadTime)
+
+    print(f"  {name}:")
+    print(f"    load:     {min(loadTimes) * 1000:.1f}ms")
+    print(f"    lookups:  {planner_lookups(store, edges) / LOOKUPS * 1_000_000:.2f}us per path step")
+
+    # The first pass includes working out how far every point is from each destination, which is only done once.
+    for run in ('first', 'later'):
+        elapsed, arrived = find_paths(store, pairs)
+        print(f"    paths ({run}): {elapsed / PATHS * 1_000_000:.1f}us per path, {arrived}/{PATHS} reach their destination")
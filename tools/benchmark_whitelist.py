@@ -0,0 +1,126 @@
+"""
+A script that measures how long the chat whitelist takes to load, to mask a chat line and to find the words starting
+with what a toon has typed so far. Compares it against the way the whitelist used to load and find prefixes and the way
+the chat manager used to mask lines, and exits with an error if they ever disagree.
+"""
+
+from bisect import bisect_left
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from otp.chat.WhiteList import WhiteList
+
+WHITELIST_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'resources', 'phase_3', 'etc',
+                                              'twhitelist.dat'))
+LOADS = 20
+LINES = 20_000
+# How many words are in a chat line, and how many of them aren't on the whitelist.
+LINE_WORDS = 40
+BAD_WORD_CHANCE = 0.5
+PREFIXES = 20_000
+
+
+class OldWhiteList:
+    """
+    The old way of loading the whitelist, finding prefixes and masking lines, kept here for comparison.
+    """
+
+    def __init__(self, wordlist):
+        self.words = []
+        for line in wordlist:
+            self.words.append(line.strip(b'\n\r').lower())
+
+        self.words.sort()
+        self.numWords = len(self.words)
+
+    def cleanText(self, text):
+        text = text.strip('.,?!')
+        text = text.lower().encode('utf-8')
+        return text
+
+    def isWord(self, text):
+        text = self.cleanText(text)
+        i = bisect_left(self.words, text)
+        if i == self.numWords:
+            return False
+        return self.words[i] == text
+
+    def prefixList(self, text):
+        text = self.cleanText(text)
+        i = bisect_left(self.words, text)
+        j = i
+        while j < self.numWords and self.words[j].startswith(text):
+            j += 1
+
+        return self.words[i:j]
+
+    def filterText(self, message):
+        modifications = []
+        words = message.split(' ')
+        offset = 0
+        for word in words:
+            if word and not self.isWord(word):
+                modifications.append((offset, offset + len(word) - 1))
+
+            offset += len(word) + 1
+
+        filteredMessage = message
+        for modStart, modStop in modifications:
+            filteredMessage = filteredMessage[:modStart] + '*' * (modStop - modStart + 1) + filteredMessage[
+                                                                                            modStop + 1:]
+
+        return filteredMessage, modifications
+
+
+def time_it(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+with open(WHITELIST_FILE, 'rb') as f:
+    data = f.read()
+
+rng = random.Random(0)
+old = OldWhiteList(data.split(b'\n'))
+new = WhiteList(data)
+words = [word.decode('latin-1') for word in new.words if word.isalpha()]
+
+lines = []
+for _ in range(LINES):
+    lineWords = [rng.choice(words) for _ in range(LINE_WORDS)]
+    for i in range(LINE_WORDS):
+        if rng.random() < BAD_WORD_CHANCE:
+            lineWords[i] += 'zq'
+    lines.append(' '.join(lineWords))
+prefixes = [rng.choice(words)[:rng.randint(1, 3)] for _ in range(PREFIXES)]
+
+print(f"{new.numWords} words in the whitelist:")
+
+oldLoad = min(time_it(OldWhiteList, data.split(b'\n')) for _ in range(LOADS))
+newLoad = min(time_it(WhiteList, data) for _ in range(LOADS))
+print(f"  load:    old {oldLoad * 1000:8.2f}ms  new {newLoad * 1000:8.2f}ms")
+
+oldFilter = time_it(lambda: [old.filterText(line) for line in lines])
+newFilter = time_it(lambda: [new.filterText(line) for line in lines])
+print(f"  mask:    old {oldFilter / LINES * 1_000_000:8.2f}us  new {newFilter / LINES * 1_000_000:8.2f}us per "
+      f"{LINE_WORDS} word line, {BAD_WORD_CHANCE:.0%} of words masked")
+
+oldPrefix = time_it(lambda: [old.prefixList(prefix) for prefix in prefixes])
+newPrefix = time_it(lambda: [new.prefixCount(prefix) for prefix in prefixes])
+print(f"  prefix:  old {oldPrefix / PREFIXES * 1_000_000:8.2f}us  new {newPrefix / PREFIXES * 1_000_000:8.2f}us per "
+      f"count of words starting with 1-3 letters")
+
+mismatches = 0
+mismatches += sum(old.filterText(line) != new.filterText(line) for line in lines[:1000])
+mismatches += sum(old.prefixList(prefix) != new.prefixList(prefix) for prefix in prefixes[:1000])
+mismatches += sum(old.isWord(word) != new.isWord(word) for word in words)
+print(f"  {mismatches} mismatches against the old whitelist")
+
+if mismatches:
+    print("FAILED")
+    sys.exit(1)
@@ -1,22 +1,171 @@
+"""
+Compiles every raw DNA file under resources/ into its binary PDNA form.
+
+Files are compiled in parallel, and a manifest of source hashes is kept so that only DNA files which changed since
+the last build (or were never built) get compiled again. Changing the compiler itself rebuilds everything.
+Once done, a report of how long every compiled file took is printed, slowest first.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
 import os
-import sys
-import subprocess
 import pathlib
+import subprocess
+import sys
+import time
 
 RESOURCES = "resources/"
 RAW_EXT = ".dna"
 COMPILED_EXT = ".pdna"
+COMPILER = os.path.join("tools", "dna_compiler", "compile.py")
+COMPILER_SOURCES = os.path.join("tools", "dna_compiler", "dna")
+MANIFEST = os.path.join(RESOURCES, "dna_manifest.json")
+
+parser = argparse.ArgumentParser(description='Compiles every DNA file in resources/ that changed since the last build.')
+parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                    help='How many files to compile at once. Defaults to the amount of CPUs.')
+parser.add_argument('--force', '-f', action='store_true',
+                    help='Compile every file, even the ones that have not changed.')
+parser.add_argument('--compress', '-c', action='store_true',
+                    help='Compress the output files using ZLib.')
+parser.add_argument('--report', '-r',
+                    help='Optional JSON file to write the per-file timing report to.')
+args = parser.parse_args()
+
+# Everything is relative to the root of the repository.
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def hash_file(filepath) -> str:
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def hash_compiler() -> str:
+    """
+    Hashes the compiler and everything it imports, so that changing how DNA is compiled rebuilds every file.
+    """
+    sources = [pathlib.Path(COMPILER)]
+    for root, _, files in os.walk(COMPILER_SOURCES):
+        sources.extend(pathlib.Path(root, file) for file in files if file.endswith('.py') and file != 'parsetab.py')
+
+    digest = hashlib.sha256()
+    for source in sorted(sources):
+        digest.update(source.as_posix().encode())
+        digest.update(hash_file(source).encode())
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict):
+    # Write to a temporary file first so an interrupted build can never leave a half written manifest behind.
+    temp = MANIFEST + '.tmp'
+    with open(temp, 'w') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(temp, MANIFEST)
 
-dna_files = []
 
-os.chdir("../")
+def compile_file(filepath: pathlib.Path) -> tuple[pathlib.Path, float, subprocess.CompletedProcess]:
+    """
+    Compiles a single DNA file in its own process. Returns the file, how long it took and the finished process.
+    """
+    command = [sys.executable, COMPILER, str(filepath)]
+    if args.compress:
+        command.append('--compress')
 
+    start = time.perf_counter()
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return filepath, time.perf_counter() - start, process
+
+
+dna_files = []
 for root, _, files in os.walk(RESOURCES):
     for file in files:
         if file.endswith(RAW_EXT):
             filename = file
             filepath = pathlib.Path(root, filename)
             dna_files.append(filepath)
+dna_files.sort()
+
+compiler_hash = hash_compiler()
+manifest = {} if args.force else load_manifest()
+
+# Work out which files actually need compiling. A file is up to date if its source, the compiler and the
+# options used are all the same as last time, and its compiled output is still there.
+stale_files = []
+for filepath in dna_files:
+    source_hash = hash_file(filepath)
+    entry = {'source': source_hash, 'compiler': compiler_hash, 'compress': args.compress}
+    if manifest.get(filepath.as_posix()) == entry and filepath.with_suffix(COMPILED_EXT).exists():
+        continue
+
+    manifest.pop(filepath.as_posix(), None)
+    stale_files.append((filepath, entry))
+
+print(f"{len(dna_files)} DNA files found, {len(stale_files)} need compiling.")
+if not stale_files:
+    sys.exit(0)
+
+entries = dict(stale_files)
+timings = []
+failures = []
+
+
+def finish(filepath: pathlib.Path, duration: float, process: subprocess.CompletedProcess):
+    timings.append((filepath, duration))
+    if process.returncode != 0:
+        failures.append(filepath)
+        print(f"Failed to compile {filepath} ({duration:.2f}s):\n{process.stdout}")
+        return
+
+    manifest[filepath.as_posix()] = entries[filepath]
+    print(f"Compiled {filepath} ({duration:.2f}s)")
+
+
+build_start = time.perf_counter()
+try:
+    # PLY writes its parser tables to disk the first time it runs. Compile one file on its own first,
+    # so the workers read those tables instead of all racing to write them.
+    finish(*compile_file(stale_files[0][0]))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = [executor.submit(compile_file, filepath) for filepath, _ in stale_files[1:]]
+        for future in concurrent.futures.as_completed(futures):
+            finish(*future.result())
+finally:
+    # Even if we were interrupted, remember everything that did compile.
+    save_manifest(manifest)
+
+build_time = time.perf_counter() - build_start
+timings.sort(key=lambda timing: timing[1], reverse=True)
+
+print()
+print("Timing report (slowest first):")
+for filepath, duration in timings:
+    print(f"{duration:>8.2f}s  {filepath}{'  FAILED' if filepath in failures else ''}")
+print(f"Compiled {len(timings) - len(failures)} files in {build_time:.2f}s "
+      f"({sum(duration for _, duration in timings):.2f}s of compile time across {max(1, args.jobs)} jobs).")
+
+if args.report:
+    with open(args.report, 'w') as f:
+        json.dump({
+            'build_time': build_time,
+            'jobs': max(1, args.jobs),
+            'files': [
+                {'file': filepath.as_posix(), 'time': duration, 'failed': filepath in failures}
+                for filepath, duration in timings
+            ],
+        }, f, indent=4)
 
-for file in dna_files:
-    subprocess.run(f"{sys.executable} {os.path.join('tools', 'dna_compiler', 'compile.py')} {file}")
\ No newline at end of file
+if failures:
+    print(f"{len(failures)} files failed to compile.")
+    sys.exit(1)
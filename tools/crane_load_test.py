@@ -0,0 +1,726 @@
+"""
+A script that finds out how many crane games one AI can run at once, by filling a local district with scripted bot
+clients that play them.
+
+Every bot is a headless client with its own connection to the client agent. It logs in (creating a toon the first
+time), steps onto the district, queues for a ranked crane game through the matchmaker, and plays: it takes control
+of a crane, grabs safes, swings and drops them on the boss the way a real client's physics would, reports the hits,
+and plays out the whole best-of series before queueing again. Bots only understand the handful of fields they need,
+using the DC file to read and write them, so hundreds of them fit in one process.
+
+The load goes up in steps of concurrent matches. For every step, the script waits for the games to start and then
+measures for a while: how many datagrams the bots sent and received, and, from the AI's load reports, how much CPU
+each AI frame took, how many datagrams the AI handled and how much memory it used per running game.
+
+Run Astron, the UberDOG and an AI locally first, with the AI's load reports turned on:
+
+    want-load-report #t
+    load-report-file ai-load.jsonl
+
+then point this script at the same file:
+
+    python tools/crane_load_test.py --ai-report ai-load.jsonl --matches 1 2 4 8 16 32
+"""
+
+import argparse
+import builtins
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from direct.task.TaskManagerGlobal import taskMgr
+from direct.showbase.MessengerGlobal import messenger
+
+# Connection repositories expect these to be around, the way they are in a real client.
+builtins.taskMgr = taskMgr
+builtins.messenger = messenger
+
+from direct.distributed.ClockDelta import globalClockDelta
+from direct.distributed.ConnectionRepository import ConnectionRepository
+from direct.distributed.PyDatagram import PyDatagram
+from direct.showbase import DConfig
+from panda3d.core import ClockObject, Filename, URLSpec
+from panda3d.direct import DCFile
+
+from otp.astron import MsgTypes
+from otp.distributed import OtpDoGlobals
+from otp.otpbase import OTPGlobals
+from toontown.coghq import CraneLeagueGlobals
+from toontown.matchmaking.skill_profile_keys import SkillProfileKey
+from toontown.minigame.craning.CraneHitValidatorAI import getImpactForSpeed
+from toontown.toon.ToonDNA import ToonDNA
+from toontown.toonbase import ToontownGlobals
+
+DC_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astron', 'dclass', 'ttap.dc'))
+
+# Where bots wait between games.
+PLAYGROUND_ZONE = ToontownGlobals.ToontownCentral
+
+# How many bots log in a second, so the UberDOG isn't hit with every login at once.
+LOGINS_PER_SECOND = 10
+
+# How often every bot thinks, and sends its heartbeat.
+THINK_PERIOD = 0.05
+HEARTBEAT_PERIOD = 10.0
+
+# How long to wait after a series before queueing again.
+REQUEUE_DELAY = 2.0
+
+# The physics the client runs objects with, and how often it broadcasts their position.
+GRAVITY = -32.0
+BROADCAST_PERIOD = 0.05
+CARRY_SPEED = 30.0
+
+# Where the boss stands, and where his head is from there.
+BOSS_POS = ToontownGlobals.CashbotBossBattleThreePosHpr[:3]
+HEAD_OFFSET = (0.0, 2.0, 18.0)
+HEAD_RADIUS = 6.0
+
+parser = argparse.ArgumentParser(description='Loads a local district with bots playing crane games.')
+parser.add_argument('--host', default='127.0.0.1:7198',
+                    help='The client agent to connect to.')
+parser.add_argument('--version', default=DConfig.GetString('server-version', 'tt-ranked-edition'),
+                    help="The version string the client agent expects.")
+parser.add_argument('--mode', default=SkillProfileKey.CRANING_SOLOS.value,
+                    choices=[SkillProfileKey.CRANING_SOLOS.value, SkillProfileKey.CRANING_FFA.value],
+                    help='The queue bots join.')
+parser.add_argument('--matches', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                    help='How many matches to run at once for every step of load.')
+parser.add_argument('--best-of', type=int, default=3, choices=[1, 3, 5, 7],
+                    help='How many rounds every series is a best of.')
+parser.add_argument('--warmup', type=float, default=60,
+                    help='How long to wait for the games of a step to start before measuring, in seconds.')
+parser.add_argument('--measure', type=float, default=60,
+                    help='How long to measure every step for, in seconds.')
+parser.add_argument('--ai-report', help="The AI's load-report-file. Without it, only the bots' side is measured.")
+parser.add_argument('--token-prefix', default='loadbot',
+                    help='Bots log in with play tokens made from this, so the same accounts are reused every run.')
+parser.add_argument('--seed', type=int, default=0)
+args = parser.parse_args()
+
+globalClock = ClockObject.getGlobalClock()
+
+DC = DCFile()
+DC.read(Filename.fromOsSpecific(DC_FILE))
+PLAYERS_PER_MATCH = 2 if args.mode == SkillProfileKey.CRANING_SOLOS.value else 4
+
+
+class ObjectView:
+    """
+    What a bot knows about a distributed object it can see. Fields the view has a method for are passed to it,
+    everything else is ignored.
+    """
+
+    def __init__(self, bot, doId: int, dclass, zoneId: int = 0):
+        self.bot = bot
+        self.doId = doId
+        self.dclass = dclass
+        self.zoneId = zoneId
+
+    def announceGenerate(self):
+        pass
+
+    def delete(self):
+        pass
+
+    def sendUpdate(self, fieldName: str, args: list = ()):
+        self.bot.sendUpdate(self, fieldName, list(args))
+
+
+class GameServicesView(ObjectView):
+
+    def acceptLogin(self):
+        self.bot.handleLoggedIn()
+
+    def avatarListResponse(self, avatarList):
+        self.bot.handleAvatarList([avatar[0] for avatar in avatarList])
+
+    def createAvatarResponse(self, avId):
+        self.bot.handleAvatarCreated(avId)
+
+
+class MatchmakerView(ObjectView):
+
+    def setMinigameZone(self, zoneId, gameId):
+        self.bot.handleMatchFound(zoneId)
+
+
+class DistrictView(ObjectView):
+
+    def announceGenerate(self):
+        self.bot.handleDistrict(self.doId)
+
+
+class TimeManagerView(ObjectView):
+
+    def announceGenerate(self):
+        self.bot.harness.syncClock(self)
+
+    def serverTime(self, context, timestamp, timeOfDay):
+        self.bot.harness.handleServerTime(timestamp)
+
+
+class CraneGameView(ObjectView):
+
+    def __init__(self, bot, doId, dclass, zoneId=0):
+        super().__init__(bot, doId, dclass, zoneId)
+        self.participants = []
+
+    def setParticipants(self, avIds):
+        self.participants = avIds
+
+    def announceGenerate(self):
+        self.bot.handleGameGenerated(self)
+
+    def setGameStart(self, timestamp):
+        self.bot.playing = True
+
+    def restart(self):
+        self.bot.playing = True
+
+    def declareVictor(self, avId):
+        self.bot.handleRoundOver()
+
+    def setGameExit(self):
+        self.bot.handleGameOver(self)
+
+    def setGameAbort(self):
+        self.bot.handleGameOver(self)
+
+    def delete(self):
+        if self.bot.game is self:
+            self.bot.handleGameOver(self)
+
+
+class CraneView(ObjectView):
+
+    def __init__(self, bot, doId, dclass, zoneId=0):
+        super().__init__(bot, doId, dclass, zoneId)
+        self.index = 0
+        self.avId = 0
+
+    def setIndex(self, index):
+        self.index = index
+
+    def setState(self, state, avId):
+        self.avId = avId if state == 'C' else 0
+        if avId == self.bot.avId:
+            self.bot.crane = self if state == 'C' else None
+
+    def announceGenerate(self):
+        self.bot.cranes[self.doId] = self
+
+    def delete(self):
+        self.bot.cranes.pop(self.doId, None)
+        if self.bot.crane is self:
+            self.bot.crane = None
+
+
+class SafeView(ObjectView):
+
+    def __init__(self, bot, doId, dclass, zoneId=0):
+        super().__init__(bot, doId, dclass, zoneId)
+        self.state = 'F'
+        self.avId = 0
+        self.pos = [0.0, 0.0, 0.0]
+
+    def setIndex(self, index):
+        self.pos = list(CraneLeagueGlobals.SAFE_POSHPR[index % len(CraneLeagueGlobals.SAFE_POSHPR)][:3])
+
+    def setX(self, x):
+        self.pos[0] = x
+
+    def setY(self, y):
+        self.pos[1] = y
+
+    def setZ(self, z):
+        self.pos[2] = z
+
+    def setPos(self, x, y, z):
+        self.pos = [x, y, z]
+
+    def setPosHpr(self, x, y, z, h, p, r):
+        self.pos = [x, y, z]
+
+    def updateClientPositions(self, x, y, z, h, p, r):
+        self.pos = [x, y, z]
+
+    def setObjectState(self, state, avId, craneId):
+        self.state = state
+        self.avId = avId
+        if state == 'G' and avId == self.bot.avId:
+            self.bot.handleGrabbed(self, craneId)
+
+    def rejectGrab(self):
+        self.bot.held = None
+
+    def announceGenerate(self):
+        self.bot.safes[self.doId] = self
+
+    def delete(self):
+        self.bot.safes.pop(self.doId, None)
+        if self.bot.held is self:
+            self.bot.held = None
+            self.bot.action = None
+
+
+VIEWS = {
+    'DistributedCraneGame': CraneGameView,
+    'DistributedCashbotBossCrane': CraneView,
+    'DistributedCashbotBossSafe': SafeView,
+    'ToontownDistrict': DistrictView,
+    'TimeManager': TimeManagerView,
+}
+
+
+class CraneBot(ConnectionRepository):
+    """
+    A headless client that plays crane games.
+    """
+
+    # Interests every bot keeps open.
+    INTEREST_DISTRICTS = 1
+    INTEREST_DISTRICT_MANAGEMENT = 2
+    INTEREST_ZONE = 3
+
+    def __init__(self, harness, index: int):
+        ConnectionRepository.__init__(self, ConnectionRepository.CM_NATIVE, DConfig)
+        self.setClientDatagram(True)
+        self.setHandleDatagramsInternally(False)
+
+        self.harness = harness
+        self.index = index
+        self.rng = random.Random(args.seed * 100_000 + index)
+        self.playToken = f'{args.token_prefix}-{index}'
+
+        self.views: dict[int, ObjectView] = {}
+        self.gameServices = self.__addGlobalView(OtpDoGlobals.OTP_DO_ID_TOONTOWN_GAME_SERVICES_MANAGER,
+                                                 'TTGameServicesManager', GameServicesView)
+        self.matchmaker = self.__addGlobalView(OtpDoGlobals.OTP_DO_ID_MATCHMAKER, 'DistributedMatchmaker',
+                                               MatchmakerView)
+
+        self.state = 'Connecting'
+        self.avId = 0
+        self.shardId = 0
+        self.interestContext = 0
+        self.nextHeartbeat = 0.0
+
+        # The game we are in, and what we are doing in it.
+        self.game: CraneGameView | None = None
+        self.playing = False
+        self.cranes: dict[int, CraneView] = {}
+        self.safes: dict[int, SafeView] = {}
+        self.crane: CraneView | None = None
+        self.held: SafeView | None = None
+        self.action = None
+        self.wakeAt = 0.0
+        self.nextControlAttempt = 0.0
+        self.nextGrabAttempt = 0.0
+        self.requeueAt = None
+
+    def __addGlobalView(self, doId: int, dclassName: str, viewClass) -> ObjectView:
+        view = viewClass(self, doId, DC.getClassByName(dclassName))
+        self.views[doId] = view
+        return view
+
+    def start(self):
+        self.connect([URLSpec(f'g://{args.host}')], successCallback=self.__handleConnected,
+                     failureCallback=self.__handleConnectFailed)
+
+    def stop(self):
+        self.stopReaderPollTask()
+        self.disconnect()
+        self.state = 'Stopped'
+
+    def __handleConnected(self):
+        self.state = 'Hello'
+        datagram = PyDatagram()
+        datagram.addUint16(MsgTypes.CLIENT_HELLO)
+        datagram.addUint32(DC.getHash())
+        datagram.addString(args.version)
+        self.sendDatagram(datagram)
+
+    def __handleConnectFailed(self, statusCode, statusString):
+        self.harness.handleBotFailed(self, f'could not connect: {statusString}')
+
+    def lostConnection(self):
+        self.harness.handleBotFailed(self, 'lost connection')
+
+    """
+    Sending
+    """
+
+    def sendDatagram(self, datagram):
+        self.send(datagram)
+        self.harness.datagramsSent += 1
+
+    def sendUpdate(self, view: ObjectView, fieldName: str, args: list):
+        self.sendDatagram(view.dclass.clientFormatUpdate(fieldName, view.doId, args))
+
+    def sendSetLocation(self, parentId: int, zoneId: int):
+        datagram = PyDatagram()
+        datagram.addUint16(MsgTypes.CLIENT_OBJECT_LOCATION)
+        datagram.addUint32(self.avId)
+        datagram.addUint32(parentId)
+        datagram.addUint32(zoneId)
+        self.sendDatagram(datagram)
+
+    def sendAddInterest(self, interestId: int, parentId: int, zoneId: int):
+        self.interestContext += 1
+        datagram = PyDatagram()
+        datagram.addUint16(MsgTypes.CLIENT_ADD_INTEREST)
+        datagram.addUint32(self.interestContext)
+        datagram.addUint16(interestId)
+        datagram.addUint32(parentId)
+        datagram.addUint32(zoneId)
+        self.sendDatagram(datagram)
+
+    """
+    Receiving
+    """
+
+    def handleDatagram(self, di):
+        self.harness.datagramsReceived += 1
+        msgType = self.getMsgType()
+
+        if msgType == MsgTypes.CLIENT_HELLO_RESP:
+            self.state = 'Login'
+            self.gameServices.sendUpdate('login', [self.playToken])
+        elif msgType == MsgTypes.CLIENT_EJECT:
+            code = di.getUint16()
+            self.harness.handleBotFailed(self, f'ejected ({code}): {di.getString()}')
+        elif msgType in (MsgTypes.CLIENT_ENTER_OBJECT_REQUIRED, MsgTypes.CLIENT_ENTER_OBJECT_REQUIRED_OTHER):
+            self.__handleEnterObject(di, msgType == MsgTypes.CLIENT_ENTER_OBJECT_REQUIRED_OTHER)
+        elif msgType == MsgTypes.CLIENT_OBJECT_SET_FIELD:
+            view = self.views.get(di.getUint32())
+            if view is not None:
+                view.dclass.receiveUpdate(view, di)
+        elif msgType == MsgTypes.CLIENT_OBJECT_LEAVING:
+            view = self.views.pop(di.getUint32(), None)
+            if view is not None:
+                view.delete()
+        # Our own toon (which we don't need to know anything about), interest and location changes are ignored.
+
+    def __handleEnterObject(self, di, hasOther: bool):
+        doId = di.getUint32()
+        di.getUint32()  # Parent
+        zoneId = di.getUint32()
+        dclass = DC.getClass(di.getUint16())
+        viewClass = VIEWS.get(dclass.getName())
+        if viewClass is None:
+            return
+
+        view = viewClass(self, doId, dclass, zoneId)
+        dclass.receiveUpdateBroadcastRequired(view, di)
+        if hasOther:
+            dclass.receiveUpdateOther(view, di)
+        self.views[doId] = view
+        view.announceGenerate()
+
+    """
+    Logging in
+    """
+
+    def handleLoggedIn(self):
+        self.state = 'Avatars'
+        self.gameServices.sendUpdate('requestAvatarList')
+
+    def handleAvatarList(self, avIds: list[int]):
+        if avIds:
+            self.handleAvatarCreated(avIds[0])
+            return
+
+        dna = ToonDNA()
+        dna.newToonRandom()
+        self.gameServices.sendUpdate('createAvatar', [dna.makeNetString(), 0])
+
+    def handleAvatarCreated(self, avId: int):
+        self.avId = avId
+        self.state = 'Districts'
+        self.gameServices.sendUpdate('requestPlayAvatar', [avId])
+        self.sendAddInterest(self.INTEREST_DISTRICTS, OtpDoGlobals.OTP_DO_ID_TOONTOWN,
+                             OtpDoGlobals.OTP_ZONE_ID_DISTRICTS)
+
+    def handleDistrict(self, shardId: int):
+        if self.shardId:
+            return
+
+        # Step onto the district, where the AI can see us.
+        self.shardId = shardId
+        self.sendAddInterest(self.INTEREST_DISTRICT_MANAGEMENT, shardId, OTPGlobals.UberZone)
+        self.goToZone(PLAYGROUND_ZONE)
+        self.requeueAt = time.monotonic() + REQUEUE_DELAY
+
+    def goToZone(self, zoneId: int):
+        self.sendSetLocation(self.shardId, zoneId)
+        self.sendAddInterest(self.INTEREST_ZONE, self.shardId, zoneId)
+
+    """
+    Playing
+    """
+
+    def queue(self):
+        self.state = 'Queued'
+        self.requeueAt = None
+        self.matchmaker.sendUpdate('requestModeQueueState', [args.mode, True])
+
+    def handleMatchFound(self, zoneId: int):
+        self.state = 'Joining'
+        self.goToZone(zoneId)
+
+    def handleGameGenerated(self, game: CraneGameView):
+        if self.avId not in game.participants:
+            return
+
+        self.state = 'Playing'
+        self.game = game
+        game.sendUpdate('setAvatarJoined')
+        if game.participants[0] == self.avId and args.best_of > 1:
+            game.sendUpdate('setBestOf', [args.best_of])
+        # Queued games have no host, so everyone readies up straight away.
+        game.sendUpdate('setAvatarReady')
+
+    def handleRoundOver(self):
+        self.playing = False
+        self.action = None
+        self.held = None
+
+    def handleGameOver(self, game: CraneGameView):
+        if self.game is not game:
+            return
+
+        game.sendUpdate('setAvatarExited')
+        self.harness.handleSeriesDone(self)
+        self.handleRoundOver()
+        self.game = None
+        self.crane = None
+        self.cranes.clear()
+        self.safes.clear()
+        self.state = 'Idle'
+        self.goToZone(PLAYGROUND_ZONE)
+        self.requeueAt = time.monotonic() + REQUEUE_DELAY
+
+    def think(self, now: float):
+        if now >= self.nextHeartbeat and self.state not in ('Connecting', 'Stopped'):
+            self.nextHeartbeat = now + HEARTBEAT_PERIOD
+            datagram = PyDatagram()
+            datagram.addUint16(MsgTypes.CLIENT_HEARTBEAT)
+            self.sendDatagram(datagram)
+
+        if self.requeueAt is not None and now >= self.requeueAt:
+            self.queue()
+
+        if self.game is None or not self.playing:
+            return
+
+        if self.action is not None:
+            if now >= self.wakeAt:
+                try:
+                    self.wakeAt = now + next(self.action)
+                except StopIteration:
+                    self.action = None
+            return
+
+        if self.crane is None:
+            # Take any crane nobody is using.
+            if now >= self.nextControlAttempt:
+                self.nextControlAttempt = now + 1.0
+                free = [crane for crane in self.cranes.values() if crane.avId == 0]
+                if free:
+                    self.rng.choice(free).sendUpdate('requestControl')
+        elif self.held is None and now >= self.nextGrabAttempt:
+            self.nextGrabAttempt = now + 0.5
+            free = [safe for safe in self.safes.values() if safe.state == 'F']
+            if free:
+                self.held = self.rng.choice(free)
+                self.held.sendUpdate('requestGrab')
+
+    def handleGrabbed(self, safe: SafeView, craneId: int):
+        self.held = safe
+        self.action = self.__swing(safe, craneId)
+        self.wakeAt = 0.0
+
+    def __swing(self, safe: SafeView, craneId: int):
+        """
+        Carries a safe over to the boss and drops it on his head, broadcasting its position the way
+        DistributedSmoothNode does. Yields how long to wait before the next step.
+        """
+        head = [BOSS_POS[i] + HEAD_OFFSET[i] for i in range(3)]
+        angle = self.rng.uniform(0, 2 * math.pi)
+        distance = self.rng.uniform(6, 20)
+        start = [head[0] + math.cos(angle) * distance, head[1] + math.sin(angle) * distance,
+                 head[2] + self.rng.uniform(2, 14)]
+
+        # Carry it over on the magnet.
+        pos = [safe.pos[0], safe.pos[1], max(safe.pos[2], start[2])]
+        steps = max(1, int(math.dist(pos, start) / CARRY_SPEED / BROADCAST_PERIOD))
+        for step in range(1, steps + 1):
+            t = step / steps
+            self.__broadcastPos(safe, [pos[i] + (start[i] - pos[i]) * t for i in range(3)])
+            yield BROADCAST_PERIOD
+
+        # Let go, aimed at his head, and let it fall.
+        safe.sendUpdate('requestDrop')
+        flightTime = self.rng.uniform(0.4, 1.2)
+        velocity = [(head[i] - start[i]) / flightTime for i in range(2)]
+        velocity.append((head[2] - start[2] - 0.5 * GRAVITY * flightTime ** 2) / flightTime)
+        pos = list(start)
+        topSpeed = 0.0
+        elapsed = 0.0
+        while pos[2] > 0 and elapsed < 3.0:
+            velocity[2] += GRAVITY * BROADCAST_PERIOD
+            pos = [pos[i] + velocity[i] * BROADCAST_PERIOD for i in range(3)]
+            topSpeed = max(topSpeed, math.sqrt(sum(v * v for v in velocity)))
+            elapsed += BROADCAST_PERIOD
+            self.__broadcastPos(safe, pos)
+            if math.dist(pos, head) <= HEAD_RADIUS:
+                safe.sendUpdate('hitBoss', [getImpactForSpeed(topSpeed), craneId])
+                self.harness.hitsReported += 1
+                break
+            yield BROADCAST_PERIOD
+
+        # Land, and give it back.
+        yield 0.5
+        safe.sendUpdate('hitFloor')
+        safe.sendUpdate('requestFree', [pos[0], pos[1], 0, 0])
+        self.held = None
+
+    def __broadcastPos(self, safe: SafeView, pos: list[float]):
+        safe.pos = list(pos)
+        safe.sendUpdate('setSmPos', [pos[0], pos[1], pos[2], globalClockDelta.getFrameNetworkTime(bits=16)])
+
+
+class LoadTest:
+
+    def __init__(self):
+        self.bots: list[CraneBot] = []
+        self.failed = 0
+        self.datagramsSent = 0
+        self.datagramsReceived = 0
+        self.hitsReported = 0
+        self.seriesPlayed = 0
+
+        self.clockSynced = False
+        self.clockSyncStart = None
+
+        self.reportFile = None
+        self.reports: list[dict] = []
+        if args.ai_report:
+            self.reportFile = open(args.ai_report)
+            # Only reports written from now on are about us.
+            self.reportFile.seek(0, os.SEEK_END)
+
+    def handleBotFailed(self, bot: CraneBot, reason: str):
+        if bot.state == 'Stopped':
+            return
+        print(f'  bot {bot.index} failed in state {bot.state}: {reason}')
+        bot.state = 'Stopped'
+        self.failed += 1
+
+    def handleSeriesDone(self, bot: CraneBot):
+        self.seriesPlayed += 1
+
+    def syncClock(self, timeManager: TimeManagerView):
+        # Every bot shares this process's clock, so it only needs to be synced once.
+        if self.clockSynced or self.clockSyncStart is not None:
+            return
+        self.clockSyncStart = globalClock.getRealTime()
+        timeManager.sendUpdate('requestServerTime', [0])
+
+    def handleServerTime(self, timestamp: int):
+        if self.clockSynced:
+            return
+        end = globalClock.getRealTime()
+        globalClockDelta.resynchronize((self.clockSyncStart + end) / 2, timestamp, (end - self.clockSyncStart) / 2)
+        self.clockSynced = True
+
+    def readReports(self):
+        if self.reportFile is None:
+            return
+        for line in self.reportFile.readlines():
+            if line.strip():
+                self.reports.append(json.loads(line))
+
+    def run(self, seconds: float, until=None):
+        """
+        Runs every bot for a while, or until the given condition is met.
+        """
+        end = time.monotonic() + seconds
+        nextThink = 0.0
+        while time.monotonic() < end:
+            globalClock.tick()
+            taskMgr.step()
+            now = time.monotonic()
+            if now >= nextThink:
+                nextThink = now + THINK_PERIOD
+                for bot in self.bots:
+                    bot.think(now)
+                self.readReports()
+                if until is not None and until():
+                    return
+            time.sleep(0.001)
+
+    def addBots(self, count: int):
+        while len(self.bots) < count:
+            bot = CraneBot(self, len(self.bots))
+            self.bots.append(bot)
+            bot.start()
+            self.run(1 / LOGINS_PER_SECOND)
+
+    def getRunningGames(self) -> int:
+        return len({bot.game.doId for bot in self.bots if bot.game is not None})
+
+    def measureStep(self, matches: int, baseline: dict | None):
+        self.addBots(matches * PLAYERS_PER_MATCH)
+        self.run(args.warmup, until=lambda: self.getRunningGames() >= matches)
+
+        sent, received = self.datagramsSent, self.datagramsReceived
+        firstReport = len(self.reports)
+        start = time.monotonic()
+        self.run(args.measure)
+        elapsed = time.monotonic() - start
+        reports = self.reports[firstReport:]
+
+        line = (f"{matches:>7} {self.getRunningGames():>7} {len(self.bots) - self.failed:>5} "
+                f"{(self.datagramsSent - sent) / elapsed:>9.0f} {(self.datagramsReceived - received) / elapsed:>9.0f}")
+        if reports:
+            ticks = [report['tickMs'] for report in reports]
+            games = max(report['craneGames'] for report in reports)
+            rss = reports[-1]['rssBytes']
+            perGame = (rss - baseline['rssBytes']) / games / 1024 / 1024 if baseline and games else float('nan')
+            line += (f" {statistics.mean(tick['p50'] for tick in ticks):>8.2f} {max(tick['p99'] for tick in ticks):>8.2f}"
+                     f" {max(tick['max'] for tick in ticks):>8.2f}"
+                     f" {statistics.mean(report['datagramsPerSecond'] for report in reports):>8.0f}"
+                     f" {games:>6} {rss / 1024 / 1024:>8.1f} {perGame:>8.2f}")
+        print(line)
+
+
+test = LoadTest()
+print(f"{args.mode} best of {args.best_of} against {args.host}, {args.warmup:g}s warmup and {args.measure:g}s "
+      f"measured for every step")
+
+baseline = None
+if test.reportFile is not None:
+    print("waiting for an AI load report to use as a baseline...")
+    test.run(60, until=lambda: bool(test.reports))
+    baseline = test.reports[-1] if test.reports else None
+
+header = f"{'matches':>7} {'running':>7} {'bots':>5} {'bot tx/s':>9} {'bot rx/s':>9}"
+if baseline is not None:
+    header += f" {'tick p50':>8} {'tick p99':>8} {'tick max':>8} {'ai dg/s':>8} {'games':>6} {'rss MB':>8} {'MB/game':>8}"
+print(header)
+
+try:
+    for matches in args.matches:
+        test.measureStep(matches, baseline)
+finally:
+    for bot in test.bots:
+        bot.stop()
+
+print(f"{test.seriesPlayed} series finished by bots, {test.hitsReported} hits reported, {test.failed} bots failed")
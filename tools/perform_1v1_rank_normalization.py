@@ -1,7 +1,12 @@
 """
 A script that modifies everyone's 1v1 rank to keep the same curve, but ensure a 1000 average ELO economy.
 Also set's the sigma value to 0, since we don't use it in a raw ELO system.
+Everyone's new ranks are calculated in one batch once every profile has been read.
 """
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 prompt = input("What you are about to do is going to alter the YAML database by normalizing everyone's 1v1 rank profile."
                " Are you sure you want to do this? If so, type CONFIRM and hit enter.")
@@ -15,6 +20,8 @@ import json
 import yaml
 from pathlib import Path
 
+from toontown.matchmaking.skill_rating_utils import compress_ratings
+
 # Define the relative path to the directory
 yaml_dir = Path("../astron/databases/astrondb")
 key_to_check = "setSkillProfiles"
@@ -28,6 +35,13 @@ new_sr_economy = 0
 profiles_viewed = 0
 profiles_changed = 0
 
+# The rank everyone is normalized around, and how hard ranks above it get pulled down.
+RATING_PIVOT = 1000
+CURVE_EXPONENT = 7 / 9
+
+# Every profile that's going to change, as (yaml file, yaml data, parsed profiles, profile index, name).
+changes = []
+
 # Loop through all .yaml and .yml files in the directory
 for yaml_file in yaml_dir.glob("*.yaml"):
 
@@ -53,9 +67,7 @@ for yaml_file in yaml_dir.glob("*.yaml"):
     # Use JSON to convert it to a readable python obj.
     parsed = json.loads(profiles)
 
-    modifications_made = False
-
-    # Perform modifications.
+    # Find the profiles to modify.
     for i, profile in enumerate(list(parsed)):
         _id, key, mu, sigma, sr, won, played, placements = profile
         # If this isn't the mode we care about, skip.
@@ -66,36 +78,35 @@ for yaml_file in yaml_dir.glob("*.yaml"):
         old_sr_economy += sr
         profiles_viewed += 1
 
-        above_1k = mu - 1000
+        above_1k = mu - RATING_PIVOT
         if above_1k <= 0:
             new_mu_economy += mu
             new_sr_economy += sr
             print(f"Skipping {name}, under 1k")
             continue
 
-        modifications_made = True
-
-        profiles_changed += 1
+        changes.append((yaml_file, data, parsed, i, name))
 
-        sigma = 0
-        old_mu = mu
-        old_sr = sr
-        mu = (mu-1000)**(7/9) + 1000
-        mu = int(mu.real)
-        sr = (sr-1000)**(7/9) + 1000
-        sr = int(sr.real)
+# Perform modifications, running everyone's mu and SR through the curve at once.
+new_mus = compress_ratings([parsed[i][2] for _, _, parsed, i, _ in changes], RATING_PIVOT, CURVE_EXPONENT)
+new_srs = compress_ratings([parsed[i][4] for _, _, parsed, i, _ in changes], RATING_PIVOT, CURVE_EXPONENT)
+changed_files = {}
+for (yaml_file, data, parsed, i, name), mu, sr in zip(changes, new_mus, new_srs):
+    _id, key, old_mu, _, old_sr, won, played, placements = parsed[i]
+    profiles_changed += 1
 
-        # Replace the data.
-        parsed[i] = [_id, key, mu, sigma, sr, won, played, placements]
+    # Replace the data.
+    sigma = 0
+    parsed[i] = [_id, key, mu, sigma, sr, won, played, placements]
+    changed_files[yaml_file] = (data, parsed)
 
-        new_mu_economy += mu
-        new_sr_economy += sr
+    new_mu_economy += mu
+    new_sr_economy += sr
 
-        print(f"{name}: {old_mu} | {old_sr} -> {mu} | {sr}")
+    print(f"{name}: {old_mu} | {old_sr} -> {mu} | {sr}")
 
-    # Save the data back to this user.
-    if not modifications_made:
-        continue
+# Save the data back to every user we changed.
+for yaml_file, (data, parsed) in changed_files.items():
 
     # This is kinda aids, but YAML files for some reason store complex data as strings.
     # We need to serialize the data we overwrote into the format the YAML expects.
@@ -1,12 +1,19 @@
 """
 A script that prints results of a potential migration where everyone's 1v1 rank to keep the same curve, but ensure a 1000 average ELO economy.
 Also set's the sigma value to 0, since we don't use it in a raw ELO system.
+Everyone's new ranks are calculated in one batch once every profile has been read.
 """
 import json
+import os
+import sys
 
 import yaml
 from pathlib import Path
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from toontown.matchmaking.skill_rating_utils import compress_ratings
+
 # Define the relative path to the directory
 yaml_dir = Path("../astron/databases/astrondb")
 key_to_check = "setSkillProfiles"
@@ -20,6 +27,13 @@ new_sr_economy = 0
 profiles_viewed = 0
 profiles_changed = 0
 
+# The rank everyone is normalized around, and how hard ranks above it get pulled down.
+RATING_PIVOT = 1000
+CURVE_EXPONENT = 7 / 9
+
+# Every profile that would change, as (name, old mu, old sr).
+changes = []
+
 # Loop through all .yaml and .yml files in the directory
 for yaml_file in yaml_dir.glob("*.yaml"):
 
@@ -45,7 +59,7 @@ for yaml_file in yaml_dir.glob("*.yaml"):
     # Use JSON to convert it to a readable python obj.
     parsed = json.loads(profiles)
 
-    # Perform modifications.
+    # Find the profiles to modify.
     for profile in list(parsed):
         _id, key, mu, _, sr, won, played, placements = profile
         # If this isn't the mode we care about, skip.
@@ -56,27 +70,25 @@ for yaml_file in yaml_dir.glob("*.yaml"):
         old_sr_economy += sr
         profiles_viewed += 1
 
-        above_1k = mu - 1000
+        above_1k = mu - RATING_PIVOT
         if above_1k <= 0:
             new_mu_economy += mu
             new_sr_economy += sr
             print(f"Skipping {name}, under 1k")
             continue
 
-        profiles_changed += 1
+        changes.append((name, mu, sr))
 
-        sigma = 0
-        old_mu = mu
-        old_sr = sr
-        mu = (mu-1000)**(7/9) + 1000
-        mu = int(mu.real)
-        sr = (sr-1000)**(7/9) + 1000
-        sr = int(sr.real)
+# Perform modifications, running everyone's mu and SR through the curve at once.
+new_mus = compress_ratings([mu for _, mu, _ in changes], RATING_PIVOT, CURVE_EXPONENT)
+new_srs = compress_ratings([sr for _, _, sr in changes], RATING_PIVOT, CURVE_EXPONENT)
+for (name, old_mu, old_sr), mu, sr in zip(changes, new_mus, new_srs):
+    profiles_changed += 1
 
-        new_mu_economy += mu
-        new_sr_economy += sr
+    new_mu_economy += mu
+    new_sr_economy += sr
 
-        print(f"{name}: {old_mu} | {old_sr} -> {mu} | {sr}")
+    print(f"{name}: {old_mu} | {old_sr} -> {mu} | {sr}")
 
 print()
 print(f"profiles changed/viewed: {profiles_changed}/{profiles_viewed}")
@@ -0,0 +1,197 @@
+"""
+A script that replays simulated crane game hit streams through the AI's hit validator.
+
+Legitimate streams are made by running the same physics the client does on safes dropped toward the boss's head,
+broadcasting their positions the way DistributedSmoothNode does and reporting the impact the way
+DistributedCashbotBossObject does. Forged streams take those and change the report (or the positions) in the ways
+a modified client could. Prints how many of each were flagged, and exits with an error if a legitimate hit was
+flagged or a forgery that should always be caught slipped through.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from toontown.minigame.craning.CraneHitValidatorAI import CraneHitValidatorAI, getImpactForSpeed
+
+STREAMS = 2000
+SEED = 0
+
+# The physics the client runs objects with.
+GRAVITY = -32.0
+PHYSICS_DT = 1 / 60
+SPEED_CACHE_PERIOD = 0.1
+SPEED_CACHE_SIZE = 7
+BROADCAST_PERIOD = 0.05
+
+# Where the boss's head target is, and how close an object has to get to it to hit.
+BOSS_POS = (0.0, 0.0, 0.0)
+HEAD_POS = (2.0, 0.0, 18.0)
+HEAD_RADIUS = 3.0 + 3.0
+
+# Network conditions between the client and the AI.
+MIN_LATENCY = 0.03
+MAX_LATENCY = 0.2
+
+AV_ID = 100000001
+CRANE_ID = 2000
+OBJ_ID = 3000
+
+
+def quantize(value: float, precision: float) -> float:
+    return round(value / precision) * precision
+
+
+def simulate_drop(rng: random.Random) -> dict | None:
+    """
+    Drops a safe from a magnet so that it falls toward the boss's head, running the client's physics. Returns the
+    position updates the client broadcast, when it hit and the impact it reported, or None if it missed.
+    """
+    angle = rng.uniform(0, 2 * math.pi)
+    distance = rng.uniform(6, 20)
+    pos = [HEAD_POS[0] + math.cos(angle) * distance, HEAD_POS[1] + math.sin(angle) * distance,
+           HEAD_POS[2] + rng.uniform(2, 14)]
+
+    # Aim for the head, arriving some time later. Slow, gentle drops and hard swings both happen.
+    flightTime = rng.uniform(0.25, 1.4)
+    velocity = [(HEAD_POS[i] - pos[i]) / flightTime for i in range(2)]
+    velocity.append((HEAD_POS[2] - pos[2] - 0.5 * GRAVITY * flightTime ** 2) / flightTime)
+    jitter = rng.uniform(0, 1.5)
+    velocity = [v + rng.uniform(-jitter, jitter) for v in velocity]
+
+    speeds = [math.sqrt(sum(v * v for v in velocity))]
+    updates = []
+    latency = rng.uniform(MIN_LATENCY, MAX_LATENCY)
+    t = 0.0
+    nextCache = SPEED_CACHE_PERIOD
+    nextBroadcast = 0.0
+    while t < 3.0:
+        if t >= nextBroadcast:
+            arrival = t + latency + rng.uniform(0, 0.03)
+            updates.append((quantize(t, 0.01), arrival, quantize(pos[0], 0.1), quantize(pos[1], 0.1),
+                            quantize(pos[2], 0.1)))
+            nextBroadcast += BROADCAST_PERIOD
+
+        velocity[2] += GRAVITY * PHYSICS_DT
+        for i in range(3):
+            pos[i] += velocity[i] * PHYSICS_DT
+        t += PHYSICS_DT
+
+        if t >= nextCache:
+            speeds.append(math.sqrt(sum(v * v for v in velocity)))
+            speeds = speeds[-SPEED_CACHE_SIZE:]
+            nextCache += SPEED_CACHE_PERIOD
+
+        if math.dist(pos, HEAD_POS) <= HEAD_RADIUS:
+            impact = quantize(getImpactForSpeed(max(speeds)), 1 / 255)
+            return {'updates': updates, 'hitTime': t + latency, 'impact': impact}
+
+        if pos[2] < 0:
+            return None
+
+    return None
+
+
+def replay(validator: CraneHitValidatorAI, stream: dict, avId=AV_ID, craneId=CRANE_ID, grabbed=True,
+           reports=1) -> list:
+    """
+    Feeds a stream to the validator the way the AI would see it, and returns the violations of the last report.
+    """
+    validator.forgetObject(OBJ_ID)
+    if grabbed:
+        validator.objectGrabbed(OBJ_ID, AV_ID, CRANE_ID)
+
+    for clientTime, arrival, x, y, z in stream['updates']:
+        if arrival <= stream['hitTime']:
+            validator.recordMotion(OBJ_ID, clientTime, arrival, x, y, z)
+
+    violations = []
+    for _ in range(reports):
+        violations = validator.checkHit(OBJ_ID, avId, craneId, stream['impact'], stream['hitTime'], BOSS_POS)
+    return violations
+
+
+def forge_impact(stream: dict) -> dict | None:
+    # Only worth it for a cheater when the real hit was weak.
+    if stream['impact'] > 0.5:
+        return None
+    return dict(stream, impact=1.0)
+
+
+def forge_distance(stream: dict) -> dict:
+    # A hit reported for a safe dropped on the other side of the room.
+    updates = [(t, arrival, x + 60, y + 60, z) for t, arrival, x, y, z in stream['updates']]
+    return dict(stream, updates=updates)
+
+
+def forge_teleport(stream: dict) -> dict | None:
+    # Positions edited to make the safe look like it was flung at the boss.
+    updates = list(stream['updates'])
+    if len(updates) < 6:
+        return None
+    for i in range(len(updates) - 6, len(updates) - 3):
+        t, arrival, x, y, z = updates[i]
+        updates[i] = (t, arrival, x, y, z + 40)
+    return dict(stream, updates=updates, impact=1.0)
+
+
+def forge_clock(stream: dict) -> dict:
+    # Timestamps squeezed together, to make the same distance look like a faster fall.
+    start = stream['updates'][0][0]
+    updates = [(start + (t - start) * 0.2 - 2.0, arrival, x, y, z) for t, arrival, x, y, z in stream['updates']]
+    return dict(stream, updates=updates, impact=1.0)
+
+
+rng = random.Random(SEED)
+streams = []
+while len(streams) < STREAMS:
+    stream = simulate_drop(rng)
+    if stream is not None:
+        streams.append(stream)
+
+validator = CraneHitValidatorAI()
+results = {}
+
+
+def tally(name: str, violations: list | None):
+    if violations is None:
+        return
+    flagged, total = results.get(name, (0, 0))
+    results[name] = (flagged + bool(violations), total + 1)
+
+
+start = time.perf_counter()
+for stream in streams:
+    tally('legitimate', replay(validator, stream))
+    forged = forge_impact(stream)
+    tally('inflated impact', forged and replay(validator, forged))
+    tally('wrong crane', replay(validator, stream, craneId=CRANE_ID + 1))
+    tally('wrong avatar', replay(validator, stream, avId=AV_ID + 1))
+    tally('never grabbed', replay(validator, stream, grabbed=False))
+    tally('repeat hit', replay(validator, stream, reports=2))
+    tally('far from boss', replay(validator, forge_distance(stream)))
+    forged = forge_teleport(stream)
+    tally('teleported', forged and replay(validator, forged))
+    tally('clock skew', replay(validator, forge_clock(stream)))
+elapsed = time.perf_counter() - start
+
+stats = validator.getStats()
+print(f"{len(streams)} simulated hits, {stats['checked']} checks in {elapsed:.2f}s "
+      f"({elapsed / stats['checked'] * 1_000_000:.1f}us per replayed hit, {stats['overBudget']} over budget)")
+print(f"  {stats['unverified']} checks had too few position updates to judge speed")
+for name, (flagged, total) in results.items():
+    print(f"  {name:<16} {flagged:>5}/{total:<5} flagged")
+
+# Everything but an inflated impact is always caught: those can only be caught once the claimed impact is beyond
+# what the measured speed allows, so only report how many were.
+failed = results['legitimate'][0] > 0
+for name, (flagged, total) in results.items():
+    if name not in ('legitimate', 'inflated impact') and flagged != total:
+        failed = True
+if failed:
+    print("FAILED")
+    sys.exit(1)
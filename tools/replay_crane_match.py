@@ -0,0 +1,458 @@
+"""
+A script that replays crane games from the event logs the AI writes with want-crane-event-log, with no clients and no
+connection to Astron, and checks that they play out the same way they did live. Since the scoring rules run exactly as
+they do on the AI, replaying a folder of real logs is a regression test for any change to how games are scored.
+
+A replay runs a real DistributedCraneGameAI from the seed in the log, on a clock the script moves itself, as fast as the
+game's logic allows. Everything in the log that came from outside the game (toons joining, hits clients reported,
+laff changes, status effects on the boss) is fed back in at the time it happened. Everything else (scores, goons,
+modifiers, state changes and who won) is worked out again by the game and compared with what the log says happened.
+
+Some things are known to not replay exactly:
+  - Where goons fall from in overtime depends on where the safes are, which clients move.
+  - The boss and goons still pick their attacks and moves with the global random, which only changes what they do, not
+    how anyone scores.
+  - Elemental synergies between safes only come back as the status effects they left on the boss.
+
+Replay logs:
+
+    python tools/replay_crane_match.py crane-logs/*.crl
+
+or play a few synthetic games headlessly, record them and check they replay exactly:
+
+    python tools/replay_crane_match.py --synthesize 10
+"""
+
+import argparse
+import builtins
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+# What AIStart sets up before anything on the AI is imported.
+class game:
+    name = 'toontown'
+    process = 'server'
+
+
+builtins.game = game
+builtins.__dev__ = False
+
+from panda3d.core import ClockObject, Filename, loadPrcFileData
+
+from toontown.coghq import CraneLeagueGlobals
+from toontown.minigame.craning.CraneEventLog import (
+    GOON_SIDES, HIT_ATTRIBUTED, HIT_DOT, HIT_GOON, SCORE_REASONS, STATUS_EFFECTS, CraneEventLogContents,
+    CraneEventType, readCraneEventLog,
+)
+# Sets up simbase, taskMgr and messenger, the way the AI has them.
+from toontown.minigame.craning.DistributedCraneGameAI import DistributedCraneGameAI
+from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect
+from toontown.toonbase import ToontownGlobals
+
+from direct.distributed.ConnectionRepository import ConnectionRepository
+from direct.showbase import DConfig
+
+DC_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astron', 'dclass', 'ttap.dc'))
+
+# How long a frame is when nothing happens in between, in milliseconds. About what the AI runs at.
+FRAME_MS = 33
+
+# How long a game is allowed to carry on after its last input before we give up on it ending, in milliseconds.
+MAX_TRAILING_MS = 15 * 60 * 1000
+
+# Goon stats are logged as 32-bit floats.
+FLOAT_TOLERANCE = 1e-4
+
+DO_IDS = itertools.count(1000)
+
+globalClock = ClockObject.getGlobalClock()
+globalClock.setMode(ClockObject.MSlave)
+
+# The AI sleeps every frame so it doesn't spin, which we don't want.
+taskMgr.remove('aiSleep')
+
+
+class ReplayToon:
+    """
+    The bare minimum of a DistributedToonAI that a crane game needs to know about.
+    """
+
+    def __init__(self, avId: int, hp: int, maxHp: int):
+        self.doId = avId
+        self.hp = hp
+        self.maxHp = maxHp
+
+    def getDoId(self) -> int:
+        return self.doId
+
+    def getName(self) -> str:
+        return f'Toon {self.doId}'
+
+    def getHp(self) -> int:
+        return self.hp
+
+    def getMaxHp(self) -> int:
+        return self.maxHp
+
+    def getGoneSadMessage(self) -> str:
+        return f'goneSad-{self.doId}'
+
+    def b_setHp(self, hp: int):
+        wasAlive = self.hp > 0
+        self.hp = min(hp, self.maxHp)
+        if wasAlive and self.hp <= 0:
+            messenger.send(self.getGoneSadMessage())
+
+    def b_setMaxHp(self, maxHp: int):
+        self.maxHp = maxHp
+
+    def takeDamage(self, deduction: int, quietly=0, sendTotal=1):
+        if deduction > 0 and self.hp > 0:
+            self.b_setHp(self.hp - deduction)
+
+    def toonUp(self, hp: int, quietly=False, sendTotal=True):
+        if hp > 0:
+            self.b_setHp(max(self.hp, 0) + int(hp))
+
+    def startToonUp(self, healFrequency):
+        pass
+
+    def stopToonUp(self):
+        pass
+
+
+class FakeAIRepository(ConnectionRepository):
+    """
+    The bare minimum of the AI repository that a crane game and everything in it needs, without a connection to
+    Astron. Smooth nodes want a real connection repository to point at, even though it never connects to anything.
+    """
+
+    def __init__(self):
+        ConnectionRepository.__init__(self, ConnectionRepository.CM_NATIVE, DConfig)
+        self.ourChannel = 1
+        self.districtId = 1
+
+        # The toon every field update is from, as far as the game can tell.
+        self.sender = 0
+
+        # Distributed objects look their class up by name, with the AI suffix, just like the real repository has them.
+        self.dcFile = self.getDcFile()
+        self.dcFile.read(Filename.fromOsSpecific(DC_FILE))
+        self.dclassesByName = {}
+        for i in range(self.dcFile.getNumClasses()):
+            dclass = self.dcFile.getClass(i)
+            self.dclassesByName[dclass.getName() + 'AI'] = dclass
+
+    def allocateChannel(self) -> int:
+        # Shared by every repository we make, so no two games log to the same file.
+        return next(DO_IDS)
+
+    def deallocateChannel(self, channel):
+        pass
+
+    def generateWithRequired(self, do, parentId, zoneId, optionalFields=[]):
+        do.doId = self.allocateChannel()
+        self.addDOToTables(do, location=(parentId, zoneId))
+
+    def addDOToTables(self, do, location=None):
+        do.parentId, do.zoneId = location
+        self.doId2do[do.doId] = do
+
+    def requestDelete(self, do):
+        self.doId2do.pop(do.doId, None)
+        do.delete()
+
+    def getAvatarIdFromSender(self) -> int:
+        return self.sender
+
+    def getAvatarExitEvent(self, avId: int) -> str:
+        return f'distObjDelete-{avId}'
+
+    def sendUpdate(self, do, fieldName, args):
+        pass
+
+    def sendUpdateToChannel(self, do, channelId, fieldName, args):
+        pass
+
+    def startMessageBundle(self, name):
+        pass
+
+    def sendMessageBundle(self, senderChannel):
+        pass
+
+    def writeServerEvent(self, logtype, *args, **kwargs):
+        pass
+
+
+class HeadlessCraneGame:
+    """
+    A crane game running with no clients, with its event log turned on. The clock only moves when we move it.
+    """
+
+    def __init__(self, logDir: str, seed: int, minigameId: int, toons: dict[int, tuple[int, int]]):
+        self.air = FakeAIRepository()
+        simbase.air = self.air
+
+        self.toons = {avId: ReplayToon(avId, hp, maxHp) for avId, (hp, maxHp) in toons.items()}
+        self.air.doId2do.update(self.toons)
+
+        # Start on a whole millisecond, so every frame lands on one too and is logged at exactly the time it ran.
+        self.startTime = (int(globalClock.getFrameTime() * 1000) + 1000) / 1000
+        self.nowMs = 0
+        globalClock.setFrameTime(self.startTime)
+        self.tasks = {task.name for task in taskMgr.getTasks() + taskMgr.getDoLaters()}
+
+        self.game = DistributedCraneGameAI(self.air, minigameId)
+        self.game.setRandomSeed(seed)
+        self.game.setExpectedAvatars(list(self.toons))
+        self.game.setTrolleyZone(ToontownGlobals.ToontownCentral)
+        self.game.generateWithRequired(ToontownGlobals.DynamicZonesBegin)
+        self.logFile = os.path.join(logDir, f'{time.strftime("%Y%m%d-%H%M%S")}-{self.game.doId}.crl')
+
+    def advanceTo(self, ms: int):
+        while self.nowMs < ms:
+            self.nowMs = min(self.nowMs + FRAME_MS, ms)
+            globalClock.setFrameTime(self.startTime + self.nowMs / 1000)
+            taskMgr.step()
+
+    def isOver(self) -> bool:
+        return self.game.frameworkFSM.getCurrentState().getName() in ('frameworkWaitClientsExit', 'frameworkCleanup')
+
+    def finish(self) -> CraneEventLogContents:
+        """
+        Plays the game out until it ends, throws it away and returns its log.
+        """
+        end = self.nowMs + MAX_TRAILING_MS
+        while not self.isOver() and self.nowMs < end:
+            self.advanceTo(self.nowMs + FRAME_MS)
+
+        if self.game.air is not None:
+            self.game.requestDelete()
+        for task in taskMgr.getTasks() + taskMgr.getDoLaters():
+            if task.name not in self.tasks:
+                taskMgr.remove(task)
+        simbase.air = None
+
+        with open(self.logFile, 'rb') as log:
+            return readCraneEventLog(log)
+
+    def setSender(self, avId: int):
+        self.air.sender = avId
+
+    def getCraneId(self, craneIndex: int) -> int:
+        if 0 <= craneIndex < len(self.game.cranes):
+            return self.game.cranes[craneIndex].doId
+        return -1
+
+    def setBossStatusEffect(self, statusEffect: StatusEffect, appliedByAvId: int, applied: bool):
+        """
+        Puts a status effect on the boss, or takes it off, without anything it would set off. Anything it set off live
+        is in the log already.
+        """
+        system = self.game.statusEffectSystem
+        bossId = self.game.boss.doId
+        effects = system.objectsWithStatusEffects.setdefault(bossId, Counter())
+        if applied:
+            effects[statusEffect] += 1
+            if appliedByAvId:
+                system.effectAppliedBy[(bossId, statusEffect)] = appliedByAvId
+        elif effects[statusEffect] > 0:
+            effects[statusEffect] -= 1
+            if effects[statusEffect] <= 0:
+                del effects[statusEffect]
+                system.effectAppliedBy.pop((bossId, statusEffect), None)
+        if not effects:
+            del system.objectsWithStatusEffects[bossId]
+
+    def setHp(self, avId: int, hp: int):
+        toon = self.toons.get(avId)
+        if toon is None:
+            return
+        # Whatever going sad sets off was worked out live while the toon was being hit, so it isn't an input.
+        with self.game.eventLog.nested():
+            toon.b_setHp(hp)
+
+
+def replay(contents: CraneEventLogContents, logDir: str) -> CraneEventLogContents:
+    """
+    Plays a logged game again from its inputs, and returns the log the replay wrote.
+    """
+    match = HeadlessCraneGame(logDir, contents.seed, contents.minigameId, contents.toons)
+    game = match.game
+    for event in contents.events:
+        if not event.isInput():
+            continue
+
+        match.advanceTo(round(event.time * 1000))
+        args = event.args
+        if event.type == CraneEventType.JOINED:
+            match.setSender(args[0])
+            game.setAvatarJoined()
+        elif event.type == CraneEventType.READY:
+            match.setSender(args[0])
+            game.setAvatarReady()
+        elif event.type == CraneEventType.EXITED:
+            match.setSender(args[0])
+            game.setAvatarExited()
+        elif event.type == CraneEventType.LEFT:
+            messenger.send(match.air.getAvatarExitEvent(args[0]))
+        elif event.type == CraneEventType.BEST_OF:
+            match.setSender(args[0])
+            game.setBestOf(args[1])
+        elif event.type == CraneEventType.HIT:
+            avId, damage, impact, craneIndex, objId, flags = args
+            craneId = match.getCraneId(craneIndex)
+            if flags & HIT_ATTRIBUTED:
+                game.recordHitWithAttribution(damage, avId, impact, craneId, objId, bool(flags & HIT_GOON),
+                                              bool(flags & HIT_DOT))
+            else:
+                match.setSender(avId)
+                game.recordHit(damage, impact, craneId, objId, bool(flags & HIT_GOON), bool(flags & HIT_DOT))
+        elif event.type == CraneEventType.SCORE:
+            game.addScore(args[0], args[1], SCORE_REASONS[args[2]])
+        elif event.type == CraneEventType.TOON_HP:
+            match.setHp(*args)
+        elif event.type == CraneEventType.STATUS_EFFECT:
+            match.setBossStatusEffect(STATUS_EFFECTS[args[0]], args[1], args[2])
+
+    return match.finish()
+
+
+def play_synthetic(logDir: str, seed: int, numToons: int, rng: random.Random) -> CraneEventLogContents:
+    """
+    Plays a game with bots that do nothing but report hits on the boss, get hurt and stun goons now and then, and
+    returns its log.
+    """
+    toons = {100_000_000 + seed * 10 + i: (137, 137) for i in range(numToons)}
+    match = HeadlessCraneGame(logDir, seed, ToontownGlobals.CraneGameId, toons)
+    game = match.game
+    for avId in toons:
+        match.setSender(avId)
+        game.setAvatarJoined()
+    for avId in toons:
+        match.setSender(avId)
+        game.setAvatarReady()
+
+    while not match.isOver() and match.nowMs < MAX_TRAILING_MS:
+        match.advanceTo(match.nowMs + FRAME_MS)
+        if game.gameFSM.getCurrentState().getName() != 'play':
+            continue
+
+        avId = rng.choice(list(toons))
+        roll = rng.random()
+        if roll < 0.03 and game.cranes and game.safes:
+            match.setSender(avId)
+            game.recordHit(rng.randint(5, 50), impact=rng.choice((0.3, 0.8, 1.0)),
+                           craneId=rng.choice(game.cranes).doId, objId=rng.choice(game.safes).doId,
+                           isGoon=rng.random() < 0.2)
+        elif roll < 0.035:
+            game.damageToon(match.toons[avId], rng.randint(5, 20))
+        elif roll < 0.04:
+            game.addScore(avId, game.ruleset.POINTS_STUN, CraneLeagueGlobals.ScoreReason.STUN)
+        elif roll < 0.042 and game.statusEffectSystem.isEnabled():
+            game.statusEffectSystem.b_applyStatusEffect(game.boss.doId, rng.choice(STATUS_EFFECTS), avId)
+
+    return match.finish()
+
+
+def get_outputs(contents: CraneEventLogContents) -> list:
+    return [event for event in contents.events if not event.isInput()]
+
+
+def outputs_match(a, b) -> bool:
+    if a.type != b.type:
+        return False
+    if a.type == CraneEventType.GOON:
+        return a.args[:2] == b.args[:2] and a.args[6] == b.args[6] and \
+            all(abs(x - y) <= FLOAT_TOLERANCE for x, y in zip(a.args[2:6] + a.args[7:], b.args[2:6] + b.args[7:]))
+    return a.args == b.args
+
+
+def describe(event) -> str:
+    args = event.args
+    if event.type == CraneEventType.SCORE:
+        args = (args[0], args[1], SCORE_REASONS[args[2]].name, f'round {args[3]}')
+    elif event.type == CraneEventType.GOON:
+        args = (GOON_SIDES[args[0]],) + args[1:]
+    return f'{event.type.name} {args} at {event.time:.3f}s'
+
+
+def get_round_scores(contents: CraneEventLogContents) -> dict[int, dict[int, int]]:
+    scores = defaultdict(lambda: defaultdict(int))
+    for event in contents.events:
+        if event.type == CraneEventType.SCORE:
+            scores[event.args[3]][event.args[0]] += event.args[1]
+    return scores
+
+
+def compare(name: str, original: CraneEventLogContents, replayed: CraneEventLogContents, elapsed: float) -> bool:
+    expected = get_outputs(original)
+    actual = get_outputs(replayed)
+    length = original.events[-1].time if original.events else 0.0
+    print(f"{name}: seed {original.seed}, {len(original.toons)} toons, {len(original.events)} events over "
+          f"{length:.1f}s{' (truncated)' if original.truncated else ''}, replayed in {elapsed:.2f}s "
+          f"({length / max(elapsed, 1e-9):.0f}x)")
+
+    for round, scores in sorted(get_round_scores(replayed).items()):
+        print(f"  round {round}: " + ', '.join(f'{avId} {score}' for avId, score in sorted(scores.items())))
+    victors = [event.args[0] for event in replayed.events if event.type == CraneEventType.VICTOR]
+    print(f"  won by: {', '.join(str(victor) for victor in victors) or 'nobody'}")
+
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if not outputs_match(a, b):
+            print(f"  MISMATCH at output {i}: logged {describe(a)}, replay got {describe(b)}")
+            return False
+
+    # A truncated log stops early, so the replay carrying on past it is fine.
+    if len(actual) < len(expected) or (len(actual) > len(expected) and not original.truncated):
+        print(f"  MISMATCH: logged {len(expected)} outputs, replay got {len(actual)}")
+        return False
+
+    print(f"  {len(expected)} outputs match")
+    return True
+
+
+parser = argparse.ArgumentParser(description='Replays crane game event logs headlessly and checks they match.')
+parser.add_argument('logs', nargs='*', help='Event logs to replay.')
+parser.add_argument('--synthesize', type=int, default=0,
+                    help='Play this many synthetic games, then check that each one replays exactly.')
+parser.add_argument('--toons', type=int, default=2, help='How many toons play in synthetic games.')
+parser.add_argument('--seed', type=int, default=0)
+args = parser.parse_args()
+
+if not args.logs and not args.synthesize:
+    parser.error('give some logs to replay, or --synthesize')
+
+failed = False
+with tempfile.TemporaryDirectory() as logDir:
+    loadPrcFileData('replay_crane_match', f'want-crane-event-log #t\ncrane-event-log-dir {logDir}')
+
+    for filename in args.logs:
+        with open(filename, 'rb') as log:
+            original = readCraneEventLog(log)
+        start = time.perf_counter()
+        replayed = replay(original, logDir)
+        failed |= not compare(filename, original, replayed, time.perf_counter() - start)
+
+    rng = random.Random(args.seed)
+    for i in range(args.synthesize):
+        start = time.perf_counter()
+        original = play_synthetic(logDir, args.seed + i, args.toons, rng)
+        played = time.perf_counter() - start
+
+        start = time.perf_counter()
+        replayed = replay(original, logDir)
+        elapsed = time.perf_counter() - start
+        failed |= not compare(f'synthetic game {i + 1} (played in {played:.2f}s)', original, replayed, elapsed)
+
+if failed:
+    print("FAILED")
+    sys.exit(1)
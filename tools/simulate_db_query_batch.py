@@ -0,0 +1,196 @@
+"""
+A script that runs queryObjects() against a fake message director standing in for Astron's database, which answers
+after a random delay, fails some objects and never answers for others. Checks that every object ends up either in the
+results or in the failures exactly once, that no more queries are ever outstanding than were asked for, that the
+callback fires exactly once and on time even when answers are lost, that a batch that timed out stops waiting on the
+queries it gave up on, and that answers arriving after that are ignored. Exits with an error if any of that doesn't hold.
+"""
+
+import builtins
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from panda3d.core import ClockObject, Filename
+from panda3d.direct import DCFile, DCPacker
+from direct.distributed.PyDatagram import PyDatagram
+from direct.distributed.PyDatagramIterator import PyDatagramIterator
+
+# What the AI has around before the database interface is imported.
+globalClock = ClockObject.getGlobalClock()
+globalClock.setMode(ClockObject.MSlave)
+builtins.globalClock = globalClock
+
+from direct.task.TaskManagerGlobal import taskMgr
+
+from otp.astron import MsgTypes
+from otp.astron.AstronDatabaseInterface import AstronDatabaseInterface
+
+DC_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astron', 'dclass', 'ttap.dc'))
+FRAME_RATE = 60
+DATABASE_ID = 4003
+FIELD_NAMES = ('setName', 'setMaxHp')
+# How long the database takes to answer, in seconds.
+LATENCY = (0.001, 0.05)
+TIMEOUT = 5.0
+MAX_IN_FLIGHT = 8
+
+# name, objects, chance an object doesn't exist, chance its answer is lost, duplicate doIds given
+SCENARIOS = [
+    ('all answered', 500, 0.0, 0.0, 50),
+    ('some missing', 500, 0.1, 0.0, 0),
+    ('some lost', 500, 0.05, 0.01, 0),
+    ('every answer lost', 20, 0.0, 1.0, 0),
+    ('nothing to query', 0, 0.0, 0.0, 0),
+]
+
+
+class FakeMessageDirector:
+    """
+    Stands in for the AI's connection to Astron. Reads the database queries the AI sends and answers them the way
+    Astron's database would, later.
+    """
+
+    def __init__(self, dcFile: DCFile, rng: random.Random):
+        self.dcFile = dcFile
+        self.rng = rng
+        self.ourChannel = 401000000
+        self.dclassesByNumber = {dcFile.getClass(i).getNumber(): dcFile.getClass(i)
+                                 for i in range(dcFile.getNumClasses())}
+        self.dbInterface = AstronDatabaseInterface(self)
+        self.context = 0
+
+        self.missing = set()
+        self.lost = set()
+        self.queued = []
+        self.lostAnswers = []
+        self.inFlight = 0
+        self.maxInFlight = 0
+        self.queries = 0
+
+    def getContext(self):
+        self.context = (self.context + 1) & 0xFFFFFFFF
+        return self.context
+
+    def send(self, dg: PyDatagram):
+        di = PyDatagramIterator(dg)
+        di.getUint8()
+        channel = di.getUint64()
+        di.getUint64()
+        msgType = di.getUint16()
+        assert channel == DATABASE_ID and msgType == MsgTypes.DBSERVER_OBJECT_GET_FIELDS
+        ctx = di.getUint32()
+        doId = di.getUint32()
+        fieldIds = [di.getUint16() for _ in range(di.getUint16())]
+
+        self.queries += 1
+        self.inFlight += 1
+        self.maxInFlight = max(self.maxInFlight, self.inFlight)
+
+        answer = PyDatagram()
+        answer.addUint32(ctx)
+        if doId in self.missing:
+            answer.addUint8(0)
+        else:
+            answer.addUint8(1)
+            answer.addUint16(len(fieldIds))
+            packer = DCPacker()
+            for fieldId in fieldIds:
+                field = self.dcFile.getFieldByIndex(fieldId)
+                packer.rawPackUint16(fieldId)
+                packer.beginPack(field)
+                field.packArgs(packer, ['Toon %d' % doId] if field.getName() == 'setName' else [doId % 137])
+                packer.endPack()
+            answer.appendData(packer.getBytes())
+
+        if doId in self.lost:
+            self.lostAnswers.append(answer)
+        else:
+            self.queued.append((globalClock.getFrameTime() + self.rng.uniform(*LATENCY), answer))
+
+    def deliver(self, answers):
+        for answer in answers:
+            self.inFlight -= 1
+            self.dbInterface.handleQueryObjectResp(MsgTypes.DBSERVER_OBJECT_GET_FIELDS_RESP, PyDatagramIterator(answer))
+
+    def deliverDue(self):
+        now = globalClock.getFrameTime()
+        due = [answer for when, answer in self.queued if when <= now]
+        self.queued = [(when, answer) for when, answer in self.queued if when > now]
+        self.deliver(due)
+
+
+dcFile = DCFile()
+dcFile.read(Filename.fromOsSpecific(DC_FILE))
+dclass = dcFile.getClassByName('DistributedToon')
+rng = random.Random(0)
+now = 0.0
+failed = False
+
+print(f"Querying toons {MAX_IN_FLIGHT} at a time, the database answering in {LATENCY[0] * 1000:g}-"
+      f"{LATENCY[1] * 1000:g}ms, giving up after {TIMEOUT:g}s:")
+for name, numObjects, missingChance, lostChance, duplicates in SCENARIOS:
+    md = FakeMessageDirector(dcFile, rng)
+    doIds = [100_000_000 + i for i in range(numObjects)]
+    md.missing = {doId for doId in doIds if rng.random() < missingChance}
+    md.lost = {doId for doId in doIds if doId not in md.missing and rng.random() < lostChance}
+    given = doIds + rng.sample(doIds, duplicates)
+    rng.shuffle(given)
+
+    calls = []
+    start = now
+    md.dbInterface.queryObjects(DATABASE_ID, given, lambda results, failures: calls.append(
+        (globalClock.getFrameTime(), dict(results), list(failures), results, failures)), dclass=dclass, fieldNames=FIELD_NAMES,
+        maxInFlight=MAX_IN_FLIGHT, timeout=TIMEOUT)
+
+    while not calls and now - start < TIMEOUT * 2:
+        now += 1 / FRAME_RATE
+        globalClock.setFrameTime(now)
+        md.deliverDue()
+        taskMgr.step()
+
+    # The batch is over, so nothing should be left waiting on the database.
+    leftover = len(md.dbInterface._callbacks) + len(md.dbInterface._dclasses)
+
+    # Answers that finally turn up after the batch gave up must not change anything.
+    md.deliver(md.lostAnswers)
+    md.deliverDue()
+
+    problems = []
+    if len(calls) != 1:
+        problems.append(f"callback fired {len(calls)} times")
+    else:
+        finishedAt, results, failures, finalResults, finalFailures = calls[0]
+        if finalResults != results or finalFailures != failures:
+            problems.append("answers after the timeout changed the results")
+        if set(results) & set(failures) or len(failures) != len(set(failures)):
+            problems.append("objects both answered and failed, or failed twice")
+        if set(results) | set(failures) != set(doIds):
+            problems.append(f"{len(set(doIds) - set(results) - set(failures))} objects never reported")
+        if not md.lost and set(failures) != md.missing:
+            problems.append("failures aren't the missing objects")
+        if md.lost and not md.lost <= set(failures):
+            problems.append("lost objects weren't reported as failed")
+        if any(results[doId][1]['setName'] != ('Toon %d' % doId,) for doId in results):
+            problems.append("results don't match what the database sent")
+        if finishedAt - start > TIMEOUT + 2 / FRAME_RATE:
+            problems.append(f"callback fired {finishedAt - start:.2f}s in, after the timeout")
+    if leftover:
+        problems.append(f"{leftover} query contexts still waiting after the batch finished")
+    if md.maxInFlight > MAX_IN_FLIGHT:
+        problems.append(f"{md.maxInFlight} queries outstanding at once")
+
+    if calls:
+        finishedAt, results, failures = calls[0][:3]
+        print(f"  {name:<18} {len(given):>4} asked for, {md.queries:>4} queries, {len(results):>4} answered, "
+              f"{len(failures):>4} failed ({len(md.missing)} missing, {len(md.lost)} lost), done in "
+              f"{finishedAt - start:.2f}s, at most {md.maxInFlight} outstanding")
+    for problem in problems:
+        print(f"    {problem}")
+    failed |= bool(problems)
+
+if failed:
+    print("FAILED")
+    sys.exit(1)
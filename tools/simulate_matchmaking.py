@@ -0,0 +1,302 @@
+"""
+A script that runs a matchmaking queue offline against a simulated population, so the matchmaker can be tuned without
+a live district.
+
+Players come online following a load curve that ramps up to an evening peak and back down, and queue with a fresh
+skill profile. Every player has a true skill drawn around the starting rating that their hidden MMR has to find. The
+queue runs the same matching pass the matchmaker does on the mode's schedule, in simulated time. Match results are
+rolled from the players' true skills with ZeroSumEloModel.predict_win, the matches of each pass are rated in one batch
+with the mode's model, and players requeue after their game or log off. Players who wait too long give up and leave
+the queue.
+
+Reports queue wait percentiles, a histogram of match quality, CPU time per matching pass, and matches per minute.
+"""
+
+import argparse
+import builtins
+import heapq
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+# What AIStart sets up before anything on the AI is imported, so the matchmaker's defaults can be read.
+class game:
+    name = 'toontown'
+    process = 'server'
+
+
+builtins.game = game
+builtins.__dev__ = False
+
+from toontown.matchmaking.DistributedMatchmakerAI import DistributedMatchmakerAI
+from toontown.matchmaking.matchmaking_modes import DEFAULT_MATCHMAKING_MODE, MATCHMAKING_MODES
+from toontown.matchmaking.matchmaking_queue import MatchmakingQueue
+from toontown.matchmaking.player_skill_profile import PlayerSkillProfile
+from toontown.matchmaking.skill_globals import STARTING_RATING
+from toontown.matchmaking.skill_rating import rate_matches
+from toontown.matchmaking.skill_profile_keys import SkillProfileKey
+from toontown.matchmaking.zero_sum_elo_model import ZeroSumEloModel, ZeroSumEloRating
+
+# How spread out the true skill of the population is, and how much luck there is in a single game.
+SKILL_DEVIATION = 300
+OUTCOME_MODEL = ZeroSumEloModel(max_elo_discrepancy=400)
+
+# How long a game lasts, in seconds.
+MIN_GAME_LENGTH = 120
+MAX_GAME_LENGTH = 360
+
+# The chance a player queues again after their game instead of logging off.
+REQUEUE_CHANCE = 0.75
+
+# How long a player is willing to wait in the queue before giving up, in seconds.
+MIN_PATIENCE = 120
+MAX_PATIENCE = 600
+
+# How many arrivals a minute there are at the quietest point of the day, as a fraction of the peak.
+OFF_PEAK_LOAD = 0.15
+
+QUALITY_BUCKETS = 10
+HISTOGRAM_WIDTH = 50
+
+parser = argparse.ArgumentParser(description='Runs a matchmaking queue against a simulated population.')
+parser.add_argument('--mode', default=DEFAULT_MATCHMAKING_MODE.value,
+                    choices=[key.value for key in MATCHMAKING_MODES],
+                    help='The matchmaking mode to simulate.')
+parser.add_argument('--minutes', type=float, default=180,
+                    help='How many minutes of simulated time to run for.')
+parser.add_argument('--peak', type=float, default=30,
+                    help='How many players come online a minute at the peak of the load curve.')
+parser.add_argument('--flat', action='store_true',
+                    help='Have players come online at the peak rate the whole time instead of following the load curve.')
+parser.add_argument('--interval', type=float,
+                    help="How often the queue looks for matches, in seconds. Defaults to the mode's interval, or "
+                         "the matchmaker's MATCHMAKING_AGGRESSIVENESS.")
+parser.add_argument('--widening', type=int, default=DistributedMatchmakerAI.SKILL_RANGE_WIDENING,
+                    help="How much the skill range of everyone left waiting grows every pass. Defaults to the "
+                         "matchmaker's SKILL_RANGE_WIDENING.")
+parser.add_argument('--seed', type=int, default=0)
+args = parser.parse_args()
+
+
+class SimulatedToon:
+    """
+    The bare minimum of a DistributedToonAI that the queue needs to know about, along with how good they really are.
+    """
+
+    def __init__(self, avId: int, key: SkillProfileKey, true_skill: float):
+        self.avId = avId
+        self.profile = PlayerSkillProfile.create_fresh(avId, key.value)
+        self.true_skill = true_skill
+
+        # When this toon joined the queue and when they give up on it, in simulated seconds.
+        self.queued_at = 0.0
+        self.gives_up_at = 0.0
+
+    def getDoId(self) -> int:
+        return self.avId
+
+    def getName(self) -> str:
+        return f"Toon {self.avId}"
+
+    def getOrCreateSkillProfile(self, key: str) -> PlayerSkillProfile:
+        return self.profile
+
+
+class SimulationStats:
+
+    def __init__(self):
+        self.waits: list[float] = []
+        self.qualities: list[float] = []
+        self.pass_times: list[float] = []
+        self.matches = 0
+        self.arrivals = 0
+        self.gave_up = 0
+        # Matches made in every simulated minute.
+        self.matches_per_minute: list[int] = []
+        # The gap between the hidden MMR and the true skill of every player who got a game, as they joined it.
+        self.skill_errors: list[float] = []
+
+
+def get_arrival_rate(now: float) -> float:
+    """
+    How many players come online a second at the given point of the simulation. Ramps up to the peak halfway through
+    and back down again, like a day does.
+    """
+    peak = args.peak / 60
+    if args.flat:
+        return peak
+
+    progress = now / (args.minutes * 60)
+    load = OFF_PEAK_LOAD + (1 - OFF_PEAK_LOAD) * math.sin(math.pi * progress) ** 2
+    return peak * load
+
+
+def get_strength(player: SimulatedToon) -> float:
+    # How likely this player is to beat a player at the starting rating, as a Plackett-Luce strength.
+    win_chance = OUTCOME_MODEL.predict_win([[ZeroSumEloRating(mu=player.true_skill)],
+                                            [ZeroSumEloRating(mu=STARTING_RATING)]])[0]
+    return win_chance / (1 - win_chance)
+
+
+def roll_ranks(match: list[list[SimulatedToon]], rng: random.Random) -> list[int]:
+    """
+    Decides how a match went from the true skill of everyone in it. Returns the rank of every team, 1 being first.
+    Places are drawn from first to last, each going to a team with a chance proportional to its strength, which in a
+    1v1 is exactly the win chance ZeroSumEloModel.predict_win gives.
+    """
+    strengths = [sum(get_strength(player) for player in team) for team in match]
+    remaining = list(range(len(match)))
+    ranks = [0] * len(match)
+    for place in range(1, len(match) + 1):
+        pick = rng.uniform(0, sum(strengths[i] for i in remaining))
+        for i in remaining:
+            pick -= strengths[i]
+            if pick <= 0:
+                break
+        ranks[i] = place
+        remaining.remove(i)
+    return ranks
+
+
+def get_match_quality(queue: MatchmakingQueue, match) -> float:
+    """
+    How close a match is to everyone having the same chance to win, from 0 to 100. In a 1v1 this is the same thing
+    MatchmakingPlayer.determine_match_quality gives.
+    """
+    win_chances = queue.mode.get_model().predict_win([[player.rating for player in team] for team in match])
+    even = 1 / len(match)
+    return (1 - (max(win_chances) - even) / (1 - even)) * 100
+
+
+def rate_pass(queue: MatchmakingQueue, matches: list, ranks: list[list[int]]):
+    """
+    Updates everyone's hidden MMR with the results of the matches a pass made, the way the game does when each one ends.
+    Nobody is in two matches from the same pass, so they are all rated in one batch.
+    """
+    ratings = [[[(player.rating.mu, player.rating.sigma) for player in team] for team in match] for match in matches]
+    for match, new_match in zip(matches, rate_matches(queue.mode.get_model(), ratings, ranks)):
+        for team, new_team in zip(match, new_match):
+            for player, (mu, sigma) in zip(team, new_team):
+                player.avatar.profile.mu = int(mu)
+                player.avatar.profile.sigma = int(sigma)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def simulate(queue: MatchmakingQueue, interval: float, rng: random.Random) -> SimulationStats:
+    stats = SimulationStats()
+    end = args.minutes * 60
+    key = queue.key
+
+    # Everyone who has ever come online, and when the players in games are done with them.
+    toons: list[SimulatedToon] = []
+    returning: list[tuple[float, int, SimulatedToon]] = []
+    offline: list[SimulatedToon] = []
+
+    def enqueue(toon: SimulatedToon, now: float):
+        toon.queued_at = now
+        toon.gives_up_at = now + rng.uniform(MIN_PATIENCE, MAX_PATIENCE)
+        queue.add(toon)
+
+    now = 0.0
+    next_arrival = rng.expovariate(get_arrival_rate(0))
+    while now < end:
+        now += interval
+
+        # Players who come online, reusing ones who logged off earlier so the population's skill keeps improving.
+        while next_arrival <= now:
+            if offline and rng.random() < 0.5:
+                toon = offline.pop(rng.randrange(len(offline)))
+            else:
+                toon = SimulatedToon(len(toons), key, rng.gauss(STARTING_RATING, SKILL_DEVIATION))
+                toons.append(toon)
+            enqueue(toon, next_arrival)
+            stats.arrivals += 1
+            next_arrival += rng.expovariate(get_arrival_rate(next_arrival))
+
+        # Players whose game ended.
+        while returning and returning[0][0] <= now:
+            finished_at, _, toon = heapq.heappop(returning)
+            if rng.random() < REQUEUE_CHANCE:
+                enqueue(toon, finished_at)
+            else:
+                offline.append(toon)
+
+        # Players who got tired of waiting.
+        for player in [player for player in queue if player.avatar.gives_up_at <= now]:
+            queue.remove(player.avatar.getDoId())
+            offline.append(player.avatar)
+            stats.gave_up += 1
+
+        start = time.perf_counter()
+        matches = queue.run_matching_pass(args.widening)
+        stats.pass_times.append(time.perf_counter() - start)
+
+        minute = int((now - interval) // 60)
+        while len(stats.matches_per_minute) <= minute:
+            stats.matches_per_minute.append(0)
+        stats.matches_per_minute[minute] += len(matches)
+        stats.matches += len(matches)
+
+        ranks = []
+        for match in matches:
+            stats.qualities.append(get_match_quality(queue, match))
+            ranks.append(roll_ranks([[player.avatar for player in team] for team in match], rng))
+
+            finished_at = now + rng.uniform(MIN_GAME_LENGTH, MAX_GAME_LENGTH)
+            for team in match:
+                for player in team:
+                    stats.waits.append(now - player.avatar.queued_at)
+                    stats.skill_errors.append(abs(player.skill - player.avatar.true_skill))
+                    heapq.heappush(returning, (finished_at, player.avatar.getDoId(), player.avatar))
+        rate_pass(queue, matches, ranks)
+
+    return stats
+
+
+def print_report(stats: SimulationStats, queue: MatchmakingQueue, interval: float):
+    mode = queue.mode
+    print(f"{mode.key.value} ({mode.num_teams} players), {args.minutes:g} simulated minutes, "
+          f"matching every {interval:g}s, skill range +{args.widening} a pass, "
+          f"{'flat' if args.flat else 'peak'} load of {args.peak:g} players a minute:")
+    print(f"  {stats.arrivals} players came online, {stats.matches} matches made, {stats.gave_up} gave up waiting, "
+          f"{len(queue)} still queued at the end")
+
+    if stats.waits:
+        print(f"  wait:    p50 {percentile(stats.waits, 0.5):6.1f}s  p90 {percentile(stats.waits, 0.9):6.1f}s  "
+              f"p99 {percentile(stats.waits, 0.99):6.1f}s  max {max(stats.waits):6.1f}s")
+        print(f"  hidden MMR off from true skill by {statistics.median(stats.skill_errors):.0f} on median")
+
+    print(f"  cpu:     median {statistics.median(stats.pass_times) * 1000:.3f}ms  "
+          f"p99 {percentile(stats.pass_times, 0.99) * 1000:.3f}ms  max {max(stats.pass_times) * 1000:.3f}ms per pass")
+
+    minutes = stats.matches_per_minute
+    print(f"  matches: {stats.matches / args.minutes:.2f} a minute on average, {max(minutes)} in the busiest minute")
+
+    if not stats.qualities:
+        return
+
+    print(f"  quality: median {statistics.median(stats.qualities):.1f}")
+    counts = [0] * QUALITY_BUCKETS
+    for quality in stats.qualities:
+        counts[min(QUALITY_BUCKETS - 1, int(quality / (100 / QUALITY_BUCKETS)))] += 1
+    width = 100 // QUALITY_BUCKETS
+    for bucket, count in enumerate(counts):
+        bar = '#' * round(count / max(counts) * HISTOGRAM_WIDTH)
+        print(f"    {bucket * width:>3}-{bucket * width + width:<3} {count:>6}  {bar}")
+
+
+key = SkillProfileKey.from_value(args.mode)
+queue = MatchmakingQueue(MATCHMAKING_MODES[key])
+interval = args.interval or queue.mode.tick_interval or DistributedMatchmakerAI.MATCHMAKING_AGGRESSIVENESS
+stats = simulate(queue, interval, random.Random(args.seed))
+print_report(stats, queue, interval)
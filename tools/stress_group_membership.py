@@ -0,0 +1,199 @@
+"""
+A script that puts thousands of toons into hundreds of groups spread over a few group managers, churns them through
+joins, leaves, promotions and logouts, and checks after every round that the district's group membership index agrees
+with scanning every group. Also measures how long finding a toon's group takes with the index and with the scan it
+replaced. Exits with an error if the index ever disagrees with the groups.
+"""
+
+import builtins
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+# What AIStart sets up before anything on the AI is imported.
+class game:
+    name = 'toontown'
+    process = 'server'
+
+
+builtins.game = game
+builtins.__dev__ = False
+
+from panda3d.core import Filename
+from panda3d.direct import DCFile
+
+from toontown.groups.DistributedGroupAI import DistributedGroupAI
+from toontown.groups.DistributedGroupManagerAI import DistributedGroupManagerAI
+from toontown.groups.GroupMembershipIndexAI import GroupMembershipIndexAI
+
+DC_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astron', 'dclass', 'ttap.dc'))
+TOONS = 5000
+MANAGERS = 4
+GROUPS = 500
+ROUNDS = 10
+OPERATIONS_PER_ROUND = 2000
+LOOKUPS = 100_000
+
+
+class FakeToon:
+    """
+    The bare minimum of a DistributedToonAI that groups need to know about.
+    """
+
+    def __init__(self, avId: int):
+        self.avId = avId
+
+    def getDoId(self) -> int:
+        return self.avId
+
+
+class FakeAIRepository:
+    """
+    The bare minimum of the AI repository that groups and group managers need, without a connection to Astron.
+    """
+
+    def __init__(self):
+        self.groupMembership = GroupMembershipIndexAI()
+
+        # Distributed objects look their class up by name, with the AI suffix, just like the real repository has them.
+        self.dcFile = DCFile()
+        self.dcFile.read(Filename.fromOsSpecific(DC_FILE))
+        self.dclassesByName = {}
+        for i in range(self.dcFile.getNumClasses()):
+            dclass = self.dcFile.getClass(i)
+            self.dclassesByName[dclass.getName() + 'AI'] = dclass
+
+
+def scan_for_group(managers: list[DistributedGroupManagerAI], avId: int) -> DistributedGroupAI | None:
+    """
+    The old way of finding a toon's group, kept here for comparison.
+    """
+    for manager in managers:
+        for group in manager.groups:
+            if avId in group.getMemberIds():
+                return group
+    return None
+
+
+def create_group(air: FakeAIRepository, manager: DistributedGroupManagerAI, leader: FakeToon) -> DistributedGroupAI:
+    # What DistributedGroupManagerAI.createGroup does, minus generating the group.
+    group = DistributedGroupAI(air, leader)
+    manager.groups.add(group)
+    return group
+
+
+def delete_group(air: FakeAIRepository, manager: DistributedGroupManagerAI, group: DistributedGroupAI):
+    # What DistributedGroupManagerAI.deleteGroup does, minus asking Astron to delete the group.
+    manager.groups.discard(group)
+    air.groupMembership.removeGroup(group)
+
+
+def leave(air: FakeAIRepository, managers: list[DistributedGroupManagerAI], toon: FakeToon):
+    # What a kick, a toon leaving or a toon logging out does.
+    for manager in managers:
+        group = manager.getGroup(toon)
+        if group is None:
+            continue
+
+        group.removeMember(toon.getDoId())
+        group.setMembers(group.getMembers())
+        if group.getMemberCount() == 0:
+            delete_group(air, manager, group)
+
+
+def churn(air: FakeAIRepository, managers: list[DistributedGroupManagerAI], toons: list[FakeToon], rng: random.Random):
+    toon = rng.choice(toons)
+    roll = rng.random()
+    group = air.groupMembership.getGroup(toon.getDoId())
+
+    if roll < 0.4:
+        # Join someone else's group, or start a new one.
+        if group is not None:
+            return
+        other = rng.choice(toons)
+        otherGroup = air.groupMembership.getGroup(other.getDoId())
+        if otherGroup is None:
+            if other is not toon:
+                otherGroup = create_group(air, rng.choice(managers), other)
+                otherGroup.addMember(toon.getDoId())
+        elif not otherGroup.isFull():
+            otherGroup.addMember(toon.getDoId())
+    elif roll < 0.8:
+        leave(air, managers, toon)
+    elif group is not None and group.getMemberCount() > 1:
+        # Promote someone, which swaps two members around and sets the members again.
+        members = group.getMembers()
+        i, j = rng.sample(range(len(members)), 2)
+        members[i], members[j] = members[j], members[i]
+        group.setMembers(members)
+
+
+def check(air: FakeAIRepository, managers: list[DistributedGroupManagerAI], toons: list[FakeToon]) -> int:
+    mismatches = 0
+    for toon in toons:
+        if air.groupMembership.getGroup(toon.getDoId()) is not scan_for_group(managers, toon.getDoId()):
+            mismatches += 1
+    return mismatches
+
+
+rng = random.Random(0)
+air = FakeAIRepository()
+managers = [DistributedGroupManagerAI(air) for _ in range(MANAGERS)]
+toons = [FakeToon(100_000_000 + i) for i in range(TOONS)]
+
+# Fill the district up with lobbies.
+unplaced = list(toons)
+rng.shuffle(unplaced)
+for _ in range(GROUPS):
+    group = create_group(air, rng.choice(managers), unplaced.pop())
+    for _ in range(rng.randint(1, TOONS // GROUPS - 2)):
+        group.addMember(unplaced.pop().getDoId())
+
+print(f"{TOONS} toons, {air.groupMembership.getNumMembers()} of them in {air.groupMembership.getNumGroups()} groups "
+      f"over {MANAGERS} group managers")
+
+failed = False
+mismatches = check(air, managers, toons)
+for round in range(ROUNDS):
+    for _ in range(OPERATIONS_PER_ROUND):
+        churn(air, managers, toons, rng)
+    mismatches += check(air, managers, toons)
+print(f"  after {ROUNDS * OPERATIONS_PER_ROUND} joins, leaves and promotions: "
+      f"{air.groupMembership.getNumMembers()} toons in {air.groupMembership.getNumGroups()} groups, "
+      f"{mismatches} mismatches")
+failed |= mismatches > 0
+
+# Everyone logs out.
+for toon in toons:
+    leave(air, managers, toon)
+leftovers = air.groupMembership.getNumMembers() + air.groupMembership.getNumGroups() + sum(len(m.groups) for m in managers)
+print(f"  after everyone logs out: {leftovers} leftover toons and groups")
+failed |= leftovers > 0
+
+# Time lookups with the district full again.
+for _ in range(GROUPS):
+    churn(air, managers, toons, rng)
+for _ in range(OPERATIONS_PER_ROUND * ROUNDS):
+    churn(air, managers, toons, rng)
+lookups = [rng.choice(toons) for _ in range(LOOKUPS)]
+print(f"  {air.groupMembership.getNumMembers()} toons in {air.groupMembership.getNumGroups()} groups for lookups:")
+
+start = time.perf_counter()
+for toon in lookups[:LOOKUPS // 100]:
+    scan_for_group(managers, toon.getDoId())
+elapsed = time.perf_counter() - start
+print(f"    scan:   {elapsed / (LOOKUPS // 100) * 1_000_000:8.2f}us per lookup")
+
+start = time.perf_counter()
+for toon in lookups:
+    air.groupMembership.getGroup(toon.getDoId())
+elapsed = time.perf_counter() - start
+print(f"    index:  {elapsed / LOOKUPS * 1_000_000:8.2f}us per lookup")
+
+if failed:
+    print("FAILED")
+    sys.exit(1)
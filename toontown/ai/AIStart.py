@@ -104,3 +104,6 @@ except Exception as error:
                                  accId=simbase.air.getAccountIdFromSender(), exception=info)
     simbase.errorReportingService.report(error)
     raise
+finally:
+    # Make sure nothing is left waiting to be written to the event log.
+    simbase.air.eventLog.flushAllEvents()
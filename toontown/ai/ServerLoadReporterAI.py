@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+import time
+
+from direct.directnotify import DirectNotifyGlobal
+from direct.task import Task
+
+from toontown.minigame.craning.DistributedCraneGameAI import DistributedCraneGameAI
+
+
+class ServerLoadReporterAI:
+    """
+    Periodically writes how hard the AI is working to a file, one JSON object per line, so load tests running
+    against the district can see what their load did to it.
+
+    Every report covers the frames since the last one: the CPU time each frame took, how many datagrams we handled,
+    how much memory we are using and how many crane games are running. CPU time is used instead of wall time so the
+    time the AI sleeps between frames isn't counted.
+
+    Only created when want-load-report is set.
+    """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory('ServerLoadReporterAI')
+
+    def __init__(self, air, filename: str, interval: float = 5.0):
+        self.air = air
+        self.filename = filename
+        self.interval = interval
+
+        self.file = None
+        self.frameTimes: list[float] = []
+        self.lastFrameCpu = None
+        self.lastReportTime = None
+        self.lastNumDatagrams = 0
+
+    def start(self):
+        self.file = open(self.filename, 'a', buffering=1)
+        self.lastReportTime = time.monotonic()
+        self.lastNumDatagrams = self.air.numDatagramsHandled
+        # Runs before anything else every frame, so the time between two runs is one whole frame.
+        taskMgr.add(self.__measureFrame, 'load-report-frame', sort=-1000)
+        taskMgr.doMethodLater(self.interval, self.__writeReport, 'load-report-write')
+        self.notify.info(f'Writing load reports to {self.filename} every {self.interval} seconds.')
+
+    def stop(self):
+        taskMgr.remove('load-report-frame')
+        taskMgr.remove('load-report-write')
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __measureFrame(self, task):
+        now = time.process_time()
+        if self.lastFrameCpu is not None:
+            self.frameTimes.append(now - self.lastFrameCpu)
+        self.lastFrameCpu = now
+        return Task.cont
+
+    def __writeReport(self, task):
+        now = time.monotonic()
+        elapsed = now - self.lastReportTime
+        frameTimes = sorted(self.frameTimes)
+        numDatagrams = self.air.numDatagramsHandled
+
+        report = {
+            'time': time.time(),
+            'frames': len(frameTimes),
+            'tickMs': {
+                'mean': sum(frameTimes) / len(frameTimes) * 1000 if frameTimes else 0.0,
+                'p50': self.__getPercentile(frameTimes, 0.5) * 1000,
+                'p99': self.__getPercentile(frameTimes, 0.99) * 1000,
+                'max': frameTimes[-1] * 1000 if frameTimes else 0.0,
+            },
+            'datagramsPerSecond': (numDatagrams - self.lastNumDatagrams) / elapsed,
+            'rssBytes': self.__getMemoryUsage(),
+            'objects': len(self.air.doId2do),
+            'craneGames': sum(1 for do in self.air.doId2do.values() if isinstance(do, DistributedCraneGameAI)),
+        }
+        self.file.write(json.dumps(report) + '\n')
+
+        self.frameTimes = []
+        self.lastReportTime = now
+        self.lastNumDatagrams = numDatagrams
+        return Task.again
+
+    @staticmethod
+    def __getPercentile(values: list[float], fraction: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    @staticmethod
+    def __getMemoryUsage() -> int:
+        """
+        Returns how much memory we are using right now in bytes, or the most we have ever used if the platform
+        can't tell us the current amount, or 0 if it can't tell us either.
+        """
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except OSError:
+            pass
+
+        try:
+            import resource
+        except ImportError:
+            # Windows has neither.
+            return 0
+
+        # Linux reports this in kilobytes, macOS in bytes.
+        maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxRss if sys.platform == 'darwin' else maxRss * 1024
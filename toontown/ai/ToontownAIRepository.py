@@ -4,7 +4,8 @@ from typing import Dict
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.PyDatagram import *
 from panda3d.core import *
-from toontown.dna.DNAParser import loadDNAFileAI, DNAStorage, DNAGroup, DNAVisGroup
+from toontown.dna.DNAParser import DNAStorage, DNAGroup, DNAVisGroup
+from toontown.dna.DNACacheAI import loadDNAFileAI
 
 from otp.ai.AIZoneData import AIZoneDataStore
 from otp.ai.TimeManagerAI import TimeManagerAI
@@ -30,6 +31,7 @@ from toontown.distributed.ToontownDistrictStatsAI import ToontownDistrictStatsAI
 from toontown.distributed.ToontownInternalRepository import ToontownInternalRepository
 from toontown.estate.EstateManagerAI import EstateManagerAI
 from toontown.fishing.FishManagerAI import FishManagerAI
+from toontown.groups.GroupMembershipIndexAI import GroupMembershipIndexAI
 from toontown.hood import ZoneUtil
 from toontown.hood.BRHoodDataAI import BRHoodDataAI
 from toontown.hood.BossbotHQDataAI import BossbotHQDataAI
@@ -65,6 +67,7 @@ from toontown.toonbase import ToontownGlobals, TTLocalizer
 from toontown.tutorial.TutorialManagerAI import TutorialManagerAI
 from toontown.uberdog.DistributedInGameNewsMgrAI import DistributedInGameNewsMgrAI
 from toontown.uberdog.DistributedPartyManagerAI import DistributedPartyManagerAI
+from toontown.uberdog.TTOffChatManagerAI import TTOffChatManagerAI
 
 
 class ToontownAIRepository(ToontownInternalRepository):
@@ -120,7 +123,10 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.magicWordManager = None
         self.deliveryManager = None
         self.leaderboardManager: LeaderboardManagerAI | None = None
+        self.chatManager: TTOffChatManagerAI | None = None
         self.matchmaker: DistributedMatchmakerAI | None = None
+        self.groupMembership: GroupMembershipIndexAI | None = None
+        self.loadReporter = None
         self.archipelagoManager = None
         self.defaultAccessLevel = OTPGlobals.accessLevelValues.get('TTOFF_DEVELOPER')
 
@@ -190,6 +196,9 @@ class ToontownAIRepository(ToontownInternalRepository):
         # Create our minigame manager...
         self.minigameMgr = MinigameCreatorAI(self)
 
+        # Create our index of which group every toon is in...
+        self.groupMembership = GroupMembershipIndexAI()
+
         # Create our quest manager...
         self.questManager = QuestManagerAI(self)
 
@@ -224,6 +233,13 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.toontownTimeManager = ToontownTimeManager(serverTimeUponLogin=int(time.time()),
                                                        globalClockRealTimeUponLogin=globalClock.getRealTime())
 
+        # Create our load reporter, if load tests want one...
+        if self.config.GetBool('want-load-report', False):
+            from toontown.ai.ServerLoadReporterAI import ServerLoadReporterAI
+            self.loadReporter = ServerLoadReporterAI(self, self.config.GetString('load-report-file', 'ai-load.jsonl'),
+                                                     self.config.GetFloat('load-report-interval', 5.0))
+            self.loadReporter.start()
+
     def createGlobals(self):
         """
         Creates "global" objects.
@@ -301,6 +317,9 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.leaderboardManager = self.generateGlobalObject(OTP_DO_ID_LEADERBOARD_MANAGER,
                                                          'LeaderboardManager')
 
+        # Generate our chat manager...
+        self.chatManager = self.generateGlobalObject(OTP_DO_ID_CHAT_MANAGER, 'TTOffChatManager')
+
         # Generate our delivery manager...
         self.deliveryManager = self.generateGlobalObject(OTP_DO_ID_TOONTOWN_DELIVERY_MANAGER,
                                                          'DistributedDeliveryManager')
@@ -322,9 +341,6 @@ class ToontownAIRepository(ToontownInternalRepository):
         self.hoods.append(hood)
 
     def createZones(self):
-        # First, generate our zone2NpcDict...
-        NPCToons.generateZone2NpcDict()
-
         # Toontown Central
         self.zoneTable[ToontownGlobals.ToontownCentral] = (
             (ToontownGlobals.ToontownCentral, 1, 0), (ToontownGlobals.SillyStreet, 1, 1),
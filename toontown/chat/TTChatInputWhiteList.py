@@ -1,5 +1,5 @@
 from otp.chat.ChatInputWhiteListFrame import ChatInputWhiteListFrame
-from toontown.chat.TTWhiteList import TTWhiteList
+from toontown.chat.TTWhiteList import getWhiteList
 from direct.showbase import DirectObject
 from otp.otpbase import OTPGlobals
 import sys
@@ -33,7 +33,7 @@ class TTChatInputWhiteList(ChatInputWhiteListFrame):
          'text': '',
          'sortOrder': DGG.FOREGROUND_SORT_INDEX}
         ChatInputWhiteListFrame.__init__(self, entryOptions, parent, **kw)
-        self.whiteList = TTWhiteList()
+        self.whiteList = getWhiteList()
         base.whiteList = self.whiteList
         base.ttwl = self
         self.autoOff = 1
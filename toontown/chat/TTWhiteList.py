@@ -26,8 +26,7 @@ class TTWhiteList(WhiteList):
         if not found:
             self.notify.info("Couldn't find whitelist data file!")
         data = vfs.readFile(filename, 1)
-        lines = data.split(b'\n')
-        WhiteList.__init__(self, lines)
+        WhiteList.__init__(self, data)
         if self.WhitelistOverHttp:
             self.redownloadWhitelist()
         self.defaultWord = TTLocalizer.ChatGarblerDefault[0]
@@ -146,14 +145,20 @@ class TTWhiteList(WhiteList):
         if not localFilename.exists():
             return
         data = vfs.readFile(localFilename, 1)
-        lines = data.split('\n')
-        self.words = []
-        for line in lines:
-            self.words.append(line.strip('\n\r').lower())
-
-        self.words.sort()
-        self.numWords = len(self.words)
+        self.setWords(data)
         self.defaultWord = TTLocalizer.ChatGarblerDefault[0]
 
     def handleNewWhitelist(self):
         self.redownloadWhitelist()
+
+
+_whiteList = None
+
+def getWhiteList():
+    """
+    Returns the whitelist everything in this process shares, loading it the first time it is asked for.
+    """
+    global _whiteList
+    if _whiteList is None:
+        _whiteList = TTWhiteList()
+    return _whiteList
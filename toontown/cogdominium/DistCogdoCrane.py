@@ -8,6 +8,7 @@ from direct.distributed import DistributedObject
 from direct.showutil import Rope
 from direct.showbase import PythonUtil
 from direct.task import Task
+from toontown.coghq import CraneCableTelemetry
 from toontown.toonbase import ToontownGlobals
 from toontown.toonbase import TTLocalizer
 from otp.otpbase import OTPGlobals
@@ -66,6 +67,8 @@ class DistCogdoCrane(DistributedObject.DistributedObject, FSM.FSM):
         self.linkSmoothers = []
         self.smoothStarted = 0
         self.__broadcastPeriod = 0.2
+        self.cableState = None
+        self.cableEncoder = CraneCableTelemetry.CableStateEncoder(base.config.GetBool('want-crane-cable-deltas', 1))
         self.cable.node().setFinal(1)
         self.crane.setPos(*self.initialArmPosition)
         self.heldObject = None
@@ -725,6 +728,17 @@ class DistCogdoCrane(DistributedObject.DistributedObject, FSM.FSM):
             smoother.clearPositions(1)
 
     def setCablePos(self, changeSeq, y, h, links, timestamp):
+        self.cableState = CraneCableTelemetry.makeCableState(y, h, links)
+        self.__applyCablePos(changeSeq, y, h, links, timestamp)
+
+    def setCableDelta(self, changeSeq, mask, deltas, timestamp):
+        if self.cableState is None:
+            return
+        self.cableState = CraneCableTelemetry.applyCableDelta(self.cableState, mask, deltas)
+        y, h, links = CraneCableTelemetry.getCableState(self.cableState)
+        self.__applyCablePos(changeSeq, y, h, links, timestamp)
+
+    def __applyCablePos(self, changeSeq, y, h, links, timestamp):
         self.changeSeq = changeSeq
         if self.smoothStarted:
             now = globalClock.getFrameTime()
@@ -733,10 +747,10 @@ class DistCogdoCrane(DistributedObject.DistributedObject, FSM.FSM):
             self.armSmoother.setH(h)
             self.armSmoother.setTimestamp(local)
             self.armSmoother.markPosition()
+            linkPositions = CraneCableTelemetry.getLinkPositions(self.crane.getX(), self.crane.getZ(), y, h, links)
             for linkNum in range(self.numLinks):
                 smoother = self.linkSmoothers[linkNum]
-                lp = links[linkNum]
-                smoother.setPos(*lp)
+                smoother.setPos(linkPositions[linkNum])
                 smoother.setTimestamp(local)
                 smoother.markPosition()
 
@@ -745,18 +759,15 @@ class DistCogdoCrane(DistributedObject.DistributedObject, FSM.FSM):
             self.arm.setH(h)
 
     def d_sendCablePos(self):
-        timestamp = globalClockDelta.getFrameNetworkTime()
         links = []
         for linkNum in range(self.numLinks):
             an, anp, cnp = self.activeLinks[linkNum]
-            p = anp.getPos()
+            p = anp.getPos(self.crane)
             links.append((p[0], p[1], p[2]))
 
-        self.sendUpdate('setCablePos', [self.changeSeq,
-         self.crane.getY(),
-         self.arm.getH(),
-         links,
-         timestamp])
+        state = CraneCableTelemetry.makeCableState(self.crane.getY(), self.arm.getH(), links)
+        for fieldName, args, frameTime in self.cableEncoder.encode(self.changeSeq, state, globalClock.getFrameTime()):
+            self.sendUpdate(fieldName, args + [globalClockDelta.localToNetworkTime(frameTime)])
 
     def stopPosHprBroadcast(self):
         taskName = self.posHprBroadcastName
@@ -765,6 +776,7 @@ class DistCogdoCrane(DistributedObject.DistributedObject, FSM.FSM):
     def startPosHprBroadcast(self):
         taskName = self.posHprBroadcastName
         self.b_clearSmoothing()
+        self.cableEncoder.reset()
         self.d_sendCablePos()
         taskMgr.remove(taskName)
         taskMgr.doMethodLater(self.__broadcastPeriod, self.__posHprBroadcast, taskName)
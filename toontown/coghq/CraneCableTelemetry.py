@@ -0,0 +1,166 @@
+"""
+Packs where a crane's arm and cable are into whole hundredths, so that the crane's controller can broadcast only what
+changed since its last broadcast instead of the whole cable every time.
+
+A cable state is a tuple of ints: the crane's Y along the arm, the arm's H, then the X, Y and Z of every link relative
+to the crane. Links are kept relative to the crane because they mostly ride along with it; a cable hanging still under
+a moving crane doesn't change at all.
+
+Every so often, and whenever something moved too far for a delta, the controller sends a keyframe with the whole
+state in setCablePos. In between it sends setCableDelta with only the parts that changed. Once the crane stops moving
+it sends empty deltas until everyone's smoothers have caught up with where it stopped, and then nothing but the odd
+keyframe for anyone who just arrived.
+"""
+
+import math
+
+from panda3d.core import Mat3, Point3, Vec3
+
+# Where the crane's Y and the arm's H sit in a cable state. The links follow.
+Y = 0
+H = 1
+FIRST_LINK = 2
+
+# Cable positions go out as hundredths, so nothing finer is worth keeping.
+PRECISION = 100
+H_RANGE = 360 * PRECISION
+# Deltas go out as int8s, so anything that moved further than this since the last broadcast needs a keyframe.
+MAX_DELTA = 127
+# How often a keyframe goes out, in seconds, even if nothing moved.
+KEYFRAME_PERIOD = 1.0
+# How long to keep saying where the crane stopped. Smoothers run a little behind, and stall if they stop hearing about
+# the crane before they've caught up with it.
+STOP_TIME = 0.25
+
+
+def quantise(value: float) -> int:
+    # Rounds the same way the DC packer does, so a keyframe's values come back out of it exactly.
+    return math.floor(value * PRECISION + 0.5)
+
+
+def makeCableState(y: float, h: float, links) -> tuple[int, ...]:
+    """
+    Makes a cable state from the crane's Y, the arm's H and the position of every link relative to the crane.
+    """
+    state = [quantise(y), quantise(h) % H_RANGE]
+    for link in links:
+        state.extend(quantise(value) for value in link)
+    return tuple(state)
+
+
+def getCableState(state: tuple[int, ...]) -> tuple[float, float, list[tuple[float, float, float]]]:
+    """
+    Returns the crane's Y, the arm's H and the position of every link relative to the crane in a cable state.
+    """
+    values = [value / PRECISION for value in state]
+    links = [tuple(values[i:i + 3]) for i in range(FIRST_LINK, len(values), 3)]
+    return values[Y], values[H], links
+
+
+def diffCableStates(old: tuple[int, ...], new: tuple[int, ...]) -> tuple[int, list[int]] | None:
+    """
+    Returns a mask of which parts of the cable state changed and how far each of them moved, or None if any of them
+    moved too far to fit in a delta.
+    """
+    mask = 0
+    deltas = []
+    for i, (oldValue, newValue) in enumerate(zip(old, new)):
+        if oldValue == newValue:
+            continue
+
+        delta = newValue - oldValue
+        if i == H:
+            # The short way around.
+            delta = (delta + H_RANGE // 2) % H_RANGE - H_RANGE // 2
+        if not -MAX_DELTA <= delta <= MAX_DELTA:
+            return None
+
+        mask |= 1 << i
+        deltas.append(delta)
+
+    return mask, deltas
+
+
+def applyCableDelta(state: tuple[int, ...], mask: int, deltas) -> tuple[int, ...]:
+    """
+    Returns the cable state after moving the parts in mask by deltas.
+    """
+    state = list(state)
+    deltas = iter(deltas)
+    for i in range(len(state)):
+        if mask & 1 << i:
+            state[i] += next(deltas)
+
+    state[H] %= H_RANGE
+    return tuple(state)
+
+
+def getLinkPositions(craneX: float, craneZ: float, y: float, h: float, links) -> list[Point3]:
+    """
+    Returns where links relative to the crane are relative to the hinge, with the crane at Y along an arm turned to H.
+    """
+    rotate = Mat3.rotateMat(h, Vec3.up())
+    return [Point3(rotate.xform(Vec3(craneX + x, y + linkY, craneZ + z))) for x, linkY, z in links]
+
+
+class CableStateEncoder:
+    """
+    Decides what the crane's controller broadcasts each time it sends where the cable is.
+    """
+
+    def __init__(self, wantDeltas: bool = True, keyframePeriod: float = KEYFRAME_PERIOD):
+        self.wantDeltas = wantDeltas
+        self.keyframePeriod = keyframePeriod
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets what was last broadcast, so the next broadcast is a keyframe.
+        """
+        self.lastState = None
+        self.lastChangeSeq = None
+        self.lastKeyframe = 0.0
+        self.stillSince = 0.0
+        # When we were last asked, and whether we sent anything then.
+        self.lastTime = 0.0
+        self.suppressed = False
+
+    def encode(self, changeSeq: int, state: tuple[int, ...], now: float) -> list[tuple[str, list, float]]:
+        """
+        Returns every field to broadcast, with its arguments less the timestamp and the time to stamp it with.
+        """
+        updates = []
+        unchanged = state == self.lastState and changeSeq == self.lastChangeSeq
+        if not unchanged and self.suppressed:
+            # The smoothers last heard where the crane stopped a while ago, and would start moving it from there as
+            # soon as they did. It was still there a moment ago, so say so before saying it moved.
+            updates.append(('setCableDelta', [self.lastChangeSeq, 0, []], self.lastTime))
+
+        if not self.wantDeltas or self.lastState is None or now - self.lastKeyframe >= self.keyframePeriod:
+            updates.append(self.__keyframe(changeSeq, state, now, unchanged))
+        elif unchanged:
+            if now - self.stillSince < STOP_TIME:
+                updates.append(('setCableDelta', [changeSeq, 0, []], now))
+        else:
+            diff = diffCableStates(self.lastState, state)
+            if diff is None:
+                updates.append(self.__keyframe(changeSeq, state, now, unchanged))
+            else:
+                self.lastState = state
+                self.lastChangeSeq = changeSeq
+                self.stillSince = now
+                mask, deltas = diff
+                updates.append(('setCableDelta', [changeSeq, mask, deltas], now))
+
+        self.lastTime = now
+        self.suppressed = not updates
+        return updates
+
+    def __keyframe(self, changeSeq: int, state: tuple[int, ...], now: float, unchanged: bool) -> tuple[str, list, float]:
+        self.lastState = state
+        self.lastChangeSeq = changeSeq
+        self.lastKeyframe = now
+        if not unchanged:
+            self.stillSince = now
+        y, h, links = getCableState(state)
+        return 'setCablePos', [changeSeq, y, h, links], now
@@ -11,6 +11,7 @@ from direct.distributed import DistributedObject
 from direct.showutil import Rope
 from direct.showbase import PythonUtil
 from direct.task import Task
+from toontown.coghq import CraneCableTelemetry
 from toontown.coghq import CraneLeagueGlobals
 from toontown.toonbase import ToontownGlobals
 from toontown.toonbase import TTLocalizer
@@ -107,6 +108,11 @@ class DistributedCashbotBossCrane(DistributedObject.DistributedObject, FSM.FSM):
         self.smoothStarted = 0
         self.__broadcastPeriod = 0.01568
 
+        # What our controller last told us the cable looks like, for their deltas to apply to, and what we last told
+        # everyone else when we're the controller.
+        self.cableState = None
+        self.cableEncoder = CraneCableTelemetry.CableStateEncoder(base.config.GetBool('want-crane-cable-deltas', 1))
+
         # Since the cable might not calculate its bounding volume
         # correctly, let's say that anything that passes the outer
         # bounding volume passes everything.
@@ -1140,23 +1146,36 @@ class DistributedCashbotBossCrane(DistributedObject.DistributedObject, FSM.FSM):
             smoother.clearPositions(1)
 
     def setCablePos(self, changeSeq, y, h, links, timestamp):
+        # A keyframe, with every link relative to the crane.
+        if len(links) > self.numLinks:
+            self.notify.warning('Links passed in is greater than total number of links')
+            return
+        self.cableState = CraneCableTelemetry.makeCableState(y, h, links)
+        self.__applyCablePos(changeSeq, y, h, links, timestamp)
+
+    def setCableDelta(self, changeSeq, mask, deltas, timestamp):
+        # Only what changed since the last broadcast. Without a keyframe to apply it to, we have to wait for the next.
+        if self.cableState is None:
+            return
+        self.cableState = CraneCableTelemetry.applyCableDelta(self.cableState, mask, deltas)
+        y, h, links = CraneCableTelemetry.getCableState(self.cableState)
+        self.__applyCablePos(changeSeq, y, h, links, timestamp)
+
+    def __applyCablePos(self, changeSeq, y, h, links, timestamp):
         h -= self.armMaxH  # can't send negative numbers over an update, get real value
 
         self.changeSeq = changeSeq
         if self.smoothStarted:
-            if len(links) > self.numLinks:
-                self.notify.warning('Links passed in is greater than total number of links')
-                return
             now = globalClock.getFrameTime()
             local = globalClockDelta.networkToLocalTime(timestamp, now)
             self.armSmoother.setY(y)
             self.armSmoother.setH(h)
             self.armSmoother.setTimestamp(local)
             self.armSmoother.markPosition()
+            linkPositions = CraneCableTelemetry.getLinkPositions(self.crane.getX(), self.crane.getZ(), y, h, links)
             for linkNum in range(self.numLinks):
                 smoother = self.linkSmoothers[linkNum]
-                lp = links[linkNum]
-                smoother.setPos(*lp)
+                smoother.setPos(linkPositions[linkNum])
                 smoother.setTimestamp(local)
                 smoother.markPosition()
 
@@ -1165,18 +1184,19 @@ class DistributedCashbotBossCrane(DistributedObject.DistributedObject, FSM.FSM):
             self.arm.setH(h)
 
     def d_sendCablePos(self):
-        timestamp = globalClockDelta.getFrameNetworkTime()
         links = []
         for linkNum in range(self.numLinks):
             an, anp, cnp = self.activeLinks[linkNum]
-            p = anp.getPos()
+            p = anp.getPos(self.crane)
             links.append((p[0], p[1], p[2]))
 
-        self.sendUpdate('setCablePos', [self.changeSeq,
-         self.crane.getY(),
-         self.arm.getH()+self.armMaxH,  # don't let this number go negative, can't send negative # over an update
-         links,
-         timestamp])
+        state = CraneCableTelemetry.makeCableState(
+            self.crane.getY(),
+            self.arm.getH()+self.armMaxH,  # don't let this number go negative, can't send negative # over an update
+            links)
+        # Nothing goes out once the crane has been standing still for a moment.
+        for fieldName, args, frameTime in self.cableEncoder.encode(self.changeSeq, state, globalClock.getFrameTime()):
+            self.sendUpdate(fieldName, args + [globalClockDelta.localToNetworkTime(frameTime)])
 
     def stopPosHprBroadcast(self):
         taskName = self.posHprBroadcastName
@@ -1187,6 +1207,7 @@ class DistributedCashbotBossCrane(DistributedObject.DistributedObject, FSM.FSM):
         
         # Broadcast our initial position
         self.b_clearSmoothing()
+        self.cableEncoder.reset()
         self.d_sendCablePos()
         
         # remove any old tasks
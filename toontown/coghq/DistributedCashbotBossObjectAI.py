@@ -1,5 +1,6 @@
 from panda3d.core import *
 from direct.distributed import DistributedSmoothNodeAI
+from direct.distributed.ClockDelta import globalClockDelta
 from toontown.coghq import DistributedCashbotBossCraneAI
 from toontown.toonbase import ToontownGlobals
 from otp.otpbase import OTPGlobals
@@ -40,6 +41,66 @@ class DistributedCashbotBossObjectAI(DistributedSmoothNodeAI.DistributedSmoothNo
         self.cleanup()
         DistributedSmoothNodeAI.DistributedSmoothNodeAI.delete(self)
 
+    ### Position updates ###
+
+    # The client controlling a falling object broadcasts where it is. These are passed on to the crane game, so it
+    # can check the hits that client reports. Moves made by the AI itself have no timestamp and aren't recorded.
+
+    def setSmZ(self, z, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmZ(self, z, t)
+        self.recordMotion(t)
+
+    def setSmXY(self, x, y, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmXY(self, x, y, t)
+        self.recordMotion(t)
+
+    def setSmXZ(self, x, z, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmXZ(self, x, z, t)
+        self.recordMotion(t)
+
+    def setSmPos(self, x, y, z, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmPos(self, x, y, z, t)
+        self.recordMotion(t)
+
+    def setSmXYH(self, x, y, h, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmXYH(self, x, y, h, t)
+        self.recordMotion(t)
+
+    def setSmXYZH(self, x, y, z, h, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmXYZH(self, x, y, z, h, t)
+        self.recordMotion(t)
+
+    def setSmPosHpr(self, x, y, z, h, p, r, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmPosHpr(self, x, y, z, h, p, r, t)
+        self.recordMotion(t)
+
+    def setSmPosHprL(self, l, x, y, z, h, p, r, t=None):
+        DistributedSmoothNodeAI.DistributedSmoothNodeAI.setSmPosHprL(self, l, x, y, z, h, p, r, t)
+        self.recordMotion(t)
+
+    def getHitValidator(self):
+        # Only the crane game checks the hits its clients report.
+        return getattr(self.boss, 'hitValidator', None)
+
+    def recordMotion(self, timestamp):
+        if timestamp is None:
+            return
+
+        validator = self.getHitValidator()
+        if validator is None:
+            return
+
+        now = globalClock.getFrameTime()
+        pos = self.getPos()
+        validator.recordMotion(self.doId, globalClockDelta.networkToLocalTime(timestamp, now, bits=16), now,
+                               pos[0], pos[1], pos[2])
+
+    def isHitPlausible(self, avId, impact, craneId):
+        # Returns False if the crane game decided a hit we were told about can't have happened.
+        if self.getHitValidator() is None:
+            return True
+        return self.boss.checkReportedHit(self, avId, impact, craneId)
+
     def startWaitFree(self, delayTime):
         # Waits a certain amount of time, then automatically
         # transitions to 'Free' state.  The amount of time to wait
@@ -162,6 +223,9 @@ class DistributedCashbotBossObjectAI(DistributedSmoothNodeAI.DistributedSmoothNo
     def enterGrabbed(self, avId, craneId):
         self.avId = avId
         self.craneId = craneId
+        validator = self.getHitValidator()
+        if validator is not None:
+            validator.objectGrabbed(self.doId, avId, craneId)
         self.__setCraneObject(self.craneId, self.doId)
         self.d_setObjectState('G', avId, craneId)
 
@@ -215,6 +279,10 @@ class DistributedCashbotBossObjectAI(DistributedSmoothNodeAI.DistributedSmoothNo
         if not self.isEmpty():
             self.detachNode()
         self.stopWaitFree()
+
+        validator = self.getHitValidator()
+        if validator is not None:
+            validator.forgetObject(self.doId)
         
         # Break circular reference to boss
         if hasattr(self, 'boss'):
@@ -6,7 +6,9 @@ from toontown.coghq.DistributedCashbotBossSideCraneAI import DistributedCashbotB
 from toontown.toonbase import ToontownGlobals
 from otp.otpbase import OTPGlobals
 from . import DistributedCashbotBossObjectAI
+from toontown.minigame.craning import SafeBroadphase
 from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect, SYNERGY_EFFECTS, STATUS_EFFECT_DURATIONS
+from toontown.minigame.statuseffects.StatusEffectScheduler import StatusEffectScheduler
 import math
 import time
 
@@ -31,19 +33,15 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
         
         # A sphere so goons will see and avoid us.
         self.collisionNode = CollisionNode('safe')
-        self.collisionNode.addSolid(CollisionSphere(0, 0, 0, 6))
+        self.collisionNode.addSolid(CollisionSphere(0, 0, 0, SafeBroadphase.SAFE_RADIUS))
         self.collisionNode.setIntoCollideMask(ToontownGlobals.CashbotBossObjectBitmask)
         self.collisionNodePath = self.attachNewNode(self.collisionNode)
         
         # A sphere so safes will see and push us when needed.
         self.safeToSafeNode = CollisionNode('safe-to-safe')
-        self.safeToSafeNode.addSolid(CollisionSphere(0, 0, 0, 8))
+        self.safeToSafeNode.addSolid(CollisionSphere(0, 0, 0, SafeBroadphase.SAFE_TO_SAFE_RADIUS))
         self.safeToSafeNode.setIntoCollideMask(ToontownGlobals.CashbotBossObjectBitmask)
         self.safeToSafeNodePath = self.attachNewNode(self.safeToSafeNode)
-  
-        self.cTrav = CollisionTraverser('safe')
-        self.cQueue = CollisionHandlerQueue()
-        self.cTrav.addCollider(self.safeToSafeNodePath, self.cQueue)
 
         self._statusEffectTasks = []
 
@@ -133,8 +131,8 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
                 self.boss.statusEffectSystem.b_applyStatusEffect(targetId, synergy, triggeringAvId)
                 
                 duration = STATUS_EFFECT_DURATIONS.get(synergy, 5.0)
-                taskName = self.uniqueName(f'remove-effect-{targetId}-{synergy.value}-{self.doId}-{int(time.time() * 1000)}')
-                taskMgr.doMethodLater(duration, self.__handleStatusEffectTimeout, taskName, extraArgs=[targetId, synergy])
+                timer = self.boss.statusEffectSystem.schedule(duration, self.__handleStatusEffectTimeout, targetId, synergy)
+                self._statusEffectTasks.append(timer)
                 return True
         return False
         
@@ -148,18 +146,16 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
         
         bossId = self.boss.getBoss().doId
         self.boss.statusEffectSystem.b_applyStatusEffect(bossId, effect, appliedByAvId)
-        taskName = self.uniqueName(f'remove-effect-{bossId}-{effect.value}-{self.doId}-{int(time.time() * 1000)}')
 
         if self.checkForSynergy(bossId, appliedByAvId):
             return
 
         # Get duration from globals instead of hardcoded 5.0
-        from toontown.minigame.statuseffects.StatusEffectGlobals import STATUS_EFFECT_DURATIONS
         duration = STATUS_EFFECT_DURATIONS.get(effect, 5.0)
         
-        # Create and track the task
-        task = taskMgr.doMethodLater(duration, self.__handleStatusEffectTimeout, taskName, extraArgs=[bossId, effect])
-        self._statusEffectTasks.append(taskName)
+        # Create and track the timer
+        timer = self.boss.statusEffectSystem.schedule(duration, self.__handleStatusEffectTimeout, bossId, effect)
+        self._statusEffectTasks.append(timer)
 
     def hitBoss(self, impact, craneId):
         avId = self.air.getAvatarIdFromSender()
@@ -171,6 +167,9 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
             
         if self.state != 'Dropped' and self.state != 'Grabbed':
             return
+
+        if not self.isHitPlausible(avId, impact, craneId):
+            return
         
         damageMultiplier = 0.0
         effects = self.boss.statusEffectSystem.getStatusEffects(self.doId)
@@ -290,22 +289,11 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
     def __checkSafeCollisions(self, goon, pushed_safes=None):
         if pushed_safes is None:
             pushed_safes = set()
-            
-        self.cTrav.traverse(self.boss.scene)
-        
-        for i in range(self.cQueue.getNumEntries()):
-            entry = self.cQueue.getEntry(i)
-            intoNodePath = entry.getIntoNodePath()
-            intoNode = intoNodePath.node()
-            fromNode = entry.getFromNode()
-
-            if 'safe-to-safe' in intoNode.getName() and 'safe-to-safe' in fromNode.getName():
-                safeDoIdTag = intoNodePath.getNetTag('doId')
-                if safeDoIdTag:
-                    safeDoId = int(safeDoIdTag)
-                    safe = self.air.doId2do.get(safeDoId)
-                    if safe and safe.state in ['Sliding Floor', 'Free']:
-                        self._pushSafe(safe, goon, pushed_safes)
+
+        # Any safe whose safe-to-safe sphere overlaps ours gets pushed along with us.
+        for safe, _ in self.boss.safeBroadphase.getSafesNear(self.getPos(), SafeBroadphase.SAFE_TO_SAFE_RADIUS * 2):
+            if safe is not self and safe.state in ['Sliding Floor', 'Free']:
+                self._pushSafe(safe, goon, pushed_safes)
 
     ### FSM States ###
 
@@ -367,6 +355,7 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
         # Update the safe's position and heading
         self.setSmPosHpr(x, y, z, rotation, 0, 0)
         self.sendUpdate('move', [x, y, z, rotation])
+        self.boss.safeBroadphase.update(self)
         
         # Only check for secondary collisions if being pushed by a goon
         # This prevents safe-to-safe pushes from triggering more collisions
@@ -380,21 +369,15 @@ class DistributedCashbotBossSafeAI(DistributedCashbotBossObjectAI.DistributedCas
 
     def cleanup(self):
         """Clean up collision system and node paths to prevent memory leaks"""
-        # Clean up status effect timeout tasks
-        for taskName in self._statusEffectTasks:
-            try:
-                taskMgr.remove(taskName)
-            except:
-                pass
+        # Clean up status effect timeout timers
+        for timer in self._statusEffectTasks:
+            StatusEffectScheduler.cancel(timer)
         self._statusEffectTasks.clear()
         
-        # Clean up collision system
-        if hasattr(self, 'cTrav') and self.cTrav:
-            self.cTrav.clearColliders()
-            del self.cTrav
-        if hasattr(self, 'cQueue') and self.cQueue:
-            del self.cQueue
-        
+        # Stop being pushed around
+        if getattr(self, 'boss', None) is not None and hasattr(self, 'doId'):
+            self.boss.safeBroadphase.remove(self)
+
         # Clean up collision node paths - check both existence and not None
         if hasattr(self, 'collisionNodePath') and self.collisionNodePath is not None:
             self.collisionNodePath.removeNode()
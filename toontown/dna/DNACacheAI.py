@@ -0,0 +1,249 @@
+"""
+A cache of preparsed DNA for the AI.
+
+Every district used to decompress and parse every street and playground DNA file at boot, building the full
+component tree and loading every texture and font it mentions, only to read a handful of things back out of it.
+Instead, the first time the AI loads a DNA file, the parts it actually uses are pulled out into a compact index:
+blocks, suit points and edges, vis groups (with their suit edges, visibles and battle cells) and the component tree
+without the purely visual components (flat buildings, walls, windows, cornices, signs, doors and streets).
+
+Indexes are kept in memory, so loading the same file twice (a street is loaded by both its hood and its suit planner)
+only builds fresh objects, and are written to dna-ai-cache-dir keyed by the hash of the compiled DNA, so every other
+district on the host (and every later boot) can skip parsing entirely until the DNA changes.
+"""
+
+import hashlib
+import marshal
+import os
+
+from direct.directnotify import DirectNotifyGlobal
+from panda3d.core import ConfigVariableString, LPoint3f, LVector3f
+
+from toontown.dna import DNABattleCell
+from toontown.dna import DNALoader
+from toontown.dna import DNAStorage
+from toontown.dna import DNASuitPoint
+from toontown.dna import DNAVisGroup
+
+notify = DirectNotifyGlobal.directNotify.newCategory('DNACacheAI')
+
+# Bump this whenever the layout of an index changes, so old cache files are ignored.
+INDEX_VERSION = 1
+
+# Components that only matter for rendering. These, and everything underneath them, are left out of the index.
+# Sign (5), SignBaseline (6), SignText (7), SignGraphic (8), FlatBuilding (9), Wall (10), Windows (11), Cornice (12),
+# Door (17), FlatDoor (18) and Street (19). Blocks come from the storage data, not from the buildings themselves.
+skippedComps = (5, 6, 7, 8, 9, 10, 11, 12, 17, 18, 19)
+
+compCodeTable = {cls: code for code, cls in DNALoader.compClassTable.items()}
+
+# Attributes that are stored separately from the rest of a component's fields.
+treeAttributes = ('name', 'children', 'parent', 'visGroup', 'visibles', 'suitEdges', 'battleCells', 'pos', 'hpr', 'scale')
+
+# {DNA file name: index} of everything loaded by this process.
+indexes = {}
+
+
+class UnindexableDNA(Exception):
+    """
+    Raised when a DNA file has something an index can't faithfully rebuild. These files are loaded in full instead.
+    """
+
+
+def loadDNAFileAI(dnaStorage, file):
+    """
+    A drop in replacement for DNAParser.loadDNAFileAI, which fills in dnaStorage and returns the root of the
+    component tree, without any of the components the AI never looks at.
+    """
+    index = indexes.get(file)
+    if index is None:
+        index = getIndex(file)
+        indexes[file] = index
+
+    if index is None:
+        loader = DNALoader.DNALoader(loadAssets=False)
+        data = loader.loadDNAFileAI(dnaStorage, file)
+        loader.destroy()
+        return data
+
+    return loadIndex(dnaStorage, index)
+
+
+def getCacheFilename(file, dnaData):
+    cacheDir = ConfigVariableString('dna-ai-cache-dir', 'dna_cache').getValue()
+    if not cacheDir:
+        return None
+
+    name = os.path.splitext(os.path.basename(file))[0]
+    return os.path.join(cacheDir, '%s-%s.aidna' % (name, hashlib.sha1(dnaData).hexdigest()))
+
+
+def getIndex(file):
+    """
+    Returns the index of a DNA file, reading it from the cache if we can and building it otherwise.
+    Returns None if the file can't be indexed.
+    """
+    loader = DNALoader.DNALoader(loadAssets=False)
+    dnaData = loader.readDNAFile(file)
+    cacheFilename = getCacheFilename(file, dnaData)
+
+    if cacheFilename and os.path.exists(cacheFilename):
+        try:
+            with open(cacheFilename, 'rb') as f:
+                index = marshal.load(f)
+            if index[0] == INDEX_VERSION:
+                loader.destroy()
+                return index
+        except (OSError, EOFError, ValueError, TypeError, IndexError) as e:
+            notify.warning('Ignoring unreadable DNA cache file %s: %s' % (cacheFilename, e))
+
+    store = DNAStorage.DNAStorage()
+    loader.loadDNAData(store, dnaData)
+    root = loader.curComp
+    loader.destroy()
+
+    try:
+        index = buildIndex(store, root)
+    except UnindexableDNA as e:
+        notify.warning('Loading %s in full, it cannot be indexed: %s' % (file, e))
+        return None
+
+    if cacheFilename:
+        # Write to a temporary file first, so a district booting alongside us never reads half an index.
+        tempFilename = '%s.%s.tmp' % (cacheFilename, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(cacheFilename) or '.', exist_ok=True)
+            with open(tempFilename, 'wb') as f:
+                marshal.dump(index, f)
+            os.replace(tempFilename, cacheFilename)
+        except OSError as e:
+            notify.warning('Failed to write DNA cache file %s: %s' % (cacheFilename, e))
+
+    return index
+
+
+def getCompFields(comp):
+    """
+    Returns every plain field of a component (such as its code, title or cell ID) that isn't part of the tree.
+    """
+    fields = {}
+    for cls in type(comp).__mro__:
+        slots = getattr(cls, '__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+
+        for slot in slots:
+            if slot in treeAttributes or slot in fields or not hasattr(comp, slot):
+                continue
+
+            value = getattr(comp, slot)
+            if isinstance(value, (bool, int, float, str)):
+                fields[slot] = value
+
+    return fields
+
+
+def buildIndex(store, root):
+    """
+    Flattens a loaded DNA file into plain tuples that can be marshalled:
+    (version, blocks, suit points, suit edges, components)
+    Components are listed parents first, each one as (comp code, parent position, name, data).
+    """
+    blocks = tuple(
+        (blockNumber, store.blockZones[blockNumber], store.blockTitles[blockNumber],
+         store.blockArticles[blockNumber], store.blockBuildingTypes[blockNumber])
+        for blockNumber in store.blockNumbers
+    )
+
+    suitPoints = tuple(
+        (point.index, point.pointType, point.pos[0], point.pos[1], point.pos[2], point.landmarkBuildingIndex)
+        for point in store.suitPoints
+    )
+
+    suitEdges = []
+    for startIndex, edges in store.suitEdges.items():
+        for edge in edges:
+            if edge.getEndPoint() is None:
+                raise UnindexableDNA('suit edge from %s leads to an unknown point' % startIndex)
+            suitEdges.append((startIndex, edge.getEndPoint().getIndex(), edge.getZoneId()))
+
+    comps = []
+    if root is not None:
+        stack = [(root, -1)]
+        while stack:
+            comp, parentIndex = stack.pop()
+            code = compCodeTable.get(type(comp))
+            if code is None:
+                raise UnindexableDNA('unknown component %s' % type(comp).__name__)
+            if code in skippedComps:
+                continue
+
+            if isinstance(comp, DNAVisGroup.DNAVisGroup):
+                visEdges = []
+                for edge in comp.suitEdges:
+                    if edge is None or edge.getStartPoint() is None:
+                        raise UnindexableDNA('vis group %s has an unknown suit edge' % comp.getName())
+                    visEdges.append((edge.getStartPoint().getIndex(), edge.getEndPoint().getIndex()))
+
+                battleCells = tuple(
+                    (cell.width, cell.height, cell.pos[0], cell.pos[1], cell.pos[2]) for cell in comp.battleCells
+                )
+                data = (tuple(visEdges), tuple(comp.visibles), battleCells)
+            elif hasattr(comp, 'pos'):
+                data = (tuple(comp.pos), tuple(comp.hpr), tuple(comp.scale), getCompFields(comp))
+            else:
+                data = None
+
+            comps.append((code, parentIndex, comp.name, data))
+
+            # Children are pushed in reverse, so they come back out (and are rebuilt) in their original order.
+            compIndex = len(comps) - 1
+            stack.extend((child, compIndex) for child in reversed(comp.children))
+
+    return INDEX_VERSION, blocks, tuple(suitPoints), tuple(suitEdges), tuple(comps)
+
+
+def loadIndex(store, index):
+    """
+    Fills in a DNAStorage and rebuilds the component tree from an index. Returns the root component.
+    """
+    _, blocks, suitPoints, suitEdges, comps = index
+
+    for blockNumber, zoneId, title, article, buildingType in blocks:
+        store.storeBlock(blockNumber, title, article, buildingType, zoneId)
+
+    for pointIndex, pointType, x, y, z, landmarkBuildingIndex in suitPoints:
+        store.storeSuitPoint(DNASuitPoint.DNASuitPoint(pointIndex, pointType, LPoint3f(x, y, z), landmarkBuildingIndex))
+
+    for startIndex, endIndex, zoneId in suitEdges:
+        store.storeSuitEdge(startIndex, endIndex, zoneId)
+
+    built = []
+    for code, parentIndex, name, data in comps:
+        comp = DNALoader.compClassTable[code](name)
+        if code == DNAVisGroup.DNAVisGroup.COMPONENT_CODE:
+            visEdges, visibles, battleCells = data
+            for startIndex, endIndex in visEdges:
+                comp.addSuitEdge(store.getSuitEdge(startIndex, endIndex))
+            for visible in visibles:
+                comp.addVisible(visible)
+            for width, height, x, y, z in battleCells:
+                comp.addBattleCell(DNABattleCell.DNABattleCell(width, height, LVector3f(x, y, z)))
+            store.storeDNAVisGroup(comp)
+        elif data is not None:
+            pos, hpr, scale, fields = data
+            comp.pos = LVector3f(*pos)
+            comp.hpr = LVector3f(*hpr)
+            comp.scale = LVector3f(*scale)
+            for field, value in fields.items():
+                setattr(comp, field, value)
+
+        if parentIndex >= 0:
+            parent = built[parentIndex]
+            comp.setParent(parent)
+            parent.add(comp)
+
+        built.append(comp)
+
+    if built:
+        return built[0]
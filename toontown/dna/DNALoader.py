@@ -59,11 +59,13 @@ childlessComps = (
 
 class DNALoader(object):
     __slots__ = (
-        'curComp', 'curStore')
+        'curComp', 'curStore', 'loadAssets')
 
-    def __init__(self):
+    def __init__(self, loadAssets=True):
         self.curComp = None
         self.curStore = None
+        # The AI has no use for the textures and fonts a DNA file uses, so it can skip loading them.
+        self.loadAssets = loadAssets
 
     def loadDNAFile(self, store, _file):
         #if base.wantHighPerformance:
@@ -101,14 +103,16 @@ class DNALoader(object):
         for i in range(num_textures):
             code = dgi.getString()
             filename = dgi.getString()
-            self.curStore.storeTexture(code, loader.loadTexture(filename))
+            if self.loadAssets:
+                self.curStore.storeTexture(code, loader.loadTexture(filename))
 
         # Fonts
         num_fonts = dgi.getUint16()
         for i in range(num_fonts):
             code = dgi.getString()
             filename = dgi.getString()
-            self.curStore.storeFont(code, loader.loadFont(filename), filename)
+            if self.loadAssets:
+                self.curStore.storeFont(code, loader.loadFont(filename), filename)
 
         # Nodes
         num_nodes = dgi.getUint16()
@@ -193,6 +197,9 @@ class DNALoader(object):
                     self.curComp = new_comp
 
     def loadDNAFileBase(self, store, _file):
+        self.loadDNAData(store, self.readDNAFile(_file))
+
+    def readDNAFile(self, _file):
         if type(_file) == str and _file.endswith(".dna"):
             _file = _file.replace(".dna", ".pdna")
             #_file = _file.replace("../resources/", "")
@@ -204,8 +211,9 @@ class DNALoader(object):
         vfs = VirtualFileSystem.getGlobalPtr()
         if not vfs.exists(_file):
             raise DNAError.DNAError("Unable to open DNA file '%s'" % (str(_file)))
-        dnaData = vfs.readFile(_file, True)
+        return vfs.readFile(_file, True)
 
+    def loadDNAData(self, store, dnaData):
         self.curStore = store
         dg = PyDatagram(dnaData)
         dgi = PyDatagramIterator(dg)
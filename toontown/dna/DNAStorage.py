@@ -6,7 +6,8 @@ from toontown.dna import DNAError
 
 class DNAStorage(object):
     __slots__ = ('visGroups', 'DNAGroups', 'textures', 'fonts', 'fontFilenames', 'catalogCodes', 'nodes', 'hoodNodes', 'placeNodes', 
-        'blockDoors', 'blockZones', 'blockNumbers', 'blockTitles', 'blockArticles', 'blockBuildingTypes', 'suitEdges', 'suitPoints', 'suitBlocks', 'suitBlockNumFloors', 'cogdoBlocks',)
+        'blockDoors', 'blockZones', 'blockNumbers', 'blockTitles', 'blockArticles', 'blockBuildingTypes', 'suitEdges', 'suitPoints', 'suitBlocks', 'suitBlockNumFloors', 'cogdoBlocks',
+        'suitPointMap', 'suitEdgeMap', 'suitEdgeLengths', 'adjacentPoints', 'suitPathDistances',)
 
     def __init__(self):
         self.visGroups = []
@@ -29,6 +30,12 @@ class DNAStorage(object):
         self.suitBlocks = {}
         self.suitBlockNumFloors = {}
         self.cogdoBlocks = {}
+        # Indexes over the suit graph, so that looking up a point or an edge doesn't mean scanning every one of them.
+        self.suitPointMap = {}  # {point index: DNASuitPoint}
+        self.suitEdgeMap = {}  # {(start index, end index): DNASuitEdge}
+        self.suitEdgeLengths = {}  # {(start index, end index): distance between the points}
+        self.adjacentPoints = {}  # {start index: DNASuitPath of every point it has an edge to}
+        self.suitPathDistances = {}  # {end index: {start index: fewest edges a suit can walk to get to the end}}
         
     def cleanup(self):
         self.resetBattleCells()
@@ -302,25 +309,29 @@ class DNAStorage(object):
 
         if not startIndex in self.suitEdges:
             self.suitEdges[startIndex] = []
-        
-        self.suitEdges[startIndex].append(DNASuitEdge.DNASuitEdge(startPoint, endPoint, zoneId))
+
+        edge = DNASuitEdge.DNASuitEdge(startPoint, endPoint, zoneId)
+        self.suitEdges[startIndex].append(edge)
+
+        # The first edge stored between two points is the one that gets looked up, just like it was with a scan.
+        self.suitEdgeMap.setdefault((startIndex, endIndex), edge)
+        if startPoint and endPoint:
+            self.suitEdgeLengths.setdefault((startIndex, endIndex), (endPoint.getPos() - startPoint.getPos()).length())
+        self.adjacentPoints.pop(startIndex, None)
+        self.suitPathDistances = {}
 
     def getSuitEdge(self, startIndex, endIndex):
-        edges = self.suitEdges[startIndex]
-        for edge in edges:
-            if edge.getEndPoint().getIndex() == endIndex:
-                return edge
+        return self.suitEdgeMap.get((startIndex, endIndex))
 
     def storeSuitPoint(self, suitPoint):
         self.suitPoints.append(suitPoint)
+        self.suitPointMap.setdefault(suitPoint.getIndex(), suitPoint)
 
     def getSuitPointAtIndex(self, index):
         return self.suitPoints[index]
 
     def getSuitPointWithIndex(self, index):
-        for point in self.suitPoints:
-            if point.getIndex() == index:
-                return point
+        return self.suitPointMap.get(index)
 
     def getNumSuitPoints(self):
         return len(self.suitPoints)
@@ -330,6 +341,7 @@ class DNAStorage(object):
             del suitPoint
 
         self.suitPoints = []
+        self.suitPointMap = {}
 
     def resetSuitEdges(self):
         for suitEdge in self.suitEdges.items():
@@ -349,49 +361,173 @@ class DNAStorage(object):
 
         self.DNAGroups = {}
 
+    @staticmethod
+    def isDoorPoint(point):
+        pointType = point.getPointType()
+        return pointType == DNASuitPoint.DNASuitPoint.FRONT_DOOR_POINT or pointType == DNASuitPoint.DNASuitPoint.SIDE_DOOR_POINT
+
+    def getSuitPathDistances(self, endIndex):
+        """
+        Returns {point index: hops} for every point that a suit can walk to the given end point from, where hops is the
+        fewest edges it has to walk along. Suits can start or end at a door, but never walk through one.
+        Calculated once per end point with a backwards breadth first search, and kept until the edges change.
+        """
+        distances = self.suitPathDistances.get(endIndex)
+        if distances is not None:
+            return distances
+
+        # Which points lead into each point.
+        sources = {}
+        for startIndex, edges in self.suitEdges.items():
+            for edge in edges:
+                if edge.getEndPoint() is not None:
+                    sources.setdefault(edge.getEndPoint().getIndex(), []).append(startIndex)
+
+        distances = {endIndex: 0}
+        frontier = [endIndex]
+        while frontier:
+            nextFrontier = []
+            for pointIndex in frontier:
+                for sourceIndex in sources.get(pointIndex, ()):
+                    if sourceIndex in distances:
+                        continue
+
+                    distances[sourceIndex] = distances[pointIndex] + 1
+                    # A door can be where a suit starts, but no other point can reach the end by walking through it.
+                    sourcePoint = self.getSuitPointWithIndex(sourceIndex)
+                    if sourcePoint is not None and not self.isDoorPoint(sourcePoint):
+                        nextFrontier.append(sourceIndex)
+            frontier = nextFrontier
+
+        self.suitPathDistances[endIndex] = distances
+        return distances
+
+    def getSuitPathHops(self, startIndex, endIndex):
+        """
+        Returns the fewest edges a suit has to walk to get from the start point to the end point,
+        or None if it can't get there at all.
+        """
+        return self.getSuitPathDistances(endIndex).get(startIndex)
+
     def getSuitPath(self, startPoint, endPoint, minPathLen, maxPathLen):
+        """
+        Finds a path from the start point to the end point that is between minPathLen and maxPathLen points long,
+        only passing through street points along the way. Returns None if there is no such path.
+
+        While the path is too short to head for the end point, the suit wanders along the first street point it can
+        walk to that still leaves it a way to the end point within maxPathLen. Once it has wandered far enough, it takes
+        the shortest way there. The same points always give the same path, as the client rebuilds suit paths itself.
+        """
+        endIndex = endPoint.getIndex()
+        distances = self.getSuitPathDistances(endIndex)
+        hops = distances.get(startPoint.getIndex())
+        if hops is None or hops + 1 > maxPathLen:
+            return None
+
         path = DNASuitPath.DNASuitPath()
         path.addPoint(startPoint)
-        while path.getNumPoints() < maxPathLen:
-            if startPoint == endPoint and path.getNumPoints() >= minPathLen:
+        point = startPoint
+
+        # Wander until heading straight to the end point would make a long enough path.
+        while path.getNumPoints() + hops < minPathLen:
+            nextPoint = None
+            adjacentPoints = self.getAdjacentPoints(point)
+            for i in range(adjacentPoints.getNumPoints()):
+                adjacentPoint = adjacentPoints.getPoint(i)
+                if self.isDoorPoint(adjacentPoint):
+                    continue
+
+                adjacentHops = distances.get(adjacentPoint.getIndex())
+                if adjacentHops is not None and path.getNumPoints() + 1 + adjacentHops <= maxPathLen:
+                    nextPoint = adjacentPoint
+                    hops = adjacentHops
+                    break
+
+            if nextPoint is None:
+                # Wandering led somewhere it can't get back from in time. Fall back to a full search.
+                return self.searchSuitPath(startPoint, endPoint, minPathLen, maxPathLen)
+
+            point = nextPoint
+            path.addPoint(point)
+
+        # Then take the shortest way to the end point.
+        while hops > 0:
+            adjacentPoints = self.getAdjacentPoints(point)
+            for i in range(adjacentPoints.getNumPoints()):
+                adjacentPoint = adjacentPoints.getPoint(i)
+                if distances.get(adjacentPoint.getIndex()) != hops - 1:
+                    continue
+                if adjacentPoint.getIndex() != endIndex and self.isDoorPoint(adjacentPoint):
+                    continue
+
+                point = adjacentPoint
                 break
 
-            adjacentPoints = self.getAdjacentPoints(startPoint)
-            if adjacentPoints.getNumPoints() == 0:
-                raise DNAError.DNAError("could not find DNASuitPath: point %s has no edges") %startPoint.getIndex()
+            hops -= 1
+            path.addPoint(point)
 
-            # First, let's see if our end point is an adjacent point
-            # If it's not, or path is still too short, advance to first
-            # non-door adjacent point
-            nonDoorPoint = None
-            for i in range(adjacentPoints.getNumPoints()):
-                _startPoint = adjacentPoints.getPoint(i)
-                if _startPoint == endPoint and path.getNumPoints() >= (minPathLen + 1):
-                    del adjacentPoints
-                    path.addPoint(_startPoint)
-                    return path
+        return path
+
+    def searchSuitPath(self, startPoint, endPoint, minPathLen, maxPathLen):
+        """
+        Finds the shortest path from the start point to the end point that is at least minPathLen points long with a
+        breadth first search, one path length at a time. Only keeps the points that can still make it to the end point
+        within maxPathLen. Returns None if there is no such path.
+        """
+        endIndex = endPoint.getIndex()
+        distances = self.getSuitPathDistances(endIndex)
+
+        # Every layer is {point index: the index of the point before it}, for paths that are one point longer.
+        layers = [{startPoint.getIndex(): None}]
+        while len(layers) <= maxPathLen:
+            layer = layers[-1]
+            if endIndex in layer and len(layers) >= minPathLen:
+                break
 
-                startPointType = _startPoint.getPointType()
-                if (startPointType != DNASuitPoint.DNASuitPoint.FRONT_DOOR_POINT) and (startPointType != DNASuitPoint.DNASuitPoint.SIDE_DOOR_POINT) and (nonDoorPoint == None):
-                    nonDoorPoint = _startPoint
+            nextLayer = {}
+            for pointIndex in layer:
+                point = self.getSuitPointWithIndex(pointIndex)
+                if len(layers) > 1 and self.isDoorPoint(point):
+                    continue
 
-            del adjacentPoints
+                adjacentPoints = self.getAdjacentPoints(point)
+                for i in range(adjacentPoints.getNumPoints()):
+                    adjacentIndex = adjacentPoints.getPointIndex(i)
+                    adjacentHops = distances.get(adjacentIndex)
+                    if adjacentIndex in nextLayer or adjacentHops is None:
+                        continue
+                    if len(layers) + 1 + adjacentHops > maxPathLen:
+                        continue
 
-            if nonDoorPoint == None:
-                raise DNAError.DNAError("could not find DNASuitPath: point %s has no non-door point edge" %startPoint.getIndex())
+                    nextLayer[adjacentIndex] = pointIndex
 
-            startPoint = nonDoorPoint
-            path.addPoint(startPoint)
+            if not nextLayer:
+                return None
 
+            layers.append(nextLayer)
+        else:
+            return None
+
+        pointIndexes = [endIndex]
+        for layer in reversed(layers[1:]):
+            pointIndexes.append(layer[pointIndexes[-1]])
+
+        path = DNASuitPath.DNASuitPath()
+        for pointIndex in reversed(pointIndexes):
+            path.addPoint(self.getSuitPointWithIndex(pointIndex))
         return path
 
     def getSuitEdgeTravelTime(self, startIndex, endIndex, suitWalkSpeed):
-        startPoint = self.getSuitPointWithIndex(startIndex)
-        endPoint = self.getSuitPointWithIndex(endIndex)
-        if not startPoint or not endPoint:
-            return 0
+        length = self.suitEdgeLengths.get((startIndex, endIndex))
+        if length is None:
+            startPoint = self.getSuitPointWithIndex(startIndex)
+            endPoint = self.getSuitPointWithIndex(endIndex)
+            if not startPoint or not endPoint:
+                return 0
+
+            length = (endPoint.getPos() - startPoint.getPos()).length()
 
-        return (endPoint.getPos() - startPoint.getPos()).length() / suitWalkSpeed
+        return length / suitWalkSpeed
 
     def getSuitEdgeZone(self, startIndex, endIndex):
         edge = self.getSuitEdge(startIndex, endIndex)
@@ -399,13 +535,14 @@ class DNAStorage(object):
         return edge.getZoneId()
 
     def getAdjacentPoints(self, point):
-        path = DNASuitPath.DNASuitPath()
+        # The same path is handed out every time, so it must not be changed by whoever asked for it.
         startIndex = point.getIndex()
-        if not startIndex in self.suitEdges:
-            return path
-
-        for edge in self.suitEdges[startIndex]:
-            path.addPoint(edge.getEndPoint())
+        path = self.adjacentPoints.get(startIndex)
+        if path is None:
+            path = DNASuitPath.DNASuitPath()
+            for edge in self.suitEdges.get(startIndex, ()):
+                path.addPoint(edge.getEndPoint())
+            self.adjacentPoints[startIndex] = path
 
         return path
 
@@ -3,7 +3,6 @@ from direct.distributed import DistributedObjectAI
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed import ClockDelta
 from .FireworkShow import FireworkShow
-from .FireworkShows import getShowDuration
 import random
 from direct.task import Task
 
@@ -31,6 +30,8 @@ class DistributedFireworkShowAI(DistributedObjectAI.DistributedObjectAI):
         self.timestamp = timestamp
         self.sendUpdate('startShow', (self.eventId, self.style, self.timestamp))
         if simbase.air.config.GetBool('want-old-fireworks', 0):
+            # The old shows are a big table nothing else needs, so only load them if they're wanted.
+            from .FireworkShows import getShowDuration
             duration = getShowDuration(self.eventId, self.style)
             taskMgr.doMethodLater(duration, self.fireworkShowDone, self.taskName('waitForShowDone'))
         else:
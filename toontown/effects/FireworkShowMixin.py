@@ -6,7 +6,6 @@ from toontown.toonbase import TTLocalizer
 from toontown.parties import PartyGlobals
 from toontown.hood import *
 from . import Fireworks
-from . import FireworkShows
 from .FireworkGlobals import skyTransitionDuration, preShowPauseDuration, postShowPauseDuration, preNormalMusicPauseDuration
 from toontown.effects.FireworkShow import FireworkShow
 
@@ -206,6 +205,7 @@ class FireworkShowMixin:
                 self.fireworkShow.setScale(1.8)
 
     def getFireworkShowIval(self, eventId, index, startT):
+        from . import FireworkShows
         show = FireworkShows.getShow(eventId, index)
         if show is None:
             FireworkShowMixin.notify.warning('could not find firework show: index: %s' % index)
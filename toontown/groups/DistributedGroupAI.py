@@ -14,6 +14,27 @@ class DistributedGroupAI(DistributedObjectAI, GroupBase):
         DistributedObjectAI.__init__(self, air)
         GroupBase.__init__(self, leader.getDoId())
         self.activityStartCooldown = 0
+        self.air.groupMembership.setGroupMembers(self, self.getMemberIds())
+
+    def delete(self):
+        self.air.groupMembership.removeGroup(self)
+        DistributedObjectAI.delete(self)
+
+    def setMembers(self, members: list[GroupMemberStruct]):
+        GroupBase.setMembers(self, members)
+        self.air.groupMembership.setGroupMembers(self, self.getMemberIds())
+
+    def addMember(self, member: int) -> bool:
+        added = GroupBase.addMember(self, member)
+        if added:
+            self.air.groupMembership.setGroupMembers(self, self.getMemberIds())
+        return added
+
+    def removeMember(self, memberId: int) -> bool:
+        removed = GroupBase.removeMember(self, memberId)
+        if removed:
+            self.air.groupMembership.setGroupMembers(self, self.getMemberIds())
+        return removed
 
     def getToons(self):
         """
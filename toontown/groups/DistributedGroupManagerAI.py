@@ -20,7 +20,7 @@ class DistributedGroupManagerAI(DistributedObjectAI):
 
     def __init__(self, air):
         super().__init__(air)
-        self.groups: list[DistributedGroupAI] = []
+        self.groups: set[DistributedGroupAI] = set()
 
     def announceGenerate(self):
         super().announceGenerate()
@@ -30,20 +30,20 @@ class DistributedGroupManagerAI(DistributedObjectAI):
         DistributedObjectAI.delete(self)
         self.ignore('avatarExited')
 
-        for group in self.groups:
+        for group in list(self.groups):
             group.delete()
 
         self.groups.clear()
 
     def getGroup(self, toon: DistributedToonAI) -> DistributedGroupAI | None:
         """
-        Gets the current group this toon is in. Returns None if this toon is not in the group.
+        Gets the current group this toon is in. Returns None if this toon is not in a group managed by us.
         """
-        for group in self.groups:
-            if toon.getDoId() in group.getMemberIds():
-                return group
+        group = self.air.groupMembership.getGroup(toon.getDoId())
+        if group not in self.groups:
+            return None
 
-        return None
+        return group
 
     def createGroup(self, leader: DistributedToonAI) -> DistributedGroupAI:
         """
@@ -59,7 +59,7 @@ class DistributedGroupManagerAI(DistributedObjectAI):
         # Create a new group!
         group = DistributedGroupAI(self.air, leader)
         group.generateWithRequired(self.zoneId)
-        self.groups.append(group)
+        self.groups.add(group)
 
         # Setup the required state.
         group.b_setCapacity(group.DefaultCapacity)
@@ -69,8 +69,8 @@ class DistributedGroupManagerAI(DistributedObjectAI):
 
     def deleteGroup(self, group: DistributedGroupAI):
         group.requestDelete()
-        if group in self.groups:
-            self.groups.remove(group)
+        self.groups.discard(group)
+        self.air.groupMembership.removeGroup(group)
 
     def __handleUnexpectedExit(self, toon):
         group = self.getGroup(toon)
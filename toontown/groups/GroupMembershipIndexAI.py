@@ -0,0 +1,63 @@
+from direct.directnotify import DirectNotifyGlobal
+
+
+class GroupMembershipIndexAI:
+    """
+    Keeps track of which group every toon on the district is in, across every group manager.
+
+    Groups tell the index whenever their members change, so finding a toon's group (which happens on every group
+    request, queue join, trolley boarding and logout) is a single lookup instead of a scan over every group.
+    """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory('GroupMembershipIndexAI')
+
+    def __init__(self):
+        # Maps avId -> the group they are in.
+        self.avId2group = {}
+        # Maps group -> the set of avIds we have indexed for it.
+        self.group2avIds = {}
+
+    def getGroup(self, avId: int):
+        """
+        Returns the group this toon is in, or None if they are not in one.
+        """
+        return self.avId2group.get(avId)
+
+    def isInGroup(self, avId: int) -> bool:
+        return avId in self.avId2group
+
+    def setGroupMembers(self, group, avIds):
+        """
+        Updates the index to the current members of a group.
+        """
+        newAvIds = set(avIds)
+        oldAvIds = self.group2avIds.get(group, set())
+
+        for avId in oldAvIds - newAvIds:
+            if self.avId2group.get(avId) is group:
+                del self.avId2group[avId]
+
+        for avId in newAvIds - oldAvIds:
+            otherGroup = self.avId2group.get(avId)
+            if otherGroup is not None and otherGroup is not group:
+                # Groups make sure this can't happen, so something went wrong.
+                self.notify.warning(f'{avId} joined group {group.getDoId()} while still in group {otherGroup.getDoId()}')
+                self.group2avIds[otherGroup].discard(avId)
+            self.avId2group[avId] = group
+
+        if newAvIds:
+            self.group2avIds[group] = newAvIds
+        else:
+            self.group2avIds.pop(group, None)
+
+    def removeGroup(self, group):
+        """
+        Forgets about a group that is going away, along with all of its members.
+        """
+        self.setGroupMembers(group, ())
+
+    def getNumGroups(self) -> int:
+        return len(self.group2avIds)
+
+    def getNumMembers(self) -> int:
+        return len(self.avId2group)
@@ -6,6 +6,7 @@ from direct.gui.DirectLabel import DirectLabel
 from direct.task import Task
 
 from toontown.matchmaking.in_queue_panel import InQueuePanel
+from toontown.matchmaking.skill_profile_keys import SkillProfileKey
 from toontown.toonbase import ToontownGlobals
 
 
@@ -80,6 +81,12 @@ class DistributedMatchmaker(DistributedObjectGlobal):
         """
         self.sendUpdate('requestQueueState', [flag])
 
+    def d_requestModeQueueState(self, key: SkillProfileKey, flag: bool):
+        """
+        Same as d_requestQueueState(), but for the queue of a specific mode.
+        """
+        self.sendUpdate('requestModeQueueState', [key.value, flag])
+
     def setMatchmakingStatus(self, position: int, total: int):
         """
         Called from the matchmaker on the AI. Tells us information about our spot in queue.
@@ -48,6 +48,12 @@ class LeaderboardManager(DistributedObjectGlobal):
         """
         self.sendUpdate('requestRankingsClientToUd', [key, start, amount])
 
+    def d_requestOwnRanking(self, key: str):
+        """
+        Asks the UD where we are on the leaderboard for a mode. The UD should respond with our leaderboard entry.
+        """
+        self.sendUpdate('requestOwnRankingClientToUd', [key])
+
     def requestRankingsResponse(self, key, results: list[Any]):
         """
         Called from the UD after a requestRankings call was invoked. Updates the internal cache of leaderboard ranks.
@@ -61,3 +67,10 @@ class LeaderboardManager(DistributedObjectGlobal):
 
         # Send an event so that the page can hook into this if needed.
         messenger.send('leaderboard-ranking-response', [key, results])
+
+    def requestOwnRankingResponse(self, key, results: list[Any]):
+        """
+        Called from the UD after a requestOwnRanking call was invoked. Results is either empty if we aren't ranked,
+        or contains just our own leaderboard entry.
+        """
+        messenger.send('leaderboard-own-ranking-response', [key, results[0] if results else None])
@@ -1,9 +1,12 @@
-import copy
+import atexit
 import json
+import os
 
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.DistributedObjectGlobalUD import DistributedObjectGlobalUD
 
+from toontown.matchmaking.leaderboard import RankedLeaderboard
+from toontown.matchmaking.leaderboard_store import LeaderboardStore
 from toontown.matchmaking.player_skill_profile import PlayerSkillProfile
 from toontown.matchmaking.skill_profile_keys import SkillProfileKey
 
@@ -11,7 +14,8 @@ from toontown.matchmaking.skill_profile_keys import SkillProfileKey
 class LeaderboardManagerUD(DistributedObjectGlobalUD):
 
     notify = DirectNotifyGlobal.directNotify.newCategory('LeaderboardManagerUD')
-    cache_filepath = "sr_leaderboard_cache.json"
+    store_filepath = "sr_leaderboard.db"
+    legacy_cache_filepath = "sr_leaderboard_cache.json"
 
     def __init__(self, air):
         DistributedObjectGlobalUD.__init__(self, air)
@@ -19,24 +23,23 @@ class LeaderboardManagerUD(DistributedObjectGlobalUD):
         self.notify.info("Leaderboard initiated")
 
         # This is a tough one. Astron's DB interface doesn't allow us to perform advanced queries on every DO record. (I think?)
-        # So to remedy this, we are going to use a JSON file that keeps track of toon IDs that are considered "active",
-        # and when UD starts up we can query the DB for these players and cache their information. Then, when ranked
-        # matches conclude, we can update the cache. That way when information is requested, we can just read values
-        # from memory. Ideally, I would prefer to read database every 5 minutes and grab top X people.
+        # So to remedy this, we keep our own copy of everything the leaderboard displays in a small SQLite database.
+        # When UD starts up we read the whole thing in one go, and when ranked matches conclude we update it.
+        # That way when information is requested, we can just read values from memory.
         # todo: when we are committed to using either SQL/Mongo, refactor this to interact with the DB directly.
-        self.__leaderboard_active_players_cache = {}  # {mode: [toonids....]}
-        self.__sr_cache = {}  # {mode: toonid: [name, sr]}
-        self.__read_or_create_cached_leaderboard_data()
-
-        # todo: once again, this can go. our refresh task should handle this with a real DB.
-        _dclass = self.air.dclassesByName['DistributedToonUD']
-        for key, activePlayerList in self.__leaderboard_active_players_cache.items():
-            for activePlayer in activePlayerList:
-                # Queue up a request to query skill profiles for the toon. Once queried, the __database_callback function will fire.
-                self.air.dbInterface.queryObject(self.air.dbId, activePlayer, self.__database_callback, dclass=_dclass, fieldNames=('setName', 'setSkillProfiles',))
+        self.__leaderboards: dict[str, RankedLeaderboard] = {}  # {mode: leaderboard}
+        self.__store = LeaderboardStore(self.store_filepath)
+        self.__load_leaderboard_data()
+        self.__store.open()
+        atexit.register(self.__store.close)
 
         taskMgr.doMethodLater(10, self.__refresh_task, 'leaderboard-refresh-task')
 
+    def delete(self):
+        taskMgr.remove('leaderboard-refresh-task')
+        self.__store.close()
+        DistributedObjectGlobalUD.delete(self)
+
     def handleRankedMatchResultsAiToUd(self, results, nameMap):
         """
         Called from the AI. A ranked match has just concluded, and the district is informing of us of rating updates.
@@ -47,23 +50,7 @@ class LeaderboardManagerUD(DistributedObjectGlobalUD):
         # Any toon that we just got word of needs to start being tracked if they aren't already.
         for result in results:
             profile = PlayerSkillProfile.from_astron(result)
-            players = self.__leaderboard_active_players_cache.get(profile.key)
-            if players is None:
-                players = []
-
-            players.append(profile.identifier)
-            self.__leaderboard_active_players_cache[profile.key] = list(set(players))
-
-            # Also, update the SR cache so that we can quickly query SR data.
-            data = self.__sr_cache.get(profile.key)
-            if data is None:
-                data = {}
-                self.__sr_cache[profile.key] = data
-
-            data[profile.identifier] = [names[profile.identifier], profile.skill_rating, profile.wins, profile.games_played]
-            self.__sr_cache[profile.key] = data
-
-        self.__save_leaderboard_data()
+            self.__track_profile(profile, names[profile.identifier])
 
     def requestRankingsClientToUd(self, key: str, start: int, amount: int):
         avId = self.air.getAvatarIdFromSender()
@@ -86,34 +73,59 @@ class LeaderboardManagerUD(DistributedObjectGlobalUD):
             return
 
         # Check that we have entries cached for the key. If we don't we can send an empty list of records!
-        if profileKey.value not in self.__sr_cache:
+        leaderboard = self.__leaderboards.get(profileKey.value)
+        if leaderboard is None:
             self.notify.debug(f"Sending empty {profileKey.value} ratings update to {avId} - no records on file")
             self.sendUpdateToAvatarId(avId, 'requestRankingsResponse', [profileKey.value, []])
             return
 
-        # We are good to return some data. Do not make DB calls. Create a sorted list of the top profile entries.
-        records = copy.deepcopy(list(self.__sr_cache[profileKey.value].values()))
-        # Sort the records based on SR.
-        records.sort(key=lambda x: x[1], reverse=True)
-        # Slice the list from where the user wanted it to start. Just to make this easier, let's add a dummy record
-        # First of all, do we even have enough records? If they requested out of bounds, we want to give them an empty list.
-        end_index = start + amount - 1
-        end_index = min(end_index, len(records))
-        if len(records) < start:
-            records = []
-        else:
-            records = records[start-1:end_index]
-
-        # Append ranking to all the records.
-        for i, record in enumerate(records):
-            record.insert(0, i+1)
+        # We are good to return some data. Do not make DB calls. The standings are always kept sorted, so we only
+        # need to read the page they asked for. If they requested out of bounds, they get an empty list.
+        records = leaderboard.get_page(start, amount)
 
         self.notify.debug(f"Sending {profileKey.value} ratings update to {avId}: {records}")
         self.sendUpdateToAvatarId(avId, 'requestRankingsResponse', [profileKey.value, records])
 
+    def requestOwnRankingClientToUd(self, key: str):
+        """
+        Called from clients when they want to know where they are on the leaderboard for a mode.
+        Responds with a list containing their entry, or an empty list if they aren't on the leaderboard.
+        """
+        avId = self.air.getAvatarIdFromSender()
+
+        profileKey = SkillProfileKey.from_value(key)
+        if profileKey is None:
+            return
+
+        entry = []
+        leaderboard = self.__leaderboards.get(profileKey.value)
+        if leaderboard is not None:
+            rank = leaderboard.get_rank(avId)
+            if rank is not None:
+                entry = leaderboard.get_page(rank, 1)
+
+        self.sendUpdateToAvatarId(avId, 'requestOwnRankingResponse', [profileKey.value, entry])
+
+    def __track_profile(self, profile: PlayerSkillProfile, name: str):
+        """
+        Updates the standings for a toon's skill profile, and queues the change to be saved.
+        """
+        self.__get_or_create_leaderboard(profile.key).update(
+            profile.identifier, name, profile.skill_rating, profile.wins, profile.games_played
+        )
+        self.__store.put(profile.key, profile.identifier, name, profile.skill_rating, profile.wins, profile.games_played)
+
+    def __get_or_create_leaderboard(self, key: str) -> RankedLeaderboard:
+        leaderboard = self.__leaderboards.get(key)
+        if leaderboard is None:
+            leaderboard = RankedLeaderboard()
+            self.__leaderboards[key] = leaderboard
+        return leaderboard
+
     def __database_callback(self, dclass, fields):
         """
-        Database callback that only runs on startup. Queries avatar information regarding skill profiles.
+        Database callback that only runs on startup when migrating from the old JSON file of tracked toons.
+        Queries avatar information regarding skill profiles.
         """
         if dclass is None:
             self.notify.error('Failed to resolve DB query. dclass is None.')
@@ -140,15 +152,8 @@ class LeaderboardManagerUD(DistributedObjectGlobalUD):
             # Convert the profile to something we can work with.
             profile = PlayerSkillProfile.from_astron(raw)
 
-            # Grab all the data cached for the gamemode. If it is non-existent, initialize it with an empty dictionary.
-            mode_data = self.__sr_cache.get(profile.key)
-            if mode_data is None:
-                self.__sr_cache[profile.key] = {}
-                mode_data = {}
-
-            # Store the player's name and SR under their toon ID for this gamemode and save the changes to the cache.
-            mode_data[profile.identifier] = [name, profile.skill_rating, profile.wins, profile.games_played]
-            self.__sr_cache[profile.key] = mode_data
+            # Store the player's name and SR in the standings for this gamemode.
+            self.__track_profile(profile, name)
 
     def __refresh_task(self, task):
         """
@@ -164,48 +169,66 @@ class LeaderboardManagerUD(DistributedObjectGlobalUD):
         task.delayTime = 5
         return task.again
 
-    def __read_or_create_cached_leaderboard_data(self):
+    def __load_leaderboard_data(self):
         """
-        Reads data from the JSON file and syncs it in memory to our leaderboard cache. Should only be called once.
+        Rebuilds the standings for every mode from our leaderboard store. Should only be called once.
         """
+        records = self.__store.load()
+        for key, mode_records in records.items():
+
+            # Skip modes that don't exist anymore.
+            if SkillProfileKey.from_value(key) is None:
+                self.notify.debug(f"Skipping stored records for unknown key: {key}")
+                continue
+
+            leaderboard = self.__get_or_create_leaderboard(key)
+            for toonId, name, sr, wins, games in mode_records:
+                leaderboard.update(toonId, name, sr, wins, games)
+
+        self.notify.info(f"Loaded {sum(len(r) for r in records.values())} leaderboard records.")
+
+        # If the store is empty but we still have the old JSON file of tracked toons, query them one last time.
+        # Their records get saved to the store as they come back, so this only ever happens once.
+        if not records and os.path.exists(self.legacy_cache_filepath):
+            self.__migrate_legacy_leaderboard_data()
 
-        # Open a JSON file containing leaderboard data.
+    def __migrate_legacy_leaderboard_data(self):
+        """
+        Queries the DB for every toon listed in the old JSON leaderboard file, so the store can be seeded from them.
+        """
         try:
-            with open(self.cache_filepath, 'r') as f:
+            with open(self.legacy_cache_filepath, 'r') as f:
                 data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.notify.warning(f"Failed to read {self.legacy_cache_filepath} for migration: {e}")
+            return
 
-                # If this JSON data is malformed or non-existent, save a fresh copy and abort.
-                if not isinstance(data, dict):
-                    self.__leaderboard_active_players_cache = {key.value: [] for key in SkillProfileKey}
-                    self.__save_leaderboard_data()
-                    return
-
-                # Loop through all the keys. These are meant to map to types of modes.
-                for key in data.keys():
-                    profile_type = SkillProfileKey.from_value(key)
+        if not isinstance(data, dict):
+            return
 
-                    # Skip bad keys.
-                    if profile_type is None:
-                        self.notify.debug(f"Failed to parse key: {key} - JSON is either malformed or out of date. Skipping.")
-                        continue
+        active_ids = set()
+        for key, ids in data.items():
 
-                    # Skip bad data as a value for this key.
-                    active_ids = data[key]
-                    if not isinstance(active_ids, list):
-                        self.notify.debug(f"Failed to parse data for key {key} - Expected list of IDs but got {type(active_ids)}")
-                        continue
+            # Skip bad keys and bad data.
+            if SkillProfileKey.from_value(key) is None or not isinstance(ids, list):
+                self.notify.debug(f"Failed to parse key: {key} - JSON is either malformed or out of date. Skipping.")
+                continue
 
-                    # Set the data.
-                    self.__leaderboard_active_players_cache[key] = active_ids
+            active_ids.update(ids)
 
-        except FileNotFoundError:
-            # If the file wasn't found, simply just create the file.
-            self.__leaderboard_active_players_cache = {key.value: [] for key in SkillProfileKey}
-            self.__save_leaderboard_data()
+        self.notify.info(f"Migrating {len(active_ids)} toons from {self.legacy_cache_filepath} to {self.store_filepath}.")
+        _dclass = self.air.dclassesByName['DistributedToonUD']
+        # Query skill profiles for every toon in one batch. Once they are all back, __handle_migration_query fires.
+        self.air.dbInterface.queryObjects(self.air.dbId, active_ids, self.__handle_migration_query, dclass=_dclass, fieldNames=('setName', 'setSkillProfiles',))
 
-    def __save_leaderboard_data(self):
+    def __handle_migration_query(self, results, failures):
         """
-        Saves whatever data we have in memory to our JSON leaderboard file. Should be called after SR updates.
+        Called once every toon being migrated from the old JSON file has been queried.
         """
-        with open(self.cache_filepath, 'w') as f:
-            json.dump(self.__leaderboard_active_players_cache, f)
+        for dclass, fields in results.values():
+            self.__database_callback(dclass, fields)
+
+        if failures:
+            self.notify.warning(f"Failed to query {len(failures)} toons while migrating the leaderboard: {failures}")
+
+        self.__store.flush()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import bisect
+import typing
+
+
+class LeaderboardRecord(typing.NamedTuple):
+    """
+    Everything the leaderboard displays about a single toon.
+    """
+    name: str
+    skill_rating: int
+    wins: int
+    games_played: int
+
+
+class SortedKeys:
+    """
+    A sorted list split up into buckets, so inserting and removing only has to shift a small bucket around
+    instead of the entire list. Keys are found by binary searching the bucket maxes, then the bucket itself.
+    Positions are found through a Fenwick tree over the bucket lengths, which is updated as keys come and go and only
+    rebuilt when a bucket is split or removed.
+    """
+
+    # Buckets are split in half once they grow past twice this size.
+    LOAD = 512
+
+    def __init__(self):
+        self._buckets: list[list[tuple]] = []
+        self._maxes: list[tuple] = []
+        self._tree: list[int] = [0]
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: tuple):
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+
+        i = min(bisect.bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        bisect.insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+
+        if len(bucket) > self.LOAD * 2:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._maxes[i] = bucket[-1]
+            self._buckets.insert(i + 1, half)
+            self._maxes.insert(i + 1, half[-1])
+            self._rebuild_tree()
+        else:
+            self._update_tree(i, 1)
+
+    def discard(self, key: tuple):
+        i = bisect.bisect_left(self._maxes, key)
+        if i >= len(self._buckets):
+            return
+
+        bucket = self._buckets[i]
+        j = bisect.bisect_left(bucket, key)
+        if j >= len(bucket) or bucket[j] != key:
+            return
+
+        self._len -= 1
+        del bucket[j]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._update_tree(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._rebuild_tree()
+
+    def index(self, key: tuple) -> int:
+        """
+        Returns the amount of keys that are smaller than the given key.
+        """
+        i = bisect.bisect_left(self._maxes, key)
+        if i >= len(self._buckets):
+            return self._len
+
+        return self._keys_before(i) + bisect.bisect_left(self._buckets[i], key)
+
+    def islice(self, start: int, stop: int) -> typing.Iterator[tuple]:
+        """
+        Yields the keys from position start up to (not including) position stop.
+        """
+        start = max(start, 0)
+        stop = min(stop, self._len)
+        if start >= stop:
+            return
+
+        i, offset = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            keys = self._buckets[i][offset:offset + remaining]
+            yield from keys
+            remaining -= len(keys)
+            i += 1
+            offset = 0
+
+    def _rebuild_tree(self):
+        # tree[n] holds the total length of the (n & -n) buckets ending with bucket n - 1.
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for n in range(1, len(tree)):
+            parent = n + (n & -n)
+            if parent < len(tree):
+                tree[parent] += tree[n]
+        self._tree = tree
+
+    def _update_tree(self, i: int, delta: int):
+        n = i + 1
+        while n < len(self._tree):
+            self._tree[n] += delta
+            n += n & -n
+
+    def _keys_before(self, i: int) -> int:
+        """
+        Returns the amount of keys in the buckets before bucket i.
+        """
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        """
+        Returns the bucket holding the key at the given position, and where in that bucket it is.
+        """
+        i = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            n = i + step
+            if n < len(self._tree) and self._tree[n] <= position:
+                i = n
+                position -= self._tree[n]
+            step >>= 1
+        return i, position
+
+
+class RankedLeaderboard:
+    """
+    The standings of every tracked toon in a single mode, kept in order as results come in.
+    Standings are a sorted list of (-SR, toonId) keys, so the highest SR is always first and ties are broken the same
+    way every time. Looking up a toon's rank takes a couple of binary searches and a walk up the bucket length tree, and
+    reading a page finds where it starts the same way, then only touches the records on that page.
+    """
+
+    def __init__(self):
+        self._records: dict[int, LeaderboardRecord] = {}
+        self._standings: SortedKeys = SortedKeys()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, toonId: int) -> bool:
+        return toonId in self._records
+
+    def get_record(self, toonId: int) -> LeaderboardRecord | None:
+        return self._records.get(toonId)
+
+    def update(self, toonId: int, name: str, skill_rating: int, wins: int, games_played: int):
+        """
+        Starts tracking a toon, or updates the record of a toon we are already tracking.
+        """
+        old_record = self._records.get(toonId)
+        if old_record is not None and old_record.skill_rating != skill_rating:
+            self._standings.discard((-old_record.skill_rating, toonId))
+            old_record = None
+
+        if old_record is None:
+            self._standings.add((-skill_rating, toonId))
+
+        self._records[toonId] = LeaderboardRecord(name, skill_rating, wins, games_played)
+
+    def remove(self, toonId: int) -> bool:
+        """
+        Stops tracking a toon. Returns False if they were never tracked.
+        """
+        record = self._records.pop(toonId, None)
+        if record is None:
+            return False
+
+        self._standings.discard((-record.skill_rating, toonId))
+        return True
+
+    def get_rank(self, toonId: int) -> int | None:
+        """
+        Returns the 1-based ranking of a toon, or None if they aren't tracked.
+        """
+        record = self._records.get(toonId)
+        if record is None:
+            return None
+
+        return self._standings.index((-record.skill_rating, toonId)) + 1
+
+    def get_page(self, start: int, amount: int) -> list[list]:
+        """
+        Returns up to amount leaderboard entries starting from the given 1-based ranking, in the format of a
+        LeaderboardEntry astron struct: [ranking, name, sr, wins, games]
+        """
+        if start <= 0 or amount <= 0:
+            return []
+
+        entries = []
+        for ranking, (_, toonId) in enumerate(self._standings.islice(start - 1, start - 1 + amount), start=start):
+            record = self._records[toonId]
+            entries.append([ranking, record.name, record.skill_rating, record.wins, record.games_played])
+        return entries
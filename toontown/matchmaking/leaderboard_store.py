@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+
+from direct.directnotify import DirectNotifyGlobal
+
+
+class LeaderboardStore:
+    """
+    Persists everything the leaderboard needs (name, SR, wins and games for every toon in every mode) to a SQLite
+    database, so the UD can rebuild its standings at boot with a single query instead of asking the Astron DB about
+    every tracked toon.
+
+    Writes are coalesced in memory by (mode, toon ID) and handed to a background thread in batches, either every
+    writePeriod seconds or once writeCountTrigger records are waiting, so finishing a match never waits on disk.
+    """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory('LeaderboardStore')
+
+    def __init__(self, filepath: str, writePeriod: float = 30, writeCountTrigger: int = 100):
+        self.filepath = filepath
+        self.writePeriod = writePeriod
+        self.writeCountTrigger = writeCountTrigger
+
+        # {(mode, toonId): (name, sr, wins, games)} waiting to be written. Newer records replace older ones.
+        self.__pending: dict[tuple[str, int], tuple[str, int, int, int]] = {}
+
+        # SQLite connections can only be used by the thread that made them, so the writer thread makes its own.
+        self.__batches: queue.Queue[list[tuple] | None] = queue.Queue()
+        self.__writer: threading.Thread | None = None
+
+        with sqlite3.connect(self.filepath) as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS leaderboard ('
+                'mode TEXT NOT NULL, toon_id INTEGER NOT NULL, name TEXT NOT NULL, '
+                'sr INTEGER NOT NULL, wins INTEGER NOT NULL, games INTEGER NOT NULL, '
+                'PRIMARY KEY (mode, toon_id))'
+            )
+        connection.close()
+
+    def open(self):
+        """
+        Starts the background writer and the periodic flush task.
+        """
+        if self.__writer is not None:
+            return
+
+        self.__writer = threading.Thread(target=self.__write_loop, name='leaderboard-store-writer', daemon=True)
+        self.__writer.start()
+        taskMgr.doMethodLater(self.writePeriod, self.__flush_task, 'leaderboard-store-flush')
+
+    def close(self):
+        """
+        Writes out anything still pending and waits for the writer to finish. Safe to call more than once.
+        """
+        taskMgr.remove('leaderboard-store-flush')
+        if self.__writer is None:
+            return
+
+        self.flush()
+        self.__batches.put(None)
+        self.__writer.join()
+        self.__writer = None
+
+    def load(self) -> dict[str, list[tuple[int, str, int, int, int]]]:
+        """
+        Reads every stored record. Returns {mode: [(toonId, name, sr, wins, games), ...]}
+        """
+        records: dict[str, list[tuple[int, str, int, int, int]]] = {}
+        connection = sqlite3.connect(self.filepath)
+        try:
+            for mode, toonId, name, sr, wins, games in connection.execute('SELECT mode, toon_id, name, sr, wins, games FROM leaderboard'):
+                records.setdefault(mode, []).append((toonId, name, sr, wins, games))
+        finally:
+            connection.close()
+        return records
+
+    def put(self, mode: str, toonId: int, name: str, sr: int, wins: int, games: int):
+        """
+        Queues a record to be written. If the toon already has a record waiting, it is replaced.
+        """
+        self.__pending[(mode, toonId)] = (name, sr, wins, games)
+        if len(self.__pending) >= self.writeCountTrigger:
+            self.flush()
+
+    def flush(self):
+        """
+        Hands every pending record to the writer thread.
+        """
+        if not self.__pending:
+            return
+
+        batch = [(mode, toonId, *record) for (mode, toonId), record in self.__pending.items()]
+        self.__pending = {}
+
+        # If we were never opened, there's no writer to hand this to. Write it ourselves.
+        if self.__writer is None:
+            connection = sqlite3.connect(self.filepath)
+            try:
+                self.__write_batch(connection, batch)
+            finally:
+                connection.close()
+            return
+
+        self.__batches.put(batch)
+
+    def __flush_task(self, task):
+        self.flush()
+        return task.again
+
+    def __write_loop(self):
+        connection = sqlite3.connect(self.filepath)
+        try:
+            while True:
+                batch = self.__batches.get()
+                if batch is None:
+                    return
+                self.__write_batch(connection, batch)
+        finally:
+            connection.close()
+
+    def __write_batch(self, connection: sqlite3.Connection, batch: list[tuple]):
+        try:
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO leaderboard (mode, toon_id, name, sr, wins, games) VALUES (?, ?, ?, ?, ?, ?)',
+                    batch
+                )
+        except sqlite3.Error as e:
+            self.notify.warning(f'Failed to write {len(batch)} leaderboard records to {self.filepath}: {e}')
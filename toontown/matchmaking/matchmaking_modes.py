@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import dataclasses
+
+from toontown.matchmaking.skill_globals import MODEL_CLASS
+from toontown.matchmaking.skill_profile_keys import SkillProfileKey
+from toontown.matchmaking.team_formation import HeadToHeadStrategy, SkillWindowStrategy, TeamFormationStrategy
+from toontown.matchmaking.zero_sum_elo_model import ZeroSumEloModel
+from toontown.toonbase import ToontownGlobals
+
+
+@dataclasses.dataclass(frozen=True)
+class MatchmakingMode:
+    """
+    Describes a queue the matchmaker runs. Every skill profile key gets its own queue, with its own lobby size,
+    the game to send players to, how often to look for matches and how to group players into matches.
+    Every player is on their own team, since the games don't support teams yet.
+    """
+    key: SkillProfileKey
+    num_teams: int  # The amount of teams in a match, which is also the amount of players.
+    game_id: int | None  # The minigame to send matches to. None lets the minigame creator decide.
+    strategy: TeamFormationStrategy
+    tick_interval: float | None = None  # How often to look for matches in seconds. None uses the matchmaker's default.
+
+    def get_players_per_match(self) -> int:
+        return self.num_teams
+
+    def get_model(self) -> MODEL_CLASS | ZeroSumEloModel:
+        return self.key.get_model()
+
+    def uses_zero_sum_model(self) -> bool:
+        return isinstance(self.get_model(), ZeroSumEloModel)
+
+
+MATCHMAKING_MODES: dict[SkillProfileKey, MatchmakingMode] = {
+    SkillProfileKey.CRANING_SOLOS: MatchmakingMode(
+        key=SkillProfileKey.CRANING_SOLOS,
+        num_teams=2,
+        game_id=ToontownGlobals.CraneGameId,
+        strategy=HeadToHeadStrategy(),
+    ),
+    SkillProfileKey.CRANING_FFA: MatchmakingMode(
+        key=SkillProfileKey.CRANING_FFA,
+        num_teams=4,
+        game_id=ToontownGlobals.CraneGameId,
+        strategy=SkillWindowStrategy(),
+        tick_interval=10,
+    ),
+    SkillProfileKey.MINIGAMES: MatchmakingMode(
+        key=SkillProfileKey.MINIGAMES,
+        num_teams=4,
+        game_id=None,
+        strategy=SkillWindowStrategy(),
+        tick_interval=10,
+    ),
+}
+
+# The mode players queue for when they don't ask for a specific one.
+DEFAULT_MATCHMAKING_MODE: SkillProfileKey = SkillProfileKey.CRANING_SOLOS
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import bisect
+import time
+import typing
+
+from toontown.matchmaking.skill_globals import MODEL, MODEL_CLASS, RATING_CLASS
+from toontown.matchmaking.skill_profile_keys import SkillProfileKey
+from toontown.matchmaking.zero_sum_elo_model import ZeroSumEloModel
+
+if typing.TYPE_CHECKING:
+    from toontown.matchmaking.matchmaking_modes import MatchmakingMode
+    from toontown.matchmaking.team_formation import Match
+    from toontown.toon.DistributedToonAI import DistributedToonAI
+
+
+class MatchmakingPlayer:
+    """
+    Wrapper class that contains a DistributedToonAI instance as well as additional information to aid in the
+    queue process. This is so we can keep track of things like wait time, OpenSkill matching softness, etc.
+    """
+
+    STARTING_SKILL_RANGE = 250
+
+    def __init__(self, avatar: DistributedToonAI, key: str):
+        self.avatar: DistributedToonAI = avatar
+        self.key: str = key
+
+        # The allowed range of players that are allowed to match with us.
+        self.skill_range = MatchmakingPlayer.STARTING_SKILL_RANGE
+
+        # How long we have been waiting for a match.
+        self.started_queue_at: float = time.time()
+
+        # The (position, total) we last told this player about, so we only resend it when it changes.
+        self.last_sent_status: tuple[int, int] | None = None
+
+        # Snapshot our skill at the time we joined the queue. Our profile can't change while we are waiting,
+        # and reading it (and building OpenSkill ratings from it) on every matchmaking pass is expensive.
+        profile = avatar.getOrCreateSkillProfile(key)
+        profile_key = SkillProfileKey.from_value(key)
+        self.model: MODEL_CLASS | ZeroSumEloModel = profile_key.get_model() if profile_key is not None else MODEL
+        self.skill: int = profile.mu
+        self.rating: RATING_CLASS = profile.to_openskill_rating()
+
+    def get_elapsed_queue_time(self) -> float:
+        """
+        Get the elapsed queue time in seconds.
+        """
+        return time.time() - self.started_queue_at
+
+    def get_skill(self) -> int:
+        """
+        Retrieves the hidden MMR of this player for the category they are queued for.
+        """
+        return self.skill
+
+    def get_skill_disparity(self, other: MatchmakingPlayer) -> int:
+        """
+        Returns the difference in skill between us and another player. Will always be a positive integer to
+        represent the "gap" in skill.
+        """
+        return abs(self.skill - other.skill)
+
+    def can_match_against(self, other: MatchmakingPlayer) -> bool:
+        """
+        Checks if we can match against the opponent. In order for that to be the case, our acceptable range must
+        be permissive of the skill disparity for both players.
+        """
+        disparity = self.get_skill_disparity(other)
+        if disparity <= self.skill_range and disparity <= other.skill_range:
+            return True
+
+        return False
+
+    def determine_match_quality(self, otherPlayer: MatchmakingPlayer) -> float:
+        """
+        Match quality is determined by how "close" of a match the two players should have.
+        There are many ways to come to a conclusion for this, but for a 1v1 we simply just want to know how
+        close these players are in terms of having a 50/50 win chance. We can calculate this pretty easy by
+        taking the difference in their win chance, and scaling it from 0->100. The lower the difference,
+        the better the matchup is. (return 100 if win chance is 50/50)
+        """
+        win_prediction = self.model.predict_win([[self.rating], [otherPlayer.rating]])[0]
+        return (1 - abs(win_prediction - 0.5) * 2) * 100
+
+
+class MatchmakingQueue:
+    """
+    The queue of players waiting for a match in a single matchmaking mode.
+    Players are keyed by avId in the order they joined, so joining, leaving and lookups are all O(1).
+    Alongside the queue order, players are kept in an index sorted by the skill they had when they joined,
+    so that finding opponents only has to look at the players within someone's skill range.
+    """
+
+    def __init__(self, mode: MatchmakingMode):
+        self.mode: MatchmakingMode = mode
+        self.key: SkillProfileKey = mode.key
+
+        # Maps avId -> player, in the order they joined the queue.
+        self._players: dict[int, MatchmakingPlayer] = {}
+
+        # (skill, avId) pairs, kept sorted. Used to look up everyone inside of a skill window.
+        self._skill_index: list[tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __iter__(self) -> typing.Iterator[MatchmakingPlayer]:
+        return iter(self._players.values())
+
+    def __contains__(self, avId: int) -> bool:
+        return avId in self._players
+
+    def get(self, avId: int) -> MatchmakingPlayer | None:
+        return self._players.get(avId)
+
+    def add(self, avatar: DistributedToonAI) -> MatchmakingPlayer | None:
+        """
+        Adds an avatar to the queue. Returns the queued player, or None if they were already queued.
+        """
+        avId = avatar.getDoId()
+        if avId in self._players:
+            return None
+
+        player = MatchmakingPlayer(avatar, self.key.value)
+        self._players[avId] = player
+        bisect.insort(self._skill_index, (player.skill, avId))
+        return player
+
+    def remove(self, avId: int) -> MatchmakingPlayer | None:
+        """
+        Removes an avatar from the queue. Returns the player that was removed, or None if they weren't queued.
+        """
+        player = self._players.pop(avId, None)
+        if player is None:
+            return None
+
+        entry = (player.skill, avId)
+        i = bisect.bisect_left(self._skill_index, entry)
+        if i < len(self._skill_index) and self._skill_index[i] == entry:
+            del self._skill_index[i]
+        return player
+
+    def clear(self):
+        self._players.clear()
+        self._skill_index.clear()
+
+    def get_status_changes(self) -> list[tuple[MatchmakingPlayer, int, int]]:
+        """
+        Returns (player, position, total) for every queued player whose position or queue total is different
+        from what they were last told, and marks the new status as sent.
+        """
+        changes: list[tuple[MatchmakingPlayer, int, int]] = []
+        total = len(self._players)
+        for position, player in enumerate(self._players.values(), start=1):
+            status = (position, total)
+            if player.last_sent_status == status:
+                continue
+
+            player.last_sent_status = status
+            changes.append((player, position, total))
+
+        return changes
+
+    def iter_nearest_players(self, player: MatchmakingPlayer) -> typing.Iterator[MatchmakingPlayer]:
+        """
+        Yields every other queued player inside of the given player's skill range, closest in skill first.
+        """
+        avId = player.avatar.getDoId()
+        index = self._skill_index
+        position = bisect.bisect_left(index, (player.skill, avId))
+        low = player.skill - player.skill_range
+        high = player.skill + player.skill_range
+        left = position - 1
+        right = position + 1 if position < len(index) and index[position][1] == avId else position
+
+        while True:
+            left_skill = index[left][0] if left >= 0 and index[left][0] >= low else None
+            right_skill = index[right][0] if right < len(index) and index[right][0] <= high else None
+            if left_skill is None and right_skill is None:
+                return
+
+            if right_skill is None or (left_skill is not None and player.skill - left_skill <= right_skill - player.skill):
+                yield self._players[index[left][1]]
+                left -= 1
+            else:
+                yield self._players[index[right][1]]
+                right += 1
+
+    def find_matches(self) -> list[Match]:
+        """
+        Groups up the players in this queue into matches using the mode's team formation strategy.
+        Does not remove anyone from the queue.
+        """
+        return self.mode.strategy.form_matches(self, self.mode)
+
+    def run_matching_pass(self, skill_range_widening: int) -> list[Match]:
+        """
+        Runs one pass of matchmaking: finds every match we can make right now, takes everyone in them out of the
+        queue, and gradually increases the acceptable match range of everyone left waiting.
+        Returns the matches that were made.
+        """
+        matches = self.find_matches()
+        for match in matches:
+            for team in match:
+                for player in team:
+                    self.remove(player.avatar.getDoId())
+
+        self.widen_skill_ranges(skill_range_widening)
+        return matches
+
+    def widen_skill_ranges(self, amount: int):
+        """
+        Gradually increases the acceptable match range of everyone still waiting.
+        """
+        for player in self._players.values():
+            player.skill_range += amount
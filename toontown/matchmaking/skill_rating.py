@@ -1,4 +1,4 @@
-from copy import deepcopy
+import dataclasses
 from typing import Any
 
 from direct.directnotify import DirectNotifyGlobal
@@ -12,6 +12,46 @@ from toontown.matchmaking.zero_sum_elo_model import ZeroSumEloModel
 
 notify = DirectNotifyGlobal.directNotify.newCategory("OpenSkill")
 
+def rate_matches(
+        model: MODEL_CLASS | ZeroSumEloModel,
+        matches: list[list[list[tuple[float, float]]]],
+        ranks: list[list[int]],
+        weights: list[list[list[float]]] | None = None,
+) -> list[list[list[tuple[float, float]]]]:
+    """
+    Rates many matches at once, without needing skill profiles. Every match is a list of teams, and every team is a
+    list of (mu, sigma) pairs. ranks (and optionally weights) line up with matches just like they do for model.rate(),
+    except ZeroSumEloModel only rates 1v1s and takes no weights. Returns new (mu, sigma) pairs in the same layout.
+    Useful for replaying lots of matches, such as rating migrations or a whole matchmaking pass.
+    Matches are rated independently of each other, so a player in multiple matches should be rated in separate calls.
+    """
+
+    # 1v1 ELO matches can all be calculated in one go.
+    if isinstance(model, ZeroSumEloModel):
+        # Same rules as model.rate(), which only rates 1v1s and has no use for weights.
+        for match in matches:
+            if len(match) != 2 or any(len(team) != 1 for team in match):
+                raise RuntimeError(f"Tried to perform 1v1 Zero-Sum ELO rating in a non 1v1 context! "
+                                   f"This is a developer error. Please check that the context of "
+                                   f"the match is a 1v1 before using this model. Team config: {match}")
+        if weights is not None:
+            raise RuntimeError("Zero-Sum ELO rating does not support weights!")
+
+        p1_mus, p2_mus = model.rate_batch(
+            [match[0][0][0] for match in matches],
+            [match[1][0][0] for match in matches],
+            ranks,
+        )
+        return [[[(p1_mu, 0)], [(p2_mu, 0)]] for p1_mu, p2_mu in zip(p1_mus, p2_mus)]
+
+    results = []
+    for i, match in enumerate(matches):
+        teams = [[model.rating(mu=mu, sigma=sigma) for mu, sigma in team] for team in match]
+        rated = model.rate(teams, ranks=ranks[i], weights=weights[i] if weights is not None else None)
+        results.append([[(player.mu, player.sigma) for player in team] for team in rated])
+    return results
+
+
 class OpenSkillMatchDeltaResults:
     """
     Mirrors the effects of what changes were made to player ratings after a match was calculated.
@@ -68,6 +108,10 @@ class OpenSkillMatch:
         self.teams: list[TeamSkillProfileCollection] = []
         self.ranks: list[int] = []
 
+        # Maps id(team) -> rank. Worked out once from every team's score the first time it's needed.
+        self.__team_rankings: dict[int, int] | None = None
+        self.__total_ranks: int = 1
+
     def __store_player(self, player: PlayerSkillProfile):
         """
         Caches old and new player data to be used for comparisons after skill adjustment.
@@ -75,8 +119,9 @@ class OpenSkillMatch:
         # Store the data so it can be retrieved by ID.
         self.new_player_data[player.identifier] = player
 
-        # Store a copy of the data so it can be compared against.
-        self.old_player_data[player.identifier] = deepcopy(player)
+        # Store a copy of the data so it can be compared against. Profiles only hold immutable values,
+        # so a shallow copy is enough.
+        self.old_player_data[player.identifier] = dataclasses.replace(player)
 
     def add_player(self, player: PlayerSkillProfile, score: int) -> TeamSkillProfileCollection:
         """
@@ -96,25 +141,38 @@ class OpenSkillMatch:
         add_player().
         """
         self.teams.append(team)
+        self.__team_rankings = None
         for player in team.as_list():
             self.__store_player(player)
 
     def get_team_ranking(self, team: TeamSkillProfileCollection) -> tuple[int, int]:
+        """
+        Returns the rank of a team based on team scores, and the total amount of ranks. Teams with the same score
+        share a rank.
+        """
+        if self.__team_rankings is None:
+            self.__calculate_team_rankings()
+
+        return self.__team_rankings.get(id(team), 1), self.__total_ranks
+
+    def __calculate_team_rankings(self):
+        self.__team_rankings = {}
+        self.__total_ranks = 1
+        if not self.teams:
+            return
 
         sorted_teams = sorted(self.teams, key=lambda iter_team: iter_team.get_team_score(), reverse=True)
         rank = 1
         point_value = sorted_teams[0].get_team_score()
-        found_team = 1
         for t in sorted_teams:
 
             if point_value != t.get_team_score():
                 point_value = t.get_team_score()
                 rank += 1
 
-            if t == team:
-                found_team = rank
+            self.__team_rankings[id(t)] = rank
 
-        return found_team, rank
+        self.__total_ranks = rank
 
     def adjust_ratings(self) -> OpenSkillMatchDeltaResults:
         """
@@ -122,14 +180,14 @@ class OpenSkillMatch:
         Keep in mind that the first team/player you added is considered the winner of the match.
         """
 
+        # Scores are final at this point. Work out the rankings of all the teams from scratch, just once.
+        self.__team_rankings = None
+
         # Construct the low level OpenSkill "match", where it is a 2D list of teams with players.
         match: list[list[RATING_CLASS]] = self.generate_openskill_match()
 
         # Generate the rankings of all the teams so we can rate the match using it.
-        self.ranks = []
-        for team in self.teams:
-            rank, _ = self.get_team_ranking(team)
-            self.ranks.append(rank)
+        self.ranks = [self.get_team_ranking(team)[0] for team in self.teams]
 
         # Adjust OpenSkill ratings.
         weights = [t.generate_weight_list() for t in self.teams]
@@ -139,10 +197,7 @@ class OpenSkillMatch:
             weights=weights,
         )
 
-        notify.warning(f"Generated match with the following teams: {match}")
-        notify.warning(f"the following ranks were used to rate: {self.ranks}")
-        notify.warning(f"the following weights were used: {weights}")
-        notify.warning(f"the following results were returned: {results}")
+        notify.debug(f"Rated match with teams: {match}, ranks: {self.ranks}, weights: {weights}, results: {results}")
 
         # The results should match up 1-to-1 with our team layout. Adjust sigma and mu values according to OpenSkill.
         for teamIndex, team in enumerate(results):
@@ -152,12 +207,13 @@ class OpenSkillMatch:
                 old_player.mu = int(round(member.mu))
 
         # Update games played for everyone involved. If it's the winning team, give them a win.
+        was_draw = max(self.ranks) <= 1
         for i, team in enumerate(self.teams):
             for player in team.as_list():
                 player.games_played += 1
                 player.placements_needed -= 1
                 player.placements_needed = max(0, player.placements_needed)
-                if self.ranks[i] == 1 and max(self.ranks) > 1:
+                if self.ranks[i] == 1 and not was_draw:
                     player.wins += 1
 
         # Now, SR adjustment. SR is pretty artificial, and is meant to be a dopamine chaser.
@@ -233,11 +289,8 @@ class OpenSkillMatch:
         Generates the structure of what OpenSkill expects. A list of teams, where each team is a list of players.
         """
         match: list[list[Any]] = []
-        ranks = []
         for team in self.teams:
             members = []
-            rank, _ = self.get_team_ranking(team)
-            ranks.append(rank)
             for player in team.as_list():
                 members.append(self.model.rating(mu=player.mu, sigma=player.sigma, name=str(player.identifier)))
             match.append(members)
@@ -1,7 +1,33 @@
+import math
+from typing import Sequence
+
+
 def interpolate_number(left: int, right: int, t: float) -> int:
     t = max(0.0, min(t, 1.0))  # Clamp t to 0-1
     return int(round(left + (right - left) * t))
 
 def interpolate_float(left: float, right: float, t: float) -> float:
     t = max(0.0, min(t, 1.0))  # Clamp t to 0-1
-    return left + (right - left) * t
\ No newline at end of file
+    return left + (right - left) * t
+
+def compress_ratings(ratings: Sequence[int], pivot: int, exponent: float) -> list[int]:
+    """
+    Runs every rating through the curve (rating - pivot) ** exponent + pivot, truncated to an int, to flatten out a
+    rating economy around the pivot. Ratings under the pivot raise a negative number to a fractional power, which Python
+    turns into a complex number, and only its real part is kept. Runs on every rating at once if NumPy is installed,
+    giving exactly the same results as one at a time.
+    """
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is None:
+        return [int(((rating - pivot) ** exponent + pivot).real) for rating in ratings]
+
+    # Python works out a negative base to a fractional power as abs(base) ** exponent * cos(pi * exponent), plus an
+    # imaginary part we don't care about. float_power uses the same pow() Python does, so the results are bit-identical.
+    offsets = numpy.asarray(ratings, dtype=numpy.float64) - pivot
+    curved = numpy.float_power(numpy.abs(offsets), exponent)
+    curved = numpy.where(offsets < 0, curved * math.cos(math.pi * exponent), curved)
+    return (curved + pivot).astype(numpy.int64).tolist()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from toontown.matchmaking.matchmaking_modes import MatchmakingMode
+    from toontown.matchmaking.matchmaking_queue import MatchmakingPlayer, MatchmakingQueue
+
+# A match is a list of teams, where each team is a list of players.
+Match = list[list['MatchmakingPlayer']]
+
+
+class TeamFormationStrategy:
+    """
+    Decides how the players waiting in a queue are grouped into matches. Strategies never remove anyone from the
+    queue, they only decide who should play who.
+    """
+
+    def form_matches(self, queue: MatchmakingQueue, mode: MatchmakingMode) -> list[Match]:
+        raise NotImplementedError
+
+
+class HeadToHeadStrategy(TeamFormationStrategy):
+    """
+    Pairs players up for a 1v1. Players who have waited the longest get to pick their opponent first, and
+    pick the highest quality match out of the players inside their skill range who will also accept them.
+    """
+
+    def form_matches(self, queue: MatchmakingQueue, mode: MatchmakingMode) -> list[Match]:
+        matches: list[Match] = []
+        _players_matched: set[int] = set()  # A flat set of players that have been matched up. Helps keep the code fast for lookups.
+
+        if len(queue) <= 1:
+            return matches
+
+        # In zero-sum ELO, win chance only depends on the gap in MMR. This means the closest opponent that is allowed
+        # to play us is always the best match, and we can stop looking as soon as we find them.
+        closest_is_best = mode.uses_zero_sum_model()
+
+        for player in queue:
+
+            # If this player was already matched up with someone previously, skip them.
+            if player.avatar.getDoId() in _players_matched:
+                continue
+
+            # This player needs a match. Only players inside of our skill window could possibly be allowed to play us.
+            matchup: MatchmakingPlayer | None = None
+            best_match_quality: float = 0
+            for otherPlayer in queue.iter_nearest_players(player):
+
+                # If this other player has already found a match, skip them.
+                if otherPlayer.avatar.getDoId() in _players_matched:
+                    continue
+
+                # Can these players play against each other? And is it a higher quality match?
+                if not player.can_match_against(otherPlayer):
+                    continue
+
+                this_match_quality = player.determine_match_quality(otherPlayer)
+                if this_match_quality > best_match_quality:
+                    matchup = otherPlayer
+                    best_match_quality = this_match_quality
+
+                if closest_is_best and matchup is not None:
+                    break
+
+            # Did we find a match? If not, skip and try again later.
+            if matchup is None:
+                continue
+
+            # We found one. Add the matchup and update required variables for future checks.
+            matches.append([[player], [matchup]])
+            _players_matched.add(player.avatar.getDoId())
+            _players_matched.add(matchup.avatar.getDoId())
+
+        return matches
+
+
+class SkillWindowStrategy(TeamFormationStrategy):
+    """
+    Fills free for all lobbies of any size. Players who have waited the longest anchor a lobby, which is filled with
+    the closest players in skill that everyone already in the lobby is allowed to play against. Every player in a
+    lobby is on their own team.
+    """
+
+    def form_matches(self, queue: MatchmakingQueue, mode: MatchmakingMode) -> list[Match]:
+        matches: list[Match] = []
+        _players_matched: set[int] = set()
+        players_needed = mode.get_players_per_match()
+
+        if len(queue) < players_needed:
+            return matches
+
+        for player in queue:
+
+            if player.avatar.getDoId() in _players_matched:
+                continue
+
+            # Fill the lobby with the closest players that are allowed to play everyone already in it.
+            lobby: list[MatchmakingPlayer] = [player]
+            for otherPlayer in queue.iter_nearest_players(player):
+
+                if otherPlayer.avatar.getDoId() in _players_matched:
+                    continue
+
+                if all(member.can_match_against(otherPlayer) for member in lobby):
+                    lobby.append(otherPlayer)
+
+                if len(lobby) >= players_needed:
+                    break
+
+            # Not enough people for this player yet. Try again later.
+            if len(lobby) < players_needed:
+                continue
+
+            matches.append([[member] for member in lobby])
+            for member in lobby:
+                _players_matched.add(member.avatar.getDoId())
+
+        return matches
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from direct.directnotify import DirectNotifyGlobal
 
@@ -19,6 +19,13 @@ class ZeroSumEloModel:
 
     Notify = DirectNotifyGlobal.directNotify.newCategory("ZeroSumEloModel")
 
+    # Maps the ranks of a match to the result for each player. 1.0 is a win, 0 is a loss and 0.5 is a draw.
+    MATCH_RESULTS = {
+        (1, 2): (1.0, 0.0),
+        (2, 1): (0.0, 1.0),
+        (1, 1): (0.5, 0.5),
+    }
+
     def __init__(self, k_factor: float = 32, max_elo_discrepancy: int = 400):
         """
         Initialize the zero-sum elo model. Optionally, you can specify a custom K-factor to use for ELO swings.
@@ -36,13 +43,27 @@ class ZeroSumEloModel:
         """
         return ZeroSumEloRating(mu=mu, sigma=0, name=name)
 
+    def __predict(self, p1_mu, p2_mu, power=pow):
+        """
+        The chance player 1 beats player 2. Works on plain floats, or on NumPy arrays when given numpy.float_power.
+        """
+        return 1.0 / (1.0 + power(10.0, (p2_mu - p1_mu) / self.skill_discrepancy))
+
+    def __adjust(self, p1_mu, p2_mu, p1_result, p2_result, power=pow):
+        """
+        The new ratings of both players after a match. Results are 1.0 for a win, 0 for a loss and 0.5 for a draw.
+        Both rate() and rate_batch() go through here, so they always give bit-identical results.
+        """
+        p1_prediction = self.__predict(p1_mu, p2_mu, power)
+        p2_prediction = 1 - p1_prediction
+        return (p1_mu + self.k_factor * (p1_result - p1_prediction),
+                p2_mu + self.k_factor * (p2_result - p2_prediction))
+
     def predict_win(self, teams: List[List[ZeroSumEloRating]]) -> list[float]:
         """
         Provides the probability of each player being able to win.
         """
-        p1 = teams[0][0]
-        p2 = teams[1][0]
-        p1_chance = 1.0 / (1.0 + pow(10, ((p2.mu - p1.mu) / self.skill_discrepancy)))
+        p1_chance = self.__predict(teams[0][0].mu, teams[1][0].mu)
         return [p1_chance, 1-p1_chance]
 
     def predict_rank(self, teams: List[List[ZeroSumEloRating]]) -> list[tuple[int, float]]:
@@ -98,26 +119,67 @@ class ZeroSumEloModel:
         p1 = teams[0][0]
         p2 = teams[1][0]
 
-        # Create new models that reflect these players. We only want to modify these so we can retain old data.
-        p1_new = ZeroSumEloRating(mu=p1.mu, name=p1.name)
-        p2_new = ZeroSumEloRating(mu=p2.mu, name=p2.name)
-
-        # Run some predictions. We use these in our adjustment formula.
-        p1_prediction, p2_prediction = self.predict_win([[p1], [p2]])
-
-        # What actually happened? 1.0 indicates a win, 0 indicates a loss.
-        p1_result = 1.0 if ranks[0] == 1 else 0.0
-        p2_result = 1.0 if ranks[1] == 1 else 0.0
+        # What actually happened? 1.0 indicates a win, 0 indicates a loss, 0.5 is a draw.
+        match_results = self.MATCH_RESULTS.get(tuple(ranks))
+        if match_results is None:
+            raise RuntimeError(f"Invalid ranks provided! Expected [1, 1], [1, 2] or [2, 1]. Got: {ranks}")
+        p1_result, p2_result = match_results
 
-        # What about a draw? This means the result is 0.5
-        if ranks == [1, 1]:
-            p1_result = p2_result = 0.5
-
-        # We now have the predictions and the results. We can adjust ratings.
-        p1_new.mu = p1.mu + self.k_factor * (p1_result - p1_prediction)
-        p2_new.mu = p2.mu + self.k_factor * (p2_result - p2_prediction)
+        # Create new models that reflect these players. We only want to modify these so we can retain old data.
+        p1_mu, p2_mu = self.__adjust(p1.mu, p2.mu, p1_result, p2_result)
+        p1_new = ZeroSumEloRating(mu=p1_mu, name=p1.name)
+        p2_new = ZeroSumEloRating(mu=p2_mu, name=p2.name)
         results = [[p1_new], [p2_new]]
         self.Notify.debug(f"Returning results from rate() -- old={teams} {results}")
 
         # Return the results matching the same format it was passed in.
         return results
+
+    def rate_batch(
+            self,
+            p1_mus: Sequence[float],
+            p2_mus: Sequence[float],
+            ranks: Sequence[Sequence[int]],
+    ) -> tuple[list[float], list[float]]:
+        """
+        Rates many 1v1 matches at once. p1_mus and p2_mus are the ratings of both players going into each match, and
+        ranks holds the [p1 rank, p2 rank] of each match, following the same rules as rate().
+        Returns the new ratings of (player 1s, player 2s). The results are exactly the same as calling rate() on every
+        match one by one, but if NumPy is installed every match is calculated at once.
+        """
+        if not (len(p1_mus) == len(p2_mus) == len(ranks)):
+            raise RuntimeError(f"Every match needs two ratings and a set of ranks! "
+                               f"Got {len(p1_mus)} player 1s, {len(p2_mus)} player 2s and {len(ranks)} ranks.")
+
+        # What actually happened? 1.0 indicates a win, 0 indicates a loss, 0.5 is a draw.
+        p1_results = []
+        p2_results = []
+        for match_ranks in ranks:
+            results = self.MATCH_RESULTS.get(tuple(match_ranks))
+            if results is None:
+                raise RuntimeError(f"Invalid ranks provided! Expected [1, 1], [1, 2] or [2, 1]. Got: {match_ranks}")
+            p1_results.append(results[0])
+            p2_results.append(results[1])
+
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        # Without NumPy, run rate()'s math one match at a time.
+        if numpy is None:
+            new_p1_mus = []
+            new_p2_mus = []
+            for match in zip(p1_mus, p2_mus, p1_results, p2_results):
+                p1_mu, p2_mu = self.__adjust(*match)
+                new_p1_mus.append(p1_mu)
+                new_p2_mus.append(p2_mu)
+            return new_p1_mus, new_p2_mus
+
+        # Every array operation here is the same IEEE operation rate() performs on each match, so the results are
+        # bit-identical. This is why float_power is used, numpy.power can use its own vectorized pow which rounds
+        # differently.
+        new_p1, new_p2 = self.__adjust(numpy.asarray(p1_mus, dtype=numpy.float64),
+                                       numpy.asarray(p2_mus, dtype=numpy.float64),
+                                       numpy.asarray(p1_results), numpy.asarray(p2_results), numpy.float_power)
+        return new_p1.tolist(), new_p2.tolist()
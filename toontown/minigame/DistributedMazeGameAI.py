@@ -4,7 +4,6 @@ from direct.fsm import State
 from . import PatternGameGlobals
 from direct.task.Task import Task
 from . import MazeGameGlobals
-from . import MazeData
 
 class DistributedMazeGameAI(DistributedMinigameAI):
 
@@ -28,6 +27,7 @@ class DistributedMazeGameAI(DistributedMinigameAI):
     def setGameReady(self):
         self.notify.debug('setGameReady')
         DistributedMinigameAI.setGameReady(self)
+        from . import MazeData
         mazeName = MazeGameGlobals.getMazeName(self.doId, self.numPlayers, MazeData.mazeNames)
         mData = MazeData.mazeData[mazeName]
         self.numTreasures = len(mData['treasurePosList'])
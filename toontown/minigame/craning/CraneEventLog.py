@@ -0,0 +1,241 @@
+import contextlib
+import struct
+import time
+from enum import IntEnum
+from typing import BinaryIO, NamedTuple
+
+from toontown.coghq.CraneLeagueGlobals import ScoreReason
+from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect
+
+MAGIC = b'CRNL'
+VERSION = 1
+
+# Magic, version, RNG seed, game doId, minigame id, when the log was opened (unix time), how many toons follow.
+HEADER = struct.Struct('<4sHQIHdB')
+# A toon playing, and their laff when the log was opened.
+HEADER_TOON = struct.Struct('<Iii')
+# What happened and when, in milliseconds since the log was opened.
+EVENT = struct.Struct('<BI')
+MODIFIER = struct.Struct('<hB')
+
+# Every state of the game's FSM, by the index it is logged with.
+STATES = ('inactive', 'prepare', 'play', 'victory', 'cleanup')
+SCORE_REASONS = list(ScoreReason)
+STATUS_EFFECTS = list(StatusEffect)
+
+GOON_SIDES = ('EmergeA', 'EmergeB')
+
+# Flags a hit is logged with.
+HIT_GOON = 1
+HIT_DOT = 2
+HIT_ATTRIBUTED = 4
+
+
+class CraneEventType(IntEnum):
+    # The game's FSM changed state.
+    STATE = 1
+    # A toon joined, readied up or exited the game, or logged out during it.
+    JOINED = 2
+    READY = 3
+    EXITED = 4
+    LEFT = 5
+    # The leader changed how many rounds the game is a best of.
+    BEST_OF = 6
+    # recordHit or recordHitWithAttribution was called.
+    HIT = 7
+    # addScore was called.
+    SCORE = 8
+    # A toon's laff changed because of something a client did.
+    TOON_HP = 9
+    # A status effect was applied to or removed from the boss.
+    STATUS_EFFECT = 10
+    # makeGoon made a goon.
+    GOON = 11
+    # rollRandomModifiers rolled some modifiers.
+    MODIFIERS = 12
+    # Someone won a round.
+    VICTOR = 13
+
+
+PAYLOADS = {
+    CraneEventType.STATE: struct.Struct('<B'),
+    CraneEventType.JOINED: struct.Struct('<I'),
+    CraneEventType.READY: struct.Struct('<I'),
+    CraneEventType.EXITED: struct.Struct('<I'),
+    CraneEventType.LEFT: struct.Struct('<I'),
+    # avId, rounds.
+    CraneEventType.BEST_OF: struct.Struct('<IB'),
+    # avId, damage, impact, which of the game's cranes it was from (or -1), objId, flags. Cranes are logged by index
+    # since a replay's cranes have different doIds.
+    CraneEventType.HIT: struct.Struct('<IifiIB'),
+    # avId, amount, reason, round, whether it was caused by another event in the log.
+    CraneEventType.SCORE: struct.Struct('<IiBB?'),
+    # avId, laff.
+    CraneEventType.TOON_HP: struct.Struct('<Ii'),
+    # effect, applied by, whether it was applied or removed.
+    CraneEventType.STATUS_EFFECT: struct.Struct('<BI?'),
+    # side, falling, stun time, velocity, hfov, attack radius, strength, scale.
+    CraneEventType.GOON: struct.Struct('<B?ffffif'),
+    # How many (modifier enum, tier) pairs follow.
+    CraneEventType.MODIFIERS: struct.Struct('<B'),
+    CraneEventType.VICTOR: struct.Struct('<I'),
+}
+
+# Events that come from outside the game's own logic, which a replay has to feed back in. Scores are only inputs if
+# nothing else in the log caused them.
+INPUT_EVENTS = {
+    CraneEventType.JOINED, CraneEventType.READY, CraneEventType.EXITED, CraneEventType.LEFT,
+    CraneEventType.BEST_OF, CraneEventType.HIT, CraneEventType.TOON_HP, CraneEventType.STATUS_EFFECT,
+}
+
+
+class CraneEvent(NamedTuple):
+    type: CraneEventType
+    # Seconds since the log was opened.
+    time: float
+    args: tuple
+
+    def isInput(self) -> bool:
+        if self.type == CraneEventType.SCORE:
+            return not self.args[4]
+        return self.type in INPUT_EVENTS
+
+
+class CraneEventLogContents(NamedTuple):
+    seed: int
+    gameDoId: int
+    minigameId: int
+    startTime: float
+    # avId -> (laff, max laff) when the log was opened.
+    toons: dict[int, tuple[int, int]]
+    events: list[CraneEvent]
+    # Whether the log ended partway through an event, like it does when the AI dies.
+    truncated: bool
+
+
+class CraneEventLog:
+    """
+    Writes everything that happens in a crane game to a compact, append-only binary stream, so the game can be
+    replayed later without any clients.
+
+    Events are written to the stream as they happen. The log doesn't need an open stream to be used: games always have
+    one, and keep track of which events are caused by others through it, but only write anything once opened.
+
+    An event is an input if it came from outside the game's own logic (a client reported it, or it came from an
+    object the replay doesn't drive). Anything that happens while an event is being handled is caused by it, and
+    replays work it out again instead of feeding it in.
+    """
+
+    def __init__(self):
+        self.stream: BinaryIO | None = None
+        self.startTime = 0.0
+        self.depth = 0
+
+    def open(self, stream: BinaryIO, seed: int, gameDoId: int, minigameId: int, toons: list[tuple[int, int, int]]):
+        self.stream = stream
+        self.startTime = globalClock.getFrameTime()
+        self.stream.write(HEADER.pack(MAGIC, VERSION, seed, gameDoId, minigameId, time.time(), len(toons)))
+        for toon in toons:
+            self.stream.write(HEADER_TOON.pack(*toon))
+
+    def isOpen(self) -> bool:
+        return self.stream is not None
+
+    def flush(self):
+        if self.stream is not None:
+            self.stream.flush()
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def isInput(self) -> bool:
+        """
+        Returns True if nothing else being logged is being handled right now.
+        """
+        return self.depth == 0
+
+    @contextlib.contextmanager
+    def nested(self):
+        """
+        Marks everything logged inside this block as caused by the event being handled.
+        """
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+    def write(self, eventType: CraneEventType, *args):
+        if self.stream is None:
+            return
+        elapsed = round((globalClock.getFrameTime() - self.startTime) * 1000)
+        self.stream.write(EVENT.pack(eventType, elapsed) + PAYLOADS[eventType].pack(*args))
+
+    def writeState(self, state: str):
+        self.write(CraneEventType.STATE, STATES.index(state))
+
+    def writeHit(self, avId: int, damage: int, impact: float, craneIndex: int, objId: int, isGoon: bool, isDOT: bool,
+                 attributed: bool = False):
+        flags = (HIT_GOON if isGoon else 0) | (HIT_DOT if isDOT else 0) | (HIT_ATTRIBUTED if attributed else 0)
+        self.write(CraneEventType.HIT, avId, damage, impact, craneIndex, objId, flags)
+
+    def writeScore(self, avId: int, amount: int, reason: ScoreReason, round: int):
+        self.write(CraneEventType.SCORE, avId, amount, SCORE_REASONS.index(reason), round, not self.isInput())
+
+    def writeStatusEffect(self, statusEffect: StatusEffect, appliedByAvId: int | None, applied: bool):
+        self.write(CraneEventType.STATUS_EFFECT, STATUS_EFFECTS.index(statusEffect), appliedByAvId or 0, applied)
+
+    def writeGoon(self, side: str, falling: bool, stunTime: float, velocity: float, hFov: float, attackRadius: float,
+                  strength: int, scale: float):
+        self.write(CraneEventType.GOON, GOON_SIDES.index(side), falling, stunTime, velocity, hFov, attackRadius,
+                   strength, scale)
+
+    def writeModifiers(self, modifiers):
+        if self.stream is None:
+            return
+        self.write(CraneEventType.MODIFIERS, len(modifiers))
+        for modifier in modifiers:
+            self.stream.write(MODIFIER.pack(modifier.MODIFIER_ENUM, modifier.tier))
+
+
+def readCraneEventLog(stream: BinaryIO) -> CraneEventLogContents:
+    """
+    Reads a whole log back. A log that ends partway through an event is read up to the last whole one.
+    """
+    data = stream.read()
+    magic, version, seed, gameDoId, minigameId, startTime, numToons = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('Not a crane event log')
+    if version != VERSION:
+        raise ValueError(f'Crane event log is version {version}, expected {VERSION}')
+
+    offset = HEADER.size
+    toons = {}
+    for _ in range(numToons):
+        avId, hp, maxHp = HEADER_TOON.unpack_from(data, offset)
+        toons[avId] = (hp, maxHp)
+        offset += HEADER_TOON.size
+
+    events = []
+    truncated = False
+    while offset < len(data):
+        try:
+            eventType, elapsed = EVENT.unpack_from(data, offset)
+            eventType = CraneEventType(eventType)
+            payload = PAYLOADS[eventType]
+            args = payload.unpack_from(data, offset + EVENT.size)
+            offset += EVENT.size + payload.size
+            if eventType == CraneEventType.MODIFIERS:
+                modifiers = []
+                for _ in range(args[0]):
+                    modifiers.append(MODIFIER.unpack_from(data, offset))
+                    offset += MODIFIER.size
+                args = tuple(modifiers)
+        except struct.error:
+            truncated = True
+            break
+        events.append(CraneEvent(eventType, elapsed / 1000, args))
+
+    return CraneEventLogContents(seed, gameDoId, minigameId, startTime, toons, events, truncated)
@@ -0,0 +1,187 @@
+import collections
+import math
+import time
+
+from direct.directnotify import DirectNotifyGlobal
+
+
+def getImpactForSpeed(speed: float) -> float:
+    """
+    The impact a client reports for an object hitting the boss at the given speed. Mirrors the formula in
+    DistributedCashbotBossObject.__hitBoss.
+    """
+    return min(1.0, max(pow(speed, 1.75) / 466.475, 0.0))
+
+
+class ObjectTrack:
+    """
+    Everything we know about an object since it was last grabbed.
+    """
+
+    __slots__ = ('avId', 'craneId', 'samples', 'hits', 'clockSkewed')
+
+    def __init__(self, avId: int, craneId: int, sampleLimit: int):
+        self.avId = avId
+        self.craneId = craneId
+        # [(client time, arrival time, x, y, z), ...] of the position updates the controlling client sent.
+        self.samples = collections.deque(maxlen=sampleLimit)
+        self.hits = 0
+        self.clockSkewed = False
+
+
+class CraneHitValidatorAI:
+    """
+    Checks the boss hits clients report in the crane game against what the AI has seen of the object that hit.
+
+    Object physics only runs on the client that dropped the object, so the AI can't work out hits for itself.
+    What it does get is the crane and avatar that grabbed the object and the position updates the dropping client
+    broadcasts, so every reported hit is checked against a simple kinematic model built from those: the object
+    must have been grabbed by the reporting toon with the reported crane, can only hit once per grab, must have
+    been near the boss, and must have been moving fast enough (going by how far it moved between updates) to
+    produce the reported impact.
+
+    Every track keeps a bounded number of samples, so a check does a fixed amount of work no matter how long a
+    match runs. Checks that still take longer than the per-event budget are counted, so an overloaded district
+    shows up in the stats.
+    """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory('CraneHitValidatorAI')
+
+    # How many position updates to remember for each object. Clients send 20 a second while an object falls.
+    SAMPLE_LIMIT = 32
+
+    # How far back from a hit to look for the speed the object was moving at. Clients take the impact from the
+    # fastest of the speeds they sampled over the last 0.7 seconds.
+    SPEED_WINDOW = 1.0
+
+    # Speeds are measured between updates at least this far apart, so quantized positions and timestamps don't
+    # turn into huge speeds.
+    MIN_BASELINE = 0.15
+
+    # Leeway for everything the AI can't see: quantization, the object speeding up between updates, and so on.
+    SPEED_TOLERANCE = 1.25
+    SPEED_SLACK = 4.0
+
+    # No object can honestly move faster than this between two updates.
+    MAX_OBJECT_SPEED = 150.0
+
+    # How far (across the floor) from the boss an object can be and still reach his head.
+    HEAD_REACH = 25.0
+
+    # How far apart a client's timestamps and our own clock can drift before we stop trusting them.
+    MAX_CLOCK_SKEW = 1.0
+
+    def __init__(self, budget: float = 0.0005):
+        # The most time a single check should take, in seconds.
+        self.budget = budget
+
+        self.tracks: dict[int, ObjectTrack] = {}
+
+        # {(avId, code): count} of every reason a hit was implausible.
+        self.violations = collections.Counter()
+        self.checkedHits = 0
+        self.unverifiedHits = 0
+        self.overBudgetChecks = 0
+
+    def objectGrabbed(self, objId: int, avId: int, craneId: int):
+        """
+        Starts a new track for an object that a crane just picked up.
+        """
+        self.tracks[objId] = ObjectTrack(avId, craneId, self.SAMPLE_LIMIT)
+
+    def forgetObject(self, objId: int):
+        self.tracks.pop(objId, None)
+
+    def recordMotion(self, objId: int, clientTime: float, arrivalTime: float, x: float, y: float, z: float):
+        """
+        Remembers a position update the client controlling an object sent us.
+        """
+        track = self.tracks.get(objId)
+        if track is None:
+            return
+
+        if abs(clientTime - arrivalTime) > self.MAX_CLOCK_SKEW:
+            track.clockSkewed = True
+            return
+
+        track.samples.append((clientTime, arrivalTime, x, y, z))
+
+    def getMaxSpeed(self, samples: list) -> float | None:
+        """
+        Returns the fastest the samples show the object moving, or None if they're too close together to tell.
+        """
+        maxSpeed = None
+        j = 0
+        for i in range(len(samples)):
+            clientTime, _, x, y, z = samples[i]
+            # Pair every sample with the first one far enough after it.
+            j = max(j, i + 1)
+            while j < len(samples) and samples[j][0] - clientTime < self.MIN_BASELINE:
+                j += 1
+            if j >= len(samples):
+                break
+
+            otherTime, _, otherX, otherY, otherZ = samples[j]
+            speed = math.sqrt((otherX - x) ** 2 + (otherY - y) ** 2 + (otherZ - z) ** 2) / (otherTime - clientTime)
+            if maxSpeed is None or speed > maxSpeed:
+                maxSpeed = speed
+
+        return maxSpeed
+
+    def checkHit(self, objId: int, avId: int, craneId: int, impact: float, now: float, bossPos) -> list[tuple[str, str]]:
+        """
+        Checks a reported hit. Returns [(code, detail), ...] of every reason it is implausible, which is empty if the
+        hit looks legitimate.
+        """
+        start = time.perf_counter()
+        self.checkedHits += 1
+        violations = []
+
+        track = self.tracks.get(objId)
+        if track is None:
+            violations.append(('never-grabbed', 'object was never grabbed'))
+        else:
+            if avId != track.avId:
+                violations.append(('wrong-avatar', 'grabbed by %s' % track.avId))
+            if craneId != track.craneId:
+                violations.append(('wrong-crane', 'reported crane %s, but grabbed by crane %s' % (craneId, track.craneId)))
+            if track.hits:
+                violations.append(('repeat-hit', 'object already hit the boss since it was grabbed'))
+            if track.clockSkewed:
+                violations.append(('clock-skew', 'position updates were timestamped too far from our clock'))
+            track.hits += 1
+
+            samples = [sample for sample in track.samples if now - sample[1] <= self.SPEED_WINDOW]
+            if samples:
+                _, _, x, y, _ = samples[-1]
+                distance = math.sqrt((x - bossPos[0]) ** 2 + (y - bossPos[1]) ** 2)
+                if distance > self.HEAD_REACH:
+                    violations.append(('distance', 'object was %.1f ft away from the boss' % distance))
+
+            maxSpeed = self.getMaxSpeed(samples)
+            if maxSpeed is None:
+                # Hit right after being dropped, before we heard enough about how fast it was going.
+                self.unverifiedHits += 1
+            else:
+                if maxSpeed > self.MAX_OBJECT_SPEED:
+                    violations.append(('teleport', 'object moved at %.1f ft/s' % maxSpeed))
+
+                allowedImpact = getImpactForSpeed(maxSpeed * self.SPEED_TOLERANCE + self.SPEED_SLACK)
+                if impact > allowedImpact + 0.001:
+                    violations.append(('impact', 'impact %.3f, but object was only moving at %.1f ft/s' % (impact, maxSpeed)))
+
+        for code, _ in violations:
+            self.violations[(avId, code)] += 1
+
+        if time.perf_counter() - start > self.budget:
+            self.overBudgetChecks += 1
+
+        return violations
+
+    def getStats(self) -> dict:
+        return {
+            'checked': self.checkedHits,
+            'unverified': self.unverifiedHits,
+            'violations': sum(self.violations.values()),
+            'overBudget': self.overBudgetChecks,
+        }
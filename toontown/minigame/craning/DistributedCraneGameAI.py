@@ -1,5 +1,7 @@
 import math
+import os
 import random
+import time
 from operator import itemgetter
 
 from direct.fsm import ClassicFSM
@@ -18,13 +20,17 @@ from toontown.coghq.DistributedCashbotBossTreasureAI import DistributedCashbotBo
 from toontown.matchmaking.skill_profile_keys import SkillProfileKey
 from toontown.minigame.DistributedMinigameAI import DistributedMinigameAI
 from toontown.minigame.craning import CraneGameGlobals
+from toontown.minigame.craning.CraneEventLog import CraneEventLog, CraneEventType
 from toontown.minigame.craning.CraneGamePracticeCheatAI import CraneGamePracticeCheatAI
+from toontown.minigame.craning.CraneHitValidatorAI import CraneHitValidatorAI
+from toontown.minigame.craning.SafeBroadphase import SafeBroadphase
 from toontown.suit.DistributedCashbotBossGoonAI import DistributedCashbotBossGoonAI
 from toontown.suit.DistributedCashbotBossStrippedAI import DistributedCashbotBossStrippedAI
 from toontown.toon.DistributedToonAI import DistributedToonAI
 from toontown.toonbase import ToontownGlobals
 from toontown.minigame.statuseffects.DistributedStatusEffectSystemAI import DistributedStatusEffectSystemAI
 from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect, SAFE_ALLOWED_EFFECTS
+from toontown.minigame.statuseffects.StatusEffectScheduler import StatusEffectScheduler
 
 class DistributedCraneGameAI(DistributedMinigameAI):
     DESPERATION_MODE_ACTIVATE_THRESHOLD = 1800
@@ -50,6 +56,9 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # We need a scene to do the collision detection in.
         self.scene = NodePath('scene')
 
+        # Goons pushing safes (and safes pushing each other) is worked out against this instead of the scene.
+        self.safeBroadphase = SafeBroadphase(self)
+
         self.toonsWon = False
 
         self.rollModsOnStart = False
@@ -100,8 +109,8 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # Add our game ClassicFSM to the framework ClassicFSM
         self.addChildGameFSM(self.gameFSM)
         
-        # Track safe effect tasks
-        self.safeEffectTasks = set()
+        # Track safe effect removal timers, by safe doId
+        self.safeEffectTasks = {}
 
         # State tracking related to the overtime mechanic.
         self.overtimeWillHappen = False  # Setting this to True will cause the CFO to enter "overtime" mode when time runs out.
@@ -113,10 +122,28 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
         self.statusEffectSystem: DistributedStatusEffectSystemAI | None = None
 
+        # Checks the hits clients report against what we've seen of the objects they hit with.
+        self.hitValidator = CraneHitValidatorAI(budget=simbase.config.GetFloat('crane-hit-check-budget', 0.0005))
+        # Whether implausible hits are thrown away in ranked games, rather than just being logged.
+        self.enforceHitChecks = simbase.config.GetBool('want-crane-hit-enforcement', False)
+
+        # Everything random in the game comes from these, so a game can be replayed from its seed. Treasures and safe
+        # effects get their own, since how often they roll depends on what clients do.
+        self.setRandomSeed(random.getrandbits(64))
+
+        # Records what happens in the game, if want-crane-event-log is on.
+        self.eventLog = CraneEventLog()
+
         # Memory leak prevention - track event listeners and task names
         self._deathListenerEvents = []
         self._allTaskNames = set()
 
+    def setRandomSeed(self, seed: int):
+        self.randomSeed = seed
+        self.random = random.Random(seed)
+        self.treasureRandom = random.Random(f'{seed}-treasure')
+        self.safeEffectRandom = random.Random(f'{seed}-safe-effects')
+
     def isRanked(self) -> bool:
 
         # Todo: setting for this. We don't want EVERY game to be ranked.
@@ -124,6 +151,8 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
     def generate(self):
         self.notify.debug("generate")
+        if simbase.config.GetBool('want-crane-event-log', False):
+            self.__openEventLog()
         self.__makeBoss()
         DistributedMinigameAI.generate(self)
 
@@ -131,6 +160,18 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         self.notify.debug("announceGenerate")
         self.__updateSkillProfile()
 
+    def __openEventLog(self):
+        directory = simbase.config.GetString('crane-event-log-dir', 'crane-logs')
+        os.makedirs(directory, exist_ok=True)
+        filename = os.path.join(directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{self.doId}.crl')
+
+        toons = []
+        for avId in self.avIdList:
+            toon = self.air.getDo(avId)
+            if toon is not None:
+                toons.append((avId, toon.getHp(), toon.getMaxHp()))
+        self.eventLog.open(open(filename, 'ab'), self.randomSeed, self.doId, self.minigameId, toons)
+
     def __makeBoss(self):
         self.__deleteBoss()
 
@@ -190,9 +231,9 @@ class DistributedCraneGameAI(DistributedMinigameAI):
             taskMgr.remove(taskName)
         self._allTaskNames.clear()
         
-        # Clean up safe effect tasks
-        for taskName in self.safeEffectTasks:
-            taskMgr.remove(taskName)
+        # Clean up safe effect timers
+        for timer in self.safeEffectTasks.values():
+            StatusEffectScheduler.cancel(timer)
         self.safeEffectTasks.clear()
         
         # Clean up specific known tasks
@@ -211,6 +252,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # Clean up objects
         self.__deleteCraningObjects()
         self.__deleteBoss()
+        self.safeBroadphase.destroy()
         
         # Clean up scene
         if self.scene is not None:
@@ -221,6 +263,8 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         if hasattr(self, 'practiceCheatHandler'):
             self.practiceCheatHandler = None
 
+        self.eventLog.close()
+
     def delete(self):
         self.notify.debug("delete")
         # Clean up all resources
@@ -247,6 +291,18 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         self.d_setBestOf()
         self.d_setRoundInfo()
 
+    def setAvatarJoined(self):
+        self.eventLog.write(CraneEventType.JOINED, self.air.getAvatarIdFromSender())
+        DistributedMinigameAI.setAvatarJoined(self)
+
+    def setAvatarReady(self):
+        self.eventLog.write(CraneEventType.READY, self.air.getAvatarIdFromSender())
+        DistributedMinigameAI.setAvatarReady(self)
+
+    def setAvatarExited(self):
+        self.eventLog.write(CraneEventType.EXITED, self.air.getAvatarIdFromSender())
+        DistributedMinigameAI.setAvatarExited(self)
+
     def setupRuleset(self):
         self.ruleset = CraneLeagueGlobals.CraneGameRuleset()
         self.modifiers.clear()
@@ -255,7 +311,9 @@ class DistributedCraneGameAI(DistributedMinigameAI):
             modifiers.append(modifier)
         # Should we randomize some modifiers?
         if self.rollModsOnStart:
-            modifiers += self.rollRandomModifiers()
+            rolled = self.rollRandomModifiers()
+            self.eventLog.writeModifiers(rolled or [])
+            modifiers += rolled
 
         # Add default competitive modifiers only on first setup for 2+ players
         if len(self.getParticipantsNotSpectating()) >= 2 and not self.defaultModifiersInitialized:
@@ -319,7 +377,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
     def rollRandomModifiers(self):
         tierLeftBound = self.ruleset.MODIFIER_TIER_RANGE[0]
         tierRightBound = self.ruleset.MODIFIER_TIER_RANGE[1]
-        pool: list[CraneLeagueGlobals.CFORulesetModifierBase] = [c(random.randint(tierLeftBound, tierRightBound)) for c in
+        pool: list[CraneLeagueGlobals.CFORulesetModifierBase] = [c(self.random.randint(tierLeftBound, tierRightBound)) for c in
                 CraneLeagueGlobals.NON_SPECIAL_MODIFIER_CLASSES]
 
         alreadyApplied = [mod.MODIFIER_ENUM for mod in self.desiredModifiers]
@@ -330,15 +388,15 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         if len(pool) <= 0:
             return
 
-        random.shuffle(pool)
+        self.random.shuffle(pool)
 
         modifiers = [pool.pop() for _ in range(self.numModsWanted)]
 
         # If we roll a % roll, go ahead and make this a special cfo
         # Doing this last also ensures any rules that the special mod needs to set override
-        if random.randint(0, 99) < CraneLeagueGlobals.SPECIAL_MODIFIER_CHANCE:
-            cls = random.choice(CraneLeagueGlobals.SPECIAL_MODIFIER_CLASSES)
-            tier = random.randint(tierLeftBound, tierRightBound)
+        if self.random.randint(0, 99) < CraneLeagueGlobals.SPECIAL_MODIFIER_CHANCE:
+            cls = self.random.choice(CraneLeagueGlobals.SPECIAL_MODIFIER_CLASSES)
+            tier = self.random.randint(tierLeftBound, tierRightBound)
             mod_instance = cls(tier)
             modifiers.append(mod_instance)
 
@@ -520,6 +578,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         self.sendUpdate('updateCombo', [avId, comboLength])
 
     def handleExitedAvatar(self, avId):
+        self.eventLog.write(CraneEventType.LEFT, avId)
         taskMgr.remove(self.uniqueName(f"reviveToon-{avId}"))
         self.removeToon(avId)
 
@@ -579,6 +638,11 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         """
         A toon wants to grab a certain treasure. Validates the treasure is valid to grab
         """
+        self.__grabAttempt(avId, treasureId)
+        # Treasures heal whoever grabs them, which replays can't work out without the treasure.
+        self.__writeToonHp(avId)
+
+    def __grabAttempt(self, avId, treasureId):
 
         # First, try to see if we can find the treasure that was grabbed.
         treasure = self.treasures.get(treasureId)
@@ -636,7 +700,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
         # Drop chance?
         if self.ruleset.GOON_TREASURE_DROP_CHANCE < 1.0:
-            if random.random() > self.ruleset.GOON_TREASURE_DROP_CHANCE:
+            if self.treasureRandom.random() > self.ruleset.GOON_TREASURE_DROP_CHANCE:
                 return
 
         # The BossCog acts like a treasure planner as far as the
@@ -653,7 +717,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
         # Then perterb that point by a distance in some random
         # direction.
-        angle = random.uniform(0.0, 2.0 * math.pi)
+        angle = self.treasureRandom.uniform(0.0, 2.0 * math.pi)
         radius = 10
         dx = radius * math.cos(angle)
         dy = radius * math.sin(angle)
@@ -667,7 +731,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         treasureHealIndex = int(clamp(treasureHealIndex, 0, len(self.ruleset.GOON_HEALS) - 1))
         healAmount = self.ruleset.GOON_HEALS[treasureHealIndex]
         availStyles = self.ruleset.TREASURE_STYLES[treasureHealIndex]
-        style = random.choice(availStyles)
+        style = self.treasureRandom.choice(availStyles)
 
         if self.recycledTreasures:
             # Reuse a previous treasure object
@@ -706,7 +770,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # Default goon spawning logic.
         # Is it okay to pick a random side?
         if self.goonCache[1] < 2:
-            return random.choice(['EmergeA', 'EmergeB'])
+            return self.random.choice(['EmergeA', 'EmergeB'])
 
         # There's too many goons coming from a certain side. Pick the opposite one.
         if self.goonCache[0] == 'EmergeA':
@@ -739,7 +803,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
             side = self.__chooseGoonEmergeSide()
 
         # Should this goon fall if we are in overtime?
-        falling = random.random() < fallingChance
+        falling = self.random.random() < fallingChance
 
         # Long logic process to determine whether a goon should be made and what type.
         # If we are at max goon size, do not make a new goon
@@ -785,6 +849,9 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # Apply multipliers if necessary
         goon_velocity *= self.ruleset.GOON_SPEED_MULTIPLIER
 
+        self.eventLog.writeGoon(side, self.currentlyInOvertime and falling, goon_stun_time, goon_velocity, goon_hfov,
+                                goon_attack_radius, goon_strength, goon_scale)
+
         # Apply attributes to the goon
         goon.STUN_TIME = goon_stun_time
         goon.b_setupGoon(velocity=goon_velocity, hFov=goon_hfov, attackRadius=goon_attack_radius,
@@ -810,8 +877,8 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # Half of our allotted area for falling goons is 250 pi. Chance of 21+ iterations is 1.15%. 41+ is 0.013%.
         while True:
             # Random position 15-20 units away from CFO on correct side
-            radius = random.uniform(20, 30)
-            theta = random.uniform(-math.pi, math.pi)
+            radius = self.random.uniform(20, 30)
+            theta = self.random.uniform(-math.pi, math.pi)
             xPos = bossPos[0] + radius * math.cos(theta)
 
             #Bad luck protection position calculation
@@ -822,7 +889,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
             # Check if position is clear
             if self.__isPositionClear(xPos, yPos):
-                randomH = random.uniform(0, 360)  # Random heading between 0-360 degrees
+                randomH = self.random.uniform(0, 360)  # Random heading between 0-360 degrees
                 goon.b_setPosHpr(xPos, yPos, 40, randomH, 0, 0)
                 goon.request('Falling')
                 return
@@ -862,7 +929,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         if noRandom:
             t += radius
         else:
-            t += radius * random.uniform(-1, 1)
+            t += radius * self.random.uniform(-1, 1)
         t = max(min(t, 1.0), 0.0)
         return fromValue + (toValue - fromValue) * t
 
@@ -884,12 +951,12 @@ class DistributedCraneGameAI(DistributedMinigameAI):
                 if numParticipants > 0:
                     # Randomize only the first 'numParticipants' positions
                     firstPositions = self.toonSpawnpointOrder[:numParticipants]
-                    random.shuffle(firstPositions)
+                    self.random.shuffle(firstPositions)
                     # Put the randomized positions back at the beginning
                     self.toonSpawnpointOrder[:numParticipants] = firstPositions
             # For other matches (best of 3, 5, 7), use the existing ruleset randomization if enabled
             elif self.ruleset.RANDOM_SPAWN_POSITIONS:
-                random.shuffle(self.toonSpawnpointOrder)
+                self.random.shuffle(self.toonSpawnpointOrder)
                 
         self.d_setToonSpawnpointOrder()
 
@@ -923,6 +990,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         """Handle best-of setting from the leader"""
         # Verify the sender is the leader (first player in avIdList)
         senderId = self.air.getAvatarIdFromSender()
+        self.eventLog.write(CraneEventType.BEST_OF, senderId, value)
         if senderId != self.avIdList[0]:
             self.notify.warning(f"Non-leader {senderId} tried to set best-of value")
             return
@@ -1015,6 +1083,18 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         return self.boss
 
     def damageToon(self, toon, deduction):
+        with self.eventLog.nested():
+            self.__damageToon(toon, deduction)
+        self.__writeToonHp(toon.getDoId())
+
+    def __writeToonHp(self, avId):
+        if not self.eventLog.isOpen() or not self.eventLog.isInput():
+            return
+        toon = self.air.getDo(avId)
+        if toon is not None:
+            self.eventLog.write(CraneEventType.TOON_HP, avId, toon.getHp())
+
+    def __damageToon(self, toon, deduction):
         if toon.getHp() <= 0:
             return
 
@@ -1023,10 +1103,46 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
         toon.takeDamage(deduction)
 
+    def checkReportedHit(self, obj, avId, impact, craneId) -> bool:
+        """
+        Checks a hit a client reported with one of our objects. Implausible hits are logged, and only rejected
+        (returning False) in ranked games with enforcement turned on.
+        """
+        violations = self.hitValidator.checkHit(obj.doId, avId, craneId, impact, globalClock.getFrameTime(),
+                                                self.boss.getPos(self.scene))
+        if not violations:
+            return True
+
+        details = '; '.join(detail for _, detail in violations)
+        self.notify.warning(f'Implausible hit from {avId} with object {obj.doId}: {details}')
+        self.air.writeServerEvent('suspicious', avId, f'Implausible crane hit with object {obj.doId}: {details}')
+        return not (self.enforceHitChecks and self.isRanked())
+
+    def __getCraneIndex(self, craneId) -> int:
+        for i, crane in enumerate(self.cranes):
+            if crane.doId == craneId:
+                return i
+        return -1
+
+    def recordStatusEffect(self, objectId, statusEffect, appliedByAvId, applied):
+        """
+        Called by the status effect system whenever an effect is applied or removed. Effects on the boss change how
+        much damage hits do, so they are logged.
+        """
+        if self.boss is not None and objectId == self.boss.doId:
+            self.eventLog.writeStatusEffect(statusEffect, appliedByAvId, applied)
+
     def getToonOutgoingMultiplier(self, avId):
         return 100
 
     def recordHit(self, damage, impact=0, craneId=-1, objId=0, isGoon=False, isDOT=False):
+        if self.eventLog.isOpen() and self.eventLog.isInput():
+            self.eventLog.writeHit(self.air.getAvatarIdFromSender(), damage, impact, self.__getCraneIndex(craneId), objId,
+                                   isGoon, isDOT)
+        with self.eventLog.nested():
+            self.__recordHit(damage, impact, craneId, objId, isGoon, isDOT)
+
+    def __recordHit(self, damage, impact=0, craneId=-1, objId=0, isGoon=False, isDOT=False):
 
         # Don't process a hit if we aren't in the play state.
         if self.gameFSM.getCurrentState().getName() != 'play':
@@ -1103,6 +1219,13 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         Record a hit with damage attributed to a specific avatar ID.
         Used for status effects that deal damage on behalf of other players.
         """
+        if self.eventLog.isOpen() and self.eventLog.isInput():
+            self.eventLog.writeHit(attributeToAvId, damage, impact, self.__getCraneIndex(craneId), objId, isGoon, isDOT,
+                                   attributed=True)
+        with self.eventLog.nested():
+            self.__recordHitWithAttribution(damage, attributeToAvId, impact, craneId, objId, isGoon, isDOT)
+
+    def __recordHitWithAttribution(self, damage, attributeToAvId, impact=0, craneId=-1, objId=0, isGoon=False, isDOT=False):
         # Don't process a hit if we aren't in the play state.
         if self.gameFSM.getCurrentState().getName() != 'play':
             return
@@ -1158,6 +1281,12 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         if amount == 0:
             return
 
+        self.eventLog.writeScore(avId, amount, reason, self.currentRound)
+        with self.eventLog.nested():
+            self.__addScore(avId, amount, reason)
+
+    def __addScore(self, avId: int, amount: int, reason: CraneLeagueGlobals.ScoreReason):
+
         self.getScoringContext().get_round(self.currentRound).add_score(avId, amount)
         self.d_addScore(avId, amount, reason)
 
@@ -1223,8 +1352,14 @@ class DistributedCraneGameAI(DistributedMinigameAI):
     FSM states
     """
 
+    def __writeState(self, state):
+        self.eventLog.writeState(state)
+        # Not much is lost if the AI goes down in the middle of a round.
+        self.eventLog.flush()
+
     def enterInactive(self):
         self.notify.debug("enterInactive")
+        self.__writeState('inactive')
 
     def exitInactive(self):
         pass
@@ -1238,6 +1373,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
     def enterPrepare(self):
         self.notify.debug("enterPrepare")
+        self.__writeState('prepare')
         if not self.__bossExists():
             self.__makeBoss()
         self.boss.b_setAttackCode(ToontownGlobals.BossCogNoAttack)
@@ -1266,6 +1402,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
     def enterPlay(self):
         self.notify.debug("enterPlay")
+        self.__writeState('play')
         taskMgr.remove(self.uniqueName("craneGameVictory"))
         self.battleThreeStart = globalClock.getFrameTime()
 
@@ -1330,23 +1467,19 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
     def __applyRandomSafeEffects(self, task=None):
         """Apply random status effects to safes periodically"""
-        if random.random() < 0.9:  # 90% chance
+        if self.safeEffectRandom.random() < 0.9:  # 90% chance
             for safe in self.safes:
                 if safe and not self.statusEffectSystem.isObjectStatusEffected(safe.getDoId()):
-                    statusEffect = random.choice(list(SAFE_ALLOWED_EFFECTS))
+                    statusEffect = self.safeEffectRandom.choice(list(SAFE_ALLOWED_EFFECTS))
                     self.statusEffectSystem.b_applyStatusEffect(safe.getDoId(), statusEffect)
-                    # Store the safe's doId before creating the task
-                    safeDoId = safe.getDoId()
-                    # Create task name
-                    taskName = self.uniqueName(f'remove-effect-{safeDoId}')
                     # Remove the effect after 10 seconds
-                    taskMgr.doMethodLater(10.0, lambda task, doId=safeDoId, effect=statusEffect: self.__removeSafeEffect(doId, effect) or task.done, taskName)
-                    # Track the task
-                    self.safeEffectTasks.add(taskName)
+                    self.safeEffectTasks[safe.getDoId()] = self.statusEffectSystem.schedule(
+                        10.0, self.__removeSafeEffect, safe.getDoId(), statusEffect)
         return task.again
 
     def __removeSafeEffect(self, doId, effect):
         """Safely remove a status effect from a safe, handling the case where the safe no longer exists"""
+        self.safeEffectTasks.pop(doId, None)
         if not hasattr(self, 'statusEffectSystem') or not self.statusEffectSystem:
             return True
             
@@ -1424,7 +1557,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         # If so, assign one lucky person the win.
         # In the future, we can probably determine this another way, but right now I am lazy.
         if allToonsAreDead and len(self.currentWinners) > 1:
-            self.addScore(random.choice(self.currentWinners), 1, CraneLeagueGlobals.ScoreReason.COIN_FLIP)
+            self.addScore(self.random.choice(self.currentWinners), 1, CraneLeagueGlobals.ScoreReason.COIN_FLIP)
 
         # End the game if everyone died or if it is literally impossible for the winner to be overtaken.
         if allToonsAreDead or winnerIsAlreadyDetermined:
@@ -1446,10 +1579,12 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         """
         Drain all present toons' laff by one.
         """
-        for toon in self.getParticipantsNotSpectating():
-            if not self.ruleset.LAFF_DRAIN_KILLS_TOONS and toon.getHp() <= 1:
-                continue
-            self.damageToon(toon, 1)
+        # Replays drain laff on their own, so this isn't logged as toons taking damage.
+        with self.eventLog.nested():
+            for toon in self.getParticipantsNotSpectating():
+                if not self.ruleset.LAFF_DRAIN_KILLS_TOONS and toon.getHp() <= 1:
+                    continue
+                self.damageToon(toon, 1)
         return task.again
 
     def __doInitialGoons(self, task):
@@ -1524,18 +1659,20 @@ class DistributedCraneGameAI(DistributedMinigameAI):
         self.sendUpdate('setOvertime', [flag])
 
     def enterVictory(self):
-
+        self.__writeState('victory')
 
         highest_scorers = self.getHighestScorers()
 
         # If nobody is in the lead (?) then go next round.
         if len(highest_scorers) == 0:
+            self.eventLog.write(CraneEventType.VICTOR, 0)
             self.sendUpdate("declareVictor", [0])
             taskMgr.doMethodLater(5, self.__startNextRound, self.uniqueName("craneGameNextRound"), extraArgs=[])
             return
 
         # If multiple people are in the lead (?) then just pick the first person. Otherwise, it will be THE winner.
         victorId = highest_scorers[0]
+        self.eventLog.write(CraneEventType.VICTOR, victorId)
         self.getScoringContext().get_round(self.currentRound).set_winners(highest_scorers)
 
         # Handle best-of matches
@@ -1585,6 +1722,7 @@ class DistributedCraneGameAI(DistributedMinigameAI):
 
     def enterCleanup(self):
         self.notify.debug("enterCleanup")
+        self.__writeState('cleanup')
         self.__deleteCraningObjects()
         self.__deleteBoss()
         self.gameFSM.request('inactive')
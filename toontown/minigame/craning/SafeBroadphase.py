@@ -0,0 +1,132 @@
+"""
+A uniform grid of safe positions, used by the crane game to work out which safes emerging goons and pushed safes
+are touching without traversing the whole collision scene for every goon and every push.
+"""
+
+import math
+
+from direct.task.TaskManagerGlobal import taskMgr
+
+# The radii of the collision spheres goons and safes push each other with. These match the solids the safes and
+# goons put in the scene, so anything pushed here is exactly what the scene would have reported as touching.
+SAFE_RADIUS = 6
+SAFE_TO_SAFE_RADIUS = 8
+GOON_SAFE_DETECTION_RADIUS = 1.8
+
+# The furthest apart two things can be and still push one another.
+MAX_PUSH_DISTANCE = max(SAFE_TO_SAFE_RADIUS * 2, GOON_SAFE_DETECTION_RADIUS + SAFE_TO_SAFE_RADIUS)
+
+
+class SafeBroadphase:
+    """
+    Buckets every safe into square cells on the floor, so that finding the safes near a point only looks at the
+    handful of cells around it. Cells are as wide as the furthest push reaches, so a query only ever needs the
+    surrounding 3x3 cells.
+    """
+
+    def __init__(self, owner, cellSize=MAX_PUSH_DISTANCE):
+        # The crane game (or CFO) whose safes these are.
+        self.owner = owner
+        self.cellSize = cellSize
+        self.cells = {}  # {(cell x, cell y): [safe, ...]}
+        self.positions = {}  # {safe doId: (x, y, z)}
+        self.safeCells = {}  # {safe doId: (cell x, cell y)}
+
+        # {goon doId: goon} of every goon that is currently able to push safes around.
+        self.pushers = {}
+        self.taskName = None
+
+    def destroy(self):
+        if self.taskName is not None:
+            taskMgr.remove(self.taskName)
+            self.taskName = None
+        self.pushers.clear()
+        self.clear()
+        self.owner = None
+
+    def addPusher(self, goon):
+        """
+        Starts letting a goon push safes. Every pusher is handled in one pass a frame.
+        """
+        self.pushers[goon.doId] = goon
+        if self.taskName is None:
+            self.taskName = self.owner.uniqueName('push-safes')
+            taskMgr.add(self.__pushSafes, self.taskName)
+
+    def removePusher(self, goon):
+        self.pushers.pop(goon.doId, None)
+        if not self.pushers and self.taskName is not None:
+            taskMgr.remove(self.taskName)
+            self.taskName = None
+
+    def __pushSafes(self, task):
+        self.rebuild(self.owner.safes or ())
+        for goon in list(self.pushers.values()):
+            goon.pushNearbySafes(self)
+        return task.cont
+
+    def getCell(self, x, y):
+        return math.floor(x / self.cellSize), math.floor(y / self.cellSize)
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+        self.safeCells.clear()
+
+    def rebuild(self, safes):
+        """
+        Reads the position of every safe again. Safes are moved around by their clients, so this is done at the
+        start of every pass.
+        """
+        self.clear()
+        for safe in safes:
+            self.update(safe)
+
+    def update(self, safe):
+        """
+        Moves a safe to wherever it is now.
+        """
+        pos = safe.getPos()
+        pos = (pos[0], pos[1], pos[2])
+        cell = self.getCell(pos[0], pos[1])
+
+        oldCell = self.safeCells.get(safe.doId)
+        if oldCell != cell:
+            if oldCell is not None:
+                self.cells[oldCell].remove(safe)
+                if not self.cells[oldCell]:
+                    del self.cells[oldCell]
+            self.cells.setdefault(cell, []).append(safe)
+            self.safeCells[safe.doId] = cell
+
+        self.positions[safe.doId] = pos
+
+    def remove(self, safe):
+        cell = self.safeCells.pop(safe.doId, None)
+        if cell is None:
+            return
+
+        self.cells[cell].remove(safe)
+        if not self.cells[cell]:
+            del self.cells[cell]
+        del self.positions[safe.doId]
+
+    def getSafesNear(self, pos, radius):
+        """
+        Returns [(safe, distance), ...] for every safe whose center is within radius of pos.
+        """
+        x, y, z = pos[0], pos[1], pos[2]
+        cellX, cellY = self.getCell(x, y)
+        reach = max(1, math.ceil(radius / self.cellSize))
+        radiusSquared = radius * radius
+
+        nearby = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                for safe in self.cells.get((cellX + dx, cellY + dy), ()):
+                    safeX, safeY, safeZ = self.positions[safe.doId]
+                    distanceSquared = (safeX - x) ** 2 + (safeY - y) ** 2 + (safeZ - z) ** 2
+                    if distanceSquared <= radiusSquared:
+                        nearby.append((safe, math.sqrt(distanceSquared)))
+
+        return nearby
@@ -1,5 +1,7 @@
 from __future__ import annotations
+from collections import Counter
 from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect
+from toontown.minigame.statuseffects.StatusEffectScheduler import StatusEffectScheduler
 from direct.distributed.DistributedObjectAI import DistributedObjectAI
 from toontown.minigame.statuseffects.CraneGameEventContext import CraneGameBossHitContext
 
@@ -8,12 +10,30 @@ class DistributedStatusEffectSystemAI(DistributedObjectAI):
         DistributedObjectAI.__init__(self, air)
         self.game = game
         self.statusEffects = list(statusEffects)
-        self.objectsWithStatusEffects = {}
+        self.objectsWithStatusEffects = {}  # Maps objectId -> Counter of statusEffect -> how many times it is applied
         self.effectAppliedBy = {}  # Maps (objectId, statusEffect) -> avId who applied it
 
+        # Runs every status effect timer in the game (durations, burn ticks, explosions) from one task.
+        self.scheduler = StatusEffectScheduler()
+
+    def announceGenerate(self):
+        DistributedObjectAI.announceGenerate(self)
+        self.scheduler.start(self.uniqueName('status-effect-timers'))
+
+    def isEnabled(self):
+        game = self.game
+        return game is not None and game.ruleset.WANT_ELEMENTAL_MASTERY_MODE
+
+    def schedule(self, delay, callback, *args):
+        """Calls callback(*args) after delay seconds. Returns a timer that can be passed to cancel()"""
+        return self.scheduler.schedule(delay, callback, *args)
+
+    def cancel(self, timer):
+        self.scheduler.cancel(timer)
+
     # DO Methods to apply status effects to targets
     def b_applyStatusEffect(self, objectId, statusEffect, appliedByAvId=None):
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
             return
         self.applyStatusEffect(objectId, statusEffect, appliedByAvId)
         self.d_applyStatusEffect(objectId, statusEffect)
@@ -22,24 +42,26 @@ class DistributedStatusEffectSystemAI(DistributedObjectAI):
         self.sendUpdate("applyStatusEffect", [objectId, statusEffect.toAstron()])
 
     def applyStatusEffect(self, objectId, statusEffect, appliedByAvId=None):
-        currentStatusEffects = self.objectsWithStatusEffects.get(objectId, [])
-        currentStatusEffects.append(statusEffect)
-        self.objectsWithStatusEffects[objectId] = currentStatusEffects
+        currentStatusEffects = self.objectsWithStatusEffects.setdefault(objectId, Counter())
+        currentStatusEffects[statusEffect] += 1
         
         # Track who applied this effect
         if appliedByAvId is not None:
             self.effectAppliedBy[(objectId, statusEffect)] = appliedByAvId
+
+        if self.game is not None:
+            self.game.recordStatusEffect(objectId, statusEffect, appliedByAvId, True)
         
         # Notify the object if it has status effect handling methods
         obj = self.air.getDo(objectId)
         if obj and hasattr(obj, 'onStatusEffectApplied'):
             obj.onStatusEffectApplied(statusEffect, appliedByAvId)
         
-        self.notify.warning(f'Applied status effect {statusEffect}. All status effects: {self.objectsWithStatusEffects[objectId]}')
+        self.notify.debug(f'Applied status effect {statusEffect}. All status effects: {self.getStatusEffects(objectId)}')
 
     # DO Methods to remove status effects from targets
     def b_removeStatusEffect(self, objectId, statusEffect):
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
             return
         self.removeStatusEffect(objectId, statusEffect)
         self.d_removeStatusEffect(objectId, statusEffect)
@@ -48,17 +70,21 @@ class DistributedStatusEffectSystemAI(DistributedObjectAI):
         self.sendUpdate("removeStatusEffect", [objectId, statusEffect.toAstron()])
 
     def removeStatusEffect(self, objectId, statusEffect):
-        currentStatusEffects = self.objectsWithStatusEffects.get(objectId, [])
-        if statusEffect in currentStatusEffects:
-            currentStatusEffects.remove(statusEffect)
-            self.objectsWithStatusEffects[objectId] = currentStatusEffects
-            if len(currentStatusEffects) == 0:
+        currentStatusEffects = self.objectsWithStatusEffects.get(objectId)
+        if currentStatusEffects and statusEffect in currentStatusEffects:
+            currentStatusEffects[statusEffect] -= 1
+            if currentStatusEffects[statusEffect] <= 0:
+                del currentStatusEffects[statusEffect]
+            if not currentStatusEffects:
                 del self.objectsWithStatusEffects[objectId]
             
             # Clean up the appliedBy tracking
             effectKey = (objectId, statusEffect)
             if effectKey in self.effectAppliedBy:
                 del self.effectAppliedBy[effectKey]
+
+            if self.game is not None:
+                self.game.recordStatusEffect(objectId, statusEffect, None, False)
             
             # Notify the object if it has status effect handling methods
             obj = self.air.getDo(objectId)
@@ -67,41 +93,44 @@ class DistributedStatusEffectSystemAI(DistributedObjectAI):
 
     # DO Methods to check if objects have status effects
     def hasStatusEffect(self, objectId, statusEffect):
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
             return False
-        return statusEffect in self.objectsWithStatusEffects.get(objectId, [])
+        return statusEffect in self.objectsWithStatusEffects.get(objectId, ())
 
     def removeAllStatusEffects(self, objectId):
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
             return
-        for statusEffect in self.objectsWithStatusEffects.get(objectId, []):
+        for statusEffect in self.getStatusEffects(objectId):
             self.b_removeStatusEffect(objectId, statusEffect)
 
     def isObjectStatusEffected(self, objectId):
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
             return False
-        return len(self.objectsWithStatusEffects.get(objectId, [])) > 0
+        return objectId in self.objectsWithStatusEffects
     
     def getStatusEffects(self, objectId):
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
+            return []
+        currentStatusEffects = self.objectsWithStatusEffects.get(objectId)
+        if not currentStatusEffects:
             return []
-        return self.objectsWithStatusEffects.get(objectId, [])
+        return list(currentStatusEffects.elements())
     
     def getEffectAppliedBy(self, objectId, statusEffect):
         """Get the avId of the player who applied this status effect"""
-        if not hasattr(self, 'game') or not self.game or not hasattr(self.game, 'ruleset') or not self.game.ruleset.WANT_ELEMENTAL_MASTERY_MODE:
+        if not self.isEnabled():
             return None
         return self.effectAppliedBy.get((objectId, statusEffect))
 
     def cleanup(self):
         """Clean up all status effect tracking to prevent memory leaks"""
-        # Clear all tracking dictionaries
+        # Stop every pending timer and clear all tracking dictionaries
+        self.scheduler.destroy()
         self.objectsWithStatusEffects.clear()
         self.effectAppliedBy.clear()
         
         # Break circular reference to game
-        if hasattr(self, 'game'):
-            self.game = None
+        self.game = None
 
     def delete(self):
         # Clean up all tracking before deletion
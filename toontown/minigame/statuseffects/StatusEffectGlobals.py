@@ -9,6 +9,10 @@ class StatusEffect(Enum):
     FROZEN = 6
     SHATTERED = 7
 
+    # Members are singletons, so hash them by identity rather than by name. Effects are looked up in dicts and sets
+    # on every hit and every status effect query.
+    __hash__ = object.__hash__
+
     def toAstron(self):
         return self.value
     
@@ -0,0 +1,126 @@
+import math
+
+from direct.task.TaskManagerGlobal import taskMgr
+
+
+class StatusEffectTimer:
+    """
+    A callback waiting in a StatusEffectScheduler. Hold on to it to cancel it.
+    """
+
+    __slots__ = ('deadline', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline: int, callback, args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class StatusEffectScheduler:
+    """
+    A hashed timer wheel that runs every status effect timer in a game from a single task.
+
+    Time is split into ticks of a fixed resolution, and every timer goes into the slot its deadline falls in, so
+    scheduling and cancelling are O(1) and each frame only looks at the slots of the ticks that passed. Timers more
+    than a lap of the wheel away just sit in their slot until their lap comes around.
+    """
+
+    def __init__(self, resolution: float = 0.05, size: int = 256):
+        self.resolution = resolution
+        self.size = size
+        self.slots: list[list[StatusEffectTimer]] = [[] for _ in range(size)]
+
+        # The last tick that was run, and the frame time tick 0 was at.
+        self.currentTick = 0
+        self.startTime = None
+        self.taskName = None
+
+    def start(self, taskName: str):
+        self.stop()
+        self.startTime = globalClock.getFrameTime() - self.currentTick * self.resolution
+        self.taskName = taskName
+        taskMgr.add(self.__tick, taskName)
+
+    def stop(self):
+        if self.taskName is not None:
+            taskMgr.remove(self.taskName)
+            self.taskName = None
+
+    def destroy(self):
+        self.stop()
+        for slot in self.slots:
+            slot.clear()
+
+    def __tick(self, task):
+        self.advance(globalClock.getFrameTime())
+        return task.cont
+
+    def schedule(self, delay: float, callback, *args) -> StatusEffectTimer:
+        """
+        Calls callback(*args) once delay seconds have passed. The callback runs on the first frame after its tick,
+        so it may be up to a frame plus the resolution late, but never early.
+        """
+        if self.startTime is None:
+            deadline = self.currentTick + math.ceil(delay / self.resolution - 1e-9)
+        else:
+            # Timed from the frame we are on, which can be part of the way into the current tick.
+            deadline = math.ceil((globalClock.getFrameTime() + delay - self.startTime) / self.resolution - 1e-9)
+        timer = StatusEffectTimer(max(deadline, self.currentTick + 1), callback, args)
+        self.slots[timer.deadline % self.size].append(timer)
+        return timer
+
+    @staticmethod
+    def cancel(timer: StatusEffectTimer | None):
+        # Cancelled timers are thrown away when their slot next comes around.
+        if timer is not None:
+            timer.cancelled = True
+
+    def advance(self, now: float):
+        """
+        Runs every timer that is due by the given frame time.
+        """
+        if self.startTime is None:
+            self.startTime = now - self.currentTick * self.resolution
+
+        targetTick = int((now - self.startTime) / self.resolution)
+        if targetTick <= self.currentTick:
+            return
+
+        # Only the slots of the ticks that passed can hold anything due. After a stall of more than a lap, that is
+        # every slot.
+        firstTick = self.currentTick + 1
+        lastTick = min(targetTick, self.currentTick + self.size)
+        # Anything the callbacks schedule is timed from now.
+        self.currentTick = targetTick
+
+        due = []
+        for tick in range(firstTick, lastTick + 1):
+            index = tick % self.size
+            slot = self.slots[index]
+            if not slot:
+                continue
+
+            waiting = []
+            for timer in slot:
+                if timer.cancelled:
+                    continue
+                if timer.deadline <= targetTick:
+                    due.append(timer)
+                else:
+                    waiting.append(timer)
+            self.slots[index] = waiting
+
+        # Slots are visited in tick order, but after a stall of more than a lap they hold timers from several laps.
+        if lastTick - firstTick >= self.size - 1:
+            due.sort(key=lambda timer: timer.deadline)
+
+        for timer in due:
+            # A timer that ran before this one may have cancelled it.
+            if not timer.cancelled:
+                # Cancelling a timer that already ran does nothing.
+                timer.cancelled = True
+                timer.callback(*timer.args)
+
+    def getPendingCount(self) -> int:
+        return sum(1 for slot in self.slots for timer in slot if not timer.cancelled)
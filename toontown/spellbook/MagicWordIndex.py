@@ -1867,12 +1867,19 @@ class LeaveRace(MagicWord):
 
 
 class Queue(MagicWord):
-    desc = "Enters the matchmaking queue."
+    desc = "Enters the matchmaking queue. Optionally, specify the mode to queue for."
     execLocation = MagicWordConfig.EXEC_LOC_SERVER
     accessLevel = 'TTOFF_DEVELOPER'
+    arguments = [("mode", str, False, '')]
 
     def handleWord(self, invoker, avId, toon, *args):
-        success = simbase.air.matchmaker.addPlayerToQueue(toon)
+        from toontown.matchmaking.matchmaking_modes import DEFAULT_MATCHMAKING_MODE
+        from toontown.matchmaking.skill_profile_keys import SkillProfileKey
+        key = SkillProfileKey.from_value(args[0]) if args[0] else DEFAULT_MATCHMAKING_MODE
+        if key is None or key not in simbase.air.matchmaker.queues:
+            return f"There is no queue for {args[0]}. Valid modes: {', '.join(k.value for k in simbase.air.matchmaker.queues)}"
+
+        success = simbase.air.matchmaker.addPlayerToQueue(toon, key)
         if not success:
             return f"{toon.getName()} was unable to join the queue. They are probably already in it."
 
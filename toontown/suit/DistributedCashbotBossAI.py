@@ -15,6 +15,7 @@ from toontown.coghq import CraneLeagueGlobals
 from toontown.battle import BattleExperienceAI
 from toontown.chat import ResistanceChat
 from toontown.toon import DistributedToonAI
+from toontown.minigame.craning.SafeBroadphase import SafeBroadphase
 from direct.fsm import FSM
 from . import DistributedBossCogAI
 import random
@@ -43,6 +44,9 @@ class DistributedCashbotBossAI(DistributedBossCogAI.DistributedBossCogAI, FSM.FS
         self.scene = NodePath('scene')
         self.reparentTo(self.scene)
 
+        # Goons pushing safes (and safes pushing each other) is worked out against this instead of the scene.
+        self.safeBroadphase = SafeBroadphase(self)
+
         # And some solids to keep the goons constrained to our room.
         cn = CollisionNode('walls')
         cs = CollisionSphere(0, 0, 0, 13)
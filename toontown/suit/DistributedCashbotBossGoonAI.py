@@ -7,6 +7,7 @@ from direct.task.Task import Task
 from toontown.toonbase import ToontownGlobals
 from otp.otpbase import OTPGlobals
 from toontown.coghq import DistributedCashbotBossObjectAI, CraneLeagueGlobals
+from toontown.minigame.craning import SafeBroadphase
 from direct.showbase import PythonUtil
 from . import DistributedGoonAI
 import math
@@ -76,7 +77,7 @@ class DistributedCashbotBossGoonAI(DistributedGoonAI.DistributedGoonAI, Distribu
 
         # Add safeDetectionFeelers from -45° to 45°
         cn = CollisionNode('safeDetectionFeelers')
-        cn.addSolid(CollisionSphere(0, 0, 0, 1.8))  # Sphere to detect safes
+        cn.addSolid(CollisionSphere(0, 0, 0, SafeBroadphase.GOON_SAFE_DETECTION_RADIUS))  # Sphere to detect safes
         cn.setFromCollideMask(ToontownGlobals.CashbotBossObjectBitmask)
         cn.setIntoCollideMask(BitMask32(0))  # Only detect safes, no collisions INTO these segments
         self.safeDetectionFeelersPath = self.attachNewNode(cn)
@@ -113,25 +114,18 @@ class DistributedCashbotBossGoonAI(DistributedGoonAI.DistributedGoonAI, Distribu
         newSafePos = safePos + direction * pushDistance
         safe.push(newSafePos[0], newSafePos[1], newSafePos[2], safe.getH(), self)
 
-    def __checkSafeCollisions(self, task):
-        self.cTrav.traverse(self.boss.scene)
+    def pushNearbySafes(self, broadphase):
+        # Called by the broadphase once a frame while we're emerging.
+        reach = SafeBroadphase.GOON_SAFE_DETECTION_RADIUS + SafeBroadphase.SAFE_TO_SAFE_RADIUS
+        for safe, distance in broadphase.getSafesNear(self.getPos(), reach):
+            if safe.state not in ['Sliding Floor', 'Free']:
+                continue
 
-        for i in range(self.cQueue.getNumEntries()):
-            entry = self.cQueue.getEntry(i)
-            intoNodePath = entry.getIntoNodePath()
-            intoNode = intoNodePath.node()
-            fromNode = entry.getFromNode()
-
-            # Only process safe collisions from safe detection feelers
-            if 'safe' in intoNode.getName() and 'safeDetectionFeelers' in fromNode.getName():
-                # Get the safe's doId
-                safeDoIdTag = intoNodePath.getNetTag('doId')
-                if safeDoIdTag:
-                    safeDoId = int(safeDoIdTag)
-                    safe = simbase.air.doId2do.get(safeDoId)
-                    if safe and safe.state in ['Sliding Floor', 'Free']:
-                        self._pushSafe(safe)
-        return task.cont
+            # Our sphere touches the safe's safe-to-safe sphere and, when we're close enough, its smaller goon
+            # sphere too. The safe gets pushed once for each, just like when both showed up in a traversal.
+            self._pushSafe(safe)
+            if distance <= SafeBroadphase.GOON_SAFE_DETECTION_RADIUS + SafeBroadphase.SAFE_RADIUS:
+                self._pushSafe(safe)
 
     def requestBattle(self, pauseTime):
         avId = self.air.getAvatarIdFromSender()
@@ -387,6 +381,9 @@ class DistributedCashbotBossGoonAI(DistributedGoonAI.DistributedGoonAI, Distribu
         if avId not in self.boss.avIdList:
             return
 
+        if not self.isHitPlausible(avId, impact, craneId):
+            return
+
         if impact <= self.getMinImpact():
             self.boss.addScore(avId, self.boss.ruleset.POINTS_PENALTY_SANDBAG, reason=CraneLeagueGlobals.ScoreReason.LOW_IMPACT)
             return
@@ -499,14 +496,14 @@ class DistributedCashbotBossGoonAI(DistributedGoonAI.DistributedGoonAI, Distribu
 
         taskMgr.doMethodLater(walkTime, self.__recoverWalk, self.uniqueName('recoverWalk'))
         self.safeDetectionFeelersPath.unstash()
-        taskMgr.add(self.__checkSafeCollisions, self.uniqueName('checkSafeCollisions'))
+        self.boss.safeBroadphase.addPusher(self)
 
     def exitEmergeA(self):
         self.__stopWalk()
         taskMgr.remove(self.uniqueName('recoverWalk'))
         taskMgr.remove(self.uniqueName('syncEmergePosition'))
         self.safeDetectionFeelersPath.stash()
-        taskMgr.remove(self.uniqueName('checkSafeCollisions'))
+        self.boss.safeBroadphase.removePusher(self)
 
     def enterEmergeB(self):
         # The goon is emerging from door b.
@@ -538,14 +535,14 @@ class DistributedCashbotBossGoonAI(DistributedGoonAI.DistributedGoonAI, Distribu
         
         taskMgr.doMethodLater(walkTime, self.__recoverWalk, self.uniqueName('recoverWalk'))
         self.safeDetectionFeelersPath.unstash()
-        taskMgr.add(self.__checkSafeCollisions, self.uniqueName('checkSafeCollisions'))
+        self.boss.safeBroadphase.addPusher(self)
 
     def exitEmergeB(self):
         self.__stopWalk()
         taskMgr.remove(self.uniqueName('recoverWalk'))
         taskMgr.remove(self.uniqueName('syncEmergePosition'))
         self.safeDetectionFeelersPath.stash()
-        taskMgr.remove(self.uniqueName('checkSafeCollisions'))
+        self.boss.safeBroadphase.removePusher(self)
 
     def enterBattle(self):
         self.__updatePosition()
@@ -643,7 +640,7 @@ class DistributedCashbotBossGoonAI(DistributedGoonAI.DistributedGoonAI, Distribu
         except:
             pass
         try:
-            taskMgr.remove(self.uniqueName('checkSafeCollisions'))
+            self.boss.safeBroadphase.removePusher(self)
         except:
             pass
         try:
@@ -12,6 +12,7 @@ from toontown.coghq.CashbotBossComboTracker import CashbotBossComboTracker
 from toontown.toonbase import ToontownGlobals
 from .DistributedBossCogStrippedAI import DistributedBossCogStrippedAI
 from toontown.minigame.statuseffects.StatusEffectGlobals import StatusEffect, STATUS_EFFECT_DURATIONS
+from toontown.minigame.statuseffects.StatusEffectScheduler import StatusEffectScheduler
 
 
 class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
@@ -44,8 +45,8 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
         self.safeHelmetCooldownsDict: dict[int, float] = {}
         
         # Status effect tracking - support multiple instances from different players
-        self.activeStatusEffectTasks = {}  # Maps (statusEffect, avId) -> taskName for cleanup
-        self.statusEffectCounters = {}  # Maps statusEffect -> counter for unique task naming
+        self.activeStatusEffectTasks = {}  # Maps (statusEffect, avId, counter) -> timer for cleanup
+        self.statusEffectCounters = {}  # Maps statusEffect -> counter for telling instances apart (and which is oldest)
         
         # Damage vulnerability from SHATTERED status effect
         self.damageVulnerable = False
@@ -55,7 +56,6 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
         
         # Captured DOT damage for synergy explosions
         self.capturedDotDamageForExplosion = None
-        self.activeTaskObjects = {}  # Maps taskKey -> actual task object
 
     def allowedToSafeHelmet(self, toonId: int) -> bool:
         if toonId not in self.safeHelmetCooldownsDict:
@@ -341,31 +341,27 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
     def setObjectID(self, objId):
         self.objectId = objId
 
+    def scheduleStatusEffectTask(self, taskKey, delay, callback, *args):
+        """Schedule callback(taskKey, *args) on the game's status effect timers, tracked by taskKey for cleanup"""
+        statusEffectSystem = getattr(self.game, 'statusEffectSystem', None)
+        if statusEffectSystem is None:
+            return
+        self.activeStatusEffectTasks[taskKey] = statusEffectSystem.schedule(delay, callback, taskKey, *args)
+
+    def cancelStatusEffectTask(self, taskKey):
+        """Stop tracking a status effect task, cancelling its timer if it hasn't run yet"""
+        StatusEffectScheduler.cancel(self.activeStatusEffectTasks.pop(taskKey, None))
+
+    def getStatusEffectTaskKeys(self, statusEffect):
+        return [key for key in self.activeStatusEffectTasks if key[0] == statusEffect]
+
     def cleanupStatusEffectTasks(self):
-        """Clean up all active status effect tasks with better memory management"""
-        # Remove tasks by object reference first, then by name as fallback
-        for taskKey, taskName in list(self.activeStatusEffectTasks.items()):
-            # Try to get the actual task object
-            taskObj = self.activeTaskObjects.get(taskKey)
-            if taskObj:
-                try:
-                    taskMgr.remove(taskObj)
-                except:
-                    # Task might already be removed, try by name
-                    try:
-                        taskMgr.remove(taskName)
-                    except:
-                        pass
-            else:
-                # Fallback to name-based removal
-                try:
-                    taskMgr.remove(taskName)
-                except:
-                    pass
-        
+        """Cancel all active status effect timers and forget about them"""
+        for timer in self.activeStatusEffectTasks.values():
+            StatusEffectScheduler.cancel(timer)
+
         # Clear all tracking dictionaries
         self.activeStatusEffectTasks.clear()
-        self.activeTaskObjects.clear()
         self.statusEffectCounters.clear()
         self.burnDataTracking.clear()
         self.capturedDotDamageForExplosion = None
@@ -409,194 +405,96 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
         # Add other status effects here as we implement them
     
     def startBurnedEffect(self, appliedByAvId):
-        """Start the BURNED status effect DOT with better task tracking"""
+        """Start the BURNED status effect DOT"""
         
-        # Create a unique task for this player's burn effect
+        # Each player's burn effect ticks on its own
         counter = self.statusEffectCounters.get(StatusEffect.BURNED, 0)
         self.statusEffectCounters[StatusEffect.BURNED] = counter + 1
-        
-        taskName = self.uniqueName(f'burnedDOT-{appliedByAvId}-{counter}')
         taskKey = (StatusEffect.BURNED, appliedByAvId, counter)
-        self.activeStatusEffectTasks[taskKey] = taskName
         
-        # Store burn data for explosion calculation
+        # Store burn data for the ticks and for explosion calculation
         self.burnDataTracking[taskKey] = {
             'appliedByAvId': appliedByAvId,
             'ticksRemaining': 10
         }
         
-        # Start the DOT task with player-specific data stored in the task
-        task = taskMgr.doMethodLater(0.5, self.doBurnTick, taskName)
-        task.burnData = {
-            'appliedByAvId': appliedByAvId,
-            'ticksRemaining': 10,
-            'taskKey': taskKey
-        }
-        
-        # Store the actual task object for better cleanup
-        self.activeTaskObjects[taskKey] = task
+        self.scheduleStatusEffectTask(taskKey, 0.5, self.doBurnTick)
     
-    def doBurnTick(self, task):
+    def doBurnTick(self, taskKey):
         """Apply one tick of burn damage"""
-        burnData = task.burnData
-        taskKey = burnData['taskKey']
+        burnData = self.burnDataTracking.get(taskKey)
         
         # Check if this burn effect has been removed/canceled
-        if taskKey not in self.burnDataTracking:
-            # This burn effect was removed, stop ticking
-            return task.done
+        if burnData is None:
+            return
         
         if burnData['ticksRemaining'] <= 0:
             # Clean up this specific burn effect
             self.cleanupBurnTask(taskKey)
-            return task.done
+            return
         
         # Apply 3 damage to the boss (marked as DOT to prevent flinching/combos)
         damage = 3
-        appliedByAvId = burnData['appliedByAvId']
         
         # Use isDOT=True to prevent flinching and combo credit
         self.game.recordHit(damage, impact=0, craneId=0, objId=0, isGoon=False, isDOT=True)
         
-        burnData['ticksRemaining'] -= 1
+        # The hit may have ended the round and cleaned us up
+        if taskKey not in self.burnDataTracking:
+            return
         
-        # Update tracking data
-        if taskKey in self.burnDataTracking:
-            self.burnDataTracking[taskKey]['ticksRemaining'] = burnData['ticksRemaining']
+        burnData['ticksRemaining'] -= 1
         
         # Schedule next tick if we have more remaining
         if burnData['ticksRemaining'] > 0:
-            return task.again
+            self.scheduleStatusEffectTask(taskKey, 0.5, self.doBurnTick)
         else:
             # Clean up when done
             self.cleanupBurnTask(taskKey)
-            return task.done
     
     def cleanupBurnTask(self, taskKey):
-        """Clean up a specific burn task with better memory management"""
-        if taskKey in self.activeStatusEffectTasks:
-            taskName = self.activeStatusEffectTasks[taskKey]
-            
-            # Remove by task object first
-            taskObj = self.activeTaskObjects.get(taskKey)
-            if taskObj:
-                try:
-                    taskMgr.remove(taskObj)
-                except:
-                    # Task might already be removed, try by name
-                    try:
-                        taskMgr.remove(taskName)
-                    except:
-                        pass
-            else:
-                # Fallback to name-based removal
-                try:
-                    taskMgr.remove(taskName)
-                except:
-                    pass
-            
-            del self.activeStatusEffectTasks[taskKey]
-        
-        # Clean up task object tracking
-        if taskKey in self.activeTaskObjects:
-            del self.activeTaskObjects[taskKey]
-        
-        # Also clean up tracking data
-        if taskKey in self.burnDataTracking:
-            del self.burnDataTracking[taskKey]
+        """Clean up a specific burn effect"""
+        self.cancelStatusEffectTask(taskKey)
+        self.burnDataTracking.pop(taskKey, None)
     
     def stopOldestBurnedEffect(self):
         """Stop the oldest BURNED status effect DOT when one is removed from the system"""
         # Find the oldest burn task and stop it
-        burnTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.BURNED]
+        burnTasks = self.getStatusEffectTaskKeys(StatusEffect.BURNED)
         if burnTasks:
             # Sort by counter (the third element) to get the oldest
             oldestTask = min(burnTasks, key=lambda x: x[2])
             self.cleanupBurnTask(oldestTask)
     
     def startDrenchedEffect(self, appliedByAvId):
-        """Start the DRENCHED status effect with better task tracking"""
+        """Start the DRENCHED status effect"""
         counter = self.statusEffectCounters.get(StatusEffect.DRENCHED, 0)
         self.statusEffectCounters[StatusEffect.DRENCHED] = counter + 1
-        
-        taskName = self.uniqueName(f'drenchedEffect-{appliedByAvId}-{counter}')
         taskKey = (StatusEffect.DRENCHED, appliedByAvId, counter)
-        self.activeStatusEffectTasks[taskKey] = taskName
         
         # Apply animation slowdown immediately
         self.applyAnimationSlowdown()
         
         # Get duration from globals (8 seconds for DRENCHED)
         duration = STATUS_EFFECT_DURATIONS.get(StatusEffect.DRENCHED, 8.0)
-        
-        # Set up cleanup task
-        drenchData = {
-            'appliedByAvId': appliedByAvId,
-            'taskKey': taskKey
-        }
-        
-        task = taskMgr.doMethodLater(duration, self.endDrenchedEffect, taskName)
-        task.drenchData = drenchData
-        
-        # Store the actual task object for better cleanup
-        self.activeTaskObjects[taskKey] = task
+        self.scheduleStatusEffectTask(taskKey, duration, self.endDrenchedEffect)
     
-    def endDrenchedEffect(self, task):
+    def endDrenchedEffect(self, taskKey):
         """End a specific DRENCHED status effect"""
-        # Get the drenchData from the task itself
-        drenchData = task.drenchData
-        
-        self.cleanupDrenchTask(drenchData['taskKey'])
+        self.cancelStatusEffectTask(taskKey)
         
         # Check if this was the last drench effect - if so, restore animation speed
-        drenchTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.DRENCHED]
-        if len(drenchTasks) == 0:
+        if not self.getStatusEffectTaskKeys(StatusEffect.DRENCHED):
             self.removeAnimationSlowdown()
-        
-        return task.done
-    
-    def cleanupDrenchTask(self, taskKey):
-        """Clean up a specific drench task with better memory management"""
-        if taskKey in self.activeStatusEffectTasks:
-            taskName = self.activeStatusEffectTasks[taskKey]
-            
-            # Remove by task object first
-            taskObj = self.activeTaskObjects.get(taskKey)
-            if taskObj:
-                try:
-                    taskMgr.remove(taskObj)
-                except:
-                    # Task might already be removed, try by name
-                    try:
-                        taskMgr.remove(taskName)
-                    except:
-                        pass
-            else:
-                # Fallback to name-based removal
-                try:
-                    taskMgr.remove(taskName)
-                except:
-                    pass
-            
-            del self.activeStatusEffectTasks[taskKey]
-        
-        # Clean up task object tracking
-        if taskKey in self.activeTaskObjects:
-            del self.activeTaskObjects[taskKey]
     
     def stopOldestDrenchedEffect(self):
         """Stop the oldest DRENCHED status effect when one is removed from the system"""
         # Find the oldest drench task and stop it
-        drenchTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.DRENCHED]
+        drenchTasks = self.getStatusEffectTaskKeys(StatusEffect.DRENCHED)
         if drenchTasks:
             # Sort by counter (the third element) to get the oldest
             oldestTask = min(drenchTasks, key=lambda x: x[2])
-            self.cleanupDrenchTask(oldestTask)
-            
-            # Check if this was the last drench effect - if so, restore animation speed
-            remainingDrenchTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.DRENCHED]
-            if len(remainingDrenchTasks) == 0:
-                self.removeAnimationSlowdown()
+            self.endDrenchedEffect(oldestTask)
     
     def applyAnimationSlowdown(self):
         """Apply animation speed slowdown to the boss"""
@@ -614,13 +512,9 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
     
     def startFrozenEffect(self, appliedByAvId):
         """Start the FROZEN status effect - completely immobilizes the boss"""
-        # Create a unique task for this player's frozen effect
         counter = self.statusEffectCounters.get(StatusEffect.FROZEN, 0)
         self.statusEffectCounters[StatusEffect.FROZEN] = counter + 1
-        
-        taskName = self.uniqueName(f'frozenEffect-{appliedByAvId}-{counter}')
         taskKey = (StatusEffect.FROZEN, appliedByAvId, counter)
-        self.activeStatusEffectTasks[taskKey] = taskName
         
         # End any existing stuns and transition to frozen state
         self.endExistingStuns()
@@ -628,75 +522,24 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
         
         # Get duration from globals (10 seconds for FROZEN)
         duration = STATUS_EFFECT_DURATIONS.get(StatusEffect.FROZEN, 10.0)
-        
-        # Set up cleanup task
-        frozenData = {
-            'appliedByAvId': appliedByAvId,
-            'taskKey': taskKey
-        }
-        
-        task = taskMgr.doMethodLater(duration, self.endFrozenEffect, taskName)
-        task.frozenData = frozenData
-
-        # Store the actual task object for better cleanup
-        self.activeTaskObjects[taskKey] = task
+        self.scheduleStatusEffectTask(taskKey, duration, self.endFrozenEffect)
     
-    def endFrozenEffect(self, task):
+    def endFrozenEffect(self, taskKey):
         """End a specific FROZEN status effect"""
-        # Get the frozenData from the task itself
-        frozenData = task.frozenData
-        
-        self.cleanupFrozenTask(frozenData['taskKey'])
+        self.cancelStatusEffectTask(taskKey)
         
         # Check if this was the last frozen effect - if so, unfreeze
-        frozenTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.FROZEN]
-        if len(frozenTasks) == 0:
+        if not self.isFrozen():
             self.removeFrozenState()
-        
-        return task.done
-    
-    def cleanupFrozenTask(self, taskKey):
-        """Clean up a specific frozen task with better memory management"""
-        if taskKey in self.activeStatusEffectTasks:
-            taskName = self.activeStatusEffectTasks[taskKey]
-            
-            # Remove by task object first
-            taskObj = self.activeTaskObjects.get(taskKey)
-            if taskObj:
-                try:
-                    taskMgr.remove(taskObj)
-                except:
-                    # Task might already be removed, try by name
-                    try:
-                        taskMgr.remove(taskName)
-                    except:
-                        pass
-            else:
-                # Fallback to name-based removal
-                try:
-                    taskMgr.remove(taskName)
-                except:
-                    pass
-            
-            del self.activeStatusEffectTasks[taskKey]
-        
-        # Clean up task object tracking
-        if taskKey in self.activeTaskObjects:
-            del self.activeTaskObjects[taskKey]
     
     def stopOldestFrozenEffect(self):
         """Stop the oldest FROZEN status effect when one is removed from the system"""
         # Find the oldest frozen task and stop it
-        frozenTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.FROZEN]
+        frozenTasks = self.getStatusEffectTaskKeys(StatusEffect.FROZEN)
         if frozenTasks:
             # Sort by counter (the third element) to get the oldest
             oldestTask = min(frozenTasks, key=lambda x: x[2])
-            self.cleanupFrozenTask(oldestTask)
-            
-            # Check if this was the last frozen effect - if so, unfreeze
-            remainingFrozenTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.FROZEN]
-            if len(remainingFrozenTasks) == 0:
-                self.removeFrozenState()
+            self.endFrozenEffect(oldestTask)
     
     def endExistingStuns(self):
         """End any existing stun effects when frozen is applied"""
@@ -751,8 +594,7 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
     
     def isFrozen(self):
         """Check if the boss is currently frozen"""
-        frozenTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.FROZEN]
-        return len(frozenTasks) > 0
+        return any(key[0] == StatusEffect.FROZEN for key in self.activeStatusEffectTasks)
     
     def isVulnerableToSafes(self):
         """Check if the boss is vulnerable to safe damage (dizzy OR frozen)"""
@@ -763,13 +605,9 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
     
     def startShatteredEffect(self, appliedByAvId):
         """Start the SHATTERED status effect - re-stuns boss and applies 25% damage vulnerability"""
-        # Create a unique task for this player's shattered effect
         counter = self.statusEffectCounters.get(StatusEffect.SHATTERED, 0)
         self.statusEffectCounters[StatusEffect.SHATTERED] = counter + 1
-        
-        taskName = self.uniqueName(f'shatteredEffect-{appliedByAvId}-{counter}')
         taskKey = (StatusEffect.SHATTERED, appliedByAvId, counter)
-        self.activeStatusEffectTasks[taskKey] = taskName
         
         # Re-stun the boss (back to Dizzy)
         from toontown.toonbase import ToontownGlobals
@@ -780,75 +618,24 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
         
         # Get duration from globals (4 seconds for SHATTERED)
         duration = STATUS_EFFECT_DURATIONS.get(StatusEffect.SHATTERED, 4.0)
-        
-        # Set up cleanup task
-        shatteredData = {
-            'appliedByAvId': appliedByAvId,
-            'taskKey': taskKey
-        }
-        
-        task = taskMgr.doMethodLater(duration, self.endShatteredEffect, taskName)
-        task.shatteredData = shatteredData
-
-        # Store the actual task object for better cleanup
-        self.activeTaskObjects[taskKey] = task
+        self.scheduleStatusEffectTask(taskKey, duration, self.endShatteredEffect)
     
-    def endShatteredEffect(self, task):
+    def endShatteredEffect(self, taskKey):
         """End a specific SHATTERED status effect"""
-        # Get the shatteredData from the task itself
-        shatteredData = task.shatteredData
-        
-        self.cleanupShatteredTask(shatteredData['taskKey'])
+        self.cancelStatusEffectTask(taskKey)
         
         # Check if this was the last shattered effect - if so, remove vulnerability
-        shatteredTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.SHATTERED]
-        if len(shatteredTasks) == 0:
+        if not self.getStatusEffectTaskKeys(StatusEffect.SHATTERED):
             self.removeDamageVulnerability()
-        
-        return task.done
-    
-    def cleanupShatteredTask(self, taskKey):
-        """Clean up a specific shattered task with better memory management"""
-        if taskKey in self.activeStatusEffectTasks:
-            taskName = self.activeStatusEffectTasks[taskKey]
-            
-            # Remove by task object first
-            taskObj = self.activeTaskObjects.get(taskKey)
-            if taskObj:
-                try:
-                    taskMgr.remove(taskObj)
-                except:
-                    # Task might already be removed, try by name
-                    try:
-                        taskMgr.remove(taskName)
-                    except:
-                        pass
-            else:
-                # Fallback to name-based removal
-                try:
-                    taskMgr.remove(taskName)
-                except:
-                    pass
-            
-            del self.activeStatusEffectTasks[taskKey]
-        
-        # Clean up task object tracking
-        if taskKey in self.activeTaskObjects:
-            del self.activeTaskObjects[taskKey]
     
     def stopOldestShatteredEffect(self):
         """Stop the oldest SHATTERED status effect when one is removed from the system"""
         # Find the oldest shattered task and stop it
-        shatteredTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.SHATTERED]
+        shatteredTasks = self.getStatusEffectTaskKeys(StatusEffect.SHATTERED)
         if shatteredTasks:
             # Sort by counter (the third element) to get the oldest
             oldestTask = min(shatteredTasks, key=lambda x: x[2])
-            self.cleanupShatteredTask(oldestTask)
-            
-            # Check if this was the last shattered effect - if so, remove vulnerability
-            remainingShatteredTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.SHATTERED]
-            if len(remainingShatteredTasks) == 0:
-                self.removeDamageVulnerability()
+            self.endShatteredEffect(oldestTask)
     
     def applyDamageVulnerability(self):
         """Apply 25% damage vulnerability to the boss"""
@@ -870,7 +657,6 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
     
     def startExplodeEffect(self, appliedByAvId):
         """Start the EXPLODE status effect - detonates after delay dealing damage"""
-        # Create unique tasks for this player's explode effect
         counter = self.statusEffectCounters.get(StatusEffect.EXPLODE, 0)
         self.statusEffectCounters[StatusEffect.EXPLODE] = counter + 1
         
@@ -881,87 +667,44 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
             dotDamageByPlayer = self.capturedDotDamageForExplosion
             self.capturedDotDamageForExplosion = None  # Clear it after use
         else:
-            # Capture remaining DOT damage immediately before DOTs are removed
-            dotsToRemove = []  # List of (taskKey, appliedByAvId, remainingDamage) to remove
-            
-            # Check all active burn effects using our tracking data
+            # Capture remaining DOT damage from every active burn effect
             for taskKey, burnData in list(self.burnDataTracking.items()):
                 statusEffect, dotAppliedByAvId, burnCounter = taskKey
                 
                 if statusEffect == StatusEffect.BURNED:
-                    ticksRemaining = burnData['ticksRemaining']
-                    remainingDamage = ticksRemaining * 3  # 3 damage per tick
+                    remainingDamage = burnData['ticksRemaining'] * 3  # 3 damage per tick
                     
                     # Track damage by player
                     if dotAppliedByAvId not in dotDamageByPlayer:
                         dotDamageByPlayer[dotAppliedByAvId] = 0
                     dotDamageByPlayer[dotAppliedByAvId] += remainingDamage
                     
-                    # Mark for removal
-                    dotsToRemove.append((taskKey, dotAppliedByAvId, remainingDamage))
-            
-            # Remove all DOT effects (explosion will consume them)
-            for taskKey, dotAppliedByAvId, remainingDamage in dotsToRemove:
-                self.cleanupBurnTask(taskKey)
+                    # Remove the DOT effect (explosion will consume it)
+                    self.cleanupBurnTask(taskKey)
         
-        # Task for DOT consumption at 0.75 seconds
-        dotTaskName = self.uniqueName(f'explodeDOT-{appliedByAvId}-{counter}')
+        # DOT consumption at 0.75 seconds
         dotTaskKey = (StatusEffect.EXPLODE, appliedByAvId, counter, 'DOT')
-        self.activeStatusEffectTasks[dotTaskKey] = dotTaskName
+        self.scheduleStatusEffectTask(dotTaskKey, 0.75, self.explodeDOTConsumption, dotDamageByPlayer)
         
-        # Task for base explosion damage at 1.5 seconds
-        explosionTaskName = self.uniqueName(f'explodeBase-{appliedByAvId}-{counter}')
+        # Base explosion damage at 1.5 seconds
         explosionTaskKey = (StatusEffect.EXPLODE, appliedByAvId, counter, 'BASE')
-        self.activeStatusEffectTasks[explosionTaskKey] = explosionTaskName
-        
-        # Set up DOT consumption task (0.75 seconds)
-        dotData = {
-            'appliedByAvId': appliedByAvId,
-            'taskKey': dotTaskKey,
-            'capturedDotDamage': dotDamageByPlayer  # Store the captured DOT damage
-        }
-        
-        dotTask = taskMgr.doMethodLater(0.75, self.explodeDOTConsumption, dotTaskName)
-        dotTask.explodeData = dotData
-        
-        # Set up base explosion damage task (1.5 seconds)
-        explosionData = {
-            'appliedByAvId': appliedByAvId,
-            'taskKey': explosionTaskKey
-        }
-        
         duration = STATUS_EFFECT_DURATIONS.get(StatusEffect.EXPLODE, 1.5)
-        explosionTask = taskMgr.doMethodLater(duration, self.explodeBaseDamage, explosionTaskName)
-        explosionTask.explodeData = explosionData
-
-        # Store the actual task objects for better cleanup
-        self.activeTaskObjects[dotTaskKey] = dotTask
-        self.activeTaskObjects[explosionTaskKey] = explosionTask
-
+        self.scheduleStatusEffectTask(explosionTaskKey, duration, self.explodeBaseDamage)
     
-    def explodeDOTConsumption(self, task):
-        """Apply DOT damage from the EXPLODE status effect"""
-        explodeData = task.explodeData
-        appliedByAvId = explodeData['appliedByAvId']
-        
-        # Use the captured DOT damage (calculated when explosion was created)
-        dotDamageByPlayer = explodeData['capturedDotDamage']
+    def explodeDOTConsumption(self, taskKey, dotDamageByPlayer):
+        """Apply DOT damage (captured when the explosion was created) from the EXPLODE status effect"""
+        self.cancelStatusEffectTask(taskKey)
         
         # Deal remaining DOT damage (attributed to respective DOT appliers)
         # Note: Even though this is consumed DOT damage, we want the CFO to flinch from explosion effects
         for dotAppliedByAvId, dotDamage in dotDamageByPlayer.items():
             if dotDamage > 0:
                 self.game.recordHitWithAttribution(dotDamage, dotAppliedByAvId, impact=0, craneId=0, objId=0, isGoon=False, isDOT=False)
-        
-        # Clean up this DOT consumption task
-        self.cleanupExplodeTask(explodeData['taskKey'])
-        
-        return task.done
     
-    def explodeBaseDamage(self, task):
+    def explodeBaseDamage(self, taskKey):
         """Deal base explosion damage from the EXPLODE status effect"""
-        explodeData = task.explodeData
-        appliedByAvId = explodeData['appliedByAvId']
+        self.cancelStatusEffectTask(taskKey)
+        appliedByAvId = taskKey[1]
         
         # Calculate total explosion damage
         explosionDamage = 40  # Base explosion damage
@@ -976,45 +719,11 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
             goonsToDestroy = list(self.game.goons)  # Create a copy since goons will modify the list
             for goon in goonsToDestroy:
                 goon.b_destroyGoon()
-        
-        # Clean up this explosion task
-        self.cleanupExplodeTask(explodeData['taskKey'])
-        
-        return task.done
-    
-    def cleanupExplodeTask(self, taskKey):
-        """Clean up a specific explode task with better memory management"""
-        if taskKey in self.activeStatusEffectTasks:
-            taskName = self.activeStatusEffectTasks[taskKey]
-            
-            # Remove by task object first
-            taskObj = self.activeTaskObjects.get(taskKey)
-            if taskObj:
-                try:
-                    taskMgr.remove(taskObj)
-                except:
-                    # Task might already be removed, try by name
-                    try:
-                        taskMgr.remove(taskName)
-                    except:
-                        pass
-            else:
-                # Fallback to name-based removal
-                try:
-                    taskMgr.remove(taskName)
-                except:
-                    pass
-            
-            del self.activeStatusEffectTasks[taskKey]
-        
-        # Clean up task object tracking
-        if taskKey in self.activeTaskObjects:
-            del self.activeTaskObjects[taskKey]
     
     def stopOldestExplodeEffect(self):
         """Stop the oldest EXPLODE status effect when one is removed from the system"""
         # Find all explode tasks (both DOT and BASE) and stop them
-        explodeTasks = [key for key in self.activeStatusEffectTasks.keys() if key[0] == StatusEffect.EXPLODE]
+        explodeTasks = self.getStatusEffectTaskKeys(StatusEffect.EXPLODE)
         if explodeTasks:
             # Group by counter to find matching DOT/BASE pairs
             explodeGroups = {}
@@ -1029,7 +738,7 @@ class DistributedCashbotBossStrippedAI(DistributedBossCogStrippedAI, FSM.FSM):
             
             # Clean up all tasks for the oldest explosion
             for taskKey in explodeGroups[oldestCounter]:
-                self.cleanupExplodeTask(taskKey)
+                self.cancelStatusEffectTask(taskKey)
 
     def delete(self):
         # Clean up all status effects and tasks before deletion
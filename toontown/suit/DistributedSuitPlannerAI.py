@@ -172,10 +172,13 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         self.numAttemptingCogdoTakeover = 0
         self.zoneInfo = {}
         self.zoneIdToPointMap = None
+        # {point index: [(leg end time, is last leg, suit), ...]} for every leg of every suit's path.
+        self.pointOccupancy = {}
         self.cogHQDoors = []
         self.battleList = []
         self.battleMgr = BattleManagerAI.BattleManagerAI(self.air)
         self.setupDNA()
+        self.initEdgeZoneIds()
         if self.notify.getDebug():
             self.notify.debug('Creating a building manager AI in zone' + str(self.zoneId))
         self.buildingMgr = self.air.buildingManagers.get(self.zoneId)
@@ -220,6 +223,22 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         self.cleanup()
         DistributedObjectAI.DistributedObjectAI.delete(self)
 
+    def loadDNAFile(self, dnaStore, dnaFileName):
+        return self.air.loadDNAFileAI(dnaStore, dnaFileName)
+
+    def initEdgeZoneIds(self):
+        # {(start index, end index): zone ID} of every suit edge, so collision checks don't parse zone names.
+        self.edgeZoneIds = {}
+        for (startIndex, endIndex), edge in self.dnaStore.suitEdgeMap.items():
+            self.edgeZoneIds[(startIndex, endIndex)] = int(self.extractGroupName(edge.getZoneId()))
+
+    def getSuitEdgeZoneId(self, startIndex, endIndex):
+        zoneId = self.edgeZoneIds.get((startIndex, endIndex))
+        if zoneId is None:
+            zoneId = int(self.extractGroupName(self.dnaStore.getSuitEdgeZone(startIndex, endIndex)))
+            self.edgeZoneIds[(startIndex, endIndex)] = zoneId
+        return zoneId
+
     def initBuildingsAndPoints(self):
         if not self.buildingMgr:
             return
@@ -312,8 +331,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
                 pi = points.getPointIndex(i)
                 p = self.pointIndexes[pi]
                 i -= 1
-                zoneName = self.dnaStore.getSuitEdgeZone(point.getIndex(), p.getIndex())
-                zoneId = int(self.extractGroupName(zoneName))
+                zoneId = self.getSuitEdgeZoneId(point.getIndex(), p.getIndex())
                 if zoneId in self.zoneIdToPointMap:
                     self.zoneIdToPointMap[zoneId].append(point)
                 else:
@@ -455,6 +473,7 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         newSuit.generateWithRequired(newSuit.zoneId)
         newSuit.moveToNextLeg(None)
         self.suitList.append(newSuit)
+        self.addPathOccupancy(newSuit)
         if newSuit.flyInSuit:
             self.numFlyInSuits += 1
         if newSuit.buildingSuit:
@@ -533,6 +552,15 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
                 minPathLen = self.MIN_PATH_LEN
         if maxPathLen == None:
             maxPathLen = self.MAX_PATH_LEN
+
+        # Don't waste any retries on destinations we can't reach within maxPathLen.
+        startIndex = suit.startPoint.getIndex()
+        possibles = [p for p in possibles if self.canReachDestination(startIndex, p[1], maxPathLen)]
+        backup = [p for p in backup if self.canReachDestination(startIndex, p[1], maxPathLen)]
+        if len(possibles) == 0:
+            possibles = backup
+            backup = []
+
         retryCount = 0
         while len(possibles) > 0 and retryCount < 50:
             p = random.choice(possibles)
@@ -553,6 +581,10 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
 
         return 0
 
+    def canReachDestination(self, startIndex, endPoint, maxPathLen):
+        hops = self.dnaStore.getSuitPathHops(startIndex, endPoint.getIndex())
+        return hops is not None and hops + 1 <= maxPathLen
+
     def pathCollision(self, path, elapsedTime):
         pathLength = path.getNumPoints()
         i = 0
@@ -571,9 +603,8 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
         return result
 
     def pointCollision(self, point, adjacentPoint, elapsedTime):
-        for suit in self.suitList:
-            if suit.pointInMyPath(point, elapsedTime):
-                return 1
+        if self.pointOccupied(point, elapsedTime):
+            return 1
 
         if adjacentPoint != None:
             return self.battleCollision(point, adjacentPoint)
@@ -589,15 +620,58 @@ class DistributedSuitPlannerAI(DistributedObjectAI.DistributedObjectAI, SuitPlan
 
         return 0
 
+    def pointOccupied(self, point, elapsedTime):
+        """
+        Returns 1 if any of our suits will be at the point within PATH_COLLISION_BUFFER seconds of elapsedTime from
+        now. This gives the same answer as asking every suit's pointInMyPath, but only looks at the suits whose
+        paths actually pass through the point.
+        """
+        occupancy = self.pointOccupancy.get(point.getIndex())
+        if not occupancy:
+            return 0
+
+        then = globalClock.getFrameTime() + elapsedTime
+        for endTime, isLastLeg, suit in occupancy:
+            if suit.pathState != 1:
+                continue
+            elapsed = then - suit.pathStartTime
+            # Like SuitLegList.isPointInRange, a suit that has finished its path is still counted as being at the
+            # end of its last leg.
+            if endTime <= elapsed + self.PATH_COLLISION_BUFFER and (isLastLeg or endTime > elapsed - self.PATH_COLLISION_BUFFER):
+                return 1
+
+        return 0
+
+    def addPathOccupancy(self, suit):
+        legs = suit.legList.legs
+        lastLeg = legs[-1]
+        for leg in legs:
+            entry = (leg.getEndTime(), leg is lastLeg, suit)
+            self.pointOccupancy.setdefault(leg.pointA.getIndex(), []).append(entry)
+            if leg.pointB is not leg.pointA:
+                self.pointOccupancy.setdefault(leg.pointB.getIndex(), []).append(entry)
+
+    def removePathOccupancy(self, suit):
+        for leg in suit.legList.legs:
+            for pointIndex in (leg.pointA.getIndex(), leg.pointB.getIndex()):
+                occupancy = self.pointOccupancy.get(pointIndex)
+                if occupancy is None:
+                    continue
+                occupancy = [entry for entry in occupancy if entry[2] is not suit]
+                if occupancy:
+                    self.pointOccupancy[pointIndex] = occupancy
+                else:
+                    del self.pointOccupancy[pointIndex]
+
     def battleCollision(self, point, adjacentPoint):
-        zoneName = self.dnaStore.getSuitEdgeZone(point.getIndex(), adjacentPoint.getIndex())
-        zoneId = int(self.extractGroupName(zoneName))
+        zoneId = self.getSuitEdgeZoneId(point.getIndex(), adjacentPoint.getIndex())
         return self.battleMgr.cellHasBattle(zoneId)
 
     def removeSuit(self, suit):
         self.zoneChange(suit, suit.zoneId)
         if self.suitList.count(suit) > 0:
             self.suitList.remove(suit)
+            self.removePathOccupancy(suit)
             if suit.flyInSuit:
                 self.numFlyInSuits -= 1
             if suit.buildingSuit:
@@ -100,11 +100,14 @@ class SuitPlannerBase:
         dnaFileName = self.genDNAFileName()
 
         self.dnaStore = DNAStorage()
-        loadDNAFileAI(self.dnaStore, self.genDNAFileName())
+        self.loadDNAFile(self.dnaStore, self.genDNAFileName())
 
         self.initDNAInfo()
         return None
 
+    def loadDNAFile(self, dnaStore, dnaFileName):
+        return loadDNAFileAI(dnaStore, dnaFileName)
+
     def genDNAFileName(self):
         try:
             return simbase.air.genDNAFileName(self.getZoneId())
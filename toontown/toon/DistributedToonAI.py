@@ -233,6 +233,8 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
         self.overflowMod = 100
         self.deathReason: DeathReason = DeathReason.UNKNOWN
         self.slotData = {}  # set in connected_packet.py
+        # Who the chat manager was last told we can whisper to freely.
+        self.chatFriends = frozenset()
 
     def generate(self):
         DistributedPlayerAI.DistributedPlayerAI.generate(self)
@@ -242,6 +244,7 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
         DistributedPlayerAI.DistributedPlayerAI.announceGenerate(self)
         DistributedSmoothNodeAI.DistributedSmoothNodeAI.announceGenerate(self)
         if self.isPlayerControlled():
+            self.chatFriends = self.__getChatFriends(self.friendsList)
             self.doLoginChecks()
             if self.WantOldGMNameBan:
                 self._checkOldGMName()
@@ -656,8 +659,23 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
 
     def d_setFriendsList(self, friendsList):
         self.sendUpdate('setFriendsList', [friendsList])
+        # Everyone online is added to everyone else's friends list at login, but the chat manager only
+        # looks at true friends, so it only needs to hear about those.
+        chatFriends = self.__getChatFriends(friendsList)
+        if chatFriends != self.chatFriends:
+            self.chatFriends = chatFriends
+            self.d_updateChatProfile()
         return None
 
+    @staticmethod
+    def __getChatFriends(friendsList):
+        return frozenset(friendId for friendId, friendCode in friendsList if friendCode == 1)
+
+    def d_updateChatProfile(self):
+        # The chat manager caches names and friends lists, so it has to hear about changes to either.
+        if self.isPlayerControlled() and self.air.chatManager is not None:
+            self.air.chatManager.d_avatarProfileChanged(self.getDoId())
+
     def setFriendsList(self, friendsList):
         self.notify.debug('setting friends list to %s' % self.friendsList)
         self.friendsList = friendsList
@@ -4169,6 +4187,10 @@ class DistributedToonAI(DistributedPlayerAI.DistributedPlayerAI, DistributedSmoo
             self.b_setName(newName)
         return
 
+    def d_setName(self, name):
+        DistributedPlayerAI.DistributedPlayerAI.d_setName(self, name)
+        self.d_updateChatProfile()
+
     def setName(self, name):
         DistributedPlayerAI.DistributedPlayerAI.setName(self, name)
         if self.WantOldGMNameBan:
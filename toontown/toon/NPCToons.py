@@ -11673,6 +11673,8 @@ BlockerPositions = {TTLocalizer.Flippy: (Point3(207.4, 18.81, -0.475), 90.0)}
 zone2NpcDict = {}
 
 def generateZone2NpcDict():
+    # Rebuilds the index from scratch, so calling this again (say, after changing NPCToonDict) can't list an NPC twice.
+    zone2NpcDict.clear()
     for id, npcDesc in list(NPCToonDict.items()):
         zoneId = npcDesc[0]
         if zoneId in zone2NpcDict:
@@ -11681,6 +11683,9 @@ def generateZone2NpcDict():
             zone2NpcDict[zoneId] = [id]
 
 
+generateZone2NpcDict()
+
+
 def getNPCName(npcId):
     npc = NPCToonDict.get(npcId)
     if npc:
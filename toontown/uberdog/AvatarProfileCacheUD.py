@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from direct.directnotify import DirectNotifyGlobal
+
+
+class AvatarProfile(NamedTuple):
+    name: str
+    # (friendId, friendCode) pairs.
+    friends: frozenset
+
+
+class AvatarProfileCacheUD:
+    """
+    Keeps the name and friends list of toons who have been chatting recently, so the chat manager doesn't have to
+    read them from the database for every line a toon says.
+
+    Holds at most maxSize toons, throwing out whoever spoke least recently when full, and forgets toons after ttl
+    seconds so the cache never drifts too far from the database. Toons are dropped whenever the AI changes their name or
+    true friends, or the UberDOG changes their name itself, and read again the next time they speak.
+
+    If a toon isn't cached, everything that asks for them while their database read is in flight waits on that one
+    read instead of starting its own.
+    """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory('AvatarProfileCacheUD')
+
+    def __init__(self, air, maxSize: int = 10000, ttl: float = 300.0):
+        self.air = air
+        self.maxSize = maxSize
+        self.ttl = ttl
+
+        # Maps avId -> (profile, when it expires), least recently used first.
+        self.profiles: OrderedDict[int, tuple[AvatarProfile, float]] = OrderedDict()
+        # Maps avId -> the callbacks waiting on their database read.
+        self.pending: dict[int, list[Callable]] = {}
+        # Toons whose in-flight read started before they last changed, so its result is already out of date.
+        self.stale: set[int] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.dbReads = 0
+
+    def getProfile(self, avId: int, callback: Callable[[AvatarProfile | None], None]):
+        """
+        Calls callback with the toon's profile, or None if they aren't a toon. Calls it right away if the toon is
+        cached, or once the database answers if not.
+        """
+        entry = self.profiles.get(avId)
+        if entry is not None:
+            profile, expires = entry
+            if expires > globalClock.getFrameTime():
+                self.profiles.move_to_end(avId)
+                self.hits += 1
+                callback(profile)
+                return
+            del self.profiles[avId]
+
+        self.misses += 1
+        waiting = self.pending.get(avId)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+
+        self.pending[avId] = [callback]
+        self.dbReads += 1
+        self.air.dbInterface.queryObject(self.air.dbId, avId,
+                                         lambda dclass, fields: self.__handleQuery(avId, dclass, fields))
+
+    def __handleQuery(self, avId: int, dclass, fields):
+        profile = None
+        if dclass == self.air.dclassesByName['DistributedToonUD']:
+            profile = AvatarProfile(fields['setName'][0], self.__makeFriends(fields['setFriendsList'][0]))
+
+        if avId in self.stale:
+            self.stale.discard(avId)
+        elif profile is not None:
+            self.__store(avId, profile)
+
+        for callback in self.pending.pop(avId, []):
+            callback(profile)
+
+    def invalidate(self, avId: int):
+        """
+        Forgets a toon, so they are read from the database the next time they speak.
+        """
+        self.profiles.pop(avId, None)
+        if avId in self.pending:
+            self.stale.add(avId)
+
+    def clear(self):
+        self.profiles.clear()
+        self.stale.update(self.pending)
+
+    def __store(self, avId: int, profile: AvatarProfile):
+        self.profiles[avId] = (profile, globalClock.getFrameTime() + self.ttl)
+        self.profiles.move_to_end(avId)
+        while len(self.profiles) > self.maxSize:
+            self.profiles.popitem(last=False)
+
+    @staticmethod
+    def __makeFriends(friendsList) -> frozenset:
+        return frozenset(tuple(friend) for friend in friendsList)
+
+    def __len__(self):
+        return len(self.profiles)
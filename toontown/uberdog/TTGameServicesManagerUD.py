@@ -78,6 +78,7 @@ class SetNamePatternOperation(AvatarOperation):
                                                                   'DistributedToonUD'], {'WishNameState': ('LOCKED',),
                                                                                          'WishName': ('',),
                                                                                          'setName': (name,)})
+        self.gameServicesManager.air.chatManager.invalidateProfile(self.avId)
 
         # We're done. We can now send off the namePatternResponse update through
         # the GameServicesManager, and set this operation's state to Off.
@@ -330,6 +331,7 @@ class AcknowledgeNameOperation(AvatarOperation):
                                                               {'WishNameState': fields['WishNameState'],
                                                                'WishName': fields['WishName'],
                                                                'setName': fields['setName']})
+        self.gameServicesManager.air.chatManager.invalidateProfile(self.avId)
 
         # We're done. We can now send off the acknowledgeAvatarNameResponse update
         # through the GameServicesManager, and set this operation's state to Off.
@@ -0,0 +1,12 @@
+from direct.directnotify import DirectNotifyGlobal
+from direct.distributed.DistributedObjectGlobalAI import DistributedObjectGlobalAI
+
+
+class TTOffChatManagerAI(DistributedObjectGlobalAI):
+    notify = DirectNotifyGlobal.directNotify.newCategory('TTOffChatManagerAI')
+
+    def d_avatarProfileChanged(self, avId):
+        """
+        Tells the UD a toon's name or friends list changed, so it stops using the one it has cached.
+        """
+        self.sendUpdate('avatarProfileChangedAiToUd', [avId])
@@ -1,7 +1,8 @@
 from direct.directnotify import DirectNotifyGlobal
 from direct.distributed.DistributedObjectGlobalUD import DistributedObjectGlobalUD
 
-from toontown.chat.TTWhiteList import TTWhiteList
+from toontown.chat.TTWhiteList import getWhiteList
+from toontown.uberdog.AvatarProfileCacheUD import AvatarProfileCacheUD
 
 
 class TTOffChatManagerUD(DistributedObjectGlobalUD):
@@ -11,12 +12,29 @@ class TTOffChatManagerUD(DistributedObjectGlobalUD):
         DistributedObjectGlobalUD.__init__(self, air)
         self.wantWhiteList = False
         self.whiteList = None
+        self.profileCache = None
 
     def announceGenerate(self):
         DistributedObjectGlobalUD.announceGenerate(self)
         self.wantWhiteList = config.GetBool('want-whitelist', True)
         if self.wantWhiteList:
-            self.whiteList = TTWhiteList()
+            self.whiteList = getWhiteList()
+
+        self.profileCache = AvatarProfileCacheUD(self.air, maxSize=config.GetInt('chat-profile-cache-size', 10000),
+                                                 ttl=config.GetFloat('chat-profile-cache-ttl', 300.0))
+
+    def avatarProfileChangedAiToUd(self, avId):
+        """
+        The AI changed a toon's name or friends list.
+        """
+        self.profileCache.invalidate(avId)
+
+    def invalidateProfile(self, avId):
+        """
+        Called when something on the UberDOG changes a toon in the database.
+        """
+        if self.profileCache is not None:
+            self.profileCache.invalidate(avId)
 
     def chatMessage(self, message):
         accId = self.air.getAccountIdFromSender()
@@ -29,11 +47,11 @@ class TTOffChatManagerUD(DistributedObjectGlobalUD):
                                       message=message)
             return
 
-        def handleAvatar(dclass, fields):
-            if dclass != self.air.dclassesByName['DistributedToonUD']:
+        def handleProfile(profile):
+            if profile is None:
                 return
 
-            senderName = fields['setName'][0]
+            senderName = profile.name
             if self.wantWhiteList:
                 filteredMessage, modifications = self.filterWhiteList(message)
             else:
@@ -45,7 +63,7 @@ class TTOffChatManagerUD(DistributedObjectGlobalUD):
             self.air.send(datagram)
             self.air.writeServerEvent('chat-message-said', avId=avId, message=message, filteredMessage=filteredMessage)
 
-        self.air.dbInterface.queryObject(self.air.dbId, avId, handleAvatar)
+        self.profileCache.getProfile(avId, handleProfile)
 
     def whisperMessage(self, message, receiverAvId):
         accId = self.air.getAccountIdFromSender()
@@ -58,13 +76,12 @@ class TTOffChatManagerUD(DistributedObjectGlobalUD):
                                       message=message)
             return
 
-        def handleAvatar(dclass, fields):
-            if dclass != self.air.dclassesByName['DistributedToonUD']:
+        def handleProfile(profile):
+            if profile is None:
                 return
 
-            senderName = fields['setName'][0]
-            senderFriendsList = fields['setFriendsList'][0]
-            if (receiverAvId, 1) in senderFriendsList:
+            senderName = profile.name
+            if (receiverAvId, 1) in profile.friends:
                 filteredMessage, modifications = message, []
             else:
                 if self.wantWhiteList:
@@ -79,21 +96,7 @@ class TTOffChatManagerUD(DistributedObjectGlobalUD):
             self.air.writeServerEvent('whisper-message-said', avId=avId, receiverAvId=receiverAvId, message=message,
                                       filteredMessage=filteredMessage)
 
-        self.air.dbInterface.queryObject(self.air.dbId, avId, handleAvatar)
+        self.profileCache.getProfile(avId, handleProfile)
 
     def filterWhiteList(self, message):
-        modifications = []
-        words = message.split(' ')
-        offset = 0
-        for word in words:
-            if word and not self.whiteList.isWord(word):
-                modifications.append((offset, offset + len(word) - 1))
-
-            offset += len(word) + 1
-
-        filteredMessage = message
-        for modStart, modStop in modifications:
-            filteredMessage = filteredMessage[:modStart] + '*' * (modStop - modStart + 1) + filteredMessage[
-                                                                                            modStop + 1:]
-
-        return filteredMessage, modifications
+        return self.whiteList.filterText(message)
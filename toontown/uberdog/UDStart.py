@@ -92,3 +92,6 @@ except Exception as error:
                                  accId=simbase.air.getAccountIdFromSender(), info=info)
     simbase.errorReportingService.report(error)
     raise
+finally:
+    # Make sure nothing is left waiting to be written to the event log.
+    simbase.air.eventLog.flushAllEvents()